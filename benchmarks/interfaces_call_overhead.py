@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+#
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+'''
+Microbenchmark of the per-call time of small 1D complex transforms through
+:mod:`pyfftw.interfaces.numpy_fft` with the cache enabled, compared with
+:mod:`numpy.fft` and with calling a :class:`pyfftw.FFTW` object directly.
+
+For small transforms the time is dominated by the overhead of the call
+rather than by the transform itself. Run with::
+
+    python benchmarks/interfaces_call_overhead.py [n_repeats]
+'''
+
+import sys
+import timeit
+
+import numpy
+import pyfftw
+from pyfftw import interfaces
+
+sizes = (16, 32, 64, 128, 256, 512, 1024)
+
+
+def best_time(function, number):
+    '''Return the best time in microseconds of a single call to
+    ``function`` over five repeats of ``number`` calls.
+    '''
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main(number=10000):
+    interfaces.cache.enable()
+    interfaces.cache.set_keepalive_time(None)
+
+    print('Time per call in microseconds, best of 5 repeats of %d calls'
+          % number)
+    print('%8s %12s %12s %12s %10s' % (
+        'size', 'numpy.fft', 'interfaces', 'FFTW', 'overhead'))
+
+    for size in sizes:
+        a = pyfftw.empty_aligned(size, dtype='complex128')
+        a[:] = numpy.random.randn(size) + 1j*numpy.random.randn(size)
+
+        fftw_object = pyfftw.builders.fft(a)
+
+        # Fill the cache
+        interfaces.numpy_fft.fft(a)
+
+        numpy_time = best_time(lambda: numpy.fft.fft(a), number)
+        interfaces_time = best_time(
+            lambda: interfaces.numpy_fft.fft(a), number)
+        fftw_time = best_time(lambda: fftw_object(a), number)
+
+        # The overhead of the interfaces over using the FFTW object directly
+        print('%8d %12.2f %12.2f %12.2f %10.2f' % (
+            size, numpy_time, interfaces_time, fftw_time,
+            interfaces_time - fftw_time))
+
+    interfaces.cache.disable()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -44,6 +44,26 @@
 # define inline
 #endif
 
+/* The bits set by cpu_features for each instruction set extension. The
+ * order matches _cpu_feature_names in utils.pxi. */
+#define CPU_SSE (1<<0)
+#define CPU_SSE2 (1<<1)
+#define CPU_SSE3 (1<<2)
+#define CPU_SSSE3 (1<<3)
+#define CPU_SSE4_1 (1<<4)
+#define CPU_SSE4_2 (1<<5)
+#define CPU_AVX (1<<6)
+#define CPU_FMA (1<<7)
+#define CPU_AVX2 (1<<8)
+#define CPU_AVX512F (1<<9)
+#define CPU_NEON (1<<10)
+
+/* The length of the buffer needed by cpu_brand */
+#define CPU_BRAND_LENGTH 49
+
+/* The number of cache levels reported by cpu_cache_sizes */
+#define CPU_CACHE_LEVELS 3
+
 #if defined(__amd64__) || defined (_M_X64) || defined(__i386__) || defined(_M_IX86) || defined(_X86_)
 
   #define AVX_WORD 2
@@ -56,6 +76,8 @@
     #include <intrin.h>
     #define cpuid(func, cpuinfo)\
       __cpuid(cpuinfo, func);
+    #define cpuid_count(func, subfunc, cpuinfo)\
+      __cpuidex(cpuinfo, func, subfunc);
 
   #else
     /* generic x86 Assembly code (based on wikipedia example)
@@ -73,6 +95,19 @@
        "=c" (cpuinfo[2]), "=d" (cpuinfo[3]) /* ecx read, edx read */\
        : :"edi")
 
+    /* As cpuid, for the functions that also take a subfunction in ecx */
+    #define cpuid_count(func, subfunc, cpuinfo)\
+      cpuinfo[0] = func;\
+      cpuinfo[2] = subfunc;\
+      __asm__ __volatile__ \
+      ("mov %%ebx, %%edi;" \
+       "cpuid;" \
+       "mov %%ebx, %%esi;" \
+       "mov %%edi, %%ebx;" \
+       :"+a" (cpuinfo[0]), "=S" (cpuinfo[1]), \
+       "+c" (cpuinfo[2]), "=d" (cpuinfo[3]) \
+       : :"edi")
+
   #endif
 
 /* Returns the byte alignment for optimum simd operations */
@@ -90,11 +125,133 @@ static inline int simd_alignment(void){
         return 4;
 }
 
+/* Returns the CPU_* bits of the instruction set extensions the CPU has */
+static inline int cpu_features(void){
+    int cpuinfo[4];
+    int max_func;
+    int features = 0;
+
+    cpuid(0, cpuinfo);
+    max_func = cpuinfo[0];
+
+    cpuid(1, cpuinfo);
+
+    if (cpuinfo[3] & (1<<25)) features |= CPU_SSE;
+    if (cpuinfo[3] & (1<<26)) features |= CPU_SSE2;
+    if (cpuinfo[2] & (1<<0)) features |= CPU_SSE3;
+    if (cpuinfo[2] & (1<<9)) features |= CPU_SSSE3;
+    if (cpuinfo[2] & (1<<19)) features |= CPU_SSE4_1;
+    if (cpuinfo[2] & (1<<20)) features |= CPU_SSE4_2;
+    if (cpuinfo[2] & (1<<28)) features |= CPU_AVX;
+    if (cpuinfo[2] & (1<<12)) features |= CPU_FMA;
+
+    if (max_func >= 7) {
+        /* The structured extended feature flags */
+        cpuid_count(7, 0, cpuinfo);
+
+        if (cpuinfo[1] & (1<<5)) features |= CPU_AVX2;
+        if (cpuinfo[1] & (1<<16)) features |= CPU_AVX512F;
+    }
+
+    return features;
+}
+
+/* Writes the CPU brand string, which names the CPU model, to brand (which
+ * must have room for CPU_BRAND_LENGTH characters). It is empty if the CPU
+ * has no brand string. */
+static inline void cpu_brand(char *brand){
+    int cpuinfo[4];
+    int n, i;
+
+    brand[0] = '\0';
+
+    cpuid(0x80000000, cpuinfo);
+    if ((unsigned int)cpuinfo[0] < 0x80000004)
+        return;
+
+    for (n = 0; n < 3; n++) {
+        cpuid(0x80000002 + n, cpuinfo);
+
+        for (i = 0; i < 16; i++)
+            brand[16*n + i] = ((char *)cpuinfo)[i];
+    }
+
+    brand[CPU_BRAND_LENGTH - 1] = '\0';
+}
+
+/* Reads the data (or unified) cache sizes in bytes of the levels 1 to
+ * CPU_CACHE_LEVELS into sizes, from the deterministic cache parameters
+ * (function 4 on Intel CPUs and 0x8000001D on AMD CPUs). The size is 0 for
+ * the levels that are not found. */
+static inline void cpu_cache_sizes(int *sizes){
+    int cpuinfo[4];
+    int funcs[2] = {4, 0x8000001D};
+    int max_funcs[2];
+    int f, n, type, level;
+
+    for (level = 0; level < CPU_CACHE_LEVELS; level++)
+        sizes[level] = 0;
+
+    cpuid(0, cpuinfo);
+    max_funcs[0] = cpuinfo[0];
+
+    cpuid(0x80000000, cpuinfo);
+    max_funcs[1] = cpuinfo[0];
+
+    for (f = 0; f < 2; f++) {
+        if ((unsigned int)max_funcs[f] < (unsigned int)funcs[f])
+            continue;
+
+        /* Each subfunction describes one cache, until one of type 0 */
+        for (n = 0; n < 16; n++) {
+            cpuid_count(funcs[f], n, cpuinfo);
+
+            type = cpuinfo[0] & 0x1f;
+            level = (cpuinfo[0] >> 5) & 0x7;
+
+            if (type == 0)
+                break;
+
+            /* Skip the instruction caches */
+            if (type == 2 || level < 1 || level > CPU_CACHE_LEVELS)
+                continue;
+
+            sizes[level - 1] = (
+                (((cpuinfo[1] >> 22) & 0x3ff) + 1) *  /* ways */
+                (((cpuinfo[1] >> 12) & 0x3ff) + 1) *  /* partitions */
+                ((cpuinfo[1] & 0xfff) + 1) *  /* line size */
+                (cpuinfo[2] + 1));  /* sets */
+        }
+
+        if (sizes[0] != 0)
+            return;
+    }
+}
+
 #else
 
 static inline int simd_alignment(void){
     return 4;
 }
+
+static inline int cpu_features(void){
+  #if defined(__ARM_NEON) || defined(__ARM_NEON__)
+    return CPU_NEON;
+  #else
+    return 0;
+  #endif
+}
+
+static inline void cpu_brand(char *brand){
+    brand[0] = '\0';
+}
+
+static inline void cpu_cache_sizes(int *sizes){
+    int level;
+
+    for (level = 0; level < CPU_CACHE_LEVELS; level++)
+        sizes[level] = 0;
+}
 #endif
 
 #endif /* Header guard */
@@ -19,7 +19,12 @@ from .pyfftw import (
         FFTW,
         export_wisdom,
         import_wisdom,
+        export_wisdom_to_files,
+        import_wisdom_from_files,
+        import_system_wisdom,
         forget_wisdom,
+        add_planner_hook,
+        remove_planner_hook,
         simd_alignment,
         n_byte_align_empty,
         n_byte_align,
@@ -39,9 +44,15 @@ from .pyfftw import (
 )
 
 from . import config
+from ._wisdom import load_wisdom, save_wisdom
+from ._tuning import next_fast_shape
+from ._hooks import LoggingPlannerHook, ChromeTracePlannerHook
 from . import builders
 from . import interfaces
 
+# Load the wisdom file set by config.WISDOM_FILE, if any
+_wisdom._saver.load()
+
 
 # clean up the namespace
 del builders.builders
@@ -0,0 +1,438 @@
+#!/usr/bin/env python
+#
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+'''
+Command line tools for building and checking bundles of wisdom, which are
+wisdom files as written by :func:`pyfftw.save_wisdom`. Run with::
+
+    python -m pyfftw {plan,merge,validate,prune} ...
+
+The transforms are read from a manifest in the format written by
+:func:`pyfftw.interfaces.cache.save_manifest`. Only the ``shape`` of each
+transform is needed; the other entries default to a C-contiguous
+``'complex128'`` array transformed by ``fftn`` over all its axes with one
+thread and ``'FFTW_MEASURE'``.
+
+* ``plan`` plans the transforms in worker processes and saves the merged
+  wisdom of the workers to a bundle (merging it with the bundle if it
+  already exists).
+* ``merge`` merges several bundles into one, keeping the wisdom of each
+  machine separate.
+* ``validate`` checks that a bundle has the wisdom for every transform,
+  by planning with ``'FFTW_WISDOM_ONLY'``, and lists those it is missing.
+* ``prune`` removes from a bundle the wisdom that is not needed by any of
+  the transforms.
+
+The wisdom in a bundle is stored under a fingerprint of the machine it
+was planned on, and the other commands work on the wisdom for the running
+machine only. Only the files named on the command line are read and
+written; :data:`pyfftw.config.WISDOM_FILE` is ignored.
+'''
+
+import argparse
+import inspect
+import json
+import multiprocessing
+import sys
+import time
+
+import numpy
+
+import pyfftw
+from pyfftw import builders, config, _wisdom
+from pyfftw.builders._utils import _valid_efforts
+from pyfftw.interfaces import cache
+
+# The index of the wisdom string in the tuple returned by
+# pyfftw.export_wisdom, for each FFTW input dtype character.
+_precision_index = {'d': 0, 'D': 0, 'f': 1, 'F': 1, 'g': 2, 'G': 2}
+
+_transform_defaults = {
+    'function': 'fftn', 'dtype': 'complex128', 's': None,
+    'alignment': 0, 'overwrite_input': False,
+    'planner_effort': 'FFTW_MEASURE', 'threads': 1, 'auto_align_input': True,
+    'auto_contiguous': True, 'type': None}
+
+
+def main(argv=None):
+    '''Run the command line tool with the arguments ``argv`` (by default,
+    those of the process), returning the exit status.
+    '''
+    parser = argparse.ArgumentParser(
+        prog='python -m pyfftw',
+        description='Build and check bundles of FFTW wisdom.')
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    plan_parser = subparsers.add_parser(
+        'plan', help='Plan the transforms in a manifest and save the wisdom.')
+    plan_parser.add_argument('manifest')
+    plan_parser.add_argument('-o', '--output', required=True,
+                             help='The bundle to save the wisdom to.')
+    plan_parser.add_argument('-e', '--planner-effort', choices=_valid_efforts,
+                             help='Plan every transform with this effort.')
+    plan_parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='The number of worker processes (1 by default). Workers that '
+        'measure at the same time can skew each other\'s timings.')
+    plan_parser.set_defaults(function=_plan)
+
+    merge_parser = subparsers.add_parser(
+        'merge', help='Merge bundles into one.')
+    merge_parser.add_argument('output')
+    merge_parser.add_argument('bundles', nargs='+')
+    merge_parser.set_defaults(function=_merge)
+
+    validate_parser = subparsers.add_parser(
+        'validate', help='List the transforms in a manifest that a bundle '
+        'has no wisdom for.')
+    validate_parser.add_argument('bundle')
+    validate_parser.add_argument('manifest')
+    validate_parser.add_argument('-e', '--planner-effort',
+                                 choices=_valid_efforts)
+    validate_parser.set_defaults(function=_validate)
+
+    prune_parser = subparsers.add_parser(
+        'prune', help='Remove the wisdom a manifest does not need from a '
+        'bundle.')
+    prune_parser.add_argument('bundle')
+    prune_parser.add_argument('manifest')
+    prune_parser.add_argument('-o', '--output',
+                              help='The pruned bundle (by default, the '
+                              'bundle is pruned in place).')
+    prune_parser.add_argument('-e', '--planner-effort',
+                              choices=_valid_efforts)
+    prune_parser.set_defaults(function=_prune)
+
+    args = parser.parse_args(argv)
+
+    config.WISDOM_FILE = None
+    pyfftw.forget_wisdom()
+
+    try:
+        return args.function(args)
+    except (OSError, ValueError) as e:
+        print('python -m pyfftw %s: %s' % (args.command, e), file=sys.stderr)
+        return 2
+
+
+def _plan(args):
+    keys = _read_manifest(args.manifest, args.planner_effort)
+    jobs = max(1, min(args.jobs, len(keys)))
+
+    # The workers share out the transforms, and each returns its wisdom
+    with multiprocessing.Pool(jobs) as pool:
+        results = pool.map(_plan_worker, [keys[n::jobs] for n in range(jobs)])
+
+    for wisdom, planning_times in results:
+        pyfftw.import_wisdom(wisdom)
+
+        for key, planning_time in planning_times:
+            print('planned %s in %.3f s' % (_describe(key), planning_time))
+
+    pyfftw.save_wisdom(args.output)
+    return 0
+
+
+def _plan_worker(keys):
+    '''Plan the transforms for the interfaces cache keys ``keys``, and
+    return the wisdom along with the time taken for each transform.
+    '''
+    config.WISDOM_FILE = None
+    pyfftw.forget_wisdom()
+
+    planning_times = []
+    for key in keys:
+        planning_start = time.perf_counter()
+        cache._build_for_key(key)
+        planning_times.append((key, time.perf_counter() - planning_start))
+
+    return pyfftw.export_wisdom(), planning_times
+
+
+def _merge(args):
+    # The bundles can hold the wisdom of several machines (see
+    # pyfftw._wisdom), and the wisdom of each machine is merged separately
+    # so that it is kept even if it cannot be imported here.
+    with _wisdom._locked(args.output, exclusive=True):
+        try:
+            machines = _wisdom._read(args.output)
+        except FileNotFoundError:
+            machines = []
+
+        for bundle in args.bundles:
+            with _wisdom._locked(bundle, exclusive=False):
+                bundle_machines = _wisdom._read(bundle)
+
+            for fingerprint, wisdom in bundle_machines:
+                for n, (each_fingerprint, each_wisdom) in enumerate(machines):
+                    if each_fingerprint == fingerprint:
+                        machines[n] = (
+                            fingerprint, _merge_wisdom(each_wisdom, wisdom))
+                        break
+                else:
+                    machines.append((fingerprint, wisdom))
+
+        _wisdom._write(args.output, machines)
+
+    return 0
+
+
+def _merge_wisdom(wisdom, other_wisdom):
+    '''Return the union of the lines of the wisdom strings of each
+    precision in ``wisdom`` and ``other_wisdom``, which are tuples as
+    returned by :func:`pyfftw.export_wisdom` on the same machine.
+    '''
+    merged = []
+
+    for each, other in zip(wisdom, other_wisdom):
+        if not each or not other:
+            merged.append(each or other)
+            continue
+
+        lines = each.splitlines()
+        new_lines = [line for line in other.splitlines()[1:-1]
+                     if line not in lines]
+
+        merged.append(b'\n'.join(lines[:-1] + new_lines + lines[-1:]) +
+                      b'\n')
+
+    return tuple(merged)
+
+
+def _validate(args):
+    keys = _read_manifest(args.manifest, args.planner_effort)
+    checks = _wisdom_checks(keys)
+
+    pyfftw.load_wisdom(args.bundle)
+
+    misses = 0
+    for check in checks:
+        if check():
+            print('ok      %s' % _describe(check.key))
+        else:
+            print('missing %s' % _describe(check.key))
+            misses += 1
+
+    print('%d of %d transforms have no wisdom' % (misses, len(checks)))
+    return 1 if misses else 0
+
+
+def _prune(args):
+    keys = _read_manifest(args.manifest, args.planner_effort)
+    checks = _wisdom_checks(keys)
+
+    pyfftw.load_wisdom(args.bundle)
+    wisdom = [each.decode('ascii') for each in pyfftw.export_wisdom()]
+
+    if not all(check() for check in checks):
+        raise ValueError('Invalid bundle: '
+                'The bundle does not have the wisdom for every transform.')
+
+    # The lines between the header and the closing bracket each hold the
+    # wisdom for one problem. Each is dropped in turn if every transform
+    # can still be planned without it.
+    lines = [each.splitlines() for each in wisdom]
+    kept = [each[1:-1] for each in lines]
+
+    for index, precision_checks in enumerate(_by_precision(checks)):
+        for line in list(kept[index]):
+            candidate = list(kept)
+            candidate[index] = [each for each in kept[index]
+                                if each is not line]
+
+            pyfftw.forget_wisdom()
+            pyfftw.import_wisdom(_join_wisdom(lines, candidate))
+
+            if all(check() for check in precision_checks):
+                kept = candidate
+
+    pyfftw.forget_wisdom()
+    pyfftw.import_wisdom(_join_wisdom(lines, kept))
+
+    print('kept %d of %d lines of wisdom' % (
+        sum(len(each) for each in kept),
+        sum(len(each) - 2 for each in lines if each)))
+
+    # Merging would put the pruned wisdom back
+    pyfftw.save_wisdom(args.output or args.bundle, merge=False)
+    return 0
+
+
+def _join_wisdom(lines, kept):
+    '''Return the tuple of wisdom strings with the header and closing
+    lines from ``lines`` and the wisdom lines in ``kept``.
+    '''
+    return tuple(
+        '\n'.join([each[0]] + each_kept + [each[-1]]).encode('ascii') + b'\n'
+        if each else b''
+        for each, each_kept in zip(lines, kept))
+
+
+def _wisdom_checks(keys):
+    '''Return a :class:`_WisdomCheck` for each of the cache keys ``keys``.
+    '''
+    checks = [_WisdomCheck(key) for key in keys]
+
+    # Even planning with 'FFTW_ESTIMATE' adds to the wisdom
+    pyfftw.forget_wisdom()
+
+    return checks
+
+
+def _by_precision(checks):
+    '''Return the checks for each precision, in the order of
+    :func:`pyfftw.export_wisdom`.
+    '''
+    precision_checks = ([], [], [])
+
+    for check in checks:
+        precision_checks[check.precision].append(check)
+
+    return precision_checks
+
+
+class _WisdomCheck(object):
+    '''Checks whether the wisdom for the transform of an interfaces cache
+    key is known, by planning it with ``'FFTW_WISDOM_ONLY'``.
+
+    The arrays and flags are found by building the object with
+    ``'FFTW_ESTIMATE'`` when the check is created, so that each check only
+    needs the planning with ``'FFTW_WISDOM_ONLY'``.
+    '''
+
+    def __init__(self, key):
+        self.key = key
+
+        planner_effort = key[cache._PLANNER_EFFORT_INDEX]
+        estimate_key = (key[:cache._PLANNER_EFFORT_INDEX] +
+                        ('FFTW_ESTIMATE',) +
+                        key[cache._PLANNER_EFFORT_INDEX + 1:])
+
+        self._obj, obj_key, planning_time = cache._build_for_key(estimate_key)
+
+        self._flags = [planner_effort, 'FFTW_WISDOM_ONLY'] + [
+            each for each in self._obj.flags if each != 'FFTW_ESTIMATE']
+        self._threads = key[cache._MANIFEST_FIELDS.index('threads')]
+
+        self.precision = _precision_index[self._obj.input_dtype.char]
+
+    def __call__(self):
+        try:
+            pyfftw.FFTW(self._obj.input_array, self._obj.output_array,
+                        axes=self._obj.axes, direction=self._obj.direction,
+                        flags=self._flags, threads=self._threads)
+        except RuntimeError:
+            return False
+
+        return True
+
+
+def _read_manifest(filename, planner_effort=None):
+    '''Return the interfaces cache keys for the transforms in the manifest
+    ``filename``, with the missing entries filled in with the defaults and
+    the planner effort replaced by ``planner_effort`` if it is given.
+    '''
+    with open(filename) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    if (not isinstance(manifest, dict) or
+            manifest.get('version') != cache._MANIFEST_VERSION):
+        raise ValueError('Invalid manifest: '
+                'The manifest version is not supported.')
+
+    keys = []
+    try:
+        for each in manifest['transforms']:
+            transform = dict(_transform_defaults)
+            transform.update(each)
+
+            if planner_effort is not None:
+                transform['planner_effort'] = planner_effort
+
+            if 'axes' not in transform:
+                transform['axes'] = _default_axes(transform['function'])
+
+            if 'strides' not in transform:
+                transform['strides'] = _c_strides(
+                    transform['shape'], numpy.dtype(transform['dtype']))
+
+            keys.append(cache._manifest_to_key(transform))
+
+    except (KeyError, TypeError) as e:
+        raise ValueError('Invalid manifest: '
+                'The transforms cannot be read (%s).' % e)
+
+    return keys
+
+
+def _default_axes(function):
+    '''Return the default axis or axes of the builder named ``function``,
+    as they appear in the cache key.
+    '''
+    try:
+        builder = getattr(builders, function)
+    except AttributeError:
+        raise ValueError('Invalid manifest: '
+                'There is no builder named %r.' % (function,))
+
+    # The axes are the third argument to every builder
+    return list(inspect.signature(builder).parameters.values())[2].default
+
+
+def _c_strides(shape, dtype):
+    '''Return the strides of a C-contiguous array of ``shape`` and
+    ``dtype``.
+    '''
+    strides = []
+    stride = dtype.itemsize
+
+    for length in reversed(shape):
+        strides.insert(0, stride)
+        stride *= length
+
+    return strides
+
+
+def _describe(key):
+    '''Return a short description of the transform of a cache key.
+    '''
+    transform = dict(zip(cache._MANIFEST_FIELDS, key))
+
+    return '%s %s %s %s threads=%d' % (
+        transform['function'], transform['shape'], transform['dtype'].name,
+        transform['planner_effort'], transform['threads'])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+#
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+'''Planner hooks, to be added with :func:`pyfftw.add_planner_hook`, that
+log the planning calls or record them as a trace.
+'''
+
+import json
+import logging
+import os
+import threading
+
+def _describe(event):
+    '''Return a one line description of the plan of a planner event.
+    '''
+    return '%s %s%s to %s%s over axes %s with %s and %d threads' % (
+            event['direction'], event['input_dtype'],
+            event['input_shape'], event['output_dtype'],
+            event['output_shape'], event['axes'],
+            ', '.join(event['flags']), event['threads'])
+
+class LoggingPlannerHook(object):
+    '''A planner hook that logs every planning call to ``logger``
+    (by default, the ``'pyfftw'`` logger) at ``level``.
+
+    If ``slow_time`` is not ``None``, the calls that take at least that
+    many seconds, including the time spent waiting for the planner lock,
+    are logged at ``logging.WARNING`` instead, as are the calls for which
+    planning fails.
+    '''
+
+    def __init__(self, logger=None, level=logging.DEBUG, slow_time=None):
+
+        if logger is None:
+            logger = logging.getLogger('pyfftw')
+
+        self.logger = logger
+        self.level = level
+        self.slow_time = slow_time
+
+    def before_plan(self, event):
+        self.logger.log(self.level, 'Planning %s', _describe(event))
+
+    def after_plan(self, event):
+        level = self.level
+        total_time = event['lock_wait_time'] + event['planning_time']
+        if self.slow_time is not None and total_time >= self.slow_time:
+            level = logging.WARNING
+
+        if event['succeeded']:
+            message = 'Planned %s in %.6f s after waiting %.6f s for the lock'
+        else:
+            level = logging.WARNING
+            message = ('Failed to plan %s in %.6f s after waiting %.6f s '
+                       'for the lock')
+
+        self.logger.log(level, message, _describe(event),
+                        event['planning_time'], event['lock_wait_time'])
+
+class ChromeTracePlannerHook(object):
+    '''A planner hook that records every planning call as trace events,
+    which can be saved in the Chrome trace event format (as read by
+    ``chrome://tracing`` and Perfetto) with
+    :meth:`~pyfftw.ChromeTracePlannerHook.save`.
+
+    Each call is recorded on the timeline of its thread as a
+    ``'planner lock'`` event, for the time spent waiting for the planner
+    lock, followed by a ``'plan'`` event whose arguments describe the
+    plan.
+    '''
+
+    def __init__(self):
+        self._events = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def before_plan(self, event):
+        pass
+
+    def after_plan(self, event):
+        # The trace event times are in microseconds
+        lock_start_time = event['start_time'] * 1e6
+        lock_wait_time = event['lock_wait_time'] * 1e6
+
+        args = {'input_shape': list(event['input_shape']),
+                'output_shape': list(event['output_shape']),
+                'input_strides': list(event['input_strides']),
+                'output_strides': list(event['output_strides']),
+                'input_dtype': str(event['input_dtype']),
+                'output_dtype': str(event['output_dtype']),
+                'axes': list(event['axes']),
+                'direction': event['direction'],
+                'flags': list(event['flags']),
+                'threads': event['threads'],
+                'planning_timelimit': event['planning_timelimit'],
+                'succeeded': event['succeeded']}
+
+        common = {'cat': 'pyfftw', 'ph': 'X', 'pid': self._pid,
+                  'tid': event['thread_id']}
+
+        with self._lock:
+            self._events.append(dict(common, name='planner lock',
+                    ts=lock_start_time, dur=lock_wait_time))
+            self._events.append(dict(common, name='plan',
+                    ts=lock_start_time + lock_wait_time,
+                    dur=event['planning_time'] * 1e6, args=args))
+
+    def events(self):
+        '''Return a list of the trace events recorded so far.
+        '''
+        with self._lock:
+            return list(self._events)
+
+    def save(self, filename):
+        '''Save the trace events recorded so far to ``filename``, as a
+        JSON trace.
+        '''
+        with open(filename, 'w') as trace_file:
+            json.dump({'traceEvents': self.events(),
+                       'displayTimeUnit': 'ms'}, trace_file)
@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+#
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+'''Choosing the lengths to pad transforms to, either from the lengths
+that FFTW is known to be fast for or by timing the transforms of some of
+those lengths on the running machine.
+
+The timings are of one dimensional transforms, and the time of a
+multi-dimensional transform is modelled as the sum of the times of the
+one dimensional transforms along each axis. They are kept for the life of
+the process and, if :data:`pyfftw.config.TUNING_FILE` is set, saved to
+that file under the fingerprint of the machine (as for the wisdom, see
+:mod:`pyfftw._wisdom`).
+'''
+
+import itertools
+import json
+import threading
+import time
+import warnings
+
+import numpy
+
+from .pyfftw import FFTW, empty_aligned, next_fast_len
+from . import config
+from . import _wisdom
+
+_TUNING_FILE_VERSION = 1
+
+# The number of fast lengths (beyond the unpadded length) that are timed
+# for each axis.
+_CANDIDATES = 4
+
+# Short transforms are timed in batches of about this many elements, so
+# that each timing is long enough to be measured.
+_TIMED_ELEMENTS = 2**14
+
+# Each transform is timed this many times, and the quickest time is used.
+_REPEATS = 5
+
+# The real dtype character for the precision of each dtype FFTW supports
+_precisions = {'f': 'f', 'F': 'f', 'd': 'd', 'D': 'd', 'g': 'g', 'G': 'g'}
+
+
+def next_fast_shape(shape, axes=None, real=False, max_extra=None,
+                    tuned=False, dtype=None, threads=1):
+    '''next_fast_shape(shape, axes=None, real=False, max_extra=None,
+    tuned=False, dtype=None, threads=1)
+
+    Find the shape to pad an array of shape ``shape`` to for a fast
+    multi-dimensional transform over ``axes``, as :func:`next_fast_len`
+    does for a single length.
+
+    Parameters
+    ----------
+    shape : sequence of ints
+        The shape to start searching from.
+    axes : sequence of ints, optional
+        The axes that are transformed (and so padded). By default, every
+        axis is.
+    real : bool, optional
+        If ``True``, the shape is for a real-to-complex (or
+        complex-to-real) transform, the last of ``axes`` of which is only
+        padded to even lengths.
+    max_extra : float, optional
+        The largest allowed increase in the number of elements, as a
+        fraction of the number in ``shape``. For example, with a
+        ``max_extra`` of ``0.5`` the padded array is at most half as big
+        again. By default there is no bound.
+    tuned : bool, optional
+        If ``True``, the one dimensional transforms of the first few fast
+        lengths above each length are timed on the running machine (the
+        timings are kept, and saved to :data:`pyfftw.config.TUNING_FILE`
+        if it is set), and the shape with the quickest transform is
+        returned. The unpadded length is always one of those timed. If
+        ``False``, each axis is padded to its first fast length.
+    dtype : dtype, optional
+        The dtype of the transformed array, which is used for the timings
+        when ``tuned`` is ``True``. It defaults to ``'complex128'``, or
+        ``'float64'`` if ``real`` is ``True``.
+    threads : int, optional
+        The number of threads used for the timings when ``tuned`` is
+        ``True``.
+
+    Returns
+    -------
+    out : tuple of ints
+        The padded shape, in which only the lengths of ``axes`` differ
+        from ``shape``.
+    '''
+    shape = tuple(int(length) for length in shape)
+
+    if axes is None:
+        axes = range(len(shape))
+
+    try:
+        # The order matters, as the last axis is the real one
+        axes = list(dict.fromkeys(axis % len(shape) for axis in axes))
+    except ZeroDivisionError:
+        axes = []
+
+    if len(axes) == 0:
+        return shape
+
+    if any(length < 1 for length in shape):
+        raise ValueError('Invalid shape: '
+                'The lengths of the shape should all be positive.')
+
+    if max_extra is not None and max_extra < 0:
+        raise ValueError('Invalid max_extra: '
+                'The extra fraction of memory cannot be negative.')
+
+    # Other dtypes are transformed in double precision by the builders
+    precision = _precisions.get(
+        numpy.dtype(dtype).char if dtype is not None else 'd', 'd')
+
+    # The kinds of the transforms along each axis: a real transform along
+    # the last axis (when real is True) and complex transforms otherwise.
+    kinds = ['c2c'] * len(axes)
+    if real:
+        kinds[-1] = 'r2c'
+
+    size = numpy.prod(shape, dtype=float)
+    if max_extra is not None:
+        max_size = size * (1 + max_extra)
+    else:
+        max_size = float('inf')
+
+    if tuned:
+        # Only the lengths that fit in the bound by themselves are timed
+        candidates = [
+            tuple(length for length in _candidates(shape[axis], kind == 'r2c')
+                  if length * size / shape[axis] <= max_size)
+            for axis, kind in zip(axes, kinds)]
+    else:
+        candidates = [(shape[axis], next_fast_len(shape[axis], kind == 'r2c'))
+                      for axis, kind in zip(axes, kinds)]
+
+    if tuned:
+        with _timings_lock:
+            costs = [dict((length, _transform_time(
+                               length, kind, precision, threads))
+                          for length in lengths)
+                     for lengths, kind in zip(candidates, kinds)]
+
+            _save_timings()
+    else:
+        # Untuned, the lengths padded to are taken to be fast enough that
+        # the padded shape with the most axes padded is the best one.
+        costs = [{lengths[0]: 1.0, lengths[-1]: 0.0}
+                 for lengths in candidates]
+
+    best = None
+    for lengths in itertools.product(*candidates):
+        padded_size = size
+        for axis, length in zip(axes, lengths):
+            padded_size = padded_size / shape[axis] * length
+
+        if padded_size > max_size:
+            continue
+
+        cost = _shape_cost(lengths, kinds, costs, tuned)
+
+        if best is None or (cost, padded_size) < best[:2]:
+            best = (cost, padded_size, lengths)
+
+    padded_shape = list(shape)
+    for axis, length in zip(axes, best[2]):
+        padded_shape[axis] = length
+
+    return tuple(padded_shape)
+
+
+def _candidates(length, real):
+    '''Return the lengths that a transform of ``length`` may be padded to,
+    which are ``length`` and the next few fast lengths above it.
+    '''
+    lengths = [length]
+
+    while len(lengths) <= _CANDIDATES:
+        lengths.append(next_fast_len(lengths[-1] + 1, real))
+
+    return tuple(lengths)
+
+
+def _shape_cost(lengths, kinds, costs, tuned):
+    '''Return the modelled cost of the multi-dimensional transform with
+    the transformed lengths ``lengths``, as the sum over the axes of the
+    number of one dimensional transforms along that axis times the cost of
+    each.
+    '''
+    if not tuned:
+        return sum(each_costs[length]
+                   for length, each_costs in zip(lengths, costs))
+
+    # The complex transforms along the other axes of a real transform
+    # are of the half length output of the transform along the last axis.
+    complex_lengths = list(lengths)
+    if kinds[-1] == 'r2c':
+        complex_lengths[-1] = lengths[-1] // 2 + 1
+
+    total = 0.0
+    for n, (length, each_costs) in enumerate(zip(lengths, costs)):
+        others = (complex_lengths[:n] + complex_lengths[n + 1:]
+                  if kinds[n] == 'c2c' else lengths[:n])
+
+        total += numpy.prod(others, dtype=float) * each_costs[length]
+
+    return total
+
+
+def _transform_time(length, kind, precision, threads):
+    '''Return the time in seconds of one transform of ``length`` of
+    ``kind`` (``'c2c'`` or ``'r2c'``) in ``precision`` (a real dtype
+    character) on the running machine. It is timed if it is not already
+    known. The caller should hold ``_timings_lock``.
+    '''
+    if kind == 'r2c':
+        input_dtype = precision
+    else:
+        input_dtype = precision.upper()
+
+    key = '%s %s %d %d' % (kind, numpy.dtype(input_dtype).name, length,
+                           threads)
+
+    if not _timings_loaded:
+        _load_timings()
+
+    if key not in _timings:
+        _timings[key] = _time_transform(length, kind, input_dtype, threads)
+        _unsaved_timings[key] = _timings[key]
+
+    return _timings[key]
+
+
+def _time_transform(length, kind, input_dtype, threads):
+    '''Time a batch of transforms of ``length`` and return the time of
+    each.
+    '''
+    batch = max(1, _TIMED_ELEMENTS // length)
+
+    input_array = empty_aligned((batch, length), dtype=input_dtype)
+
+    if kind == 'r2c':
+        output_array = empty_aligned(
+            (batch, length // 2 + 1), dtype=input_dtype.upper())
+    else:
+        output_array = empty_aligned((batch, length), dtype=input_dtype)
+
+    fftw_object = FFTW(input_array, output_array, axes=(-1,),
+                       flags=('FFTW_MEASURE',), threads=threads)
+    input_array[:] = 0
+
+    best_time = float('inf')
+    for n in range(_REPEATS):
+        start = time.perf_counter()
+        fftw_object.execute()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    return best_time / batch
+
+
+def _load_timings():
+    '''Load the timings for the running machine from
+    :data:`pyfftw.config.TUNING_FILE`, if it is set and exists.
+    '''
+    global _timings_loaded
+
+    _timings_loaded = True
+    filename = config.TUNING_FILE
+
+    if filename is None:
+        return
+
+    try:
+        with _wisdom._locked(filename, exclusive=False):
+            timings = _timings_for(_read(filename), _wisdom._fingerprint())
+
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        warnings.warn('The timings could not be loaded from %s: %s'
+                      % (filename, e), RuntimeWarning)
+        return
+
+    _timings.update(timings)
+
+
+def _save_timings():
+    '''Add the timings measured since the last save to the timings for the
+    running machine in :data:`pyfftw.config.TUNING_FILE`, if it is set.
+    '''
+    filename = config.TUNING_FILE
+    new_timings = dict(_unsaved_timings)
+    _unsaved_timings.clear()
+
+    if filename is None or not new_timings:
+        return
+
+    fingerprint = _wisdom._fingerprint()
+
+    try:
+        with _wisdom._locked(filename, exclusive=True):
+            try:
+                machines = _read(filename)
+            except FileNotFoundError:
+                machines = []
+
+            timings = dict(_timings_for(machines, fingerprint))
+            timings.update(new_timings)
+
+            machines = [each for each in machines
+                        if each['fingerprint'] != fingerprint]
+            machines.append({'fingerprint': fingerprint, 'timings': timings})
+
+            _wisdom._write_atomically(filename, {
+                'version': _TUNING_FILE_VERSION, 'machines': machines})
+
+    except (OSError, ValueError) as e:
+        warnings.warn('The timings could not be saved to %s: %s'
+                      % (filename, e), RuntimeWarning)
+
+
+def _read(filename):
+    '''Return the list of the timings of each machine in the file
+    ``filename``, each a dictionary of the ``'fingerprint'`` of the machine
+    and its ``'timings'``.
+    '''
+    with open(filename) as tuning_file:
+        try:
+            contents = json.load(tuning_file)
+        except ValueError as e:
+            raise ValueError('Invalid tuning file: '
+                    'The file cannot be read (%s).' % e)
+
+    if (not isinstance(contents, dict) or
+            contents.get('version') != _TUNING_FILE_VERSION):
+        raise ValueError('Invalid tuning file: '
+                'The tuning file version is not supported.')
+
+    try:
+        machines = contents['machines']
+        for each in machines:
+            each['fingerprint']
+            dict(each['timings'])
+
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError('Invalid tuning file: '
+                'The timings cannot be read (%s).' % e)
+
+    return machines
+
+
+def _timings_for(machines, fingerprint):
+    '''Return the timings for ``fingerprint`` in ``machines`` (as returned
+    by :func:`_read`), which are empty if there are none.
+    '''
+    for each in machines:
+        if each['fingerprint'] == fingerprint:
+            return each['timings']
+
+    return {}
+
+
+# The time of one transform for each kind, dtype, length and number of
+# threads, as measured by _time_transform or loaded from the tuning file.
+_timings = {}
+_unsaved_timings = {}
+_timings_loaded = False
+_timings_lock = threading.Lock()
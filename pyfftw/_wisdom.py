@@ -0,0 +1,405 @@
+#!/usr/bin/env python
+#
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+'''Saving the FFTW wisdom of all the precisions to a single file, which
+can be shared by several processes, and loading it back.
+
+Wisdom measured on one machine can give slow plans on another, so the
+wisdom in a file is stored under a fingerprint of the machine that it was
+gained on: the CPU model, its instruction set extensions and cache sizes,
+the number of cores and the FFTW version. Only the wisdom for the running
+machine is loaded, and the wisdom for other machines is kept when the
+file is saved, so that one file can serve several kinds of machine.
+
+If :data:`pyfftw.config.WISDOM_FILE` is set, the wisdom in that file is
+loaded when :mod:`pyfftw` is imported. New wisdom is then saved to it
+shortly after it is gained through :mod:`pyfftw.builders` (and so
+:mod:`pyfftw.interfaces`), in a background thread, and at exit.
+'''
+
+import atexit
+import contextlib
+import json
+import os
+import platform
+import tempfile
+import threading
+import warnings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+from .pyfftw import (
+        export_wisdom, import_wisdom, _fftw_version, _cpu_brand,
+        _cpu_features, _cpu_cache_sizes)
+from . import config
+
+_WISDOM_FILE_VERSION = 2
+
+# The precisions of the strings returned by export_wisdom, in order.
+_PRECISIONS = ('double', 'single', 'long double')
+
+# The time in seconds from new wisdom being reported to it being saved,
+# so that the wisdom gained by a burst of planning is saved only once.
+_SAVE_DELAY = 1.0
+
+
+def load_wisdom(filename):
+    '''load_wisdom(filename)
+
+    Import the wisdom of all the precisions from the file ``filename``, as
+    written by :func:`~pyfftw.save_wisdom`. Only the wisdom that was saved
+    on a machine with the same fingerprint as the running machine is
+    imported.
+
+    This function returns a tuple of boolean values indicating the
+    success of loading each of the wisdom types (double, float and long
+    double, in that order), as for :func:`~pyfftw.import_wisdom`. They
+    are all ``False`` if the file has no wisdom for the running machine.
+    A ``ValueError`` is raised if the file is not a valid wisdom file.
+    '''
+    filename = os.fspath(filename)
+
+    with _locked(filename, exclusive=False):
+        wisdom = _wisdom_for(_read(filename), _fingerprint())
+
+    if wisdom is None:
+        return (False, False, False)
+
+    return import_wisdom(wisdom)
+
+
+def save_wisdom(filename, merge=True):
+    '''save_wisdom(filename, merge=True)
+
+    Save the wisdom of all the precisions to the file ``filename``, under
+    the fingerprint of the running machine. The wisdom saved in the file
+    for other machines is kept.
+
+    If ``merge`` is ``True`` and the file already exists, the wisdom in it
+    for the running machine is imported first, so that the wisdom saved by
+    other processes is kept (and is gained by this process too).
+
+    The file is replaced atomically, while holding a lock that is shared
+    with the other processes using these functions, so any number of
+    processes can load and save the same file.
+    '''
+    _save(os.fspath(filename), merge)
+
+
+@contextlib.contextmanager
+def _locked(filename, exclusive):
+    '''Hold a lock for ``filename`` across processes, which is shared
+    unless ``exclusive`` is ``True``. The lock is taken on the file
+    ``filename + '.lock'``, as ``filename`` itself is replaced when it is
+    saved. Without :mod:`fcntl` or :mod:`msvcrt` there is no lock.
+
+    A shared lock is only taken where the lock file can be opened, so that
+    a file in a read-only directory can still be read. As the file is
+    replaced atomically, it is never seen half written anyway.
+    '''
+    try:
+        lock_file = open(filename + '.lock', 'a+b')
+    except OSError:
+        if exclusive:
+            raise
+
+        yield
+        return
+
+    with lock_file:
+        fd = lock_file.fileno()
+
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        elif msvcrt is not None:
+            # Only exclusive locks of a range of bytes are available
+            lock_file.seek(0)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _fingerprint():
+    '''Return the fingerprint of the running machine, as a dictionary that
+    can be stored as JSON. Wisdom is only used on machines with the same
+    fingerprint as the one it was gained on.
+    '''
+    global _machine_fingerprint
+
+    if _machine_fingerprint is None:
+        _machine_fingerprint = {
+            'machine': platform.machine(),
+            'cpu': _cpu_brand(),
+            'features': list(_cpu_features()),
+            'caches': list(_cpu_cache_sizes()),
+            'cores': os.cpu_count(),
+            'fftw': _fftw_version}
+
+    return _machine_fingerprint
+
+_machine_fingerprint = None
+
+
+def _read(filename):
+    '''Return the wisdom in the file ``filename`` as a list of pairs of
+    the fingerprint of a machine and its wisdom, which is a tuple of
+    strings as for :func:`~pyfftw.import_wisdom`.
+
+    The wisdom in a file of the first version, which has no fingerprint,
+    is given the fingerprint ``None`` so that it is never loaded.
+    '''
+    with open(filename) as wisdom_file:
+        try:
+            contents = json.load(wisdom_file)
+        except ValueError as e:
+            raise ValueError('Invalid wisdom file: '
+                    'The file cannot be read (%s).' % e)
+
+    if not isinstance(contents, dict) or contents.get('version') not in (
+            1, _WISDOM_FILE_VERSION):
+        raise ValueError('Invalid wisdom file: '
+                'The wisdom file version is not supported.')
+
+    try:
+        if contents['version'] == 1:
+            machines = [{'fingerprint': None, 'wisdom': contents['wisdom']}]
+        else:
+            machines = contents['machines']
+
+        return [(each['fingerprint'],
+                 tuple(each['wisdom'][precision].encode('ascii')
+                       for precision in _PRECISIONS))
+                for each in machines]
+
+    except (KeyError, TypeError, AttributeError, UnicodeError) as e:
+        raise ValueError('Invalid wisdom file: '
+                'The wisdom cannot be read (%s).' % e)
+
+
+def _wisdom_for(machines, fingerprint):
+    '''Return the wisdom for ``fingerprint`` in ``machines`` (as returned
+    by :func:`_read`), or ``None`` if there is none.
+    '''
+    for each_fingerprint, wisdom in machines:
+        if each_fingerprint == fingerprint:
+            return wisdom
+
+    return None
+
+
+def _write(filename, machines):
+    '''Write the pairs of fingerprint and wisdom ``machines`` (as returned
+    by :func:`_read`) to the file ``filename``.
+    '''
+    contents = {
+        'version': _WISDOM_FILE_VERSION,
+        'machines': [
+            {'fingerprint': fingerprint,
+             'wisdom': {precision: each.decode('ascii')
+                        for precision, each in zip(_PRECISIONS, wisdom)}}
+            for fingerprint, wisdom in machines]}
+
+    _write_atomically(filename, contents)
+
+
+def _save(filename, merge):
+    '''Save the wisdom as for :func:`~pyfftw.save_wisdom`, returning the
+    wisdom saved.
+    '''
+    fingerprint = _fingerprint()
+
+    with _locked(filename, exclusive=True):
+        try:
+            machines = _read(filename)
+        except FileNotFoundError:
+            machines = []
+
+        if merge:
+            saved_wisdom = _wisdom_for(machines, fingerprint)
+
+            if saved_wisdom is not None:
+                import_wisdom(saved_wisdom)
+
+        wisdom = export_wisdom()
+
+        machines = [each for each in machines if each[0] != fingerprint]
+        machines.append((fingerprint, wisdom))
+
+        _write(filename, machines)
+
+    return wisdom
+
+
+def _write_atomically(filename, contents):
+    '''Write ``contents`` to the file ``filename`` as JSON, by writing a
+    temporary file in the same directory and then moving it over
+    ``filename``. Readers see either the old or the new file in full.
+    '''
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_filename = tempfile.mkstemp(
+        prefix=os.path.basename(filename) + '.', suffix='.tmp',
+        dir=directory)
+
+    try:
+        with os.fdopen(fd, 'w') as temp_file:
+            json.dump(contents, temp_file, indent=1)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+
+        try:
+            # Keep the permissions of the file being replaced
+            os.chmod(temp_filename, os.stat(filename).st_mode)
+        except FileNotFoundError:
+            pass
+
+        os.replace(temp_filename, filename)
+
+    except BaseException:
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+
+        raise
+
+
+class _WisdomSaver(object):
+    '''Loads the wisdom from :data:`pyfftw.config.WISDOM_FILE` and saves
+    any new wisdom back to it, either in a background thread shortly after
+    :meth:`schedule` is called or when :meth:`flush` is called at exit.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._timer = None
+
+        # The wisdom last loaded or saved, so that unchanged wisdom is
+        # not saved again
+        self._saved = None
+
+    def load(self):
+        '''Load the wisdom file, if one is set and it exists.
+        '''
+        filename = config.WISDOM_FILE
+
+        if filename is None:
+            return
+
+        try:
+            load_wisdom(filename)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            warnings.warn('The wisdom could not be loaded from %s: %s'
+                          % (filename, e), RuntimeWarning)
+            return
+
+        self._saved = export_wisdom()
+
+    def schedule(self):
+        '''Save the wisdom in a background thread after a short delay, if
+        a wisdom file is set. Calls made before the wisdom is saved are
+        covered by the same save.
+        '''
+        if config.WISDOM_FILE is None:
+            return
+
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(_SAVE_DELAY, self._run)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _run(self):
+        with self._lock:
+            self._timer = None
+
+        self.save()
+
+    def save(self):
+        '''Save the wisdom, if a wisdom file is set and the wisdom has
+        changed since it was last loaded or saved.
+        '''
+        filename = config.WISDOM_FILE
+
+        if filename is None:
+            return
+
+        with self._save_lock:
+            if export_wisdom() == self._saved:
+                return
+
+            try:
+                self._saved = _save(filename, merge=True)
+            except (OSError, ValueError) as e:
+                warnings.warn('The wisdom could not be saved to %s: %s'
+                              % (filename, e), RuntimeWarning)
+
+    def flush(self):
+        '''Save the wisdom now rather than when it is scheduled.
+        '''
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        self.save()
+
+
+_saver = _WisdomSaver()
+
+# Wisdom gained by FFTW objects created directly is also caught at exit
+atexit.register(_saver.flush)
+
+
+def _new_wisdom():
+    '''Report that planning may have added to the wisdom, which is then
+    saved to :data:`pyfftw.config.WISDOM_FILE` if that is set.
+    '''
+    _saver.schedule()
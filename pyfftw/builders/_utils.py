@@ -51,11 +51,13 @@ and may change in future versions.
 '''
 
 import multiprocessing
+import time
 import pyfftw
 import numpy
 import warnings
 from .. import _threading_type
 from .. import config
+from .. import _wisdom
 
 __all__ = ['_FFTWWrapper', '_rc_dtype_pairs', '_default_dtype', '_Xfftn',
         '_setup_input_slicers', '_compute_array_shapes', '_precook_1d_args',
@@ -135,16 +137,71 @@ def _norm_args(norm):
     return dict(normalise_idft=normalise_idft, ortho=ortho)
 
 
+# The real-to-real kinds that compute each type of (unnormalised) discrete
+# cosine and sine transform, as numbered by scipy.fft.
+_dct_kinds = {1: 'FFTW_REDFT00', 2: 'FFTW_REDFT10',
+              3: 'FFTW_REDFT01', 4: 'FFTW_REDFT11'}
+_dst_kinds = {1: 'FFTW_RODFT00', 2: 'FFTW_RODFT10',
+              3: 'FFTW_RODFT01', 4: 'FFTW_RODFT11'}
+
+
+def _r2r_kind(kinds, type):
+    '''Look up the real-to-real kind for a DCT or DST ``type`` in one of
+    ``_dct_kinds`` or ``_dst_kinds``.
+    '''
+    try:
+        return kinds[type]
+    except (KeyError, TypeError):
+        raise ValueError('Invalid type: '
+                'The transform type should be 1, 2, 3 or 4.')
+
+
 def _Xfftn(a, s, axes, overwrite_input,
         planner_effort, threads, auto_align_input, auto_contiguous,
-        avoid_copy, inverse, real, normalise_idft=True, ortho=False):
+        avoid_copy, inverse, real, normalise_idft=True, ortho=False,
+        real_direction_flag=None, split=False, hermitian_fill=False):
     '''Generic transform interface for all the transforms. No
     defaults exist. The transform must be specified exactly.
+
+    If ``real_direction_flag`` is not ``None``, a real-to-real transform
+    of that kind is planned instead (``inverse`` and ``real`` should then
+    both be ``False``).
+
+    If ``hermitian_fill`` is ``True``, a forward complex transform of a
+    real array keeps the input real and plans a real-to-complex transform
+    that fills in the full (Hermitian symmetric) complex output.
+
+    If ``split`` is ``True``, the complex side(s) of the transform are held
+    as a ``(real, imag)`` pair of real arrays rather than as one interleaved
+    complex array. A complex input ``a`` should then be such a pair (or
+    a complex array, which is split into its parts).
     '''
     a_orig = a
     invreal = inverse and real
 
-    if inverse:
+    # Real-to-real transforms take a real input like the forward real
+    # transforms, but the output has the same shape and dtype as the input.
+    real_input = (real and not inverse) or real_direction_flag is not None
+
+    # Split complex inputs are handled as a pair of real arrays that share
+    # the shape and dtype of the first part.
+    split_input = split and not real_input
+    if split_input:
+        a_parts = _split_parts(a)
+        a = a_parts[0]
+
+    a_is_complex = numpy.iscomplexobj(a)
+
+    # A forward complex transform of real data is computed as a
+    # real-to-complex transform, with the redundant half of the output
+    # filled in from the Hermitian symmetry.
+    hermitian = (hermitian_fill and not real and not inverse
+            and real_direction_flag is None and not a_is_complex
+            and not split)
+
+    if real_direction_flag is not None:
+        direction = real_direction_flag
+    elif inverse:
         direction = 'FFTW_BACKWARD'
     else:
         direction = 'FFTW_FORWARD'
@@ -157,8 +214,6 @@ def _Xfftn(a, s, axes, overwrite_input,
     input_shape, output_shape = _compute_array_shapes(
             a, s, axes, inverse, real)
 
-    a_is_complex = numpy.iscomplexobj(a)
-
     # Make the input dtype correct by transforming to an available type
     if a.dtype.char not in _rc_dtype_pairs:
         dtype = _default_dtype
@@ -170,31 +225,39 @@ def _Xfftn(a, s, axes, overwrite_input,
         if dtype.itemsize < a.dtype.itemsize:
             warnings.warn("Narrowing conversion from %s to %s precision" % (a.dtype, dtype))
 
-        if not real or inverse:
+        if not (real_input or hermitian or split):
             # It's going to be complex
             dtype = numpy.dtype(_rc_dtype_pairs[dtype.char])
 
         # finally convert the input array
         a = numpy.asarray(a, dtype=dtype)
-    elif not (real and not inverse) and not a_is_complex:
+    elif (not real_input and not a_is_complex and not hermitian
+            and not split):
         # We need to make it a complex dtype
         a = numpy.asarray(a, dtype=_rc_dtype_pairs[a.dtype.char])
 
-    elif (real and not inverse) and a_is_complex:
+    elif real_input and a_is_complex:
         # It should be real
         a = numpy.asarray(a, dtype=_rc_dtype_pairs[a.dtype.char])
 
+    if split_input:
+        a_parts = tuple(numpy.asarray(part, dtype=a.dtype)
+                for part in a_parts)
+    else:
+        a_parts = (a,)
+
     # Make the output dtype correct
-    if not real:
+    if split or not (real or hermitian):
         output_dtype = a.dtype
 
     else:
         output_dtype = _rc_dtype_pairs[a.dtype.char]
 
-    if not avoid_copy:
-        a_copy = a.copy()
-
-    output_array = pyfftw.empty_aligned(output_shape, output_dtype)
+    if split and not invreal:
+        output_array = (pyfftw.empty_aligned(output_shape, output_dtype),
+                pyfftw.empty_aligned(output_shape, output_dtype))
+    else:
+        output_array = pyfftw.empty_aligned(output_shape, output_dtype)
 
     flags = [planner_effort]
 
@@ -203,6 +266,17 @@ def _Xfftn(a, s, axes, overwrite_input,
 
     if overwrite_input:
         flags.append('FFTW_DESTROY_INPUT')
+    elif invreal:
+        # FFTW destroys the input of a multi-dimensional complex-to-real
+        # transform by default, so ask for it to be preserved (which
+        # raises a ValueError when it is not possible).
+        flags.append('FFTW_PRESERVE_INPUT')
+
+    # Planning overwrites the arrays it is given, except when the planner
+    # only estimates. When `a` is used as the FFTW input array and planning
+    # could destroy it, the planning is therefore done on a scratch array
+    # laid out like `a`.
+    planning_destroys_input = planner_effort != 'FFTW_ESTIMATE'
 
     if not a.shape == input_shape:
 
@@ -218,55 +292,202 @@ def _Xfftn(a, s, axes, overwrite_input,
 
         # Also, the input array will be a different shape to the shape of
         # `a`, so we need to create a new array.
-        input_array = pyfftw.empty_aligned(input_shape, a.dtype)
+        input_array = _join_parts(
+                [pyfftw.empty_aligned(input_shape, a.dtype)
+                 for part in a_parts], split_input)
 
-        FFTW_object = _FFTWWrapper(input_array, output_array, axes, direction,
-                flags, threads, input_array_slicer=update_input_array_slicer,
+        FFTW_object = _plan(_FFTWWrapper, input_array, output_array, axes,
+                direction, flags, threads,
+                input_array_slicer=update_input_array_slicer,
                 FFTW_array_slicer=FFTW_array_slicer,
                 normalise_idft=normalise_idft, ortho=ortho)
 
-        # We copy the data back into the internal FFTW object array
-        internal_array = FFTW_object.input_array
-        internal_array[:] = 0
-        internal_array[FFTW_array_slicer] = (
-                a_copy[update_input_array_slicer])
+        # We copy the data into the internal FFTW object array (`a` itself
+        # is not touched by the planner)
+        for internal_array, part in zip(
+                _array_parts(FFTW_object.input_array), a_parts):
+            internal_array[:] = 0
+            internal_array[FFTW_array_slicer] = (
+                    part[update_input_array_slicer])
 
     else:
         # Otherwise we can use `a` as-is
 
-        input_array = a
+        input_parts = list(a_parts)
+
+        for n, part in enumerate(input_parts):
+            if auto_contiguous:
+                # We only need to create a new array if it's not already
+                # contiguous
+                if not (part.flags['C_CONTIGUOUS'] or
+                        part.flags['F_CONTIGUOUS']):
+                    if avoid_copy:
+                        raise ValueError('Cannot avoid copy: '
+                                'The input array is not contiguous and '
+                                'auto_contiguous is set. '
+                                '(from avoid_copy flag)')
+
+                    part = pyfftw.empty_aligned(part.shape, part.dtype)
+
+            if (auto_align_input and not pyfftw.is_byte_aligned(part)):
 
-        if auto_contiguous:
-            # We only need to create a new array if it's not already
-            # contiguous
-            if not (a.flags['C_CONTIGUOUS'] or a.flags['F_CONTIGUOUS']):
                 if avoid_copy:
                     raise ValueError('Cannot avoid copy: '
-                            'The input array is not contiguous and '
-                            'auto_contiguous is set. (from avoid_copy flag)')
+                            'The input array is not aligned and '
+                            'auto_align is set. (from avoid_copy flag)')
 
-                input_array = pyfftw.empty_aligned(a.shape, a.dtype)
+                part = pyfftw.byte_align(part)
 
-        if (auto_align_input and not pyfftw.is_byte_aligned(input_array)):
+            input_parts[n] = part
 
+        if len(set(part.strides for part in input_parts)) > 1:
+            # The parts of a split complex array need the same layout
             if avoid_copy:
                 raise ValueError('Cannot avoid copy: '
-                        'The input array is not aligned and '
-                        'auto_align is set. (from avoid_copy flag)')
+                        'The real and imaginary parts of the input array '
+                        'have different strides. (from avoid_copy flag)')
 
-            input_array = pyfftw.byte_align(input_array)
+            input_parts = [pyfftw.empty_aligned(part.shape, part.dtype)
+                    for part in input_parts]
 
+        input_array = _join_parts(input_parts, split_input)
 
-        FFTW_object = pyfftw.FFTW(input_array, output_array, axes, direction,
-                flags, threads, normalise_idft=normalise_idft, ortho=ortho)
+        if planning_destroys_input and not avoid_copy:
+            planning_parts = [
+                    _empty_like_layout(input_part) if input_part is part
+                    else input_part
+                    for part, input_part in zip(a_parts, input_parts)]
+        else:
+            planning_parts = input_parts
+
+        FFTW_object = _plan(pyfftw.FFTW,
+                _join_parts(planning_parts, split_input), output_array,
+                axes, direction, flags, threads,
+                normalise_idft=normalise_idft, ortho=ortho)
 
-        if not avoid_copy:
-            # Copy the data back into the (likely) destroyed array
-            FFTW_object.input_array[:] = a_copy
+        if planning_parts is not input_parts:
+            # The scratch array has the same strides and alignment as `a`,
+            # so this cannot fail.
+            FFTW_object.update_arrays(input_array, output_array)
+
+        # Fill any new input array, which may have been destroyed by the
+        # planner
+        for input_part, part in zip(input_parts, a_parts):
+            if input_part is not part:
+                input_part[:] = part
 
     return FFTW_object
 
 
+def _plan(FFTW_class, input_array, output_array, axes, direction, flags,
+        threads, **kwargs):
+    '''Return an instance of ``FFTW_class`` (:class:`pyfftw.FFTW` or a
+    child of it) planned with the given arguments.
+
+    In the low-memory mode (:data:`pyfftw.config.LOW_MEMORY`), a plan
+    that fails is retried once with the ``'FFTW_CONSERVE_MEMORY'`` flag.
+
+    If :data:`pyfftw.config.WISDOM_FILE` is set, the wisdom gained by
+    planning with more effort than ``'FFTW_ESTIMATE'`` is saved to it in
+    the background.
+    '''
+    try:
+        FFTW_object = FFTW_class(input_array, output_array, axes,
+                direction, flags, threads, **kwargs)
+    except (MemoryError, RuntimeError):
+        if not config.LOW_MEMORY or 'FFTW_CONSERVE_MEMORY' in flags:
+            raise
+
+        FFTW_object = FFTW_class(input_array, output_array, axes,
+                direction, flags + ['FFTW_CONSERVE_MEMORY'], threads,
+                **kwargs)
+
+    if 'FFTW_ESTIMATE' not in flags:
+        # Any new wisdom is saved to config.WISDOM_FILE, if it is set
+        _wisdom._new_wisdom()
+
+    return FFTW_object
+
+
+def _empty_like_layout(a):
+    '''Return an uninitialised array with the same shape, dtype and
+    strides as ``a``, and at the same offset from a SIMD alignment
+    boundary. An object planned with it can then be moved on to ``a``
+    with :meth:`pyfftw.FFTW.update_arrays`.
+    '''
+    if a.size == 0:
+        return numpy.empty(a.shape, a.dtype)
+
+    # The byte offsets of the first and last elements from a.ctypes.data
+    low = sum(min(0, (n - 1) * stride)
+              for n, stride in zip(a.shape, a.strides))
+    high = sum(max(0, (n - 1) * stride)
+               for n, stride in zip(a.shape, a.strides))
+
+    alignment = pyfftw.simd_alignment
+    first_byte = (a.ctypes.data + low) % alignment
+
+    buffer = pyfftw.empty_aligned(first_byte + high - low + a.itemsize,
+                                  dtype='int8', n=alignment)
+
+    return numpy.ndarray(a.shape, a.dtype, buffer=buffer,
+                         offset=first_byte - low, strides=a.strides)
+
+
+def _split_parts(a):
+    '''Return the ``(real, imag)`` parts of a split complex input ``a``,
+    which is either a pair of real array-likes or a complex array. Both
+    parts are given the same shape and dtype.
+    '''
+    if isinstance(a, (tuple, list)):
+        if len(a) != 2:
+            raise ValueError('Invalid input array: '
+                    'A split complex array should be a pair of the real '
+                    'and imaginary parts.')
+
+        real_part = numpy.asanyarray(a[0])
+        imag_part = numpy.asanyarray(a[1])
+
+        if real_part.shape != imag_part.shape:
+            raise ValueError('Invalid input array: '
+                    'The real and imaginary parts should be the same '
+                    'shape.')
+
+        if (numpy.iscomplexobj(real_part) or
+                numpy.iscomplexobj(imag_part)):
+            raise ValueError('Invalid input array: '
+                    'The real and imaginary parts should be real arrays.')
+    else:
+        a = numpy.asanyarray(a)
+        real_part = a.real
+        imag_part = (a.imag if numpy.iscomplexobj(a)
+                else numpy.zeros_like(a))
+
+    dtype = numpy.result_type(real_part, imag_part)
+
+    return (numpy.asarray(real_part, dtype=dtype),
+            numpy.asarray(imag_part, dtype=dtype))
+
+
+def _array_parts(array):
+    '''Return the arrays that make up one side of an FFTW object: the
+    ``(real, imag)`` pair of a split complex side, or else a 1-tuple.
+    '''
+    if isinstance(array, tuple):
+        return array
+    else:
+        return (array,)
+
+
+def _join_parts(parts, split):
+    '''The inverse of :func:`_array_parts`.
+    '''
+    if split:
+        return tuple(parts)
+    else:
+        return parts[0]
+
+
 class _FFTWWrapper(pyfftw.FFTW):
     ''' A class that wraps :class:`pyfftw.FFTW`, providing a slicer on the input
     stage during calls to :meth:`~pyfftw.builders._utils._FFTWWrapper.__call__`.
@@ -314,19 +535,65 @@ class _FFTWWrapper(pyfftw.FFTW):
 
         ``output_array`` and ``normalise_idft`` are passed through to
         :meth:`pyfftw.FFTW.__call__` untouched.
+
+        If stats are enabled, the copy is recorded as the ``'copy'`` stage
+        with a ``'slicer'`` reason.
         '''
 
         if input_array is not None:
-            # Do the update here (which is a copy, so it's alignment
-            # safe etc).
+            start_time = time.perf_counter()
+            self._copy_input(input_array)
+            self._record_slicer_copy(time.perf_counter() - start_time)
+
+        if normalise_idft is None:
+            normalise_idft = self._normalise_idft
+
+        if ortho is None:
+            ortho = self._ortho
+
+        output = super(_FFTWWrapper, self).__call__(input_array=None,
+                output_array=output_array, normalise_idft=normalise_idft,
+                ortho=ortho)
+
+        return output
+
+    def _execute_to_output(self, input_array, output_array=None,
+            normalise_idft=None, ortho=None):
+        '''Wrap :meth:`pyfftw.FFTW._execute_to_output` by firstly copying
+        the passed-in input array into the internal array through the
+        slicers, as for :meth:`~pyfftw.builders._utils._FFTWWrapper.__call__`.
+        '''
+        self._copy_input(input_array)
+
+        if normalise_idft is None:
+            normalise_idft = self._normalise_idft
+
+        if ortho is None:
+            ortho = self._ortho
+
+        return super(_FFTWWrapper, self)._execute_to_output(
+                self.input_array, output_array,
+                normalise_idft=normalise_idft, ortho=ortho)
 
-            internal_input_array = self.input_array
-            input_array = numpy.asanyarray(input_array)
+    def _copy_input(self, input_array):
+        '''Copy the sliced ``input_array`` into the sliced internal input
+        array (which is a copy, so it's alignment safe etc).
+        '''
+        internal_input_arrays = _array_parts(self.input_array)
+
+        if len(internal_input_arrays) == 2:
+            input_arrays = _split_parts(input_array)
+        else:
+            input_arrays = (numpy.asanyarray(input_array),)
+
+        for internal_input_array, input_array in zip(
+                internal_input_arrays, input_arrays):
 
             if self._input_destroyed:
                 internal_input_array[:] = 0
 
-            sliced_internal = internal_input_array[self._FFTW_array_slicer]
+            sliced_internal = (
+                    internal_input_array[self._FFTW_array_slicer])
             sliced_input = input_array[self._input_array_slicer]
 
             if sliced_internal.shape != sliced_input.shape:
@@ -337,18 +604,6 @@ class _FFTWWrapper(pyfftw.FFTW):
 
             sliced_internal[:] = sliced_input
 
-        if normalise_idft is None:
-            normalise_idft = self._normalise_idft
-
-        if ortho is None:
-            ortho = self._ortho
-
-        output = super(_FFTWWrapper, self).__call__(input_array=None,
-                output_array=output_array, normalise_idft=normalise_idft,
-                ortho=ortho)
-
-        return output
-
 
 def _setup_input_slicers(a_shape, input_shape):
     ''' This function returns two slicers that are to be used to
@@ -437,6 +692,25 @@ def _precook_1d_args(a, n, axis):
 
     return s, (axis,)
 
+def _auto_pad(a, s, axes, auto_pad, real, threads):
+    '''Return ``(s, axes)`` with the lengths in ``s`` padded by
+    :func:`pyfftw.next_fast_shape` as set by the ``auto_pad`` argument
+    to the builders, or unchanged if ``auto_pad`` is ``False``.
+    '''
+    if auto_pad is False:
+        return s, axes
+
+    if auto_pad not in (True, 'tuned'):
+        raise ValueError('Invalid auto_pad: '
+                'auto_pad should be False, True or \'tuned\'.')
+
+    s, axes = _cook_nd_args(a, s, axes)
+
+    s = pyfftw.next_fast_shape(s, real=real, tuned=(auto_pad == 'tuned'),
+                               dtype=a.dtype, threads=threads)
+
+    return s, axes
+
 def _cook_nd_args(a, s=None, axes=None, invreal=False):
     '''Similar to :func:`numpy.fft.fftpack._cook_nd_args`.
     '''
@@ -88,6 +88,10 @@ array is passed to a real transform routine, or vice-versa), then an
 attempt is made to convert the array to an array of the correct
 complexity. This results in a copy being made.
 
+The exception is a real array passed to one of the forward complex
+routines (:func:`fft`, :func:`fft2` and :func:`fftn`) with
+``hermitian_fill`` set (see :ref:`below <builders_args>`).
+
 Although the array that is internal to the :class:`pyfftw.FFTW` object
 will be correctly loaded with the values within the input array, it is
 not necessarily the case that the internal array *is* the input array.
@@ -139,6 +143,46 @@ same calling signature as their respective functions in
 * :func:`~pyfftw.builders.rfftn`
 * :func:`~pyfftw.builders.irfftn`
 
+**Real-to-real transforms**
+
+* :func:`~pyfftw.builders.dct`
+* :func:`~pyfftw.builders.dst`
+* :func:`~pyfftw.builders.dctn`
+* :func:`~pyfftw.builders.dstn`
+* :func:`~pyfftw.builders.r2hc`
+* :func:`~pyfftw.builders.hc2r`
+
+The discrete cosine and sine transforms have the same calling signature as
+their respective functions in :mod:`scipy.fft`, but without ``norm``; the
+returned :class:`pyfftw.FFTW` object always computes the unnormalised
+transform (``norm=None`` in :mod:`scipy.fft`). The inverse transforms are
+the transforms of the complementary type, scaled by ``1/N``
+(:attr:`pyfftw.FFTW.N`).
+
+:func:`~pyfftw.builders.r2hc` and :func:`~pyfftw.builders.hc2r` are the
+1D real FFT and its unnormalised inverse, with the complex spectrum
+stored in the real `halfcomplex
+<http://www.fftw.org/fftw3_doc/The-Halfcomplex_002dformat-DFT.html>`_
+format of FFTW.
+
+**Split complex FFTs**
+
+* :func:`~pyfftw.builders.fft_split`
+* :func:`~pyfftw.builders.ifft_split`
+* :func:`~pyfftw.builders.fftn_split`
+* :func:`~pyfftw.builders.ifftn_split`
+* :func:`~pyfftw.builders.rfft_split`
+* :func:`~pyfftw.builders.irfft_split`
+* :func:`~pyfftw.builders.rfftn_split`
+* :func:`~pyfftw.builders.irfftn_split`
+
+These are as per their interleaved counterparts, but every complex array
+is held as a ``(real, imag)`` pair of real arrays of the same shape and
+dtype (see :ref:`split complex arrays <FFTW_split_arrays>`). A complex
+input ``a`` should be such a pair; a complex array is also accepted and is
+split into its parts (which is a copy). The returned
+:class:`pyfftw.FFTW` object takes and returns pairs in the same way.
+
 The first caveat is that the dtype of the input array must match the
 transform. For example, for ``fft`` and ``ifft``, the dtype must
 be complex, for ``rfft`` it must be real, and so on. The other point
@@ -173,9 +217,13 @@ following additional keyword arguments:
 * ``overwrite_input``: Whether or not the input array can be
   overwritten during the transform. This sometimes results in a faster
   algorithm being made available. It causes the ``'FFTW_DESTROY_INPUT'``
-  flag to be passed to the :class:`pyfftw.FFTW` object. This flag is not
-  offered for the multi-dimensional inverse real transforms, as FFTW is
-  unable to not overwrite the input in that case.
+  flag to be passed to the :class:`pyfftw.FFTW` object. For the inverse
+  real transforms, ``False`` causes the ``'FFTW_PRESERVE_INPUT'`` flag to
+  be passed instead. FFTW is unable to preserve the input of an inverse
+  real transform over more than one axis, so :func:`irfft2` and
+  :func:`irfftn` take ``overwrite_input`` as their last argument and
+  default it to ``True``; ``False`` is only valid when they transform a
+  single axis, and a ``ValueError`` is raised otherwise.
 
 * ``planner_effort``: A string dictating how much effort is spent
   in planning the FFTW routines. This is passed to the creation
@@ -235,14 +283,16 @@ following additional keyword arguments:
   up to the calling code to acquire that new input array using
   :attr:`pyfftw.FFTW.input_array`.
 
-* ``avoid_copy``: By default, these functions will always create a copy
-  (and sometimes more than one) of the passed in input array. This is
-  because the creation of the :class:`pyfftw.FFTW` object generally
-  destroys the contents of the input array. Setting this argument to
-  ``True`` will try not to create a copy of the input array, likely
-  resulting in the input array being destroyed. If it is not possible
-  to create the object without a copy being made, a ``ValueError`` is
-  raised.
+* ``avoid_copy``: By default, whenever the creation of the
+  :class:`pyfftw.FFTW` object could destroy the contents of the passed
+  in input array, these functions plan on a scratch array with the same
+  layout and then update the object to use the input array. This is the
+  case for every ``planner_effort`` other than ``'FFTW_ESTIMATE'``, when
+  the input array is used as the internal array of the object. Setting
+  this argument to ``True`` will try not to create any new input array,
+  planning on the input array itself and likely resulting in it being
+  destroyed. If it is not possible to create the object without a copy
+  being made, a ``ValueError`` is raised.
 
   Example situations that require a copy, and so cause the exception
   to be raised when this flag is set:
@@ -259,22 +309,46 @@ following additional keyword arguments:
   influences a copy during the creation of the object. It changes no
   flags in the :class:`pyfftw.FFTW` object.
 
+* ``auto_pad``: If ``True``, the transform is zero-padded to the shape
+  given by :func:`pyfftw.next_fast_shape`, so that it is planned for
+  lengths FFTW is fast for. The lengths padded are those given by ``s``
+  (or ``n``), or the lengths of the transformed axes of the input if that
+  is ``None``. If ``'tuned'``, the shape is chosen by timing the
+  candidate lengths on the running machine (see
+  :func:`pyfftw.next_fast_shape`). As with any zero-padding, the output
+  is the transform of the padded input, with more (and so differently
+  spaced) frequencies than the transform of the input. This argument is
+  only taken by the complex and the forward real transforms.
+
+* ``hermitian_fill``: If ``True`` and the input array is real, the
+  forward complex transforms (:func:`fft`, :func:`fft2` and
+  :func:`fftn`) keep the input real and plan a real-to-complex
+  transform, with the redundant half of the full complex output filled
+  in from its Hermitian symmetry. This roughly halves the work, but the
+  returned object then only accepts real arrays on subsequent calls.
+  It has no effect on a complex input array. By default the input is
+  converted to complex, as for any other complex transform.
+
 The exceptions raised by each of these functions are as per their
 equivalents in :mod:`numpy.fft`, or as documented above.
 '''
 
 from ._utils import (_precook_1d_args, _Xfftn, _norm_args, _default_effort,
-                     _default_threads)
+                     _default_threads, _auto_pad, _dct_kinds, _dst_kinds,
+                     _r2r_kind, _split_parts)
 
 __all__ = ['fft','ifft', 'fft2', 'ifft2', 'fftn',
            'ifftn', 'rfft', 'irfft', 'rfft2', 'irfft2', 'rfftn',
-           'irfftn']
+           'irfftn', 'dct', 'dst', 'dctn', 'dstn', 'r2hc', 'hc2r',
+           'fft_split', 'ifft_split', 'fftn_split', 'ifftn_split',
+           'rfft_split', 'irfft_split', 'rfftn_split', 'irfftn_split']
 
 
 def fft(a, n=None, axis=-1, overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False,
+        hermitian_fill=False):
     '''Return a :class:`pyfftw.FFTW` object representing a 1D FFT.
 
     The first three arguments are as per :func:`numpy.fft.fft`;
@@ -287,15 +361,17 @@ def fft(a, n=None, axis=-1, overwrite_input=False,
     s, axes = _precook_1d_args(a, n, axis)
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            avoid_copy, inverse, real, **_norm_args(norm))
+            avoid_copy, inverse, real, **_norm_args(norm),
+            hermitian_fill=hermitian_fill)
 
 def ifft(a, n=None, axis=-1, overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False):
     '''Return a :class:`pyfftw.FFTW` object representing a 1D
     inverse FFT.
 
@@ -310,6 +386,7 @@ def ifft(a, n=None, axis=-1, overwrite_input=False,
     s, axes = _precook_1d_args(a, n, axis)
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
@@ -319,7 +396,8 @@ def ifft(a, n=None, axis=-1, overwrite_input=False,
 def fft2(a, s=None, axes=(-2,-1), overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False,
+        hermitian_fill=False):
     '''Return a :class:`pyfftw.FFTW` object representing a 2D FFT.
 
     The first three arguments are as per :func:`numpy.fft.fft2`;
@@ -332,15 +410,17 @@ def fft2(a, s=None, axes=(-2,-1), overwrite_input=False,
     real = False
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            avoid_copy, inverse, real, **_norm_args(norm))
+            avoid_copy, inverse, real, **_norm_args(norm),
+            hermitian_fill=hermitian_fill)
 
 def ifft2(a, s=None, axes=(-2,-1), overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False):
     '''Return a :class:`pyfftw.FFTW` object representing a
     2D inverse FFT.
 
@@ -354,6 +434,7 @@ def ifft2(a, s=None, axes=(-2,-1), overwrite_input=False,
     real = False
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
@@ -363,7 +444,8 @@ def ifft2(a, s=None, axes=(-2,-1), overwrite_input=False,
 def fftn(a, s=None, axes=None, overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False,
+        hermitian_fill=False):
     '''Return a :class:`pyfftw.FFTW` object representing a n-D FFT.
 
     The first three arguments are as per :func:`numpy.fft.fftn`;
@@ -376,15 +458,17 @@ def fftn(a, s=None, axes=None, overwrite_input=False,
     real = False
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            avoid_copy, inverse, real, **_norm_args(norm))
+            avoid_copy, inverse, real, **_norm_args(norm),
+            hermitian_fill=hermitian_fill)
 
 def ifftn(a, s=None, axes=None, overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False):
     '''Return a :class:`pyfftw.FFTW` object representing an n-D
     inverse FFT.
 
@@ -398,6 +482,7 @@ def ifftn(a, s=None, axes=None, overwrite_input=False,
     real = False
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
@@ -406,7 +491,7 @@ def ifftn(a, s=None, axes=None, overwrite_input=False,
 def rfft(a, n=None, axis=-1, overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False):
     '''Return a :class:`pyfftw.FFTW` object representing a 1D
     real FFT.
 
@@ -422,6 +507,7 @@ def rfft(a, n=None, axis=-1, overwrite_input=False,
     s, axes = _precook_1d_args(a, n, axis)
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
@@ -454,7 +540,7 @@ def irfft(a, n=None, axis=-1, overwrite_input=False,
 def rfft2(a, s=None, axes=(-2,-1), overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False):
     '''Return a :class:`pyfftw.FFTW` object representing a 2D
     real FFT.
 
@@ -467,6 +553,7 @@ def rfft2(a, s=None, axes=(-2,-1), overwrite_input=False,
     real = True
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
@@ -475,7 +562,7 @@ def rfft2(a, s=None, axes=(-2,-1), overwrite_input=False,
 def irfft2(a, s=None, axes=(-2,-1),
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, overwrite_input=True):
     '''Return a :class:`pyfftw.FFTW` object representing a 2D
     real inverse FFT.
 
@@ -488,7 +575,6 @@ def irfft2(a, s=None, axes=(-2,-1),
     inverse = True
     real = True
 
-    overwrite_input = True
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
 
@@ -500,7 +586,7 @@ def irfft2(a, s=None, axes=(-2,-1),
 def rfftn(a, s=None, axes=None, overwrite_input=False,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, auto_pad=False):
     '''Return a :class:`pyfftw.FFTW` object representing an n-D
     real FFT.
 
@@ -514,6 +600,7 @@ def rfftn(a, s=None, axes=None, overwrite_input=False,
     real = True
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
+    s, axes = _auto_pad(a, s, axes, auto_pad, real, threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
@@ -523,7 +610,7 @@ def rfftn(a, s=None, axes=None, overwrite_input=False,
 def irfftn(a, s=None, axes=None,
         planner_effort=None, threads=None,
         auto_align_input=True, auto_contiguous=True,
-        avoid_copy=False, norm=None):
+        avoid_copy=False, norm=None, overwrite_input=True):
     '''Return a :class:`pyfftw.FFTW` object representing an n-D
     real inverse FFT.
 
@@ -536,10 +623,330 @@ def irfftn(a, s=None, axes=None,
     inverse = True
     real = True
 
-    overwrite_input = True
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
             avoid_copy, inverse, real, **_norm_args(norm))
+
+
+def dct(a, n=None, axis=-1, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, type=2):
+    '''Return a :class:`pyfftw.FFTW` object representing a 1D
+    unnormalised discrete cosine transform.
+
+    The first three arguments and ``type`` are as per
+    :func:`scipy.fft.dct`; the rest of the arguments are documented
+    :ref:`in the module docs <builders_args>`.
+    '''
+    inverse = False
+    real = False
+
+    direction = _r2r_kind(_dct_kinds, type)
+    s, axes = _precook_1d_args(a, n, axis)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, normalise_idft=False,
+            real_direction_flag=direction)
+
+
+def dst(a, n=None, axis=-1, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, type=2):
+    '''Return a :class:`pyfftw.FFTW` object representing a 1D
+    unnormalised discrete sine transform.
+
+    The first three arguments and ``type`` are as per
+    :func:`scipy.fft.dst`; the rest of the arguments are documented
+    :ref:`in the module docs <builders_args>`.
+    '''
+    inverse = False
+    real = False
+
+    direction = _r2r_kind(_dst_kinds, type)
+    s, axes = _precook_1d_args(a, n, axis)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, normalise_idft=False,
+            real_direction_flag=direction)
+
+
+def dctn(a, s=None, axes=None, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, type=2):
+    '''Return a :class:`pyfftw.FFTW` object representing an n-D
+    unnormalised discrete cosine transform.
+
+    The first three arguments and ``type`` are as per
+    :func:`scipy.fft.dctn`; the rest of the arguments are documented
+    :ref:`in the module docs <builders_args>`.
+    '''
+    inverse = False
+    real = False
+
+    direction = _r2r_kind(_dct_kinds, type)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, normalise_idft=False,
+            real_direction_flag=direction)
+
+
+def dstn(a, s=None, axes=None, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, type=2):
+    '''Return a :class:`pyfftw.FFTW` object representing an n-D
+    unnormalised discrete sine transform.
+
+    The first three arguments and ``type`` are as per
+    :func:`scipy.fft.dstn`; the rest of the arguments are documented
+    :ref:`in the module docs <builders_args>`.
+    '''
+    inverse = False
+    real = False
+
+    direction = _r2r_kind(_dst_kinds, type)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, normalise_idft=False,
+            real_direction_flag=direction)
+
+
+def r2hc(a, n=None, axis=-1, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False):
+    '''Return a :class:`pyfftw.FFTW` object representing a 1D real FFT
+    with the output in halfcomplex format.
+
+    The first three arguments are as per :func:`numpy.fft.rfft`;
+    the rest of the arguments are documented
+    :ref:`in the module docs <builders_args>`.
+    '''
+    inverse = False
+    real = False
+
+    s, axes = _precook_1d_args(a, n, axis)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, normalise_idft=False,
+            real_direction_flag='FFTW_R2HC')
+
+
+def hc2r(a, n=None, axis=-1, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False):
+    '''Return a :class:`pyfftw.FFTW` object representing an unnormalised
+    1D real inverse FFT of an input in halfcomplex format.
+
+    The first three arguments are as per :func:`numpy.fft.rfft` (``n`` is
+    the length of both the input and the output); the rest of the
+    arguments are documented :ref:`in the module docs <builders_args>`.
+    '''
+    inverse = False
+    real = False
+
+    s, axes = _precook_1d_args(a, n, axis)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, normalise_idft=False,
+            real_direction_flag='FFTW_HC2R')
+
+
+def fft_split(a, n=None, axis=-1, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, norm=None):
+    '''Return a :class:`pyfftw.FFTW` object representing a 1D FFT
+    with split complex input and output.
+
+    The arguments are as per :func:`~pyfftw.builders.fft`, except that ``a``
+    is a ``(real, imag)`` pair of real arrays.
+    '''
+    inverse = False
+    real = False
+
+    a = _split_parts(a)
+    s, axes = _precook_1d_args(a[0], n, axis)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, split=True, **_norm_args(norm))
+
+
+def ifft_split(a, n=None, axis=-1, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, norm=None):
+    '''Return a :class:`pyfftw.FFTW` object representing a 1D inverse FFT
+    with split complex input and output.
+
+    The arguments are as per :func:`~pyfftw.builders.ifft`, except that ``a``
+    is a ``(real, imag)`` pair of real arrays.
+    '''
+    inverse = True
+    real = False
+
+    a = _split_parts(a)
+    s, axes = _precook_1d_args(a[0], n, axis)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, split=True, **_norm_args(norm))
+
+
+def fftn_split(a, s=None, axes=None, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, norm=None):
+    '''Return a :class:`pyfftw.FFTW` object representing an n-D FFT
+    with split complex input and output.
+
+    The arguments are as per :func:`~pyfftw.builders.fftn`, except that ``a``
+    is a ``(real, imag)`` pair of real arrays.
+    '''
+    inverse = False
+    real = False
+
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, split=True, **_norm_args(norm))
+
+
+def ifftn_split(a, s=None, axes=None, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, norm=None):
+    '''Return a :class:`pyfftw.FFTW` object representing an n-D inverse FFT
+    with split complex input and output.
+
+    The arguments are as per :func:`~pyfftw.builders.ifftn`, except that ``a``
+    is a ``(real, imag)`` pair of real arrays.
+    '''
+    inverse = True
+    real = False
+
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, split=True, **_norm_args(norm))
+
+
+def rfft_split(a, n=None, axis=-1, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, norm=None):
+    '''Return a :class:`pyfftw.FFTW` object representing a 1D real FFT
+    with a split complex output.
+
+    The arguments are as per :func:`~pyfftw.builders.rfft`, and the output of
+    the returned object is a ``(real, imag)`` pair of real arrays.
+    '''
+    inverse = False
+    real = True
+
+    s, axes = _precook_1d_args(a, n, axis)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, split=True, **_norm_args(norm))
+
+
+def irfft_split(a, n=None, axis=-1, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, norm=None):
+    '''Return a :class:`pyfftw.FFTW` object representing a 1D real inverse FFT
+    with a split complex input.
+
+    The arguments are as per :func:`~pyfftw.builders.irfft`, except that ``a``
+    is a ``(real, imag)`` pair of real arrays.
+    '''
+    inverse = True
+    real = True
+
+    a = _split_parts(a)
+    s, axes = _precook_1d_args(a[0], n, axis)
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, split=True, **_norm_args(norm))
+
+
+def rfftn_split(a, s=None, axes=None, overwrite_input=False,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, norm=None):
+    '''Return a :class:`pyfftw.FFTW` object representing an n-D real FFT
+    with a split complex output.
+
+    The arguments are as per :func:`~pyfftw.builders.rfftn`, and the output of
+    the returned object is a ``(real, imag)`` pair of real arrays.
+    '''
+    inverse = False
+    real = True
+
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, split=True, **_norm_args(norm))
+
+
+def irfftn_split(a, s=None, axes=None,
+        planner_effort=None, threads=None,
+        auto_align_input=True, auto_contiguous=True,
+        avoid_copy=False, norm=None, overwrite_input=True):
+    '''Return a :class:`pyfftw.FFTW` object representing an n-D real inverse FFT
+    with a split complex input.
+
+    The arguments are as per :func:`~pyfftw.builders.irfftn`, except that ``a``
+    is a ``(real, imag)`` pair of real arrays.
+    '''
+    inverse = True
+    real = True
+
+    planner_effort = _default_effort(planner_effort)
+    threads = _default_threads(threads)
+
+    return _Xfftn(a, s, axes, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous,
+            avoid_copy, inverse, real, split=True, **_norm_args(norm))
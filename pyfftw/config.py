@@ -67,6 +67,13 @@ class _EnvReloader(object):
         PLANNER_EFFORT = _readenv(
             "PYFFTW_PLANNER_EFFORT", str, "FFTW_ESTIMATE")
 
+        LOW_MEMORY = _readenv(
+            "PYFFTW_LOW_MEMORY", lambda x: bool(int(x)), False)
+
+        WISDOM_FILE = _readenv("PYFFTW_WISDOM_FILE", optional_str, None)
+
+        TUNING_FILE = _readenv("PYFFTW_TUNING_FILE", optional_str, None)
+
         # Inject the configuration values into the module globals
         for name, value in locals().copy().items():
             if name.isupper():
@@ -37,3 +37,10 @@
 cdef extern from "cpu.h":
 
     int simd_alignment()
+    int cpu_features()
+    void cpu_brand(char *brand)
+    void cpu_cache_sizes(int *sizes)
+
+    enum:
+        CPU_BRAND_LENGTH
+        CPU_CACHE_LEVELS
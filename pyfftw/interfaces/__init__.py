@@ -133,6 +133,14 @@ where an error is raised.
 * :func:`pyfftw.interfaces.scipy_fft.irfftn`
 * :func:`pyfftw.interfaces.scipy_fft.hfft`
 * :func:`pyfftw.interfaces.scipy_fft.ihfft`
+* :func:`pyfftw.interfaces.scipy_fft.dct`
+* :func:`pyfftw.interfaces.scipy_fft.idct`
+* :func:`pyfftw.interfaces.scipy_fft.dst`
+* :func:`pyfftw.interfaces.scipy_fft.idst`
+* :func:`pyfftw.interfaces.scipy_fft.dctn`
+* :func:`pyfftw.interfaces.scipy_fft.idctn`
+* :func:`pyfftw.interfaces.scipy_fft.dstn`
+* :func:`pyfftw.interfaces.scipy_fft.idstn`
 * :func:`pyfftw.interfaces.scipy_fft.next_fast_len`
 
 :mod:`~pyfftw.interfaces.scipy_fftpack`
@@ -252,6 +260,19 @@ exceptions and with different defaults.
 
   The default is ``True``.
 
+* ``out``: An array into which the output is written, which is then
+  returned, rather than a new array being allocated on every call. This is
+  only available in :mod:`~pyfftw.interfaces.numpy_fft` and
+  :mod:`~pyfftw.interfaces.scipy_fft`.
+
+  The array must have exactly the dtype, shape and strides of the output
+  (for example, a C-contiguous array created with
+  :func:`pyfftw.empty_aligned`) and be aligned for the transform.
+  Otherwise a ``ValueError`` is raised; the output is never copied into
+  ``out``. It should not overlap the input.
+
+  The default is ``None``, for which a new output array is returned.
+
 '''
 
 from . import (
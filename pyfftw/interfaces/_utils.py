@@ -44,40 +44,41 @@ Utility functions for the interfaces routines
 import pyfftw.builders as builders
 import pyfftw
 import numpy
+import time
 from . import cache
 
 
 def _Xfftn(a, s, axes, overwrite_input, planner_effort,
         threads, auto_align_input, auto_contiguous,
-        calling_func, normalise_idft=True, ortho=False):
+        calling_func, normalise_idft=True, ortho=False, r2r_type=None,
+        out=None):
+    '''Perform the transform given by ``calling_func`` through a (possibly
+    cached) :class:`pyfftw.FFTW` object and return the output array.
+
+    If ``out`` is not ``None``, the output is written into it and it is
+    returned. It must have the dtype, shape, strides and alignment of the
+    output array of the object, else a ``ValueError`` is raised.
+    '''
 
     work_with_copy = False
 
     a = numpy.asanyarray(a)
 
-    try:
-        s = tuple(s)
-    except TypeError:
-        pass
-
-    try:
-        axes = tuple(axes)
-    except TypeError:
-        pass
-
-    if calling_func in ('irfft2', 'irfftn'):
-        # overwrite_input is not an argument to irfft2 or irfftn
-        args = (planner_effort, threads, auto_align_input, auto_contiguous)
+    # Checking the common cases first avoids raising a TypeError on
+    # every call.
+    if s is not None and not isinstance(s, (tuple, int)):
+        try:
+            s = tuple(s)
+        except TypeError:
+            pass
 
-        if not overwrite_input:
-            # Only irfft2 and irfftn have overwriting the input
-            # as the default (and so require the input array to
-            # be reloaded).
-            work_with_copy = True
-    else:
-        args = (overwrite_input, planner_effort, threads,
-                auto_align_input, auto_contiguous)
+    if axes is not None and not isinstance(axes, (tuple, int)):
+        try:
+            axes = tuple(axes)
+        except TypeError:
+            pass
 
+    if calling_func not in ('irfft2', 'irfftn'):
         if not a.flags.writeable:
             # Special case of a locked array - always work with a
             # copy.  See issue #92.
@@ -87,6 +88,14 @@ def _Xfftn(a, s, axes, overwrite_input, planner_effort,
                 raise ValueError('overwrite_input cannot be True when the ' +
                                  'input array flags.writeable is False')
 
+    elif not overwrite_input:
+        # Only irfft2 and irfftn have overwriting the input as the
+        # default. FFTW can preserve the input of a transform over a
+        # single axis, which is preferred to working with a copy (see
+        # _build).
+        if _transform_rank(a, s, axes, calling_func) != 1:
+            work_with_copy = True
+
     if work_with_copy:
         # We make the copy before registering the key so that the
         # copy's stride information will be cached since this will be
@@ -96,57 +105,119 @@ def _Xfftn(a, s, axes, overwrite_input, planner_effort,
         a = pyfftw.empty_aligned(shape=a.shape, dtype=a.dtype)
         a[...] = a_original
 
-    if cache.is_enabled():
-        alignment = a.ctypes.data % pyfftw.simd_alignment
+    # Hold on to the cache in case it is disabled by another thread
+    fftw_cache = cache._fftw_cache
+    FFTW_object = None
+    planning_time = None
 
-        key = (calling_func, a.shape, a.strides, a.dtype, s.__hash__(),
-               axes.__hash__(), alignment, args)
+    if fftw_cache is not None:
+        key = _cache_key(a, s, axes, overwrite_input, planner_effort,
+                         threads, auto_align_input, auto_contiguous,
+                         calling_func, r2r_type)
 
         try:
-            if key in cache._fftw_cache:
-                FFTW_object = cache._fftw_cache.lookup(key)
-            else:
-                FFTW_object = None
-
+            # The object is ours alone until it is checked back in
+            FFTW_object = fftw_cache.checkout(key)
         except KeyError:
-            # This occurs if the object has fallen out of the cache between
-            # the check and the lookup
-            FFTW_object = None
+            pass
 
-    if not cache.is_enabled() or FFTW_object is None:
+    if FFTW_object is None:
 
-        # If we're going to create a new FFTW object and are not
-        # working with a copy, then we need to copy the input array to
-        # preserve it, otherwise we can't actually  take the transform
-        # of the input array! (in general, we have to assume that the
-        # input array will be destroyed during planning).
-        if not work_with_copy:
-            a_copy = a.copy()
+        if fftw_cache is not None:
+            # With adaptive planning, the transform may be estimated until
+            # it has been used often enough.
+            planner_effort = fftw_cache.planner_effort(key)
 
-        planner_args = (a, s, axes) + args
+        # The builders plan on a scratch array whenever the planner could
+        # destroy the input, so `a` is neither copied nor touched here.
+        planning_start = time.perf_counter()
+        FFTW_object = _build(a, s, axes, overwrite_input, planner_effort,
+                             threads, auto_align_input, auto_contiguous,
+                             calling_func, r2r_type)
+        planning_time = time.perf_counter() - planning_start
 
-        FFTW_object = getattr(builders, calling_func)(*planner_args)
+    try:
+        if planning_time is None:
+            # The checks, the allocation of the output array (unless out
+            # is given) and the execution are all done in compiled code.
+            output_array = FFTW_object._execute_to_output(
+                a, out, normalise_idft=normalise_idft, ortho=ortho)
+
+        elif out is None:
+            output_array = FFTW_object(
+                normalise_idft=normalise_idft, ortho=ortho)
 
-        # Only copy if the input array is what was actually used
-        # (otherwise it shouldn't be overwritten)
-        if not work_with_copy and FFTW_object.input_array is a:
-            a[:] = a_copy
+        else:
+            # The new object already holds the input
+            output_array = FFTW_object.execute_into(
+                FFTW_object.input_array, out,
+                normalise_idft=normalise_idft, ortho=ortho)
 
-        if cache.is_enabled():
-            cache._fftw_cache.insert(FFTW_object, key)
+    finally:
+        # The object can still be used after an invalid out is rejected
+        if fftw_cache is not None:
+            fftw_cache.checkin(FFTW_object, key, planning_time)
 
-        output_array = FFTW_object(normalise_idft=normalise_idft, ortho=ortho)
+    return output_array
 
-    else:
-        orig_output_array = FFTW_object.output_array
-        output_shape = orig_output_array.shape
-        output_dtype = orig_output_array.dtype
-        output_alignment = FFTW_object.output_alignment
 
-        output_array = pyfftw.empty_aligned(
-            output_shape, output_dtype, n=output_alignment)
+# Return the key under which the object that transforms ``a`` is cached,
+# given the rest of the arguments to _build. Everything that goes into the
+# planning is part of the key, so that the object can be rebuilt from it.
+# The key is built in compiled code as it is needed on every call.
+_cache_key = pyfftw.pyfftw._interfaces_cache_key
 
-        FFTW_object(input_array=a, output_array=output_array,
-                normalise_idft=normalise_idft, ortho=ortho)
 
-    return output_array
+def _build(a, s, axes, overwrite_input, planner_effort, threads,
+        auto_align_input, auto_contiguous, calling_func, r2r_type):
+    '''Return a new :class:`pyfftw.FFTW` object from the builder named by
+    ``calling_func``, for the (possibly copied) input array ``a``.
+    '''
+    planner_kwargs = {}
+
+    if calling_func in ('irfft2', 'irfftn'):
+        # overwrite_input is not an argument to irfft2 or irfftn
+        args = (planner_effort, threads, auto_align_input, auto_contiguous)
+
+        if (not overwrite_input and
+                _transform_rank(a, s, axes, calling_func) == 1):
+            planner_kwargs['overwrite_input'] = False
+    else:
+        args = (overwrite_input, planner_effort, threads,
+                auto_align_input, auto_contiguous)
+
+    if calling_func in ('fft', 'fft2', 'fftn'):
+        # The object is only ever used for arrays of the dtype of ``a``
+        # (which is part of the cache key), so a real input can be
+        # transformed with the cheaper real-to-complex transform.
+        planner_kwargs['hermitian_fill'] = True
+
+    if r2r_type is not None:
+        # The DCT and DST builders take the transform type as an
+        # extra keyword argument.
+        planner_kwargs['type'] = r2r_type
+
+    return getattr(builders, calling_func)(a, s, axes, *args,
+                                           **planner_kwargs)
+
+
+def _transform_rank(a, s, axes, calling_func):
+    '''Return the number of distinct axes that ``calling_func`` (one of
+    ``'irfft2'`` and ``'irfftn'``) transforms ``a`` over, or ``None`` if
+    the axes are invalid (in which case the builder raises the error).
+    '''
+    if axes is None:
+        if calling_func == 'irfft2':
+            axes = (-2, -1)
+        elif s is None:
+            return a.ndim
+        else:
+            try:
+                return len(s)
+            except TypeError:
+                return None
+
+    try:
+        return len(set(numpy.arange(a.ndim)[list(axes)]))
+    except (IndexError, TypeError):
+        return None
@@ -42,18 +42,24 @@ possesses the necessary wisdom to create the plan immediately), it may
 still take longer than a short transform.
 
 This module implements a method by which objects that are created through
-:mod:`pyfftw.interfaces` are temporarily cached. If an equivalent
-transform is then performed within a short period, the object is acquired
-from the cache rather than a new one created. The equivalency is quite
-conservative and in practice means that if any of the arguments change, or
-if the properties of the array (shape, strides, dtype) change in any way, then
-the cache lookup will fail.
-
-The cache temporarily stores a copy of any interim :class:`pyfftw.FFTW`
-objects that are created. If they are not used for some period of time,
-which can be set with :func:`pyfftw.interfaces.cache.set_keepalive_time`,
-then they are removed from the cache (liberating any associated memory).
-The default keepalive time is 0.1 seconds.
+:mod:`pyfftw.interfaces` are cached. If an equivalent transform is then
+performed, the object is acquired from the cache rather than a new one
+created. The equivalency is quite conservative and in practice means that
+if any of the arguments change, or if the properties of the array (shape,
+strides, dtype) change in any way, then the cache lookup will fail.
+
+The cache stores any interim :class:`pyfftw.FFTW` objects that are created
+and is bounded both by the number of objects it holds and by the total size
+in bytes of their internal arrays. When either bound is exceeded, the least
+recently used objects are removed from the cache (liberating any associated
+memory). The bounds can be changed with
+:func:`pyfftw.interfaces.cache.set_max_entries` and
+:func:`pyfftw.interfaces.cache.set_max_bytes`, and default to 64 objects
+and 256 MiB respectively.
+
+Optionally, objects that are not used for some period of time, which can be
+set with :func:`pyfftw.interfaces.cache.set_keepalive_time`, are also
+removed from the cache. By default there is no such time limit.
 
 Enable the cache by calling :func:`pyfftw.interfaces.cache.enable`.
 Disable it by calling :func:`pyfftw.interfaces.cache.disable`. By default,
@@ -62,11 +68,42 @@ the cache is disabled.
 Note that even with the cache enabled, there is a fixed overhead associated
 with lookups. This means that for small transforms, the overhead may exceed
 the transform. At this point, it's worth looking at using :class:`pyfftw.FFTW`
-directly.
+directly. The overhead can be measured with the
+``benchmarks/interfaces_call_overhead.py`` script in the source distribution.
+
+The cache is safe to use from several threads, for which it relies on
+:mod:`threading`. Each cached object is used by only one call at a time, so
+concurrent calls for the same transform do not share internal arrays. The
+cache holds up to a number of objects for each transform, set with
+:func:`pyfftw.interfaces.cache.set_max_per_key` (4 by default), so that
+concurrent callers can each reuse their own. If :mod:`threading` is not
+available, then the cache is not available and trying to use it will raise
+an ImportError exception.
+
+The cache keeps counts of its hits, misses and evictions, along with the
+time spent planning the objects it holds, for each transform and in
+aggregate. These are returned by
+:func:`pyfftw.interfaces.cache.get_statistics` and can be used to size the
+cache or to find transforms whose shapes keep changing. The counters are
+kept for the most recently used transforms only (1024 of them), with those
+of the others just counted in the totals, so that they do not grow without
+bound when the shapes keep changing. They are zeroed with
+:func:`pyfftw.interfaces.cache.reset_statistics`.
 
-When the cache is enabled, the module spawns a new thread to keep track
-of the objects. If :mod:`threading` is not available, then the cache
-is not available and trying to use it will raise an ImportError exception.
+To avoid planning every transform again after a restart, the transforms
+held by the cache can be written to a file with
+:func:`pyfftw.interfaces.cache.save_manifest`. A later process can then
+build and cache the same objects up front, optionally in a background
+thread, with :func:`pyfftw.interfaces.cache.warm_start`.
+
+Planning with ``'FFTW_MEASURE'`` or more effort gives faster transforms,
+but makes the first call for each transform slow. With adaptive planning,
+enabled by :func:`pyfftw.interfaces.cache.set_adaptive_threshold`, the
+first calls for such a transform instead use an object planned with
+``'FFTW_ESTIMATE'``. Once the transform has been used a given number of
+times, an object is planned with the requested effort in a background
+thread and replaces the estimated objects in the cache. Calls that find an
+object in the cache never wait for this planning.
 
 The actual implementation of the cache is liable to change, but the
 documented API is stable.
@@ -77,15 +114,27 @@ try:
     _threading_import_error = None
 except ImportError as e:
     _threading_import_error = e
-    _threading == None
+    _threading = None
 
+import collections
+import json
 import time
-import weakref
+import warnings
+
+import numpy
+import pyfftw
 
-__all__ = ['enable', 'disable', 'set_keepalive_time']
+__all__ = ['enable', 'disable', 'set_keepalive_time', 'set_max_entries',
+           'set_max_bytes', 'set_max_per_key', 'get_statistics',
+           'reset_statistics', 'save_manifest', 'warm_start',
+           'set_adaptive_threshold']
 
 _fftw_cache = None
 
+# The number of keys for which the cache keeps statistics and adaptive
+# planning state.
+_MAX_KEY_STATES = 1024
+
 class CacheError(Exception):
     pass
 
@@ -115,18 +164,13 @@ def is_enabled():
         return True
 
 def set_keepalive_time(keepalive_time):
-    '''Set the minimum time in seconds for which any :mod:`pyfftw.FFTW` object
-    in the cache is kept alive.
-
-    When the cache is enabled, the interim objects that are used through
-    a :mod:`pyfftw.interfaces` function are cached for the time set through
-    this function. If the object is not used for the that time, it is
-    removed from the cache. Using the object zeros the timer.
-
-    The time is not precise, and sets a minimum time to be alive. In
-    practice, it may be quite a bit longer before the object is
-    deleted from the cache (due to implementational details - e.g. contention
-    from other threads).
+    '''Set the time in seconds after which an unused :mod:`pyfftw.FFTW`
+    object is removed from the cache, or ``None`` (the default) for no
+    time limit.
+
+    Using the object zeros the timer. Objects are only removed when the
+    cache is next accessed, so no background work is done while the cache
+    is idle.
     '''
     global _fftw_cache
 
@@ -135,130 +179,864 @@ def set_keepalive_time(keepalive_time):
     else:
         _fftw_cache.set_keepalive_time(keepalive_time)
 
+def set_max_entries(max_entries):
+    '''Set the maximum number of :class:`pyfftw.FFTW` objects held by the
+    cache, or ``None`` for no limit.
+
+    If the cache holds more objects than this, the least recently used
+    objects are removed from it.
+    '''
+    global _fftw_cache
+
+    if _fftw_cache is None:
+        raise CacheError('Cache is not currently enabled')
+    else:
+        _fftw_cache.set_max_entries(max_entries)
+
+def set_max_bytes(max_bytes):
+    '''Set the maximum total size in bytes of the internal arrays of the
+    :class:`pyfftw.FFTW` objects held by the cache, or ``None`` for no
+    limit.
+
+    If the cache holds more than this, the least recently used objects
+    are removed from it. An object that is bigger than the limit on its own
+    is not kept at all.
+    '''
+    global _fftw_cache
+
+    if _fftw_cache is None:
+        raise CacheError('Cache is not currently enabled')
+    else:
+        _fftw_cache.set_max_bytes(max_bytes)
+
+def set_max_per_key(max_per_key):
+    '''Set the maximum number of idle :class:`pyfftw.FFTW` objects held by
+    the cache for any one transform, or ``None`` for no limit.
+
+    Each object is used by only one caller at a time, so concurrent calls
+    for the same transform each need their own. The cache keeps up to this
+    many of them for later calls; any more are discarded once used.
+    '''
+    global _fftw_cache
+
+    if _fftw_cache is None:
+        raise CacheError('Cache is not currently enabled')
+    else:
+        _fftw_cache.set_max_per_key(max_per_key)
+
+def set_adaptive_threshold(threshold):
+    '''Set the number of calls for a transform after which an object
+    planned with the requested effort replaces the objects planned with
+    ``'FFTW_ESTIMATE'``, or ``None`` (the default) to disable adaptive
+    planning.
+
+    With adaptive planning, a transform for which the planner effort is
+    more than ``'FFTW_ESTIMATE'`` is first planned with
+    ``'FFTW_ESTIMATE'``. After ``threshold`` calls, the object with the
+    requested effort is planned in a background thread. In the meantime,
+    the calls carry on with the estimated objects. Once it is ready, it
+    replaces them in the cache, and any further objects for the
+    transform are planned with the requested effort (which is then quick,
+    as FFTW keeps the wisdom it gained).
+
+    FFTW can only plan one transform at a time, so a call that plans a new
+    transform while an object is planned in the background waits for it.
+    '''
+    global _fftw_cache
+
+    if _fftw_cache is None:
+        raise CacheError('Cache is not currently enabled')
+    else:
+        _fftw_cache.set_adaptive_threshold(threshold)
+
+def get_statistics():
+    '''Return the statistics of the cache as a dictionary with the
+    following entries:
+
+    * ``'hits'``: The number of calls that used an object from the cache.
+    * ``'misses'``: The number of calls that had to create a new object.
+    * ``'evictions'``: The number of objects removed from the cache, or not
+      returned to it, because of its bounds or the keepalive time.
+    * ``'upgrades'``: The number of objects planned in the background to
+      replace objects planned with ``'FFTW_ESTIMATE'`` (see
+      :func:`pyfftw.interfaces.cache.set_adaptive_threshold`).
+    * ``'planning_time'``: The time in seconds spent creating new objects.
+    * ``'planning_time_saved'``: An estimate of the time in seconds saved
+      by the hits, taking each hit to save the mean planning time of its
+      transform.
+    * ``'nbytes'``: The total size in bytes of the internal arrays of the
+      objects in the cache.
+    * ``'keys'``: A dictionary mapping each of the most recently used
+      cache keys (up to 1024) seen since the statistics were last reset to
+      a dictionary of the above entries for that key alone. The entries
+      for the older keys are only included in the totals.
+
+    The statistics are gathered from when the cache was enabled or the
+    statistics were last reset with
+    :func:`pyfftw.interfaces.cache.reset_statistics`.
+    '''
+    global _fftw_cache
+
+    if _fftw_cache is None:
+        raise CacheError('Cache is not currently enabled')
+    else:
+        return _fftw_cache.get_statistics()
+
+def reset_statistics():
+    '''Zero the statistics of the cache. The objects in the cache are
+    kept.
+    '''
+    global _fftw_cache
+
+    if _fftw_cache is None:
+        raise CacheError('Cache is not currently enabled')
+    else:
+        _fftw_cache.reset_statistics()
+
+def save_manifest(filename):
+    '''Write the transforms for which the cache holds objects to the file
+    ``filename``, as JSON.
+
+    For each transform, the manifest records the interfaces function, the
+    shape, strides, dtype and alignment of the input array, ``s``, the
+    axes and the planning arguments (the number of threads, the planner
+    effort and so on). It can be read back with
+    :func:`pyfftw.interfaces.cache.warm_start`.
+    '''
+    global _fftw_cache
+
+    if _fftw_cache is None:
+        raise CacheError('Cache is not currently enabled')
+
+    transforms = [_key_to_manifest(key) for key in _fftw_cache.keys()]
+
+    with open(filename, 'w') as manifest_file:
+        json.dump({'version': _MANIFEST_VERSION, 'transforms': transforms},
+                  manifest_file, indent=1)
+
+def warm_start(filename, background=False):
+    '''Build the objects for the transforms in the manifest ``filename``,
+    as written by :func:`pyfftw.interfaces.cache.save_manifest`, and put
+    them in the cache. Transforms for which the cache already holds an
+    object are skipped.
+
+    If ``background`` is ``True``, the objects are built in a daemon
+    thread, which is returned (so it can be joined); calls made in the
+    meantime plan their own objects as usual. Otherwise the objects are
+    built before returning and ``None`` is returned.
+
+    The manifest is read before returning in either case, so an invalid
+    manifest raises a ``ValueError`` here.
+    '''
+    global _fftw_cache
+
+    # Hold on to the cache in case it is disabled by another thread
+    fftw_cache = _fftw_cache
+
+    if fftw_cache is None:
+        raise CacheError('Cache is not currently enabled')
+
+    with open(filename) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    if (not isinstance(manifest, dict) or
+            manifest.get('version') != _MANIFEST_VERSION):
+        raise ValueError('Invalid manifest: '
+                'The manifest version is not supported.')
+
+    try:
+        keys = [_manifest_to_key(each) for each in manifest['transforms']]
+    except (KeyError, TypeError) as e:
+        raise ValueError('Invalid manifest: '
+                'The transforms cannot be read (%s).' % e)
+
+    if background:
+        warm_thread = _threading.Thread(
+            target=_warm, args=(fftw_cache, keys), name='PyFFTWCacheWarm')
+        warm_thread.daemon = True
+        warm_thread.start()
+
+        return warm_thread
+
+    else:
+        _warm(fftw_cache, keys)
+
+_MANIFEST_VERSION = 1
+
+# The arguments to interfaces._utils._cache_key, in the order they are
+# found in the cache keys.
+_MANIFEST_FIELDS = ('function', 'shape', 'strides', 'dtype', 's', 'axes',
+                    'alignment', 'overwrite_input', 'planner_effort',
+                    'threads', 'auto_align_input', 'auto_contiguous',
+                    'type')
+
+_PLANNER_EFFORT_INDEX = _MANIFEST_FIELDS.index('planner_effort')
+
+def _to_json(value):
+    '''Return ``value``, a tuple of integers or an integer as found in the
+    cache keys, in a form that can be written as JSON.
+    '''
+    if isinstance(value, tuple):
+        return [int(each) for each in value]
+    elif isinstance(value, numpy.integer):
+        return int(value)
+    else:
+        return value
+
+def _key_to_manifest(key):
+    '''Return the manifest entry for the cache key ``key``.
+    '''
+    transform = dict(zip(_MANIFEST_FIELDS, key))
+    transform['dtype'] = transform['dtype'].str
+
+    return {name: _to_json(value) for name, value in transform.items()}
+
+def _manifest_to_key(transform):
+    '''Return the cache key for the manifest entry ``transform``.
+    '''
+    transform = dict(transform)
+
+    for name in ('shape', 'strides', 's', 'axes'):
+        if isinstance(transform[name], list):
+            transform[name] = tuple(transform[name])
+
+    transform['dtype'] = numpy.dtype(transform['dtype'])
+
+    return tuple(transform[name] for name in _MANIFEST_FIELDS)
+
+def _empty_for_key(shape, strides, dtype, alignment):
+    '''Return an uninitialised array with the given shape, strides, dtype
+    and alignment (the address modulo :data:`pyfftw.simd_alignment`).
+    '''
+    n = pyfftw.simd_alignment
+
+    # The offsets in bytes of the lowest and just past the highest
+    # elements from the first element.
+    if 0 in shape:
+        low = high = 0
+    else:
+        low = sum((m - 1) * stride
+                  for m, stride in zip(shape, strides) if stride < 0)
+        high = dtype.itemsize + sum(
+            (m - 1) * stride for m, stride in zip(shape, strides) if stride > 0)
+
+    buffer = pyfftw.empty_aligned(high - low + n, dtype='int8', n=n)
+    offset = -low + (alignment + low) % n
+
+    return numpy.ndarray(shape, dtype, buffer=buffer, offset=offset,
+                         strides=strides)
+
+def _build_for_key(key):
+    '''Return a new object for the cache key ``key``, planned on a scratch
+    array, along with the key of that array and the planning time.
+
+    The key returned only differs from ``key`` if the alignment could not
+    be matched (if ``key`` came from a manifest written on a machine with
+    a different simd_alignment).
+    '''
+    from . import _utils
+
+    (calling_func, shape, strides, dtype, s, axes, alignment,
+     overwrite_input, planner_effort, threads, auto_align_input,
+     auto_contiguous, r2r_type) = key
+
+    a = _empty_for_key(shape, strides, dtype, alignment)
+    args = (s, axes, overwrite_input, planner_effort, threads,
+            auto_align_input, auto_contiguous, calling_func, r2r_type)
+
+    planning_start = time.perf_counter()
+    obj = _utils._build(a, *args)
+    planning_time = time.perf_counter() - planning_start
+
+    return obj, _utils._cache_key(a, *args), planning_time
+
+def _warm(fftw_cache, keys):
+    '''Build the objects for ``keys`` that are not in ``fftw_cache`` and
+    check them in.
+    '''
+    for key in keys:
+        if key in fftw_cache:
+            continue
+
+        obj, key, planning_time = _build_for_key(key)
+        fftw_cache.checkin(obj, key, planning_time)
+
+def _nbytes(obj):
+    '''Return the total size in bytes of the internal arrays of ``obj``.
+    '''
+    nbytes = 0
+    for each_array in (obj.input_array, obj.output_array):
+        if isinstance(each_array, tuple):
+            # A split complex array
+            nbytes += sum(part.nbytes for part in each_array)
+        else:
+            nbytes += each_array.nbytes
+
+    return nbytes
+
+class _CacheEntry(object):
+    '''The idle objects held by the cache for one key, as a list of
+    ``(object, size in bytes)`` pairs from the least to the most recently
+    checked in, and the time the key was last used.
+    '''
+    __slots__ = ('objects', 'last_used')
+
+    def __init__(self, last_used):
+        self.objects = []
+        self.last_used = last_used
+
+class _KeyStatistics(object):
+    '''The counters of the cache for one key. ``planned`` is the number of
+    objects whose planning time was recorded. The objects for a key all
+    have the same size, which is kept in ``object_nbytes`` once known to
+    save working it out on every checkin.
+    '''
+    __slots__ = ('hits', 'misses', 'evictions', 'upgrades', 'planned',
+                 'planning_time', 'object_nbytes')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.upgrades = 0
+        self.planned = 0
+        self.planning_time = 0.0
+        self.object_nbytes = None
+
+    def planning_time_saved(self):
+        if self.planned == 0:
+            return 0.0
+
+        return self.hits * self.planning_time / self.planned
+
+# The totals of the statistics that get_statistics returns.
+_STATISTICS_NAMES = ('hits', 'misses', 'evictions', 'upgrades',
+                     'planning_time', 'planning_time_saved')
+
 class _Cache(object):
+    '''A least recently used cache of :class:`pyfftw.FFTW` objects. All
+    the operations take constant time (apart from removing expired
+    objects) and no thread is used.
+
+    Objects are handed out exclusively: :meth:`checkout` removes an object
+    from the cache and :meth:`checkin` returns it once it is no longer in
+    use. Up to ``max_per_key`` idle objects are held for each key, so that
+    concurrent users of the same key can each have their own object.
+
+    If ``adaptive_threshold`` is not ``None``, the objects for keys (which
+    are then those of :mod:`pyfftw.interfaces`) with a planner effort
+    other than ``'FFTW_ESTIMATE'`` are upgraded: :meth:`planner_effort`
+    says to plan them with ``'FFTW_ESTIMATE'`` until the key has been
+    checked out ``adaptive_threshold`` times, after which an object with
+    the planner effort of the key is built in a background thread and
+    replaces them.
+
+    The statistics and the adaptive planning state are kept for up to
+    ``max_key_states`` keys, dropping those of the least recently used
+    keys beyond that.
+    '''
 
     @property
     def keepalive_time(self):
         return self._keepalive_time
 
-    def __init__(self, keepalive_time=0.1):
+    @property
+    def max_entries(self):
+        return self._max_entries
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def max_per_key(self):
+        return self._max_per_key
+
+    @property
+    def adaptive_threshold(self):
+        return self._adaptive_threshold
+
+    @property
+    def nbytes(self):
+        '''The total size in bytes of the internal arrays of the objects in
+        the cache.
+        '''
+        return self._nbytes
+
+    def __init__(self, keepalive_time=None, max_entries=64,
+            max_bytes=256*1024*1024, max_per_key=4, adaptive_threshold=None,
+            max_key_states=_MAX_KEY_STATES):
+
+        # Maps each key to a _CacheEntry, ordered from the least to the
+        # most recently used.
+        self._cache_dict = collections.OrderedDict()
+        self._n_objects = 0
+        self._nbytes = 0
+
+        # Maps each key seen to its _KeyStatistics, ordered from the least
+        # to the most recently used. Unlike the objects, these are kept
+        # after the key leaves the cache, up to max_key_states keys. The
+        # statistics of the keys dropped beyond that are summed into
+        # _dropped_statistics.
+        self._max_key_states = max_key_states
+        self._statistics = collections.OrderedDict()
+        self._dropped_statistics = dict.fromkeys(_STATISTICS_NAMES, 0)
+
+        # Maps each key that may be upgraded to the number of times it has
+        # been checked out, until the upgrade starts. It then maps the key
+        # to 'upgrading' and finally to 'upgraded' (or 'failed'). It is
+        # bounded as for the statistics, other than the states that
+        # _set_adaptive_state keeps.
+        self._adaptive_state = collections.OrderedDict()
+        self._upgrade_threads = []
+
+        self._lock = _threading.Lock()
 
-        self._cache_dict = {}
         self.set_keepalive_time(keepalive_time)
+        self.set_max_entries(max_entries)
+        self.set_max_bytes(max_bytes)
+        self.set_max_per_key(max_per_key)
+        self.set_adaptive_threshold(adaptive_threshold)
+
+    def __contains__(self, key):
+        '''Return whether an idle object is held for key.
+        '''
+        with self._lock:
+            self._expire(time.time())
+            return key in self._cache_dict
+
+    def __len__(self):
+        '''Return the number of idle objects in the cache.
+        '''
+        return self._n_objects
+
+    def set_keepalive_time(self, keepalive_time=None):
+        '''Set the time in seconds after which an unused object is removed
+        from the cache, or ``None`` for no time limit.
+        '''
+        if keepalive_time is not None:
+            keepalive_time = float(keepalive_time)
+
+        with self._lock:
+            self._keepalive_time = keepalive_time
+            self._expire(time.time())
+
+    def set_max_entries(self, max_entries):
+        '''Set the maximum number of objects in the cache, or ``None`` for
+        no limit.
+        '''
+        max_entries = _check_bound(max_entries, 'max_entries')
+
+        with self._lock:
+            self._max_entries = max_entries
+            self._shrink()
+
+    def set_max_bytes(self, max_bytes):
+        '''Set the maximum total size in bytes of the internal arrays of
+        the objects in the cache, or ``None`` for no limit.
+        '''
+        max_bytes = _check_bound(max_bytes, 'max_bytes')
+
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._shrink()
+
+    def set_max_per_key(self, max_per_key):
+        '''Set the maximum number of idle objects held for each key, or
+        ``None`` for no limit.
+        '''
+        max_per_key = _check_bound(max_per_key, 'max_per_key')
+
+        with self._lock:
+            self._max_per_key = max_per_key
+
+            if max_per_key is not None:
+                for key in list(self._cache_dict):
+                    while len(self._cache_dict[key].objects) > max_per_key:
+                        self._remove_oldest(key)
+
+    def set_adaptive_threshold(self, adaptive_threshold):
+        '''Set the number of checkouts of a key after which its objects
+        are upgraded, or ``None`` to disable the upgrades.
+        '''
+        adaptive_threshold = _check_bound(
+            adaptive_threshold, 'adaptive_threshold')
+
+        with self._lock:
+            self._adaptive_threshold = adaptive_threshold
+
+    def planner_effort(self, key):
+        '''Return the planner effort with which to create a new object for
+        key: ``'FFTW_ESTIMATE'`` if the key is still to be upgraded, and
+        otherwise the planner effort of the key.
+        '''
+        planner_effort = key[_PLANNER_EFFORT_INDEX]
+
+        with self._lock:
+            if (self._adaptive_threshold is None or
+                    planner_effort == 'FFTW_ESTIMATE' or
+                    self._adaptive_state.get(key) == 'upgraded'):
+                return planner_effort
+
+        return 'FFTW_ESTIMATE'
+
+    def _count_checkout(self, key):
+        '''Count a checkout of key towards its upgrade, returning whether
+        the upgrade should now start. The lock should be held.
+        '''
+        state = self._adaptive_state.get(key, 0)
+
+        if not isinstance(state, int):
+            return False
 
-        # A set of objects to be kept alive during the next cull
-        self._keepalive_set = set()
+        if key[_PLANNER_EFFORT_INDEX] == 'FFTW_ESTIMATE':
+            return False
 
-        self._cull_lock = _threading.Lock()
-        self._keepalive_set_lock = _threading.Lock()
+        state += 1
+        if state < self._adaptive_threshold:
+            self._set_adaptive_state(key, state)
+            return False
 
-        self.initialised = _threading.Event()
+        self._set_adaptive_state(key, 'upgrading')
+        return True
+
+    def _set_adaptive_state(self, key, state):
+        '''Set the adaptive planning state of key, dropping that of the
+        least recently set keys if there are then too many. The keys that
+        are being upgraded are never dropped, and nor are those that have
+        been upgraded (or have failed to be) while they have objects in
+        the cache, which would otherwise be upgraded again. The lock
+        should be held.
+        '''
+        self._adaptive_state[key] = state
+        self._adaptive_state.move_to_end(key)
 
-        self._parent_thread = _threading.current_thread()
-        self._close_thread_now = _threading.Event()
+        for n in range(len(self._adaptive_state) - self._max_key_states):
+            oldest_key, oldest_state = self._adaptive_state.popitem(
+                last=False)
 
-        self._initialised = _threading.Event()
-        self._initialised.clear() # Explicitly clear it for clarity
+            if oldest_state == 'upgrading' or (
+                    oldest_state in ('upgraded', 'failed') and
+                    oldest_key in self._cache_dict):
+                self._adaptive_state[oldest_key] = oldest_state
 
-        self._thread_object = _threading.Thread(target=_Cache._run,
-                args=(weakref.proxy(self), ), name='PyFFTWCacheThread')
+    def _start_upgrade(self, key):
+        '''Start a thread that builds an object for key with its planner
+        effort and swaps it in for the objects already held.
+        '''
+        upgrade_thread = _threading.Thread(
+            target=self._upgrade, args=(key,), name='PyFFTWCacheUpgrade')
+        upgrade_thread.daemon = True
 
-        self._thread_object.daemon = True
-        self._thread_object.start()
+        with self._lock:
+            self._upgrade_threads = [
+                each for each in self._upgrade_threads if each.is_alive()]
+            self._upgrade_threads.append(upgrade_thread)
 
-        while not self._initialised.is_set():
-            # This loop is necessary to stop the main thread doing
-            # anything until the exception handler in _run can deal with
-            # the object being deleted.
-            pass
+        upgrade_thread.start()
 
-    def __del__(self):
-        # Wait until the thread object has quit before
-        # exiting (which it will because a reference error will
-        # be raised).
+    def _upgrade(self, key):
+        '''Build an object for key with its planner effort (which may take
+        a while), then swap it in for the idle objects held for key.
+        '''
         try:
-            self._close_thread_now.set()
+            obj, obj_key, planning_time = _build_for_key(key)
+        except Exception as e:
+            # The estimated objects carry on being used
+            with self._lock:
+                self._set_adaptive_state(key, 'failed')
 
-        except TypeError:
-            # Not sure what's going on here, but IPython baulks on exit
-            pass
+            warnings.warn('Upgrading the cached objects failed: %s' % e,
+                          RuntimeWarning)
+            return
 
-    def __contains__(self, key):
-        return key in self._cache_dict
+        with self._lock:
+            self._set_adaptive_state(key, 'upgraded')
 
-    def _run(self):
+            # The estimated objects that are checked out are discarded
+            # when they are checked in.
+            entry = self._cache_dict.pop(key, None)
+            if entry is not None:
+                self._n_objects -= len(entry.objects)
+                self._nbytes -= sum(each[1] for each in entry.objects)
 
-        last_cull_time = time.time()
+            # The scratch array has the alignment of the key, so obj_key
+            # is key.
+            self._key_statistics(obj_key).upgrades += 1
+            self._checkin(obj, obj_key, planning_time, time.time())
+
+    def wait_for_upgrades(self, timeout=None):
+        '''Wait for the upgrades that have been started to finish, each
+        for up to ``timeout`` seconds.
+        '''
+        with self._lock:
+            upgrade_threads = list(self._upgrade_threads)
 
+        for upgrade_thread in upgrade_threads:
+            upgrade_thread.join(timeout)
+
+    def _key_statistics(self, key):
+        '''Return the statistics for key, creating them if need be, and
+        mark them as the most recently used. If there are then statistics
+        for too many keys, those of the least recently used key are summed
+        into the totals and dropped. The lock should be held.
+        '''
         try:
-            self._initialised.set()
+            key_statistics = self._statistics[key]
+        except KeyError:
+            key_statistics = _KeyStatistics()
+            self._statistics[key] = key_statistics
 
-            while True:
-                if (not self._parent_thread.is_alive() or
-                    self._close_thread_now.is_set()):
-                    break
+            while len(self._statistics) > self._max_key_states:
+                oldest_key, oldest_statistics = self._statistics.popitem(
+                    last=False)
+                self._drop_statistics(oldest_statistics)
+        else:
+            self._statistics.move_to_end(key)
 
-                if time.time() - last_cull_time > self._keepalive_time:
-                    # Perform a cull
-                    last_cull_time = time.time()
+        return key_statistics
 
-                    with self._cull_lock:
-                        # Operate on a copy of the cache dict
-                        # so lookups continue.
-                        new_cache_dict = self._cache_dict.copy()
+    def _drop_statistics(self, key_statistics):
+        '''Sum the statistics of a key into the totals of the dropped
+        keys. The lock should be held.
+        '''
+        dropped = self._dropped_statistics
 
-                        with self._keepalive_set_lock:
-                            # Work out which should be culled
-                            cull_set = set(new_cache_dict).difference(
-                                    self._keepalive_set)
+        dropped['hits'] += key_statistics.hits
+        dropped['misses'] += key_statistics.misses
+        dropped['evictions'] += key_statistics.evictions
+        dropped['upgrades'] += key_statistics.upgrades
+        dropped['planning_time'] += key_statistics.planning_time
+        dropped['planning_time_saved'] += (
+            key_statistics.planning_time_saved())
 
-                            self._keepalive_set = set()
+    def _remove_oldest(self, key):
+        '''Evict the least recently checked in object for key. The lock
+        should be held.
+        '''
+        entry = self._cache_dict[key]
+        obj, nbytes = entry.objects.pop(0)
 
-                        for each_key in cull_set:
-                            del new_cache_dict[each_key]
+        self._n_objects -= 1
+        self._nbytes -= nbytes
+        self._key_statistics(key).evictions += 1
 
-                        # Necessarily atomic, so no problem with
-                        # the lookups continuing
-                        self._cache_dict = new_cache_dict
+        if not entry.objects:
+            del self._cache_dict[key]
 
-                time.sleep(self._wakeup_time)
+    def _shrink(self):
+        '''Remove the least recently used objects until the cache is
+        within its bounds. The lock should be held.
+        '''
+        while self._cache_dict and (
+                (self._max_entries is not None and
+                 self._n_objects > self._max_entries) or
+                (self._max_bytes is not None and
+                 self._nbytes > self._max_bytes)):
 
-        except ReferenceError:
-            pass
+            self._remove_oldest(next(iter(self._cache_dict)))
 
-    def set_keepalive_time(self, keepalive_time=0.1):
-        '''Set the minimum time in seconds for which any object in the cache
-        is kept alive.
+    def _expire(self, now):
+        '''Remove the objects that have not been used within the keepalive
+        time. The lock should be held.
+        '''
+        if self._keepalive_time is None:
+            return
 
-        The time is not precise, and sets a minimum time to be alive. In
-        practice, it may be up to twice as long before the object is
-        deleted from the cache (due to implementational details).
+        # The least recently used keys come first, so only the expired
+        # keys are visited.
+        while self._cache_dict:
+            key = next(iter(self._cache_dict))
+
+            if now - self._cache_dict[key].last_used <= self._keepalive_time:
+                break
+
+            while key in self._cache_dict:
+                self._remove_oldest(key)
+
+    def checkin(self, obj, key, planning_time=None):
+        '''Return the passed object to the cache once it is no longer in
+        use, referenced by key, a hashable. If the cache already holds
+        ``max_per_key`` idle objects for key, the object is not kept.
+
+        If the object was newly created, ``planning_time`` should be the
+        time in seconds taken to create it, which is added to the
+        statistics.
         '''
-        self._keepalive_time = float(keepalive_time)
+        with self._lock:
+            self._checkin(obj, key, planning_time, time.time())
+
+    def _checkin(self, obj, key, planning_time, now):
+        '''Check in the passed object, as :meth:`checkin` does. The lock
+        should be held.
+        '''
+        key_statistics = self._key_statistics(key)
+
+        if planning_time is not None:
+            key_statistics.planned += 1
+            key_statistics.planning_time += planning_time
 
-        if self._keepalive_time/2 > 0.1:
-            self._wakeup_time = 0.1
+        if (self._adaptive_state and
+                self._adaptive_state.get(key) == 'upgraded' and
+                'FFTW_ESTIMATE' in obj.flags):
+            # The object was planned before the key was upgraded
+            return
+
+        nbytes = key_statistics.object_nbytes
+        if nbytes is None:
+            nbytes = _nbytes(obj)
+            key_statistics.object_nbytes = nbytes
+
+        try:
+            entry = self._cache_dict[key]
+            self._cache_dict.move_to_end(key)
+        except KeyError:
+            entry = _CacheEntry(now)
+            self._cache_dict[key] = entry
+
+        entry.last_used = now
+
+        if (self._max_per_key is None or
+                len(entry.objects) < self._max_per_key):
+            entry.objects.append((obj, nbytes))
+            self._n_objects += 1
+            self._nbytes += nbytes
         else:
-            self._wakeup_time = self._keepalive_time/2
+            key_statistics.evictions += 1
+
+        if not entry.objects:
+            # Only possible with a max_per_key of 0
+            del self._cache_dict[key]
+
+        if self._keepalive_time is not None:
+            self._expire(now)
 
-    def _refresh(self, key):
-        '''Refresh the object referenced by key to stop it being culled
-        on the next round.
+        self._shrink()
+
+    # Inserting a new object is the same as checking it in.
+    insert = checkin
+
+    def checkout(self, key):
+        '''Remove an idle object referenced by key from the cache and
+        return it, for the exclusive use of the caller until it is passed
+        back to :meth:`checkin`.
+
+        A ``KeyError`` is raised if the cache holds no idle object for key.
+        Either way, the outcome is counted in the statistics.
         '''
-        with self._keepalive_set_lock:
-            self._keepalive_set.add(key)
+        obj = None
+        upgrade = False
+
+        with self._lock:
+            now = time.time()
+
+            if self._keepalive_time is not None:
+                self._expire(now)
+
+            if self._adaptive_threshold is not None:
+                upgrade = self._count_checkout(key)
+
+            try:
+                entry = self._cache_dict[key]
+            except KeyError:
+                self._key_statistics(key).misses += 1
+            else:
+                self._key_statistics(key).hits += 1
+                obj, nbytes = entry.objects.pop()
 
-    def insert(self, obj, key):
-        '''Insert the passed object into the cache, referenced by key,
-        a hashable.
+                self._n_objects -= 1
+                self._nbytes -= nbytes
+
+                if entry.objects:
+                    entry.last_used = now
+                    self._cache_dict.move_to_end(key)
+                else:
+                    del self._cache_dict[key]
+
+        if upgrade:
+            self._start_upgrade(key)
+
+        if obj is None:
+            raise KeyError(key)
+
+        return obj
+
+    def keys(self):
+        '''Return a list of the keys for which idle objects are held,
+        from the least to the most recently used.
         '''
-        with self._cull_lock:
-            self._cache_dict[key] = obj
-            self._refresh(key)
+        with self._lock:
+            self._expire(time.time())
+            return list(self._cache_dict)
 
     def lookup(self, key):
-        '''Lookup the object referenced by key and return it, refreshing
-        the cache at the same time.
+        '''Lookup an idle object referenced by key and return it, marking
+        it as the most recently used. Unlike :meth:`checkout`, the object
+        stays in the cache, so it may be used by others at the same time.
+
+        A ``KeyError`` is raised if the key is not in the cache.
+        '''
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+
+            entry = self._cache_dict[key]
+            entry.last_used = now
+            self._cache_dict.move_to_end(key)
+
+            return entry.objects[-1][0]
+
+    def get_statistics(self):
+        '''Return the statistics of the cache, as described for
+        :func:`pyfftw.interfaces.cache.get_statistics`.
+        '''
+        with self._lock:
+            self._expire(time.time())
+
+            keys = {}
+            for key, key_statistics in self._statistics.items():
+                try:
+                    nbytes = sum(
+                        each[1] for each in self._cache_dict[key].objects)
+                except KeyError:
+                    nbytes = 0
+
+                keys[key] = {
+                    'hits': key_statistics.hits,
+                    'misses': key_statistics.misses,
+                    'evictions': key_statistics.evictions,
+                    'upgrades': key_statistics.upgrades,
+                    'planning_time': key_statistics.planning_time,
+                    'planning_time_saved':
+                        key_statistics.planning_time_saved(),
+                    'nbytes': nbytes}
+
+            statistics = {}
+            for name in _STATISTICS_NAMES:
+                statistics[name] = self._dropped_statistics[name] + sum(
+                    each[name] for each in keys.values())
+
+            # Objects checked in before a reset are still held
+            statistics['nbytes'] = self._nbytes
+            statistics['keys'] = keys
+
+            return statistics
+
+    def reset_statistics(self):
+        '''Zero the statistics of the cache.
         '''
-        self._refresh(key)
-        return self._cache_dict[key]
+        with self._lock:
+            self._statistics = collections.OrderedDict()
+            self._dropped_statistics = dict.fromkeys(_STATISTICS_NAMES, 0)
+
+def _check_bound(bound, name):
+    '''Return ``bound`` as a non-negative integer, or ``None``.
+    '''
+    if bound is not None:
+        bound = int(bound)
+
+        if bound < 0:
+            raise ValueError('Invalid %s: '
+                    'The bound cannot be negative.' % name)
+
+    return bound
@@ -82,7 +82,7 @@ except ImportError:
 
 def fft(a, n=None, axis=-1, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 1D FFT.
 
     The first four arguments are as per :func:`numpy.fft.fft`;
@@ -96,11 +96,11 @@ def fft(a, n=None, axis=-1, norm=None, overwrite_input=False,
 
     return _Xfftn(a, n, axis, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 def ifft(a, n=None, axis=-1, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 1D inverse FFT.
 
     The first four arguments are as per :func:`numpy.fft.ifft`;
@@ -113,12 +113,12 @@ def ifft(a, n=None, axis=-1, norm=None, overwrite_input=False,
 
     return _Xfftn(a, n, axis, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def fft2(a, s=None, axes=(-2,-1), norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 2D FFT.
 
     The first four arguments are as per :func:`numpy.fft.fft2`;
@@ -131,11 +131,11 @@ def fft2(a, s=None, axes=(-2,-1), norm=None, overwrite_input=False,
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 def ifft2(a, s=None, axes=(-2,-1), norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 2D inverse FFT.
 
     The first four arguments are as per :func:`numpy.fft.ifft2`;
@@ -148,12 +148,12 @@ def ifft2(a, s=None, axes=(-2,-1), norm=None, overwrite_input=False,
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def fftn(a, s=None, axes=None, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform an n-D FFT.
 
     The first four arguments are as per :func:`numpy.fft.fftn`;
@@ -166,12 +166,12 @@ def fftn(a, s=None, axes=None, norm=None, overwrite_input=False,
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def ifftn(a, s=None, axes=None, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform an n-D inverse FFT.
 
     The first four arguments are as per :func:`numpy.fft.ifftn`;
@@ -184,12 +184,12 @@ def ifftn(a, s=None, axes=None, norm=None, overwrite_input=False,
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def rfft(a, n=None, axis=-1, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 1D real FFT.
 
     The first four arguments are as per :func:`numpy.fft.rfft`;
@@ -202,12 +202,12 @@ def rfft(a, n=None, axis=-1, norm=None, overwrite_input=False,
 
     return _Xfftn(a, n, axis, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def irfft(a, n=None, axis=-1, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 1D real inverse FFT.
 
     The first four arguments are as per :func:`numpy.fft.irfft`;
@@ -220,12 +220,12 @@ def irfft(a, n=None, axis=-1, norm=None, overwrite_input=False,
 
     return _Xfftn(a, n, axis, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def rfft2(a, s=None, axes=(-2,-1), norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 2D real FFT.
 
     The first four arguments are as per :func:`numpy.fft.rfft2`;
@@ -238,12 +238,12 @@ def rfft2(a, s=None, axes=(-2,-1), norm=None, overwrite_input=False,
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def irfft2(a, s=None, axes=(-2,-1), norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 2D real inverse FFT.
 
     The first four arguments are as per :func:`numpy.fft.irfft2`;
@@ -256,12 +256,12 @@ def irfft2(a, s=None, axes=(-2,-1), norm=None, overwrite_input=False,
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def rfftn(a, s=None, axes=None, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform an n-D real FFT.
 
     The first four arguments are as per :func:`numpy.fft.rfftn`;
@@ -274,12 +274,12 @@ def rfftn(a, s=None, axes=None, norm=None, overwrite_input=False,
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def irfftn(a, s=None, axes=None, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform an n-D real inverse FFT.
 
     The first four arguments are as per :func:`numpy.fft.rfftn`;
@@ -292,12 +292,12 @@ def irfftn(a, s=None, axes=None, norm=None, overwrite_input=False,
 
     return _Xfftn(a, s, axes, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, **_norm_args(norm))
+            calling_func, out=out, **_norm_args(norm))
 
 
 def hfft(a, n=None, axis=-1, norm=None, overwrite_input=False,
          planner_effort=None, threads=None,
-         auto_align_input=True, auto_contiguous=True):
+         auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 1D FFT of a signal with hermitian symmetry.
     This yields a real output spectrum. See :func:`numpy.fft.hfft`
     for more information.
@@ -331,12 +331,12 @@ def hfft(a, n=None, axis=-1, norm=None, overwrite_input=False,
 
     return _Xfftn(a, n, axis, overwrite_input, planner_effort,
             threads, auto_align_input, auto_contiguous,
-            calling_func, normalise_idft=False)
+            calling_func, normalise_idft=False, out=out)
 
 
 def ihfft(a, n=None, axis=-1, norm=None, overwrite_input=False,
         planner_effort=None, threads=None,
-        auto_align_input=True, auto_contiguous=True):
+        auto_align_input=True, auto_contiguous=True, out=None):
     '''Perform a 1D inverse FFT of a real-spectrum, yielding
     a signal with hermitian symmetry. See :func:`numpy.fft.ihfft`
     for more information.
@@ -363,5 +363,14 @@ def ihfft(a, n=None, axis=-1, norm=None, overwrite_input=False,
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
 
-    return scaling * rfft(a, n, axis, None, overwrite_input, planner_effort,
-            threads, auto_align_input, auto_contiguous).conj()
+    output = rfft(a, n, axis, None, overwrite_input, planner_effort,
+            threads, auto_align_input, auto_contiguous, out)
+
+    if out is None:
+        return scaling * output.conj()
+
+    # Finish in place, so no new array is needed
+    numpy.conjugate(output, out=output)
+    output *= scaling
+
+    return output
@@ -50,10 +50,11 @@ a 2D `s` argument will return without exception whereas
 import os
 
 from . import numpy_fft
+from ._utils import _Xfftn
+from ..builders._utils import _precook_1d_args, _cook_nd_args
 
 # Complete the namespace (these are not actually used in this module)
-from scipy.fft import (dct, idct, dst, idst, dctn, idctn, dstn, idstn,
-                       hfft2, ihfft2, hfftn, ihfftn,
+from scipy.fft import (hfft2, ihfft2, hfftn, ihfftn,
                        fftshift, ifftshift, fftfreq, rfftfreq,
                        get_workers, set_workers)
 
@@ -117,7 +118,8 @@ def _workers_to_threads(workers):
 
 @_implements(_fft.fft)
 def fft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
-        planner_effort=None, auto_align_input=True, auto_contiguous=True):
+        planner_effort=None, auto_align_input=True, auto_contiguous=True,
+        out=None):
     '''Perform a 1D FFT.
 
     The first six arguments are as per :func:`scipy.fft.fft`;
@@ -126,12 +128,13 @@ def fft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.fft(x, n, axis, norm, overwrite_x, planner_effort,
-                         threads, auto_align_input, auto_contiguous)
+                         threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.ifft)
 def ifft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
-         planner_effort=None, auto_align_input=True, auto_contiguous=True):
+         planner_effort=None, auto_align_input=True, auto_contiguous=True,
+         out=None):
     '''Perform a 1D inverse FFT.
 
     The first six arguments are as per :func:`scipy.fft.ifft`;
@@ -141,12 +144,13 @@ def ifft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
     threads = _workers_to_threads(workers)
     return numpy_fft.ifft(x, n, axis, norm, overwrite_x,
                           planner_effort, threads, auto_align_input,
-                          auto_contiguous)
+                          auto_contiguous, out)
 
 
 @_implements(_fft.fft2)
 def fft2(x, s=None, axes=(-2, -1), norm=None, overwrite_x=False, workers=None,
-         planner_effort=None, auto_align_input=True, auto_contiguous=True):
+         planner_effort=None, auto_align_input=True, auto_contiguous=True,
+         out=None):
     '''Perform a 2D FFT.
 
     The first six arguments are as per :func:`scipy.fft.fft2`;
@@ -155,12 +159,13 @@ def fft2(x, s=None, axes=(-2, -1), norm=None, overwrite_x=False, workers=None,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.fft2(x, s, axes, norm, overwrite_x, planner_effort,
-                          threads, auto_align_input, auto_contiguous)
+                          threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.ifft2)
 def ifft2(x, s=None, axes=(-2, -1), norm=None, overwrite_x=False, workers=None,
-          planner_effort=None, auto_align_input=True, auto_contiguous=True):
+          planner_effort=None, auto_align_input=True, auto_contiguous=True,
+          out=None):
     '''Perform a 2D inverse FFT.
 
     The first six arguments are as per :func:`scipy.fft.ifft2`;
@@ -169,12 +174,13 @@ def ifft2(x, s=None, axes=(-2, -1), norm=None, overwrite_x=False, workers=None,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.ifft2(x, s, axes, norm, overwrite_x, planner_effort,
-                           threads, auto_align_input, auto_contiguous)
+                           threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.fftn)
 def fftn(x, s=None, axes=None, norm=None, overwrite_x=False, workers=None,
-         planner_effort=None, auto_align_input=True, auto_contiguous=True):
+         planner_effort=None, auto_align_input=True, auto_contiguous=True,
+         out=None):
     '''Perform an n-D FFT.
 
     The first six arguments are as per :func:`scipy.fft.fftn`;
@@ -183,12 +189,13 @@ def fftn(x, s=None, axes=None, norm=None, overwrite_x=False, workers=None,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.fftn(x, s, axes, norm, overwrite_x, planner_effort,
-                          threads, auto_align_input, auto_contiguous)
+                          threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.ifftn)
 def ifftn(x, s=None, axes=None, norm=None, overwrite_x=False, workers=None,
-          planner_effort=None, auto_align_input=True, auto_contiguous=True):
+          planner_effort=None, auto_align_input=True, auto_contiguous=True,
+          out=None):
     '''Perform an n-D inverse FFT.
 
     The first six arguments are as per :func:`scipy.fft.ifftn`;
@@ -197,12 +204,13 @@ def ifftn(x, s=None, axes=None, norm=None, overwrite_x=False, workers=None,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.ifftn(x, s, axes, norm, overwrite_x, planner_effort,
-                           threads, auto_align_input, auto_contiguous)
+                           threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.rfft)
 def rfft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
-         planner_effort=None, auto_align_input=True, auto_contiguous=True):
+         planner_effort=None, auto_align_input=True, auto_contiguous=True,
+         out=None):
     '''Perform a 1D real FFT.
 
     The first six arguments are as per :func:`scipy.fft.rfft`;
@@ -214,12 +222,13 @@ def rfft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
         raise TypeError('x must be a real sequence')
     threads = _workers_to_threads(workers)
     return numpy_fft.rfft(x, n, axis, norm, overwrite_x, planner_effort,
-                          threads, auto_align_input, auto_contiguous)
+                          threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.irfft)
 def irfft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
-          planner_effort=None, auto_align_input=True, auto_contiguous=True):
+          planner_effort=None, auto_align_input=True, auto_contiguous=True,
+          out=None):
     '''Perform a 1D real inverse FFT.
 
     The first six arguments are as per :func:`scipy.fft.irfft`;
@@ -228,12 +237,13 @@ def irfft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.irfft(x, n, axis, norm, overwrite_x, planner_effort,
-                           threads, auto_align_input, auto_contiguous)
+                           threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.rfft2)
 def rfft2(x, s=None, axes=(-2, -1), norm=None, overwrite_x=False, workers=None,
-          planner_effort=None, auto_align_input=True, auto_contiguous=True):
+          planner_effort=None, auto_align_input=True, auto_contiguous=True,
+          out=None):
     '''Perform a 2D real FFT.
 
     The first six arguments are as per :func:`scipy.fft.rfft2`;
@@ -245,13 +255,13 @@ def rfft2(x, s=None, axes=(-2, -1), norm=None, overwrite_x=False, workers=None,
         raise TypeError('x must be a real sequence')
     threads = _workers_to_threads(workers)
     return numpy_fft.rfft2(x, s, axes, norm, overwrite_x, planner_effort,
-                           threads, auto_align_input, auto_contiguous)
+                           threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.irfft2)
 def irfft2(x, s=None, axes=(-2, -1), norm=None, overwrite_x=False,
            workers=None, planner_effort=None, auto_align_input=True,
-           auto_contiguous=True):
+           auto_contiguous=True, out=None):
     '''Perform a 2D real inverse FFT.
 
     The first six arguments are as per :func:`scipy.fft.irfft2`;
@@ -260,12 +270,13 @@ def irfft2(x, s=None, axes=(-2, -1), norm=None, overwrite_x=False,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.irfft2(x, s, axes, norm, overwrite_x, planner_effort,
-                            threads, auto_align_input, auto_contiguous)
+                            threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.rfftn)
 def rfftn(x, s=None, axes=None, norm=None, overwrite_x=False, workers=None,
-          planner_effort=None, auto_align_input=True, auto_contiguous=True):
+          planner_effort=None, auto_align_input=True, auto_contiguous=True,
+          out=None):
     '''Perform an n-D real FFT.
 
     The first six arguments are as per :func:`scipy.fft.rfftn`;
@@ -277,12 +288,13 @@ def rfftn(x, s=None, axes=None, norm=None, overwrite_x=False, workers=None,
         raise TypeError('x must be a real sequence')
     threads = _workers_to_threads(workers)
     return numpy_fft.rfftn(x, s, axes, norm, overwrite_x, planner_effort,
-                           threads, auto_align_input, auto_contiguous)
+                           threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.irfftn)
 def irfftn(x, s=None, axes=None, norm=None, overwrite_x=False, workers=None,
-           planner_effort=None, auto_align_input=True, auto_contiguous=True):
+           planner_effort=None, auto_align_input=True, auto_contiguous=True,
+           out=None):
     '''Perform an n-D real inverse FFT.
 
     The first six arguments are as per :func:`scipy.fft.irfftn`;
@@ -291,12 +303,13 @@ def irfftn(x, s=None, axes=None, norm=None, overwrite_x=False, workers=None,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.irfftn(x, s, axes, norm, overwrite_x, planner_effort,
-                            threads, auto_align_input, auto_contiguous)
+                            threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.hfft)
 def hfft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
-         planner_effort=None, auto_align_input=True, auto_contiguous=True):
+         planner_effort=None, auto_align_input=True, auto_contiguous=True,
+         out=None):
     '''Perform a 1D Hermitian FFT.
 
     The first six arguments are as per :func:`scipy.fft.hfft`;
@@ -305,12 +318,13 @@ def hfft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
     '''
     threads = _workers_to_threads(workers)
     return numpy_fft.hfft(x, n, axis, norm, overwrite_x, planner_effort,
-                          threads, auto_align_input, auto_contiguous)
+                          threads, auto_align_input, auto_contiguous, out)
 
 
 @_implements(_fft.ihfft)
 def ihfft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
-          planner_effort=None, auto_align_input=True, auto_contiguous=True):
+          planner_effort=None, auto_align_input=True, auto_contiguous=True,
+          out=None):
     '''Perform a 1D Hermitian inverse FFT.
 
     The first six arguments are as per :func:`scipy.fft.ihfft`;
@@ -323,4 +337,247 @@ def ihfft(x, n=None, axis=-1, norm=None, overwrite_x=False, workers=None,
 
     threads = _workers_to_threads(workers)
     return numpy_fft.ihfft(x, n, axis, norm, overwrite_x, planner_effort,
-                           threads, auto_align_input, auto_contiguous)
+                           threads, auto_align_input, auto_contiguous, out)
+
+
+# The inverse of each DCT or DST type is the (suitably normalised)
+# transform of the complementary type.
+_inverse_r2r_types = {1: 1, 2: 3, 3: 2, 4: 4}
+_inverse_r2r_norms = {'backward': 'forward', 'ortho': 'ortho',
+                      'forward': 'backward'}
+
+
+def _r2rn(x, type, s, axes, norm, overwrite_x, threads, planner_effort,
+          auto_align_input, auto_contiguous, orthogonalize, calling_func,
+          inverse, out=None):
+    '''Compute a DCT or DST of any type with a cached real-to-real FFTW
+    object, applying the :mod:`scipy.fft` normalisation to the result.
+
+    ``calling_func`` is one of ``'dct'``, ``'dst'``, ``'dctn'`` or
+    ``'dstn'``, in which case ``s`` and ``axes`` are ``n`` and ``axis``
+    for the 1D transforms. The inverse transform is computed if
+    ``inverse`` is ``True``. The output is written into ``out`` if it is
+    not ``None``.
+    '''
+    x = np.asanyarray(x)
+
+    if x.dtype.kind == 'c':
+        if out is not None:
+            raise ValueError('Invalid output array: '
+                    'out cannot be used with a complex input, the parts '
+                    'of which are transformed separately.')
+
+        # As with scipy.fft, the real and imaginary parts of a complex
+        # input are transformed independently.
+        args = (type, s, axes, norm, overwrite_x, threads, planner_effort,
+                auto_align_input, auto_contiguous, orthogonalize,
+                calling_func, inverse)
+        return _r2rn(x.real, *args) + 1j * _r2rn(x.imag, *args)
+
+    if norm is None:
+        norm = 'backward'
+
+    if norm not in _inverse_r2r_norms:
+        raise ValueError('Invalid norm value %s, should be "backward", '
+                         '"ortho" or "forward".' % norm)
+
+    if inverse:
+        type = _inverse_r2r_types.get(type, type)
+        norm = _inverse_r2r_norms[norm]
+
+    if orthogonalize is None:
+        orthogonalize = norm == 'ortho'
+
+    is_dst = calling_func in ('dst', 'dstn')
+
+    if calling_func in ('dct', 'dst'):
+        cooked_s, cooked_axes = _precook_1d_args(x, s, axes)
+        cooked_s, cooked_axes = _cook_nd_args(x, cooked_s, cooked_axes)
+    else:
+        cooked_s, cooked_axes = _cook_nd_args(x, s, axes)
+
+    # As with scipy.fft, an axis cannot be transformed more than once.
+    if len(set(axis % x.ndim for axis in cooked_axes)) != len(cooked_axes):
+        raise ValueError('Invalid axes: '
+                'all axes must be unique.')
+
+    # The transform length along each axis.
+    lengths = {}
+    for n, axis in zip(cooked_s, cooked_axes):
+        lengths[axis % x.ndim] = n
+
+    # The orthogonalised transforms weight the first and/or last samples
+    # of the input (types 1 and 3) or output (types 1 and 2) by sqrt(2).
+    scale_first = not is_dst
+    scale_last = is_dst or type == 1
+
+    if orthogonalize and type in (1, 3) and not (is_dst and type == 1):
+        x = np.array(x, dtype=np.result_type(x, np.float32))
+        overwrite_x = True
+
+        for axis, n in lengths.items():
+            idx = [slice(None)] * x.ndim
+            if scale_first:
+                idx[axis] = 0
+                x[tuple(idx)] *= np.sqrt(2)
+            if scale_last and n <= x.shape[axis]:
+                idx[axis] = n - 1
+                x[tuple(idx)] *= np.sqrt(2)
+
+    output = _Xfftn(x, s, axes, overwrite_x, planner_effort, threads,
+                    auto_align_input, auto_contiguous, calling_func,
+                    normalise_idft=False, ortho=False, r2r_type=type,
+                    out=out)
+
+    if norm != 'backward':
+        N = 1
+        for n in lengths.values():
+            if type == 1:
+                N *= 2 * (n + 1) if is_dst else 2 * (n - 1)
+            else:
+                N *= 2 * n
+
+        if norm == 'ortho':
+            output *= 1.0 / np.sqrt(N)
+        else:
+            output *= 1.0 / N
+
+    if orthogonalize and type in (1, 2) and not (is_dst and type == 1):
+        for axis in lengths:
+            idx = [slice(None)] * output.ndim
+            if scale_first:
+                idx[axis] = 0
+                output[tuple(idx)] /= np.sqrt(2)
+            if scale_last:
+                idx[axis] = -1
+                output[tuple(idx)] /= np.sqrt(2)
+
+    return output
+
+
+@_implements(_fft.dct)
+def dct(x, type=2, n=None, axis=-1, norm=None, overwrite_x=False,
+        workers=None, planner_effort=None, auto_align_input=True,
+        auto_contiguous=True, orthogonalize=None, out=None):
+    '''Perform a 1D discrete cosine transform.
+
+    The first seven arguments and ``orthogonalize`` are as per
+    :func:`scipy.fft.dct`; the rest of the arguments are documented
+    in the :ref:`additional argument docs<interfaces_additional_args>`.
+    '''
+    threads = _workers_to_threads(workers)
+    return _r2rn(x, type, n, axis, norm, overwrite_x, threads,
+                 planner_effort, auto_align_input, auto_contiguous,
+                 orthogonalize, 'dct', False, out)
+
+
+@_implements(_fft.idct)
+def idct(x, type=2, n=None, axis=-1, norm=None, overwrite_x=False,
+         workers=None, planner_effort=None, auto_align_input=True,
+         auto_contiguous=True, orthogonalize=None, out=None):
+    '''Perform a 1D inverse discrete cosine transform.
+
+    The first seven arguments and ``orthogonalize`` are as per
+    :func:`scipy.fft.idct`; the rest of the arguments are documented
+    in the :ref:`additional argument docs<interfaces_additional_args>`.
+    '''
+    threads = _workers_to_threads(workers)
+    return _r2rn(x, type, n, axis, norm, overwrite_x, threads,
+                 planner_effort, auto_align_input, auto_contiguous,
+                 orthogonalize, 'dct', True, out)
+
+
+@_implements(_fft.dst)
+def dst(x, type=2, n=None, axis=-1, norm=None, overwrite_x=False,
+        workers=None, planner_effort=None, auto_align_input=True,
+        auto_contiguous=True, orthogonalize=None, out=None):
+    '''Perform a 1D discrete sine transform.
+
+    The first seven arguments and ``orthogonalize`` are as per
+    :func:`scipy.fft.dst`; the rest of the arguments are documented
+    in the :ref:`additional argument docs<interfaces_additional_args>`.
+    '''
+    threads = _workers_to_threads(workers)
+    return _r2rn(x, type, n, axis, norm, overwrite_x, threads,
+                 planner_effort, auto_align_input, auto_contiguous,
+                 orthogonalize, 'dst', False, out)
+
+
+@_implements(_fft.idst)
+def idst(x, type=2, n=None, axis=-1, norm=None, overwrite_x=False,
+         workers=None, planner_effort=None, auto_align_input=True,
+         auto_contiguous=True, orthogonalize=None, out=None):
+    '''Perform a 1D inverse discrete sine transform.
+
+    The first seven arguments and ``orthogonalize`` are as per
+    :func:`scipy.fft.idst`; the rest of the arguments are documented
+    in the :ref:`additional argument docs<interfaces_additional_args>`.
+    '''
+    threads = _workers_to_threads(workers)
+    return _r2rn(x, type, n, axis, norm, overwrite_x, threads,
+                 planner_effort, auto_align_input, auto_contiguous,
+                 orthogonalize, 'dst', True, out)
+
+
+@_implements(_fft.dctn)
+def dctn(x, type=2, s=None, axes=None, norm=None, overwrite_x=False,
+         workers=None, planner_effort=None, auto_align_input=True,
+         auto_contiguous=True, orthogonalize=None, out=None):
+    '''Perform an n-D discrete cosine transform.
+
+    The first seven arguments and ``orthogonalize`` are as per
+    :func:`scipy.fft.dctn`; the rest of the arguments are documented
+    in the :ref:`additional argument docs<interfaces_additional_args>`.
+    '''
+    threads = _workers_to_threads(workers)
+    return _r2rn(x, type, s, axes, norm, overwrite_x, threads,
+                 planner_effort, auto_align_input, auto_contiguous,
+                 orthogonalize, 'dctn', False, out)
+
+
+@_implements(_fft.idctn)
+def idctn(x, type=2, s=None, axes=None, norm=None, overwrite_x=False,
+          workers=None, planner_effort=None, auto_align_input=True,
+          auto_contiguous=True, orthogonalize=None, out=None):
+    '''Perform an n-D inverse discrete cosine transform.
+
+    The first seven arguments and ``orthogonalize`` are as per
+    :func:`scipy.fft.idctn`; the rest of the arguments are documented
+    in the :ref:`additional argument docs<interfaces_additional_args>`.
+    '''
+    threads = _workers_to_threads(workers)
+    return _r2rn(x, type, s, axes, norm, overwrite_x, threads,
+                 planner_effort, auto_align_input, auto_contiguous,
+                 orthogonalize, 'dctn', True, out)
+
+
+@_implements(_fft.dstn)
+def dstn(x, type=2, s=None, axes=None, norm=None, overwrite_x=False,
+         workers=None, planner_effort=None, auto_align_input=True,
+         auto_contiguous=True, orthogonalize=None, out=None):
+    '''Perform an n-D discrete sine transform.
+
+    The first seven arguments and ``orthogonalize`` are as per
+    :func:`scipy.fft.dstn`; the rest of the arguments are documented
+    in the :ref:`additional argument docs<interfaces_additional_args>`.
+    '''
+    threads = _workers_to_threads(workers)
+    return _r2rn(x, type, s, axes, norm, overwrite_x, threads,
+                 planner_effort, auto_align_input, auto_contiguous,
+                 orthogonalize, 'dstn', False, out)
+
+
+@_implements(_fft.idstn)
+def idstn(x, type=2, s=None, axes=None, norm=None, overwrite_x=False,
+          workers=None, planner_effort=None, auto_align_input=True,
+          auto_contiguous=True, orthogonalize=None, out=None):
+    '''Perform an n-D inverse discrete sine transform.
+
+    The first seven arguments and ``orthogonalize`` are as per
+    :func:`scipy.fft.idstn`; the rest of the arguments are documented
+    in the :ref:`additional argument docs<interfaces_additional_args>`.
+    '''
+    threads = _workers_to_threads(workers)
+    return _r2rn(x, type, s, axes, norm, overwrite_x, threads,
+                 planner_effort, auto_align_input, auto_contiguous,
+                 orthogonalize, 'dstn', True, out)
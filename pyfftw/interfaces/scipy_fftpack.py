@@ -49,8 +49,10 @@ a 2D `shape` argument will return without exception whereas
 '''
 
 from . import numpy_fft
+from ._utils import _Xfftn
 
 from ..builders._utils import _default_effort, _default_threads
+import pyfftw
 import numpy
 
 # Complete the namespace (these are not actually used in this module)
@@ -184,74 +186,23 @@ def ifftn(x, shape=None, axes=None, overwrite_x=False,
     return numpy_fft.ifftn(x, shape, axes, None, overwrite_x,
             planner_effort, threads, auto_align_input, auto_contiguous)
 
-def _complex_to_rfft_output(complex_output, output_shape, axis):
-    '''Convert the complex output from pyfftw to the real output expected
-    from :func:`scipy.fftpack.rfft`.
+def _fftpack_order(n):
+    '''Return the indices that gather a length ``n`` halfcomplex array
+    (``r0, r1, ..., r(n/2), i((n+1)/2-1), ..., i1``) into the order used by
+    :func:`scipy.fftpack.rfft` (``r0, r1, i1, r2, i2, ...``).
     '''
+    j = numpy.arange(n)
+    k = (j + 1)//2
+    return numpy.where(j % 2 == 1, k, n - k) % n
 
-    rfft_output = numpy.empty(output_shape, dtype=complex_output.real.dtype)
-    source_slicer = [slice(None)] * complex_output.ndim
-    target_slicer = [slice(None)] * complex_output.ndim
 
-    # First element
-    source_slicer[axis] = slice(0, 1)
-    target_slicer[axis] = slice(0, 1)
-    rfft_output[tuple(target_slicer)] = complex_output[tuple(source_slicer)].real
-
-    # Real part
-    source_slicer[axis] = slice(1, None)
-    target_slicer[axis] = slice(1, None, 2)
-    rfft_output[tuple(target_slicer)] = complex_output[tuple(source_slicer)].real
-
-    # Imaginary part
-    if output_shape[axis] % 2 == 0:
-        end_val = -1
-    else:
-        end_val = None
-
-    source_slicer[axis] = slice(1, end_val, None)
-    target_slicer[axis] = slice(2, None, 2)
-    rfft_output[tuple(target_slicer)] = complex_output[tuple(source_slicer)].imag
-
-    return rfft_output
-
-
-def _irfft_input_to_complex(irfft_input, axis):
-    '''Convert the expected real input to :func:`scipy.fftpack.irfft` to
-    the complex input needed by pyfftw.
+def _halfcomplex_order(n):
+    '''Return the indices that gather a length ``n`` array in the order
+    used by :func:`scipy.fftpack.rfft` into halfcomplex order. This is the
+    inverse permutation of :func:`_fftpack_order`.
     '''
-    complex_dtype = numpy.result_type(irfft_input, 1j)
-
-    input_shape = list(irfft_input.shape)
-    input_shape[axis] = input_shape[axis]//2 + 1
-
-    complex_input = numpy.empty(input_shape, dtype=complex_dtype)
-    source_slicer = [slice(None)] * len(input_shape)
-    target_slicer = [slice(None)] * len(input_shape)
-
-    # First element
-    source_slicer[axis] = slice(0, 1)
-    target_slicer[axis] = slice(0, 1)
-    complex_input[tuple(target_slicer)] = irfft_input[tuple(source_slicer)]
-
-    # Real part
-    source_slicer[axis] = slice(1, None, 2)
-    target_slicer[axis] = slice(1, None)
-    complex_input[tuple(target_slicer)].real = irfft_input[tuple(source_slicer)]
-
-    # Imaginary part
-    if irfft_input.shape[axis] % 2 == 0:
-        end_val = -1
-        target_slicer[axis] = slice(-1, None)
-        complex_input[tuple(target_slicer)].imag = 0.0
-    else:
-        end_val = None
-
-    source_slicer[axis] = slice(2, None, 2)
-    target_slicer[axis] = slice(1, end_val)
-    complex_input[tuple(target_slicer)].imag = irfft_input[tuple(source_slicer)]
-
-    return complex_input
+    k = numpy.arange(n)
+    return numpy.where(k <= n//2, 2*k - 1, 2*(n - k)).clip(0)
 
 
 def rfft(x, n=None, axis=-1, overwrite_x=False,
@@ -271,14 +222,15 @@ def rfft(x, n=None, axis=-1, overwrite_x=False,
     planner_effort = _default_effort(planner_effort)
     threads = _default_threads(threads)
 
-    complex_output = numpy_fft.rfft(x, n, axis, None, overwrite_x,
-            planner_effort, threads, auto_align_input, auto_contiguous)
+    if n is None:
+        n = x.shape[axis]
 
-    output_shape = list(x.shape)
-    if n is not None:
-        output_shape[axis] = n
+    # FFTW computes the halfcomplex array directly, which only needs
+    # gathering into the scipy.fftpack order.
+    hc_output = _Xfftn(x, n, axis, overwrite_x, planner_effort, threads,
+            auto_align_input, auto_contiguous, 'r2hc')
 
-    return _complex_to_rfft_output(complex_output, output_shape, axis)
+    return hc_output.take(_fftpack_order(n), axis=axis)
 
 def irfft(x, n=None, axis=-1, overwrite_x=False,
         planner_effort=None, threads=None,
@@ -300,7 +252,22 @@ def irfft(x, n=None, axis=-1, overwrite_x=False,
     if n is None:
         n = x.shape[axis]
 
-    complex_input = _irfft_input_to_complex(x, axis)
-
-    return numpy_fft.irfft(complex_input, n, axis, None, overwrite_x,
-            planner_effort, threads, auto_align_input, auto_contiguous)
+    if n > x.shape[axis]:
+        # Zero pad the input first so that the gather below only
+        # indexes existing entries.
+        pad_width = [(0, 0)] * x.ndim
+        pad_width[axis] = (0, n - x.shape[axis])
+        x = numpy.pad(x, pad_width, mode='constant')
+
+    # The gather into halfcomplex order makes a new (aligned) array, so it
+    # can always be overwritten.
+    hc_shape = list(x.shape)
+    hc_shape[axis] = n
+    hc_input = pyfftw.empty_aligned(hc_shape, dtype=x.dtype)
+    numpy.take(x, _halfcomplex_order(n), axis=axis, out=hc_input)
+
+    output = _Xfftn(hc_input, n, axis, True, planner_effort, threads,
+            auto_align_input, auto_contiguous, 'hc2r')
+    output *= 1.0/n
+
+    return output
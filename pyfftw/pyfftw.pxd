@@ -34,11 +34,18 @@
 
 cimport numpy as np
 from libc.stdint cimport int64_t
+from libc.stdio cimport FILE
 
+# Matches fftw_iodim64, so arrays with more than 2^31 elements along an
+# axis, or strides bigger than that, can be planned for.
 ctypedef struct _fftw_iodim:
-    int _n
-    int _is
-    int _os
+    ptrdiff_t _n
+    ptrdiff_t _is
+    ptrdiff_t _os
+
+cdef extern from 'pyfftw_timer.h':
+
+    double pyfftw_perf_counter() nogil
 
 cdef extern from 'pyfftw_complex.h':
 
@@ -66,77 +73,172 @@ cdef extern from 'fftw3.h':
 
     ctypedef fftwl_plan_struct *fftwl_plan
 
+    # The version of the library, with its build options
+    const char fftw_version[]
+    const char fftwf_version[]
+    const char fftwl_version[]
+
     # The stride info structure. I think that strictly
     # speaking, this should be defined with a type suffix
     # on fftw (ie fftw, fftwf or fftwl), but since the
     # definition is transparent and is defined as _fftw_iodim,
     # we ignore the distinction in order to simplify the code.
-    ctypedef struct fftw_iodim:
+    # The 64-bit guru interface is used throughout.
+    ctypedef struct fftw_iodim64:
         pass
 
+    # The real-to-real transform kinds. This is an enum in fftw3.h; it is
+    # declared as an int here so that arrays of kinds can be passed
+    # through the generic function pointers below.
+    ctypedef int fftw_r2r_kind
+
     # Double precision complex planner
-    fftw_plan fftw_plan_guru_dft(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftw_plan fftw_plan_guru64_dft(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             cdouble *_in, cdouble *_out,
             int sign, unsigned flags) nogil
 
     # Single precision complex planner
-    fftwf_plan fftwf_plan_guru_dft(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftwf_plan fftwf_plan_guru64_dft(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             cfloat *_in, cfloat *_out,
             int sign, unsigned flags) nogil
 
     # Single precision complex planner
-    fftwl_plan fftwl_plan_guru_dft(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftwl_plan fftwl_plan_guru64_dft(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             clongdouble *_in, clongdouble *_out,
             int sign, unsigned flags) nogil
 
     # Double precision real to complex planner
-    fftw_plan fftw_plan_guru_dft_r2c(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftw_plan fftw_plan_guru64_dft_r2c(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             double *_in, cdouble *_out,
             unsigned flags) nogil
 
     # Single precision real to complex planner
-    fftwf_plan fftwf_plan_guru_dft_r2c(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftwf_plan fftwf_plan_guru64_dft_r2c(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             float *_in, cfloat *_out,
             unsigned flags) nogil
 
     # Single precision real to complex planner
-    fftwl_plan fftwl_plan_guru_dft_r2c(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftwl_plan fftwl_plan_guru64_dft_r2c(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             long double *_in, clongdouble *_out,
             unsigned flags) nogil
 
     # Double precision complex to real planner
-    fftw_plan fftw_plan_guru_dft_c2r(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftw_plan fftw_plan_guru64_dft_c2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             cdouble *_in, double *_out,
             unsigned flags) nogil
 
     # Single precision complex to real planner
-    fftwf_plan fftwf_plan_guru_dft_c2r(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftwf_plan fftwf_plan_guru64_dft_c2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             cfloat *_in, float *_out,
             unsigned flags) nogil
 
     # Single precision complex to real planner
-    fftwl_plan fftwl_plan_guru_dft_c2r(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+    fftwl_plan fftwl_plan_guru64_dft_c2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             clongdouble *_in, long double *_out,
             unsigned flags) nogil
 
+    # Double precision real to real planner
+    fftw_plan fftw_plan_guru64_r2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            double *_in, double *_out,
+            fftw_r2r_kind *kind, unsigned flags) nogil
+
+    # Single precision real to real planner
+    fftwf_plan fftwf_plan_guru64_r2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            float *_in, float *_out,
+            fftw_r2r_kind *kind, unsigned flags) nogil
+
+    # Long double precision real to real planner
+    fftwl_plan fftwl_plan_guru64_r2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            long double *_in, long double *_out,
+            fftw_r2r_kind *kind, unsigned flags) nogil
+
+    # Double precision split complex planner
+    fftw_plan fftw_plan_guru64_split_dft(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            double *ri, double *ii, double *ro, double *io,
+            unsigned flags) nogil
+
+    # Single precision split complex planner
+    fftwf_plan fftwf_plan_guru64_split_dft(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            float *ri, float *ii, float *ro, float *io,
+            unsigned flags) nogil
+
+    # Long double precision split complex planner
+    fftwl_plan fftwl_plan_guru64_split_dft(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            long double *ri, long double *ii, long double *ro, long double *io,
+            unsigned flags) nogil
+
+    # Double precision real to split complex planner
+    fftw_plan fftw_plan_guru64_split_dft_r2c(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            double *_in, double *ro, double *io,
+            unsigned flags) nogil
+
+    # Single precision real to split complex planner
+    fftwf_plan fftwf_plan_guru64_split_dft_r2c(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            float *_in, float *ro, float *io,
+            unsigned flags) nogil
+
+    # Long double precision real to split complex planner
+    fftwl_plan fftwl_plan_guru64_split_dft_r2c(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            long double *_in, long double *ro, long double *io,
+            unsigned flags) nogil
+
+    # Double precision split complex to real planner
+    fftw_plan fftw_plan_guru64_split_dft_c2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            double *ri, double *ii, double *_out,
+            unsigned flags) nogil
+
+    # Single precision split complex to real planner
+    fftwf_plan fftwf_plan_guru64_split_dft_c2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            float *ri, float *ii, float *_out,
+            unsigned flags) nogil
+
+    # Long double precision split complex to real planner
+    fftwl_plan fftwl_plan_guru64_split_dft_c2r(
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
+            long double *ri, long double *ii, long double *_out,
+            unsigned flags) nogil
+
     # Double precision complex new array execute
     void fftw_execute_dft(fftw_plan,
           cdouble *_in, cdouble *_out) nogil
@@ -173,6 +275,54 @@ cdef extern from 'fftw3.h':
     void fftwl_execute_dft_c2r(fftwl_plan,
           clongdouble *_in, long double *_out) nogil
 
+    # Double precision real to real new array execute
+    void fftw_execute_r2r(fftw_plan,
+          double *_in, double *_out) nogil
+
+    # Single precision real to real new array execute
+    void fftwf_execute_r2r(fftwf_plan,
+          float *_in, float *_out) nogil
+
+    # Long double precision real to real new array execute
+    void fftwl_execute_r2r(fftwl_plan,
+          long double *_in, long double *_out) nogil
+
+    # Double precision split complex new array execute
+    void fftw_execute_split_dft(fftw_plan,
+          double *ri, double *ii, double *ro, double *io) nogil
+
+    # Single precision split complex new array execute
+    void fftwf_execute_split_dft(fftwf_plan,
+          float *ri, float *ii, float *ro, float *io) nogil
+
+    # Long double precision split complex new array execute
+    void fftwl_execute_split_dft(fftwl_plan,
+          long double *ri, long double *ii, long double *ro, long double *io) nogil
+
+    # Double precision real to split complex new array execute
+    void fftw_execute_split_dft_r2c(fftw_plan,
+          double *_in, double *ro, double *io) nogil
+
+    # Single precision real to split complex new array execute
+    void fftwf_execute_split_dft_r2c(fftwf_plan,
+          float *_in, float *ro, float *io) nogil
+
+    # Long double precision real to split complex new array execute
+    void fftwl_execute_split_dft_r2c(fftwl_plan,
+          long double *_in, long double *ro, long double *io) nogil
+
+    # Double precision split complex to real new array execute
+    void fftw_execute_split_dft_c2r(fftw_plan,
+          double *ri, double *ii, double *_out) nogil
+
+    # Single precision split complex to real new array execute
+    void fftwf_execute_split_dft_c2r(fftwf_plan,
+          float *ri, float *ii, float *_out) nogil
+
+    # Long double precision split complex to real new array execute
+    void fftwl_execute_split_dft_c2r(fftwl_plan,
+          long double *ri, long double *ii, long double *_out) nogil
+
     # Double precision plan destroyer
     void fftw_destroy_plan(fftw_plan)
 
@@ -191,6 +341,24 @@ cdef extern from 'fftw3.h':
     # Long double precision set timelimit
     void fftwl_set_timelimit(double seconds)
 
+    # Double precision plan introspection
+    void fftw_flops(fftw_plan, double *add, double *mul, double *fma)
+    double fftw_estimate_cost(fftw_plan)
+    double fftw_cost(fftw_plan)
+    void fftw_fprint_plan(fftw_plan, FILE *output_file)
+
+    # Single precision plan introspection
+    void fftwf_flops(fftwf_plan, double *add, double *mul, double *fma)
+    double fftwf_estimate_cost(fftwf_plan)
+    double fftwf_cost(fftwf_plan)
+    void fftwf_fprint_plan(fftwf_plan, FILE *output_file)
+
+    # Long double precision plan introspection
+    void fftwl_flops(fftwl_plan, double *add, double *mul, double *fma)
+    double fftwl_estimate_cost(fftwl_plan)
+    double fftwl_cost(fftwl_plan)
+    void fftwl_fprint_plan(fftwl_plan, FILE *output_file)
+
     # Threading routines
     # Double precision
     void fftw_init_threads()
@@ -221,13 +389,17 @@ cdef extern from 'fftw3.h':
     int fftwf_import_wisdom_from_string(char *input_string)
     int fftwl_import_wisdom_from_string(char *input_string)
 
-    #int fftw_export_wisdom_to_filename(char *filename)
-    #int fftwf_export_wisdom_to_filename(char *filename)
-    #int fftwl_export_wisdom_to_filename(char *filename)
-    #
-    #int fftw_import_wisdom_from_filename(char *filename)
-    #int fftwf_import_wisdom_from_filename(char *filename)
-    #int fftwl_import_wisdom_from_filename(char *filename)
+    int fftw_export_wisdom_to_filename(const char *filename)
+    int fftwf_export_wisdom_to_filename(const char *filename)
+    int fftwl_export_wisdom_to_filename(const char *filename)
+
+    int fftw_import_wisdom_from_filename(const char *filename)
+    int fftwf_import_wisdom_from_filename(const char *filename)
+    int fftwl_import_wisdom_from_filename(const char *filename)
+
+    int fftw_import_system_wisdom()
+    int fftwf_import_system_wisdom()
+    int fftwl_import_system_wisdom()
 
     void fftw_forget_wisdom()
     void fftwf_forget_wisdom()
@@ -240,10 +412,10 @@ cdef extern from 'fftw3.h':
 # has different function names and signatures for all the
 # different precisions and dft types).
 ctypedef void * (*fftw_generic_plan_guru)(
-        int rank, fftw_iodim *dims,
-        int howmany_rank, fftw_iodim *howmany_dims,
+        int rank, fftw_iodim64 *dims,
+        int howmany_rank, fftw_iodim64 *howmany_dims,
         void *_in, void *_out,
-        int sign, unsigned flags) nogil
+        int *directions, unsigned flags) nogil
 
 ctypedef void (*fftw_generic_execute)(void *_plan, void *_in, void *_out) nogil
 
@@ -255,6 +427,24 @@ ctypedef void (*fftw_generic_plan_with_nthreads)(int n)
 
 ctypedef void (*fftw_generic_set_timelimit)(double seconds)
 
+ctypedef void (*fftw_generic_flops)(void *_plan,
+        double *add, double *mul, double *fma)
+
+ctypedef double (*fftw_generic_cost)(void *_plan)
+
+ctypedef void (*fftw_generic_fprint_plan)(void *_plan, FILE *output_file)
+
+ctypedef void (*fftw_generic_export_wisdom)(
+        void (*write_char)(char c, void *), void *data)
+
+ctypedef void (*fftw_generic_hermitian_fill)(void *_data, int ndim,
+        np.npy_intp *shape, np.npy_intp *strides,
+        int64_t *axes, int64_t axes_length) nogil
+
+ctypedef void (*fftw_generic_scale)(void *_data, int ndim,
+        np.npy_intp *shape, np.npy_intp *strides,
+        int components, double scaling) nogil
+
 ctypedef bint (*validator)(np.ndarray input_array,
         np.ndarray output_array, int64_t *axes, int64_t *not_axes,
         int64_t axes_length)
@@ -264,6 +454,20 @@ cdef enum:
     FFTW_FORWARD = -1
     FFTW_BACKWARD = 1
 
+# Real to real transform kinds
+cdef enum:
+    FFTW_R2HC = 0
+    FFTW_HC2R = 1
+    FFTW_DHT = 2
+    FFTW_REDFT00 = 3
+    FFTW_REDFT01 = 4
+    FFTW_REDFT10 = 5
+    FFTW_REDFT11 = 6
+    FFTW_RODFT00 = 7
+    FFTW_RODFT01 = 8
+    FFTW_RODFT10 = 9
+    FFTW_RODFT11 = 10
+
 # Documented flags
 cdef enum:
     FFTW_MEASURE = 0
@@ -275,3 +479,21 @@ cdef enum:
     FFTW_PATIENT = 32
     FFTW_ESTIMATE = 64
     FFTW_WISDOM_ONLY = 2097152
+
+# The stages of FFTW.__call__ that are timed when stats are enabled
+cdef enum:
+    CALL_STAGE_COPY = 0
+    CALL_STAGE_UPDATE = 1
+    CALL_STAGE_EXECUTE = 2
+    CALL_STAGE_NORMALISE = 3
+    CALL_STAGES = 4
+
+# The reasons an input array is copied by FFTW.__call__
+cdef enum:
+    NO_COPY = -1
+    COPY_NOT_NDARRAY = 0
+    COPY_DTYPE = 1
+    COPY_STRIDES = 2
+    COPY_ALIGNMENT = 3
+    COPY_SLICER = 4
+    COPY_REASONS = 5
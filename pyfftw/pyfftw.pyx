@@ -36,10 +36,11 @@
 
 import numpy as np
 cimport numpy as np
-from libc.stdlib cimport calloc, malloc, free
+from libc.stdlib cimport calloc, malloc, realloc, free
 from libc.stdint cimport intptr_t, int64_t
-from libc cimport limits
+from libc.stdio cimport FILE, tmpfile, fflush, ftell, rewind, fread, fclose
 
+import os
 import warnings
 import threading
 
@@ -82,6 +83,15 @@ IF HAVE_LONG:
     _supported_nptypes_complex.append(np.clongdouble)
     _supported_nptypes_real.append(np.longdouble)
 
+# the version of the FFTW library in use (the libraries of each precision
+# are built from the same source)
+IF HAVE_DOUBLE:
+    _fftw_version = fftw_version.decode('ascii')
+ELIF HAVE_SINGLE:
+    _fftw_version = fftwf_version.decode('ascii')
+ELSE:
+    _fftw_version = fftwl_version.decode('ascii')
+
 IF (HAVE_SINGLE_OMP or HAVE_DOUBLE_OMP or HAVE_LONG_OMP):
     _threading_type = 'OMP'
 ELIF (HAVE_SINGLE_THREADS or HAVE_DOUBLE_THREADS or HAVE_LONG_THREADS):
@@ -97,6 +107,39 @@ cdef object directions_lookup
 directions_lookup = {FFTW_FORWARD: 'FFTW_FORWARD',
         FFTW_BACKWARD: 'FFTW_BACKWARD'}
 
+# The real-to-real transform kinds. For the r2r schemes these take the
+# place of the direction, with one kind given per transformed axis.
+cdef object r2r_kinds
+r2r_kinds = {'FFTW_R2HC': FFTW_R2HC,
+        'FFTW_HC2R': FFTW_HC2R,
+        'FFTW_DHT': FFTW_DHT,
+        'FFTW_REDFT00': FFTW_REDFT00,
+        'FFTW_REDFT01': FFTW_REDFT01,
+        'FFTW_REDFT10': FFTW_REDFT10,
+        'FFTW_REDFT11': FFTW_REDFT11,
+        'FFTW_RODFT00': FFTW_RODFT00,
+        'FFTW_RODFT01': FFTW_RODFT01,
+        'FFTW_RODFT10': FFTW_RODFT10,
+        'FFTW_RODFT11': FFTW_RODFT11}
+
+cdef object r2r_kinds_lookup
+r2r_kinds_lookup = dict((v, k) for k, v in r2r_kinds.items())
+
+cdef int64_t _r2r_logical_size(int kind, int64_t n):
+    ''' Return the logical size of the DFT to which a real-to-real
+    transform of the given kind and physical length n corresponds. This
+    is the size by which a transform followed by its inverse scales the
+    data.
+    '''
+    if kind == FFTW_REDFT00:
+        return 2 * (n - 1)
+    elif kind == FFTW_RODFT00:
+        return 2 * (n + 1)
+    elif kind in (FFTW_R2HC, FFTW_HC2R, FFTW_DHT):
+        return n
+    else:
+        return 2 * n
+
 cdef object flag_dict
 flag_dict = {'FFTW_MEASURE': FFTW_MEASURE,
         'FFTW_EXHAUSTIVE': FFTW_EXHAUSTIVE,
@@ -104,6 +147,8 @@ flag_dict = {'FFTW_MEASURE': FFTW_MEASURE,
         'FFTW_ESTIMATE': FFTW_ESTIMATE,
         'FFTW_UNALIGNED': FFTW_UNALIGNED,
         'FFTW_DESTROY_INPUT': FFTW_DESTROY_INPUT,
+        'FFTW_PRESERVE_INPUT': FFTW_PRESERVE_INPUT,
+        'FFTW_CONSERVE_MEMORY': FFTW_CONSERVE_MEMORY,
         'FFTW_WISDOM_ONLY': FFTW_WISDOM_ONLY}
 
 _flag_dict = flag_dict.copy()
@@ -112,6 +157,11 @@ _flag_dict = flag_dict.copy()
 # do not attempt to plan simultaneously.
 cdef object plan_lock = threading.Lock()
 
+# The hooks that are told about every planning call, as added by
+# add_planner_hook. The tuple is replaced rather than changed, so that it
+# can be read without a lock.
+cdef tuple _planner_hooks = ()
+
 # Function wrappers
 # =================
 # All of these have the same signature as the fftw_generic functions
@@ -125,124 +175,271 @@ cdef object plan_lock = threading.Lock()
 #     ========
 #
 cdef void* _fftw_plan_null(
-            int rank, fftw_iodim *dims,
-            int howmany_rank, fftw_iodim *howmany_dims,
+            int rank, fftw_iodim64 *dims,
+            int howmany_rank, fftw_iodim64 *howmany_dims,
             void *_in, void *_out,
-            int sign, unsigned flags):
+            int *directions, unsigned flags):
 
     raise RuntimeError("Undefined planner. This is a bug")
 
 # Complex double precision
 IF HAVE_DOUBLE:
     cdef void* _fftw_plan_guru_dft(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftw_plan_guru_dft(rank, dims,
+        return <void *>fftw_plan_guru64_dft(rank, dims,
                 howmany_rank, howmany_dims,
                 <cdouble *>_in, <cdouble *>_out,
-                sign, flags)
+                directions[0], flags)
 
     # real to complex double precision
     cdef void* _fftw_plan_guru_dft_r2c(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftw_plan_guru_dft_r2c(rank, dims,
+        return <void *>fftw_plan_guru64_dft_r2c(rank, dims,
                 howmany_rank, howmany_dims,
                 <double *>_in, <cdouble *>_out,
                 flags)
 
     # complex to real double precision
     cdef void* _fftw_plan_guru_dft_c2r(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftw_plan_guru_dft_c2r(rank, dims,
+        return <void *>fftw_plan_guru64_dft_c2r(rank, dims,
                 howmany_rank, howmany_dims,
                 <cdouble *>_in, <double *>_out,
                 flags)
 
+    # real to real double precision
+    cdef void* _fftw_plan_guru_r2r(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftw_plan_guru64_r2r(rank, dims,
+                howmany_rank, howmany_dims,
+                <double *>_in, <double *>_out,
+                <fftw_r2r_kind *>directions, flags)
+
+    # split complex double precision
+    cdef void* _fftw_plan_guru_split_dft(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftw_plan_guru64_split_dft(rank, dims,
+                howmany_rank, howmany_dims,
+                (<double **>_in)[0], (<double **>_in)[1],
+                (<double **>_out)[0], (<double **>_out)[1],
+                flags)
+
+    # real to split complex double precision
+    cdef void* _fftw_plan_guru_split_dft_r2c(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftw_plan_guru64_split_dft_r2c(rank, dims,
+                howmany_rank, howmany_dims,
+                <double *>_in, (<double **>_out)[0], (<double **>_out)[1],
+                flags)
+
+    # split complex to real double precision
+    cdef void* _fftw_plan_guru_split_dft_c2r(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftw_plan_guru64_split_dft_c2r(rank, dims,
+                howmany_rank, howmany_dims,
+                (<double **>_in)[0], (<double **>_in)[1], <double *>_out,
+                flags)
+
 IF HAVE_SINGLE:
     # Complex single precision
     cdef void* _fftwf_plan_guru_dft(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftwf_plan_guru_dft(rank, dims,
+        return <void *>fftwf_plan_guru64_dft(rank, dims,
                 howmany_rank, howmany_dims,
                 <cfloat *>_in, <cfloat *>_out,
-                sign, flags)
+                directions[0], flags)
 
     # real to complex single precision
     cdef void* _fftwf_plan_guru_dft_r2c(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftwf_plan_guru_dft_r2c(rank, dims,
+        return <void *>fftwf_plan_guru64_dft_r2c(rank, dims,
                 howmany_rank, howmany_dims,
                 <float *>_in, <cfloat *>_out,
                 flags)
 
     # complex to real single precision
     cdef void* _fftwf_plan_guru_dft_c2r(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftwf_plan_guru_dft_c2r(rank, dims,
+        return <void *>fftwf_plan_guru64_dft_c2r(rank, dims,
                 howmany_rank, howmany_dims,
                 <cfloat *>_in, <float *>_out,
                 flags)
 
+    # real to real single precision
+    cdef void* _fftwf_plan_guru_r2r(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftwf_plan_guru64_r2r(rank, dims,
+                howmany_rank, howmany_dims,
+                <float *>_in, <float *>_out,
+                <fftw_r2r_kind *>directions, flags)
+
+    # split complex single precision
+    cdef void* _fftwf_plan_guru_split_dft(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftwf_plan_guru64_split_dft(rank, dims,
+                howmany_rank, howmany_dims,
+                (<float **>_in)[0], (<float **>_in)[1],
+                (<float **>_out)[0], (<float **>_out)[1],
+                flags)
+
+    # real to split complex single precision
+    cdef void* _fftwf_plan_guru_split_dft_r2c(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftwf_plan_guru64_split_dft_r2c(rank, dims,
+                howmany_rank, howmany_dims,
+                <float *>_in, (<float **>_out)[0], (<float **>_out)[1],
+                flags)
+
+    # split complex to real single precision
+    cdef void* _fftwf_plan_guru_split_dft_c2r(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftwf_plan_guru64_split_dft_c2r(rank, dims,
+                howmany_rank, howmany_dims,
+                (<float **>_in)[0], (<float **>_in)[1], <float *>_out,
+                flags)
+
 IF HAVE_LONG:
     # Complex long double precision
     cdef void* _fftwl_plan_guru_dft(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftwl_plan_guru_dft(rank, dims,
+        return <void *>fftwl_plan_guru64_dft(rank, dims,
                 howmany_rank, howmany_dims,
                 <clongdouble *>_in, <clongdouble *>_out,
-                sign, flags)
+                directions[0], flags)
 
     # real to complex long double precision
     cdef void* _fftwl_plan_guru_dft_r2c(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftwl_plan_guru_dft_r2c(rank, dims,
+        return <void *>fftwl_plan_guru64_dft_r2c(rank, dims,
                 howmany_rank, howmany_dims,
                 <long double *>_in, <clongdouble *>_out,
                 flags)
 
     # complex to real long double precision
     cdef void* _fftwl_plan_guru_dft_c2r(
-                int rank, fftw_iodim *dims,
-                int howmany_rank, fftw_iodim *howmany_dims,
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
                 void *_in, void *_out,
-                int sign, unsigned flags) nogil:
+                int *directions, unsigned flags) nogil:
 
-        return <void *>fftwl_plan_guru_dft_c2r(rank, dims,
+        return <void *>fftwl_plan_guru64_dft_c2r(rank, dims,
                 howmany_rank, howmany_dims,
                 <clongdouble *>_in, <long double *>_out,
                 flags)
 
+    # real to real long double precision
+    cdef void* _fftwl_plan_guru_r2r(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftwl_plan_guru64_r2r(rank, dims,
+                howmany_rank, howmany_dims,
+                <long double *>_in, <long double *>_out,
+                <fftw_r2r_kind *>directions, flags)
+
+    # split complex long double precision
+    cdef void* _fftwl_plan_guru_split_dft(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftwl_plan_guru64_split_dft(rank, dims,
+                howmany_rank, howmany_dims,
+                (<long double **>_in)[0], (<long double **>_in)[1],
+                (<long double **>_out)[0], (<long double **>_out)[1],
+                flags)
+
+    # real to split complex long double precision
+    cdef void* _fftwl_plan_guru_split_dft_r2c(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftwl_plan_guru64_split_dft_r2c(rank, dims,
+                howmany_rank, howmany_dims,
+                <long double *>_in, (<long double **>_out)[0], (<long double **>_out)[1],
+                flags)
+
+    # split complex to real long double precision
+    cdef void* _fftwl_plan_guru_split_dft_c2r(
+                int rank, fftw_iodim64 *dims,
+                int howmany_rank, fftw_iodim64 *howmany_dims,
+                void *_in, void *_out,
+                int *directions, unsigned flags) nogil:
+
+        return <void *>fftwl_plan_guru64_split_dft_c2r(rank, dims,
+                howmany_rank, howmany_dims,
+                (<long double **>_in)[0], (<long double **>_in)[1], <long double *>_out,
+                flags)
+
 #    Executors
 #    =========
 #
@@ -270,6 +467,34 @@ IF HAVE_DOUBLE:
         fftw_execute_dft_c2r(<fftw_plan>_plan,
                 <cdouble *>_in, <double *>_out)
 
+    # real to real double precision
+    cdef void _fftw_execute_r2r(void *_plan, void *_in, void *_out) nogil:
+
+        fftw_execute_r2r(<fftw_plan>_plan,
+                <double *>_in, <double *>_out)
+
+    # split complex double precision
+    cdef void _fftw_execute_split_dft(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftw_execute_split_dft(<fftw_plan>_plan,
+                (<double **>_in)[0], (<double **>_in)[1],
+                (<double **>_out)[0], (<double **>_out)[1])
+
+    # real to split complex double precision
+    cdef void _fftw_execute_split_dft_r2c(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftw_execute_split_dft_r2c(<fftw_plan>_plan,
+                <double *>_in, (<double **>_out)[0], (<double **>_out)[1])
+
+    # split complex to real double precision
+    cdef void _fftw_execute_split_dft_c2r(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftw_execute_split_dft_c2r(<fftw_plan>_plan,
+                (<double **>_in)[0], (<double **>_in)[1], <double *>_out)
+
 IF HAVE_SINGLE:
     # Complex single precision
     cdef void _fftwf_execute_dft(void *_plan, void *_in, void *_out) nogil:
@@ -289,6 +514,34 @@ IF HAVE_SINGLE:
         fftwf_execute_dft_c2r(<fftwf_plan>_plan,
                 <cfloat *>_in, <float *>_out)
 
+    # real to real single precision
+    cdef void _fftwf_execute_r2r(void *_plan, void *_in, void *_out) nogil:
+
+        fftwf_execute_r2r(<fftwf_plan>_plan,
+                <float *>_in, <float *>_out)
+
+    # split complex single precision
+    cdef void _fftwf_execute_split_dft(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftwf_execute_split_dft(<fftwf_plan>_plan,
+                (<float **>_in)[0], (<float **>_in)[1],
+                (<float **>_out)[0], (<float **>_out)[1])
+
+    # real to split complex single precision
+    cdef void _fftwf_execute_split_dft_r2c(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftwf_execute_split_dft_r2c(<fftwf_plan>_plan,
+                <float *>_in, (<float **>_out)[0], (<float **>_out)[1])
+
+    # split complex to real single precision
+    cdef void _fftwf_execute_split_dft_c2r(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftwf_execute_split_dft_c2r(<fftwf_plan>_plan,
+                (<float **>_in)[0], (<float **>_in)[1], <float *>_out)
+
 IF HAVE_LONG:
     # Complex long double precision
     cdef void _fftwl_execute_dft(void *_plan, void *_in, void *_out) nogil:
@@ -308,6 +561,34 @@ IF HAVE_LONG:
         fftwl_execute_dft_c2r(<fftwl_plan>_plan,
                 <clongdouble *>_in, <long double *>_out)
 
+    # real to real long double precision
+    cdef void _fftwl_execute_r2r(void *_plan, void *_in, void *_out) nogil:
+
+        fftwl_execute_r2r(<fftwl_plan>_plan,
+                <long double *>_in, <long double *>_out)
+
+    # split complex long double precision
+    cdef void _fftwl_execute_split_dft(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftwl_execute_split_dft(<fftwl_plan>_plan,
+                (<long double **>_in)[0], (<long double **>_in)[1],
+                (<long double **>_out)[0], (<long double **>_out)[1])
+
+    # real to split complex long double precision
+    cdef void _fftwl_execute_split_dft_r2c(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftwl_execute_split_dft_r2c(<fftwl_plan>_plan,
+                <long double *>_in, (<long double **>_out)[0], (<long double **>_out)[1])
+
+    # split complex to real long double precision
+    cdef void _fftwl_execute_split_dft_c2r(void *_plan, void *_in,
+            void *_out) nogil:
+
+        fftwl_execute_split_dft_c2r(<fftwl_plan>_plan,
+                (<long double **>_in)[0], (<long double **>_in)[1], <long double *>_out)
+
 #    Destroyers
 #    ==========
 #
@@ -337,44 +618,68 @@ IF HAVE_LONG:
 # ======================
 
 # Planner table (of size the number of planners).
-cdef fftw_generic_plan_guru planners[9]
+cdef fftw_generic_plan_guru planners[21]
 
 cdef fftw_generic_plan_guru * _build_planner_list():
-    for i in range(9):
+    for i in range(21):
         planners[i] = <fftw_generic_plan_guru>&_fftw_plan_null
 
     IF HAVE_DOUBLE:
         planners[0] = <fftw_generic_plan_guru>&_fftw_plan_guru_dft
         planners[3] = <fftw_generic_plan_guru>&_fftw_plan_guru_dft_r2c
         planners[6] = <fftw_generic_plan_guru>&_fftw_plan_guru_dft_c2r
+        planners[9] = <fftw_generic_plan_guru>&_fftw_plan_guru_r2r
+        planners[12] = <fftw_generic_plan_guru>&_fftw_plan_guru_split_dft
+        planners[15] = <fftw_generic_plan_guru>&_fftw_plan_guru_split_dft_r2c
+        planners[18] = <fftw_generic_plan_guru>&_fftw_plan_guru_split_dft_c2r
     IF HAVE_SINGLE:
         planners[1] = <fftw_generic_plan_guru>&_fftwf_plan_guru_dft
         planners[4] = <fftw_generic_plan_guru>&_fftwf_plan_guru_dft_r2c
         planners[7] = <fftw_generic_plan_guru>&_fftwf_plan_guru_dft_c2r
+        planners[10] = <fftw_generic_plan_guru>&_fftwf_plan_guru_r2r
+        planners[13] = <fftw_generic_plan_guru>&_fftwf_plan_guru_split_dft
+        planners[16] = <fftw_generic_plan_guru>&_fftwf_plan_guru_split_dft_r2c
+        planners[19] = <fftw_generic_plan_guru>&_fftwf_plan_guru_split_dft_c2r
     IF HAVE_LONG:
         planners[2] = <fftw_generic_plan_guru>&_fftwl_plan_guru_dft
         planners[5] = <fftw_generic_plan_guru>&_fftwl_plan_guru_dft_r2c
         planners[8] = <fftw_generic_plan_guru>&_fftwl_plan_guru_dft_c2r
+        planners[11] = <fftw_generic_plan_guru>&_fftwl_plan_guru_r2r
+        planners[14] = <fftw_generic_plan_guru>&_fftwl_plan_guru_split_dft
+        planners[17] = <fftw_generic_plan_guru>&_fftwl_plan_guru_split_dft_r2c
+        planners[20] = <fftw_generic_plan_guru>&_fftwl_plan_guru_split_dft_c2r
 
 # Executor table (of size the number of executors)
-cdef fftw_generic_execute executors[9]
+cdef fftw_generic_execute executors[21]
 
 cdef fftw_generic_execute * _build_executor_list():
-    for i in range(9):
+    for i in range(21):
         executors[i] = <fftw_generic_execute>&_fftw_execute_null
 
     IF HAVE_DOUBLE:
         executors[0] = <fftw_generic_execute>&_fftw_execute_dft
         executors[3] = <fftw_generic_execute>&_fftw_execute_dft_r2c
         executors[6] = <fftw_generic_execute>&_fftw_execute_dft_c2r
+        executors[9] = <fftw_generic_execute>&_fftw_execute_r2r
+        executors[12] = <fftw_generic_execute>&_fftw_execute_split_dft
+        executors[15] = <fftw_generic_execute>&_fftw_execute_split_dft_r2c
+        executors[18] = <fftw_generic_execute>&_fftw_execute_split_dft_c2r
     IF HAVE_SINGLE:
         executors[1] = <fftw_generic_execute>&_fftwf_execute_dft
         executors[4] = <fftw_generic_execute>&_fftwf_execute_dft_r2c
         executors[7] = <fftw_generic_execute>&_fftwf_execute_dft_c2r
+        executors[10] = <fftw_generic_execute>&_fftwf_execute_r2r
+        executors[13] = <fftw_generic_execute>&_fftwf_execute_split_dft
+        executors[16] = <fftw_generic_execute>&_fftwf_execute_split_dft_r2c
+        executors[19] = <fftw_generic_execute>&_fftwf_execute_split_dft_c2r
     IF HAVE_LONG:
         executors[2] = <fftw_generic_execute>&_fftwl_execute_dft
         executors[5] = <fftw_generic_execute>&_fftwl_execute_dft_r2c
         executors[8] = <fftw_generic_execute>&_fftwl_execute_dft_c2r
+        executors[11] = <fftw_generic_execute>&_fftwl_execute_r2r
+        executors[14] = <fftw_generic_execute>&_fftwl_execute_split_dft
+        executors[17] = <fftw_generic_execute>&_fftwl_execute_split_dft_r2c
+        executors[20] = <fftw_generic_execute>&_fftwl_execute_split_dft_c2r
 
 # Destroyer table (of size the number of destroyers)
 cdef fftw_generic_destroy_plan destroyers[3]
@@ -433,6 +738,49 @@ cdef fftw_generic_set_timelimit * _build_set_timelimit_funcs_list():
         set_timelimit_funcs[2] = (
             <fftw_generic_set_timelimit>&fftwl_set_timelimit)
 
+# Plan introspection
+cdef fftw_generic_flops flops_funcs[3]
+cdef fftw_generic_cost estimate_cost_funcs[3]
+cdef fftw_generic_cost cost_funcs[3]
+cdef fftw_generic_fprint_plan fprint_plan_funcs[3]
+
+cdef void _fftw_generic_flops_null(void *plan,
+        double *add, double *mul, double *fma):
+
+    raise RuntimeError("Undefined flops. This is a bug")
+
+cdef double _fftw_generic_cost_null(void *plan):
+
+    raise RuntimeError("Undefined cost. This is a bug")
+
+cdef void _fftw_generic_fprint_plan_null(void *plan, FILE *output_file):
+
+    raise RuntimeError("Undefined fprint plan. This is a bug")
+
+cdef void _build_introspection_funcs_list():
+    for i in range(3):
+        flops_funcs[i] = <fftw_generic_flops>&_fftw_generic_flops_null
+        estimate_cost_funcs[i] = <fftw_generic_cost>&_fftw_generic_cost_null
+        cost_funcs[i] = <fftw_generic_cost>&_fftw_generic_cost_null
+        fprint_plan_funcs[i] = (
+            <fftw_generic_fprint_plan>&_fftw_generic_fprint_plan_null)
+
+    IF HAVE_DOUBLE:
+        flops_funcs[0] = <fftw_generic_flops>&fftw_flops
+        estimate_cost_funcs[0] = <fftw_generic_cost>&fftw_estimate_cost
+        cost_funcs[0] = <fftw_generic_cost>&fftw_cost
+        fprint_plan_funcs[0] = <fftw_generic_fprint_plan>&fftw_fprint_plan
+    IF HAVE_SINGLE:
+        flops_funcs[1] = <fftw_generic_flops>&fftwf_flops
+        estimate_cost_funcs[1] = <fftw_generic_cost>&fftwf_estimate_cost
+        cost_funcs[1] = <fftw_generic_cost>&fftwf_cost
+        fprint_plan_funcs[1] = <fftw_generic_fprint_plan>&fftwf_fprint_plan
+    IF HAVE_LONG:
+        flops_funcs[2] = <fftw_generic_flops>&fftwl_flops
+        estimate_cost_funcs[2] = <fftw_generic_cost>&fftwl_estimate_cost
+        cost_funcs[2] = <fftw_generic_cost>&fftwl_cost
+        fprint_plan_funcs[2] = <fftw_generic_fprint_plan>&fftwl_fprint_plan
+
 # Data validators table
 cdef validator validators[2]
 
@@ -505,6 +853,238 @@ cdef bint _validate_c2r_arrays(np.ndarray input_array,
     return True
 
 
+# Hermitian fill functions
+# ========================
+# A real to complex transform only computes the first n//2 + 1 entries
+# along the last transformed axis. When the output array holds the full
+# complex DFT, the remaining entries follow from the conjugate symmetry
+# of the DFT of a real array, X[k] = conj(X[-k]), where the negation is
+# modulo the length along every transformed axis.
+ctypedef fused _fftw_real:
+    float
+    double
+    long double
+
+cdef void _fill_hermitian_half(_fftw_real *_data, int ndim,
+        np.npy_intp *shape, np.npy_intp *strides,
+        int64_t *axes, int64_t axes_length) nogil:
+
+    cdef char *data = <char *>_data
+    cdef int64_t axis = axes[axes_length - 1]
+    cdef np.npy_intp n = shape[axis]
+    cdef np.npy_intp stride = strides[axis]
+
+    cdef np.npy_intp index[np.NPY_MAXDIMS]
+    cdef bint mirrored[np.NPY_MAXDIMS]
+    cdef np.npy_intp dst_offset, src_offset, k
+    cdef _fftw_real *dst
+    cdef _fftw_real *src
+    cdef int d
+
+    for d in range(ndim):
+        if shape[d] == 0:
+            return
+
+        index[d] = 0
+        mirrored[d] = False
+
+    for d in range(axes_length):
+        mirrored[axes[d]] = True
+
+    # Iterate over every 1D line along the last transformed axis
+    while True:
+        dst_offset = 0
+        src_offset = 0
+        for d in range(ndim):
+            if d == axis:
+                continue
+
+            dst_offset += index[d] * strides[d]
+            if mirrored[d] and index[d] != 0:
+                src_offset += (shape[d] - index[d]) * strides[d]
+            else:
+                src_offset += index[d] * strides[d]
+
+        for k in range(n//2 + 1, n):
+            dst = <_fftw_real *>(data + dst_offset + k * stride)
+            src = <_fftw_real *>(data + src_offset + (n - k) * stride)
+            dst[0] = src[0]
+            dst[1] = -src[1]
+
+        d = ndim - 1
+        while d >= 0:
+            if d != axis:
+                index[d] += 1
+                if index[d] < shape[d]:
+                    break
+                index[d] = 0
+            d -= 1
+
+        if d < 0:
+            break
+
+# Hermitian fill table, indexed by the generic precision
+cdef fftw_generic_hermitian_fill hermitian_fills[3]
+
+cdef void _build_hermitian_fills_list():
+    hermitian_fills[0] = (
+            <fftw_generic_hermitian_fill>&_fill_hermitian_half[double])
+    hermitian_fills[1] = (
+            <fftw_generic_hermitian_fill>&_fill_hermitian_half[float])
+    hermitian_fills[2] = (
+            <fftw_generic_hermitian_fill>&_fill_hermitian_half['long double'])
+
+cdef bint _is_split_pair(array):
+    '''Whether ``array`` is a split complex array, given as a pair of
+    (real and imaginary) arrays.
+    '''
+    return isinstance(array, (tuple, list)) and len(array) == 2
+
+def _split_planes(pair, name):
+    '''Check that ``pair`` is a valid split complex array and return its
+    real and imaginary arrays. ``name`` is used in the error messages.
+    '''
+    real, imag = pair
+
+    if not (isinstance(real, np.ndarray) and isinstance(imag, np.ndarray)):
+        raise ValueError('Invalid %s array: '
+                'The real and imaginary parts of a split complex array '
+                'need to be instances of numpy.ndarray' % name)
+
+    if not (real.dtype.kind == 'f' and imag.dtype == real.dtype and
+            imag.shape == real.shape and imag.strides == real.strides):
+        raise ValueError('Invalid %s array: '
+                'The real and imaginary parts of a split complex array '
+                'should be real arrays of the same dtype, shape and '
+                'strides.' % name)
+
+    return real, imag
+
+cdef bint _planes_aligned(np.ndarray array, imag_array, int alignment):
+    '''Whether the array, and the imaginary part array of a split complex
+    array if it is not ``None``, lie on an ``alignment`` byte boundary.
+    '''
+    if not <intptr_t>np.PyArray_DATA(array) % alignment == 0:
+        return False
+
+    if (imag_array is not None and not
+            <intptr_t>np.PyArray_DATA(imag_array) % alignment == 0):
+        return False
+
+    return True
+
+cdef bint _is_stacked(arrays, bint split, int ndim):
+    '''Whether ``arrays`` passed to ``execute_batch`` is a stacked array
+    (or a pair of stacked arrays if ``split``) rather than a sequence of
+    arrays of ``ndim`` dimensions.
+    '''
+    if split:
+        return (_is_split_pair(arrays) and
+                all([_is_stacked(each_array, False, ndim)
+                     for each_array in arrays]))
+
+    return (isinstance(arrays, np.ndarray) and
+            np.PyArray_NDIM(arrays) == ndim + 1)
+
+def _batch_item(arrays, bint stacked, bint split, Py_ssize_t n):
+    '''Return the ``n``-th item of ``arrays`` passed to ``execute_batch``.
+    '''
+    if not stacked:
+        return arrays[n]
+
+    if split:
+        return (arrays[0][n], arrays[1][n])
+
+    return arrays[n]
+
+cdef inline bint _equal_intp_arrays(np.npy_intp *a, np.npy_intp *b,
+        int n):
+    cdef int i
+    for i in range(n):
+        if a[i] != b[i]:
+            return False
+
+    return True
+
+cdef object _empty_aligned_c(shape, dtype, Py_ssize_t itemsize,
+        int ndim, np.npy_intp *dims, int n):
+    '''Return a new C-contiguous ``n``-byte aligned array of the given
+    ``shape`` and ``dtype`` (whose item size is ``itemsize``). ``ndim`` and
+    ``dims`` are the dimensions as C values. This is as for
+    :func:`empty_aligned`, but does less work in Python.
+    '''
+    cdef np.npy_intp nbytes = itemsize
+    cdef int i
+    for i in range(ndim):
+        nbytes *= dims[i]
+
+    cdef np.ndarray buffer = np.empty(nbytes + n, dtype=np.int8)
+    cdef intptr_t offset = (n - <intptr_t>np.PyArray_DATA(buffer) % n) % n
+
+    return buffer[offset:offset + nbytes].view(dtype).reshape(shape)
+
+# Scaling functions
+# =================
+# Scale every element of an arbitrarily strided array in place, so the
+# normalisation can be applied within the same nogil block as the
+# execute rather than as a separate numpy pass. ``components`` is 2 for
+# a complex array and 1 for a real one.
+cdef void _scale_array(_fftw_real *_data, int ndim,
+        np.npy_intp *shape, np.npy_intp *strides,
+        int components, double scaling) nogil:
+
+    cdef char *data = <char *>_data
+    cdef int last = ndim - 1
+    cdef np.npy_intp n = shape[last]
+    cdef np.npy_intp stride = strides[last]
+
+    cdef np.npy_intp index[np.NPY_MAXDIMS]
+    cdef np.npy_intp offset, k
+    cdef _fftw_real *line
+    cdef int d, c
+
+    for d in range(ndim):
+        if shape[d] == 0:
+            return
+
+        index[d] = 0
+
+    # Iterate over every 1D line along the last axis
+    while True:
+        offset = 0
+        for d in range(last):
+            offset += index[d] * strides[d]
+
+        if stride == components * sizeof(_fftw_real):
+            # The line is contiguous, so scale it as a flat run
+            line = <_fftw_real *>(data + offset)
+            for k in range(n * components):
+                line[k] = line[k] * scaling
+        else:
+            for k in range(n):
+                line = <_fftw_real *>(data + offset + k * stride)
+                for c in range(components):
+                    line[c] = line[c] * scaling
+
+        d = last - 1
+        while d >= 0:
+            index[d] += 1
+            if index[d] < shape[d]:
+                break
+            index[d] = 0
+            d -= 1
+
+        if d < 0:
+            break
+
+# Scaling function table, indexed by the generic precision
+cdef fftw_generic_scale scalers[3]
+
+cdef void _build_scalers_list():
+    scalers[0] = <fftw_generic_scale>&_scale_array[double]
+    scalers[1] = <fftw_generic_scale>&_scale_array[float]
+    scalers[2] = <fftw_generic_scale>&_scale_array['long double']
+
 # Shape lookup functions
 # ======================
 def _lookup_shape_r2c_arrays(input_array, output_array):
@@ -550,7 +1130,9 @@ fftw_schemes = {
         (np.dtype('float64'), np.dtype('complex128')): ('r2c', '64'),
         (np.dtype('float32'), np.dtype('complex64')): ('r2c', '32'),
         (np.dtype('complex128'), np.dtype('float64')): ('c2r', '64'),
-        (np.dtype('complex64'), np.dtype('float32')): ('c2r', '32')}
+        (np.dtype('complex64'), np.dtype('float32')): ('c2r', '32'),
+        (np.dtype('float64'), np.dtype('float64')): ('r2r', '64'),
+        (np.dtype('float32'), np.dtype('float32')): ('r2r', '32')}
 
 cdef object fftw_default_output
 fftw_default_output = {
@@ -563,7 +1145,8 @@ if np.dtype('longdouble') != np.dtype('float64'):
     fftw_schemes.update({
         (np.dtype('clongdouble'), np.dtype('clongdouble')): ('c2c', 'ld'),
         (np.dtype('longdouble'), np.dtype('clongdouble')): ('r2c', 'ld'),
-        (np.dtype('clongdouble'), np.dtype('longdouble')): ('c2r', 'ld')})
+        (np.dtype('clongdouble'), np.dtype('longdouble')): ('c2r', 'ld'),
+        (np.dtype('longdouble'), np.dtype('longdouble')): ('r2r', 'ld')})
 
     fftw_default_output.update({
         np.dtype('longdouble'): np.dtype('clongdouble'),
@@ -579,7 +1162,28 @@ scheme_directions = {
         ('r2c', 'ld'): ['FFTW_FORWARD'],
         ('c2r', '64'): ['FFTW_BACKWARD'],
         ('c2r', '32'): ['FFTW_BACKWARD'],
-        ('c2r', 'ld'): ['FFTW_BACKWARD']}
+        ('c2r', 'ld'): ['FFTW_BACKWARD'],
+        ('r2r', '64'): list(r2r_kinds),
+        ('r2r', '32'): list(r2r_kinds),
+        ('r2r', 'ld'): list(r2r_kinds),
+        ('c2c_split', '64'): ['FFTW_FORWARD', 'FFTW_BACKWARD'],
+        ('c2c_split', '32'): ['FFTW_FORWARD', 'FFTW_BACKWARD'],
+        ('c2c_split', 'ld'): ['FFTW_FORWARD', 'FFTW_BACKWARD'],
+        ('r2c_split', '64'): ['FFTW_FORWARD'],
+        ('r2c_split', '32'): ['FFTW_FORWARD'],
+        ('r2c_split', 'ld'): ['FFTW_FORWARD'],
+        ('c2r_split', '64'): ['FFTW_BACKWARD'],
+        ('c2r_split', '32'): ['FFTW_BACKWARD'],
+        ('c2r_split', 'ld'): ['FFTW_BACKWARD']}
+
+# The schemes that are used when the complex arrays are split into
+# separate real and imaginary arrays. These are looked up from the
+# scheme that the equivalent interleaved complex arrays would give.
+cdef object split_schemes
+split_schemes = {
+        'c2c': 'c2c_split',
+        'r2c': 'r2c_split',
+        'c2r': 'c2r_split'}
 
 # In the following, -1 denotes using the default. A segfault has been
 # reported on some systems when this is set to None. It seems
@@ -595,6 +1199,16 @@ IF HAVE_DOUBLE:
         'fft_shape_lookup': _lookup_shape_r2c_arrays},
     ('c2r', '64'): {'planner':6, 'executor':6, 'generic_precision':0,
         'validator': 1,
+        'fft_shape_lookup': _lookup_shape_c2r_arrays},
+    ('r2r', '64'): {'planner':9, 'executor':9, 'generic_precision':0,
+        'validator': -1, 'fft_shape_lookup': -1},
+    ('c2c_split', '64'): {'planner':12, 'executor':12,
+        'generic_precision':0, 'validator': -1, 'fft_shape_lookup': -1},
+    ('r2c_split', '64'): {'planner':15, 'executor':15,
+        'generic_precision':0, 'validator': 0,
+        'fft_shape_lookup': _lookup_shape_r2c_arrays},
+    ('c2r_split', '64'): {'planner':18, 'executor':18,
+        'generic_precision':0, 'validator': 1,
         'fft_shape_lookup': _lookup_shape_c2r_arrays}})
 IF HAVE_SINGLE:
     _scheme_functions.update({
@@ -605,6 +1219,16 @@ IF HAVE_SINGLE:
         'fft_shape_lookup': _lookup_shape_r2c_arrays},
     ('c2r', '32'): {'planner':7, 'executor':7, 'generic_precision':1,
         'validator': 1,
+        'fft_shape_lookup': _lookup_shape_c2r_arrays},
+    ('r2r', '32'): {'planner':10, 'executor':10, 'generic_precision':1,
+        'validator': -1, 'fft_shape_lookup': -1},
+    ('c2c_split', '32'): {'planner':13, 'executor':13,
+        'generic_precision':1, 'validator': -1, 'fft_shape_lookup': -1},
+    ('r2c_split', '32'): {'planner':16, 'executor':16,
+        'generic_precision':1, 'validator': 0,
+        'fft_shape_lookup': _lookup_shape_r2c_arrays},
+    ('c2r_split', '32'): {'planner':19, 'executor':19,
+        'generic_precision':1, 'validator': 1,
         'fft_shape_lookup': _lookup_shape_c2r_arrays}})
 IF HAVE_LONG:
     _scheme_functions.update({
@@ -615,6 +1239,16 @@ IF HAVE_LONG:
         'fft_shape_lookup': _lookup_shape_r2c_arrays},
     ('c2r', 'ld'): {'planner':8, 'executor':8, 'generic_precision':2,
         'validator': 1,
+        'fft_shape_lookup': _lookup_shape_c2r_arrays},
+    ('r2r', 'ld'): {'planner':11, 'executor':11, 'generic_precision':2,
+        'validator': -1, 'fft_shape_lookup': -1},
+    ('c2c_split', 'ld'): {'planner':14, 'executor':14,
+        'generic_precision':2, 'validator': -1, 'fft_shape_lookup': -1},
+    ('r2c_split', 'ld'): {'planner':17, 'executor':17,
+        'generic_precision':2, 'validator': 0,
+        'fft_shape_lookup': _lookup_shape_r2c_arrays},
+    ('c2r_split', 'ld'): {'planner':20, 'executor':20,
+        'generic_precision':2, 'validator': 1,
         'fft_shape_lookup': _lookup_shape_c2r_arrays}})
 
 def scheme_functions(scheme):
@@ -650,7 +1284,10 @@ _build_destroyer_list()
 _build_executor_list()
 _build_nthreads_plan_setters_list()
 _build_validators_list()
+_build_hermitian_fills_list()
+_build_scalers_list()
 _build_set_timelimit_funcs_list()
+_build_introspection_funcs_list()
 
 IF HAVE_DOUBLE_MULTITHREADING:
     fftw_init_threads()
@@ -730,6 +1367,11 @@ cdef void make_axes_unique(int64_t *axes, int64_t axes_length,
 # The External Interface
 # ======================
 #
+# The names of the __call__ stages and the copy reasons, in the order of
+# their enums, as reported by FFTW.stats
+_call_stages = ('copy', 'update', 'execute', 'normalise')
+_copy_reasons = ('not_ndarray', 'dtype', 'strides', 'alignment', 'slicer')
+
 cdef class FFTW:
     '''
     FFTW is a class for computing the complex N-Dimensional DFT or
@@ -765,6 +1407,13 @@ cdef class FFTW:
     cdef fftw_generic_execute _fftw_execute
     cdef fftw_generic_destroy_plan _fftw_destroy
     cdef fftw_generic_plan_with_nthreads _nthreads_plan_setter
+    cdef fftw_generic_hermitian_fill _hermitian_fill
+    cdef fftw_generic_scale _scale
+    cdef fftw_generic_flops _flops
+    cdef fftw_generic_cost _estimate_cost
+    cdef fftw_generic_cost _cost
+    cdef fftw_generic_fprint_plan _fprint_plan
+    cdef int _output_components
 
     # The plan is typecast when it is created or used
     # within the wrapper functions
@@ -772,7 +1421,18 @@ cdef class FFTW:
 
     cdef np.ndarray _input_array
     cdef np.ndarray _output_array
+
+    # For split complex arrays, _input_array and _output_array hold the
+    # real parts and these the imaginary parts (otherwise they are None).
+    cdef object _input_imag_array
+    cdef object _output_imag_array
+    cdef bint _split_input
+    cdef bint _split_output
+    # Whether the real and imaginary parts are passed to FFTW the other
+    # way around, which is how a backwards split complex DFT is computed.
+    cdef bint _split_swap
     cdef int _direction
+    cdef int *_r2r_kinds
     cdef unsigned _flags
 
     cdef bint _simd_allowed
@@ -800,12 +1460,21 @@ cdef class FFTW:
 
     cdef int64_t *_axes
     cdef int64_t *_not_axes
+    cdef int64_t _axes_length
 
     cdef int64_t _total_size
 
     cdef bint _normalise_idft
     cdef bint _ortho
 
+    # Call statistics, only recorded when enabled
+    cdef bint _stats_enabled
+    cdef Py_ssize_t _call_count
+    cdef Py_ssize_t _stage_counts[CALL_STAGES]
+    cdef double _stage_total_times[CALL_STAGES]
+    cdef double _stage_last_times[CALL_STAGES]
+    cdef Py_ssize_t _copy_reason_counts[COPY_REASONS]
+
     def _get_N(self):
         '''
         The product of the lengths of the DFT over all DFT axes.
@@ -864,8 +1533,12 @@ cdef class FFTW:
     def _get_input_array(self):
         '''
         Return the input array that is associated with the FFTW
-        instance.
+        instance. For a split complex input, this is a tuple of the real
+        and imaginary part arrays.
         '''
+        if self._split_input:
+            return (self._input_array, self._input_imag_array)
+
         return self._input_array
 
     input_array = property(_get_input_array)
@@ -873,8 +1546,12 @@ cdef class FFTW:
     def _get_output_array(self):
         '''
         Return the output array that is associated with the FFTW
-        instance.
+        instance. For a split complex output, this is a tuple of the real
+        and imaginary part arrays.
         '''
+        if self._split_output:
+            return (self._output_array, self._output_imag_array)
+
         return self._output_array
 
     output_array = property(_get_output_array)
@@ -930,8 +1607,14 @@ cdef class FFTW:
     def _get_direction(self):
         '''
         Return the planned FFT direction. Either `'FFTW_FORWARD'` or
-        `'FFTW_BACKWARD'`.
+        `'FFTW_BACKWARD'`, or for a real-to-real transform, a list of the
+        transform kinds (such as `'FFTW_REDFT10'`) along each of the
+        :attr:`~pyfftw.FFTW.axes`.
         '''
+        if self._r2r_kinds != NULL:
+            return [r2r_kinds_lookup[self._r2r_kinds[i]]
+                    for i in range(self._rank)]
+
         return directions_lookup[self._direction]
 
     direction = property(_get_direction)
@@ -967,6 +1650,75 @@ cdef class FFTW:
 
     ortho = property(_get_ortho)
 
+    def _get_flops(self):
+        '''
+        Return a tuple of the number of floating point additions,
+        multiplications and fused multiply-adds that the plan performs
+        on a single execution, as counted by ``fftw_flops()``.
+        '''
+        cdef double add = 0, mul = 0, fma = 0
+
+        self._flops(self._plan, &add, &mul, &fma)
+
+        return (add, mul, fma)
+
+    flops = property(_get_flops)
+
+    def _get_estimated_cost(self):
+        '''
+        Return FFTW's estimate of the cost of executing the plan, as
+        returned by ``fftw_estimate_cost()``. The units are arbitrary, but
+        the estimates of different plans can be compared.
+        '''
+        return self._estimate_cost(self._plan)
+
+    estimated_cost = property(_get_estimated_cost)
+
+    def _get_cost(self):
+        '''
+        Return the cost of executing the plan that was measured while
+        planning, as returned by ``fftw_cost()``. This is ``0.0`` if the
+        plan was recreated from wisdom or from an identical plan instead.
+        A plan that was not measured, such as with ``'FFTW_ESTIMATE'``,
+        may also report ``0.0``, so :attr:`~pyfftw.FFTW.estimated_cost`
+        should be used for it.
+        '''
+        return self._cost(self._plan)
+
+    cost = property(_get_cost)
+
+    def _get_stats(self):
+        '''
+        Return the statistics of the calls to the instance that were
+        recorded since :meth:`~pyfftw.FFTW.enable_stats` was called, or
+        ``None`` if they are not enabled.
+
+        This is a dictionary of the number of ``'calls'``, a dictionary
+        for each of the ``'copy'``, ``'update'``, ``'execute'`` and
+        ``'normalise'`` stages of :meth:`~pyfftw.FFTW.__call__` holding
+        its ``'count'``, ``'total_time'`` and ``'last_time'`` (wall times
+        in seconds), and a ``'copy_reasons'`` dictionary of the number of
+        input copies made because the input was ``'not_ndarray'`` or had
+        the wrong ``'dtype'``, ``'strides'`` or ``'alignment'``, or
+        because it was copied through the ``'slicer'`` of a builder.
+        '''
+        if not self._stats_enabled:
+            return None
+
+        stats = {'calls': self._call_count}
+        for stage, name in enumerate(_call_stages):
+            stats[name] = {'count': self._stage_counts[stage],
+                           'total_time': self._stage_total_times[stage],
+                           'last_time': self._stage_last_times[stage]}
+
+        stats['copy_reasons'] = {
+                name: self._copy_reason_counts[reason]
+                for reason, name in enumerate(_copy_reasons)}
+
+        return stats
+
+    stats = property(_get_stats)
+
     def __cinit__(self, input_array, output_array, axes=(-1,),
                   direction='FFTW_FORWARD', flags=('FFTW_MEASURE',),
                   unsigned int threads=1, planning_timelimit=None,
@@ -980,6 +1732,7 @@ cdef class FFTW:
 
         self._axes = NULL
         self._not_axes = NULL
+        self._r2r_kinds = NULL
 
         self._normalise_idft = normalise_idft
         self._ortho = ortho
@@ -999,6 +1752,20 @@ cdef class FFTW:
                 raise TypeError('Invalid planning timelimit: '
                         'The planning timelimit needs to be a float.')
 
+        # A split complex array is passed as a pair of real arrays
+        self._split_input = _is_split_pair(input_array)
+        self._split_output = _is_split_pair(output_array)
+        self._input_imag_array = None
+        self._output_imag_array = None
+
+        if self._split_input:
+            input_array, self._input_imag_array = _split_planes(
+                    input_array, 'input')
+
+        if self._split_output:
+            output_array, self._output_imag_array = _split_planes(
+                    output_array, 'output')
+
         if not isinstance(input_array, np.ndarray):
             raise ValueError('Invalid input array: '
                     'The input array needs to be an instance '
@@ -1009,15 +1776,37 @@ cdef class FFTW:
                     'The output array needs to be an instance '
                     'of numpy.ndarray')
 
+        input_dtype = input_array.dtype
+        output_dtype = output_array.dtype
+
+        # The scheme is looked up with the complex dtype that a split
+        # complex array stands in for.
+        scheme_input_dtype = input_dtype
+        scheme_output_dtype = output_dtype
+        if self._split_input:
+            scheme_input_dtype = np.dtype(input_dtype.char.upper())
+        if self._split_output:
+            scheme_output_dtype = np.dtype(output_dtype.char.upper())
+
         try:
-            input_dtype = input_array.dtype
-            output_dtype = output_array.dtype
-            scheme = fftw_schemes[(input_dtype, output_dtype)]
+            scheme = fftw_schemes[(scheme_input_dtype, scheme_output_dtype)]
         except KeyError:
             raise ValueError('Invalid scheme: '
                     'The output array and input array dtypes '
                     'do not correspond to a valid fftw scheme.')
 
+        if self._split_input or self._split_output:
+            # Every complex array has to be split; FFTW cannot mix split
+            # and interleaved complex arrays.
+            if not (scheme[0] in split_schemes and
+                    self._split_input == (scheme[0] != 'r2c') and
+                    self._split_output == (scheme[0] != 'c2r')):
+                raise ValueError('Invalid scheme: '
+                        'Split complex arrays cannot be mixed with '
+                        'interleaved complex arrays.')
+
+            scheme = (split_schemes[scheme[0]], scheme[1])
+
         self._input_dtype = input_dtype
         self._output_dtype = output_dtype
 
@@ -1030,6 +1819,22 @@ cdef class FFTW:
         self._nthreads_plan_setter = (
                 nthreads_plan_setters[functions['generic_precision']])
 
+        # Only set for a real to complex transform with a full length
+        # output (see below)
+        self._hermitian_fill = NULL
+
+        self._scale = scalers[functions['generic_precision']]
+
+        self._flops = flops_funcs[functions['generic_precision']]
+        self._estimate_cost = (
+                estimate_cost_funcs[functions['generic_precision']])
+        self._cost = cost_funcs[functions['generic_precision']]
+        self._fprint_plan = fprint_plan_funcs[functions['generic_precision']]
+        if np.iscomplexobj(output_array):
+            self._output_components = 2
+        else:
+            self._output_components = 1
+
         cdef fftw_generic_set_timelimit set_timelimit_func = (
                 set_timelimit_funcs[functions['generic_precision']])
 
@@ -1054,10 +1859,11 @@ cdef class FFTW:
             self._output_array_alignment = -1
 
             for each_alignment in _valid_simd_alignments:
-                if (<intptr_t>np.PyArray_DATA(input_array) %
-                        each_alignment == 0 and
-                        <intptr_t>np.PyArray_DATA(output_array) %
-                        each_alignment == 0):
+                if (_planes_aligned(input_array, self._input_imag_array,
+                                    each_alignment) and
+                        _planes_aligned(output_array,
+                                        self._output_imag_array,
+                                        each_alignment)):
 
                     self._simd_allowed = True
 
@@ -1077,24 +1883,54 @@ cdef class FFTW:
                         natural_output_alignment)
                 flags.append('FFTW_UNALIGNED')
 
-        if (not (<intptr_t>np.PyArray_DATA(input_array)
-            % self._input_array_alignment == 0)):
+        if not _planes_aligned(input_array, self._input_imag_array,
+                               self._input_array_alignment):
             raise ValueError('Invalid input alignment: '
                     'The input array is expected to lie on a %d '
                     'byte boundary.' % self._input_array_alignment)
 
-        if (not (<intptr_t>np.PyArray_DATA(output_array)
-            % self._output_array_alignment == 0)):
+        if not _planes_aligned(output_array, self._output_imag_array,
+                               self._output_array_alignment):
             raise ValueError('Invalid output alignment: '
                     'The output array is expected to lie on a %d '
                     'byte boundary.' % self._output_array_alignment)
 
-        if not direction in scheme_directions[scheme]:
-            raise ValueError('Invalid direction: '
-                    'The direction is not valid for the scheme. '
-                    'Try setting it explicitly if it is not already.')
+        if scheme[0] == 'r2r':
+            # The real-to-real schemes take a transform kind for each axis
+            # in place of the direction. A single kind applies to every axis.
+            if isinstance(direction, str):
+                r2r_directions = [direction] * len(axes)
+            else:
+                r2r_directions = list(direction)
+
+            for each_direction in r2r_directions:
+                if not each_direction in scheme_directions[scheme]:
+                    raise ValueError('Invalid direction: '
+                            'The direction is not valid for the scheme. '
+                            'Try setting it explicitly if it is not already.')
+
+            if len(r2r_directions) != len(axes):
+                raise ValueError('Invalid direction: '
+                        'A real-to-real transform needs one kind of '
+                        'transform for each axis.')
+
+            if self._ortho:
+                raise ValueError('Invalid options: '
+                        'ortho is not supported for real-to-real '
+                        'transforms.')
+
+            # The real-to-real transforms are never normalised, so the
+            # direction is only a placeholder.
+            self._direction = FFTW_FORWARD
+
+        else:
+            if not direction in scheme_directions[scheme]:
+                raise ValueError('Invalid direction: '
+                        'The direction is not valid for the scheme. '
+                        'Try setting it explicitly if it is not already.')
+
+            self._direction = directions[direction]
 
-        self._direction = directions[direction]
         self._input_shape = input_array.shape
         self._output_shape = output_array.shape
 
@@ -1121,6 +1957,8 @@ cdef class FFTW:
         cdef int64_t *unique_axes
         cdef int64_t *not_axes
 
+        given_axes = [self._axes[n] for n in range(len(axes))]
+
         make_axes_unique(self._axes, len(axes), &unique_axes,
                 &not_axes, array_dimension, &unique_axes_length)
 
@@ -1129,6 +1967,18 @@ cdef class FFTW:
         self._axes = unique_axes
         self._not_axes = not_axes
 
+        if scheme[0] == 'r2r':
+            # Keep the kind that was given with the first occurrence of
+            # each (unique) axis.
+            self._r2r_kinds = <int *>malloc(
+                    unique_axes_length * sizeof(int))
+            if self._r2r_kinds == NULL:
+                raise MemoryError
+
+            for n in range(unique_axes_length):
+                self._r2r_kinds[n] = r2r_kinds[
+                        r2r_directions[given_axes.index(self._axes[n])]]
+
         total_N = 1
         for n in range(unique_axes_length):
             if self._input_shape[self._axes[n]] == 0:
@@ -1136,7 +1986,17 @@ cdef class FFTW:
                     'The input array should have no zero length'
                     'axes over which the FFT is to be taken')
 
-            if self._direction == FFTW_FORWARD:
+            if self._r2r_kinds != NULL:
+                if (self._r2r_kinds[n] == FFTW_REDFT00 and
+                        self._input_shape[self._axes[n]] < 2):
+                    raise ValueError('Invalid shapes: '
+                        'An FFTW_REDFT00 transform needs at least two '
+                        'points along its axis.')
+
+                total_N *= _r2r_logical_size(self._r2r_kinds[n],
+                        self._input_shape[self._axes[n]])
+
+            elif self._direction == FFTW_FORWARD:
                 total_N *= self._input_shape[self._axes[n]]
             else:
                 total_N *= self._output_shape[self._axes[n]]
@@ -1155,12 +2015,24 @@ cdef class FFTW:
                         'input array for the given array dtypes.')
         else:
             _validator = validators[functions['validator']]
-            if not _validator(input_array, output_array,
+            if _validator(input_array, output_array,
                     self._axes, self._not_axes, unique_axes_length):
+                pass
+
+            elif (scheme[0] == 'r2c' and
+                    output_array.shape == input_array.shape):
+                # The output holds the full complex DFT of the real input.
+                # The plan writes the first n//2 + 1 entries along the last
+                # axis and the rest are filled in by conjugate symmetry.
+                self._hermitian_fill = (
+                        hermitian_fills[functions['generic_precision']])
+            else:
                 raise ValueError('Invalid shapes: '
                         'The input array and output array are invalid '
                         'complementary shapes for their dtypes.')
 
+        self._axes_length = unique_axes_length
+
         self._rank = unique_axes_length
         self._howmany_rank = self._input_array.ndim - unique_axes_length
 
@@ -1175,8 +2047,22 @@ cdef class FFTW:
                         each_flag + '\' is not a valid planner flag.')
 
 
+        if 'FFTW_PRESERVE_INPUT' in flags:
+            if 'FFTW_DESTROY_INPUT' in flags:
+                raise ValueError('Invalid flags: '
+                        'FFTW_DESTROY_INPUT and FFTW_PRESERVE_INPUT cannot '
+                        'both be set.')
+
+            if scheme[0] in ('c2r', 'c2r_split') and self._rank > 1:
+                # FFTW has no input preserving algorithms for these, so
+                # the planner would only return NULL.
+                raise ValueError('Invalid flags: '
+                        'FFTW_PRESERVE_INPUT cannot be set for a '
+                        'complex-to-real transform over more than one axis.')
+
         if ('FFTW_DESTROY_INPUT' not in flags) and (
-                (scheme[0] != 'c2r') or not self._rank > 1):
+                (scheme[0] not in ('c2r', 'c2r_split')) or
+                not self._rank > 1):
             # The default in all possible cases is to preserve the input
             # This is not possible for r2c arrays with rank > 1
             self._flags |= FFTW_PRESERVE_INPUT
@@ -1195,41 +2081,22 @@ cdef class FFTW:
         # Find the strides for all the axes of both arrays in terms of the
         # number of items (as opposed to the number of bytes).
         self._input_strides = input_array.strides
-        self._input_item_strides = tuple([stride/input_array.itemsize
+        self._input_item_strides = tuple([stride//input_array.itemsize
             for stride in input_array.strides])
         self._output_strides = output_array.strides
-        self._output_item_strides = tuple([stride/output_array.itemsize
+        self._output_item_strides = tuple([stride//output_array.itemsize
             for stride in output_array.strides])
 
-        # Make sure that the arrays are not too big for fftw
-        # This is hard to test, so we cross our fingers and hope for the
-        # best (any suggestions, please get in touch).
-        cdef int i
-        for i in range(0, len(self._input_shape)):
-            if self._input_shape[i] >= <Py_ssize_t> limits.INT_MAX:
-                raise ValueError('Dimensions of the input array must be ' +
-                        'less than ', str(limits.INT_MAX))
-
-            if self._input_item_strides[i] >= <Py_ssize_t> limits.INT_MAX:
-                raise ValueError('Strides of the input array must be ' +
-                        'less than ', str(limits.INT_MAX))
-
-        for i in range(0, len(self._output_shape)):
-            if self._output_shape[i] >= <Py_ssize_t> limits.INT_MAX:
-                raise ValueError('Dimensions of the output array must be ' +
-                        'less than ', str(limits.INT_MAX))
-
-            if self._output_item_strides[i] >= <Py_ssize_t> limits.INT_MAX:
-                raise ValueError('Strides of the output array must be ' +
-                        'less than ', str(limits.INT_MAX))
-
         fft_shape_lookup = functions['fft_shape_lookup']
         if fft_shape_lookup == -1:
             fft_shape = self._input_shape
         else:
             fft_shape = fft_shape_lookup(input_array, output_array)
 
-        # Fill in the stride and shape information
+        # Fill in the stride and shape information. These are ptrdiff_t
+        # sized, as the 64-bit guru interface is used, so there is no
+        # limit on the sizes beyond those numpy imposes.
+        cdef int i
         input_strides_array = self._input_item_strides
         output_strides_array = self._output_item_strides
         for i in range(0, self._rank):
@@ -1262,19 +2129,59 @@ cdef class FFTW:
         cdef void *plan
         cdef fftw_generic_plan_guru fftw_planner = self._fftw_planner
         cdef int rank = self._rank
-        cdef fftw_iodim *dims = <fftw_iodim *>self._dims
+        cdef fftw_iodim64 *dims = <fftw_iodim64 *>self._dims
         cdef int howmany_rank = self._howmany_rank
-        cdef fftw_iodim *howmany_dims = <fftw_iodim *>self._howmany_dims
-        cdef void *_in = <void *>np.PyArray_DATA(self._input_array)
-        cdef void *_out = <void *>np.PyArray_DATA(self._output_array)
+        cdef fftw_iodim64 *howmany_dims = <fftw_iodim64 *>self._howmany_dims
+        self._split_swap = (scheme[0] == 'c2c_split' and
+                            self._direction == FFTW_BACKWARD)
+
+        # A split complex array is passed to the planner (and executor)
+        # as a pointer to the pointers to its two parts.
+        cdef void *input_pointers[2]
+        cdef void *output_pointers[2]
+        self._fill_pointers((self._get_input_array(),), False,
+                self._split_input, 1, input_pointers)
+        self._fill_pointers((self._get_output_array(),), False,
+                self._split_output, 1, output_pointers)
+
+        cdef void *_in = input_pointers[0]
+        cdef void *_out = output_pointers[0]
+        if self._split_input:
+            _in = <void *>input_pointers
+        if self._split_output:
+            _out = <void *>output_pointers
+
         cdef int sign = self._direction
+        cdef int *_directions = &sign
         cdef unsigned c_flags = self._flags
 
-        with plan_lock, nogil:
-            plan = fftw_planner(rank, dims, howmany_rank, howmany_dims,
-                                _in, _out, sign, c_flags)
+        if self._r2r_kinds != NULL:
+            _directions = self._r2r_kinds
+
+        cdef tuple hooks = _planner_hooks
+        if hooks:
+            event = self._planner_event(threads, planning_timelimit)
+            for hook in hooks:
+                hook.before_plan(event)
+
+        cdef double lock_start_time = pyfftw_perf_counter()
+        cdef double plan_start_time, plan_end_time
+        with plan_lock:
+            plan_start_time = pyfftw_perf_counter()
+            with nogil:
+                plan = fftw_planner(rank, dims, howmany_rank, howmany_dims,
+                                    _in, _out, _directions, c_flags)
+            plan_end_time = pyfftw_perf_counter()
         self._plan = plan
 
+        if hooks:
+            event = dict(event, start_time=lock_start_time,
+                    lock_wait_time=plan_start_time - lock_start_time,
+                    planning_time=plan_end_time - plan_start_time,
+                    succeeded=plan != NULL)
+            for hook in hooks:
+                hook.after_plan(event)
+
         if self._plan == NULL:
             if 'FFTW_WISDOM_ONLY' in flags:
                 raise RuntimeError('No FFTW wisdom is known for this plan.')
@@ -1282,6 +2189,24 @@ cdef class FFTW:
                 raise RuntimeError('The data has an uncaught error that led '+
                     'to the planner returning NULL. This is a bug.')
 
+    def _planner_event(self, threads, planning_timelimit):
+        '''Return the description of the planning call that is passed to
+        the planner hooks (see :func:`~pyfftw.add_planner_hook`).
+        '''
+        return {'input_shape': self._input_shape,
+                'output_shape': self._output_shape,
+                'input_strides': self._input_strides,
+                'output_strides': self._output_strides,
+                'input_dtype': self._input_dtype,
+                'output_dtype': self._output_dtype,
+                'axes': self._get_axes(),
+                'direction': self._get_direction(),
+                'flags': self._get_flags_used(),
+                'threads': threads,
+                'planning_timelimit': planning_timelimit,
+                'thread_id': threading.get_ident(),
+                'start_time': pyfftw_perf_counter()}
+
     def __init__(self, input_array, output_array, axes=(-1,),
             direction='FFTW_FORWARD', flags=('FFTW_MEASURE',),
             int threads=1, planning_timelimit=None,
@@ -1293,6 +2218,9 @@ cdef class FFTW:
           The contents of these arrays will be destroyed by the planning
           process during initialisation. Information on supported
           dtypes for the arrays is :ref:`given below <scheme_table>`.
+          A complex side of the transform can instead be given as a
+          ``(real, imag)`` pair of real arrays, as described
+          :ref:`below <FFTW_split_arrays>`.
 
         * ``axes`` describes along which axes the DFT should be taken.
           This should be a valid list of axes. Repeated axes are
@@ -1316,6 +2244,20 @@ cdef class FFTW:
           the :ref:`table below <scheme_table>` if a Real scheme
           is used, otherwise a ``ValueError`` is raised.
 
+          For the Real-to-real schemes, ``direction`` instead gives the
+          kind of transform to take along each axis. It should be either
+          a list of strings of the same length as ``axes``, or a single
+          string that is then used for every axis. The valid kinds are
+          ``'FFTW_REDFT00'``, ``'FFTW_REDFT10'``, ``'FFTW_REDFT01'`` and
+          ``'FFTW_REDFT11'`` (the DCT types I to IV),
+          ``'FFTW_RODFT00'``, ``'FFTW_RODFT10'``, ``'FFTW_RODFT01'`` and
+          ``'FFTW_RODFT11'`` (the DST types I to IV), ``'FFTW_R2HC'``
+          and ``'FFTW_HC2R'`` (the forward and backward half-complex
+          transforms) and ``'FFTW_DHT'`` (the discrete Hartley
+          transform). These are described in the FFTW documentation on
+          `real-to-real transform kinds
+          <http://www.fftw.org/fftw3_doc/Real_002dto_002dReal-Transform-Kinds.html>`_.
+
         .. _FFTW_flags:
 
         * ``flags`` is a list of strings and is a subset of the
@@ -1341,6 +2283,17 @@ cdef class FFTW:
             possible to preserve the input, making this flag implicit
             in that case. A little more on this is given
             :ref:`below<scheme_table>`.
+          * ``'FFTW_PRESERVE_INPUT'`` is supported.
+            This explicitly asks for the input array to be left untouched
+            by the transform. It is already the default wherever FFTW
+            allows it, but, unlike the default, an error is raised if the
+            input cannot be preserved (i.e. for a backwards real transform
+            over more than one axis) rather than the input being silently
+            destroyed. It cannot be combined with
+            ``'FFTW_DESTROY_INPUT'``.
+          * ``'FFTW_CONSERVE_MEMORY'`` is supported.
+            This tells FFTW to favour algorithms that use less working
+            memory, even when they are slower.
           * ``'FFTW_WISDOM_ONLY'`` is supported.
             This tells FFTW to raise an error if no plan for this transform
             and data type is already in the wisdom. It thus provides a method
@@ -1409,6 +2362,12 @@ cdef class FFTW:
         +----------------+-----------------------+------------------------+-----------+
         | Real\ :sup:`1` | ``clongdouble``       | ``longdouble``         | Backwards |
         +----------------+-----------------------+------------------------+-----------+
+        | Real-to-real   | ``float32``           | ``float32``            | Per axis  |
+        +----------------+-----------------------+------------------------+-----------+
+        | Real-to-real   | ``float64``           | ``float64``            | Per axis  |
+        +----------------+-----------------------+------------------------+-----------+
+        | Real-to-real   | ``longdouble``        | ``longdouble``         | Per axis  |
+        +----------------+-----------------------+------------------------+-----------+
 
         \ :sup:`1`  Note that the Backwards Real transform for the case
         in which the dimensionality of the transform is greater than 1
@@ -1425,15 +2384,44 @@ cdef class FFTW:
         or ``complex192``, and ``longdouble`` to ``float128`` or
         ``float96``, dependent on platform.
 
+        The Real-to-real transforms are always unnormalised, so
+        ``normalise_idft`` has no effect on them and ``ortho`` cannot be
+        used. :attr:`~pyfftw.FFTW.N` gives the product of the logical
+        DFT sizes along the transformed axes (e.g. ``2*(n-1)`` for
+        ``'FFTW_REDFT00'`` and ``2*n`` for ``'FFTW_REDFT10'``), so a
+        transform followed by its inverse scales the input by ``N``.
+
+        .. _FFTW_split_arrays:
+
+        Any complex array in the above table can be replaced by a
+        *split complex* array: a tuple ``(real, imag)`` of two real arrays
+        of the corresponding real dtype that hold the real and imaginary
+        parts. The two parts must have the same shape and strides, and
+        both must be aligned for SIMD to be used. Such a transform is
+        planned with the FFTW `split array interface
+        <http://www.fftw.org/fftw3_doc/Guru-Complex-DFTs.html>`_, which
+        avoids interleaving data that is naturally held in two arrays.
+        Both sides of a Complex transform must then be split. Wherever
+        an array is taken or returned (e.g. :attr:`input_array`,
+        :meth:`update_arrays` and :meth:`__call__`), a split side is a
+        ``(real, imag)`` tuple. The shapes below apply to each part.
+
         The relative shapes of the arrays should be as follows:
 
-        * For a Complex transform, ``output_array.shape == input_array.shape``
+        * For a Complex or a Real-to-real transform,
+          ``output_array.shape == input_array.shape``
         * For a Real transform in the Forwards direction, both the following
           should be true:
 
           * ``output_array.shape[axes][-1] == input_array.shape[axes][-1]//2 + 1``
           * All the other axes should be equal in length.
 
+          Alternatively, ``output_array.shape == input_array.shape``, in
+          which case the output is the full complex DFT of the real input
+          (as a Complex transform of the same data would give). Only the
+          first half along the last axis is computed by FFTW; the rest is
+          filled in from the conjugate symmetry of the DFT.
+
         * For a Real transform in the Backwards direction, both the following
           should be true:
 
@@ -1501,6 +2489,9 @@ cdef class FFTW:
         if not self._not_axes == NULL:
             free(self._not_axes)
 
+        if not self._r2r_kinds == NULL:
+            free(self._r2r_kinds)
+
         if not self._plan == NULL:
             self._fftw_destroy(self._plan)
 
@@ -1578,67 +2569,166 @@ cdef class FFTW:
         internally and will be overwritten again on subsequent calls. If you
         need the data to persist longer than a subsequent call, you should
         copy the returned array.
+
+        If :meth:`~pyfftw.FFTW.enable_stats` has been called, the time
+        taken by each stage of the call and the reason for any copy of the
+        input array are recorded in :attr:`~pyfftw.FFTW.stats`.
         '''
 
-        if ortho is None:
-            ortho = self._ortho
-        if normalise_idft is None:
-            normalise_idft = self._normalise_idft
+        cdef double scaling = self._get_scaling(normalise_idft, ortho)
+        cdef bint stats_enabled = self._stats_enabled
+        cdef double start_time = 0
+        cdef int copy_reason = NO_COPY
 
-        if ortho and normalise_idft:
-            raise ValueError('Invalid options: ortho and normalise_idft cannot'
-                             ' both be True.')
+        if stats_enabled:
+            self._call_count += 1
 
         if input_array is not None or output_array is not None:
 
             if input_array is None:
-                input_array = self._input_array
+                input_array = self._get_input_array()
 
             if output_array is None:
-                output_array = self._output_array
+                output_array = self._get_output_array()
 
-            if not isinstance(input_array, np.ndarray):
-                copy_needed = True
-            elif (not input_array.dtype == self._input_dtype):
-                copy_needed = True
-            elif (not input_array.strides == self._input_strides):
-                copy_needed = True
-            elif not (<intptr_t>np.PyArray_DATA(input_array)
-                    % self.input_alignment == 0):
-                copy_needed = True
+            if self._split_input:
+                if not _is_split_pair(input_array):
+                    raise ValueError('Invalid input array: '
+                            'The new input array should be a pair of the '
+                            'real and imaginary parts.')
+
+                input_planes = tuple(input_array)
+                internal_planes = (self._input_array,
+                                   self._input_imag_array)
             else:
-                copy_needed = False
+                input_planes = (input_array,)
+                internal_planes = (self._input_array,)
+
+            for input_plane in input_planes:
+                if not isinstance(input_plane, np.ndarray):
+                    copy_reason = COPY_NOT_NDARRAY
+                elif (not input_plane.dtype == self._input_dtype):
+                    copy_reason = COPY_DTYPE
+                elif (not input_plane.strides == self._input_strides):
+                    copy_reason = COPY_STRIDES
+                elif not (<intptr_t>np.PyArray_DATA(input_plane)
+                        % self.input_alignment == 0):
+                    copy_reason = COPY_ALIGNMENT
+
+                if copy_reason != NO_COPY:
+                    break
+
+            if copy_reason != NO_COPY:
+
+                if stats_enabled:
+                    self._copy_reason_counts[copy_reason] += 1
+                    start_time = pyfftw_perf_counter()
 
-            if copy_needed:
+                for internal_plane, input_plane in zip(internal_planes,
+                                                       input_planes):
 
-                if not isinstance(input_array, np.ndarray):
-                    input_array = np.asanyarray(input_array)
+                    if not isinstance(input_plane, np.ndarray):
+                        input_plane = np.asanyarray(input_plane)
 
-                if not input_array.shape == self._input_shape:
-                    raise ValueError('Invalid input shape: '
-                            'The new input array should be the same shape '
-                            'as the input array used to instantiate the '
-                            'object.')
+                    if not input_plane.shape == self._input_shape:
+                        raise ValueError('Invalid input shape: '
+                                'The new input array should be the same '
+                                'shape as the input array used to '
+                                'instantiate the object.')
 
-                self._input_array[:] = input_array
+                    internal_plane[:] = input_plane
+
+                if stats_enabled:
+                    self._record_stage(CALL_STAGE_COPY, start_time)
 
                 if output_array is not None:
                     # No point wasting time if no update is necessary
                     # (which the copy above may have avoided)
-                    input_array = self._input_array
+                    input_array = self._get_input_array()
+
+                    if stats_enabled:
+                        start_time = pyfftw_perf_counter()
+
                     self.update_arrays(input_array, output_array)
 
+                    if stats_enabled:
+                        self._record_stage(CALL_STAGE_UPDATE, start_time)
+
             else:
+                if stats_enabled:
+                    start_time = pyfftw_perf_counter()
+
                 self.update_arrays(input_array, output_array)
 
-        self.execute()
+                if stats_enabled:
+                    self._record_stage(CALL_STAGE_UPDATE, start_time)
+
+        if stats_enabled:
+            # The normalisation is timed separately from the execution
+            start_time = pyfftw_perf_counter()
+            self._execute(self._get_input_array(),
+                          self._get_output_array(), 1.0)
+            self._record_stage(CALL_STAGE_EXECUTE, start_time)
+
+            if scaling != 1.0:
+                start_time = pyfftw_perf_counter()
+                self._scale_output(self._get_output_array(), scaling)
+                self._record_stage(CALL_STAGE_NORMALISE, start_time)
+
+        else:
+            self._execute(self._get_input_array(), self._get_output_array(),
+                          scaling)
+
+        return self._get_output_array()
+
+    cdef void _record_stage(self, int stage, double start_time):
+        '''Record a call of the ``__call__`` stage ``stage``, which
+        started at ``start_time``, in the stats.
+        '''
+        cdef double stage_time = pyfftw_perf_counter() - start_time
+
+        self._stage_counts[stage] += 1
+        self._stage_total_times[stage] += stage_time
+        self._stage_last_times[stage] = stage_time
+
+    def _record_slicer_copy(self, double copy_time):
+        '''Record in the stats, if they are enabled, a copy of the input
+        array that took ``copy_time`` seconds and was made before
+        ``__call__``, such as through the slicers of
+        :class:`pyfftw.builders._utils._FFTWWrapper`.
+        '''
+        if not self._stats_enabled:
+            return
+
+        self._copy_reason_counts[COPY_SLICER] += 1
+        self._stage_counts[CALL_STAGE_COPY] += 1
+        self._stage_total_times[CALL_STAGE_COPY] += copy_time
+        self._stage_last_times[CALL_STAGE_COPY] = copy_time
+
+    cdef double _get_scaling(self, normalise_idft, ortho) except -1:
+        '''Work out the factor the output should be scaled by for the given
+        ``normalise_idft`` and ``ortho`` call arguments, where ``None``
+        means the value the object was created with.
+        '''
+        if ortho is None:
+            ortho = self._ortho
+        if normalise_idft is None:
+            normalise_idft = self._normalise_idft
+
+        if ortho and normalise_idft:
+            raise ValueError('Invalid options: ortho and normalise_idft cannot'
+                             ' both be True.')
+
+        if ortho and self._r2r_kinds != NULL:
+            raise ValueError('Invalid options: ortho is not supported for '
+                             'real-to-real transforms.')
 
         if ortho == True:
-            self._output_array *= self._sqrt_normalisation_scaling
+            return self._sqrt_normalisation_scaling
         elif self._direction == FFTW_BACKWARD and normalise_idft:
-            self._output_array *= self._normalisation_scaling
-
-        return self._output_array
+            return self._normalisation_scaling
+        else:
+            return 1.0
 
     cpdef update_arrays(self,
             new_input_array, new_output_array):
@@ -1663,75 +2753,127 @@ cdef class FFTW:
         be raised and the data will *not* be updated (though the
         object will still be in a sane state).
         '''
-        if not isinstance(new_input_array, np.ndarray):
-            raise ValueError('Invalid input array: '
-                    'The new input array needs to be an instance '
-                    'of numpy.ndarray')
-
-        if not isinstance(new_output_array, np.ndarray):
-            raise ValueError('Invalid output array '
-                    'The new output array needs to be an instance '
-                    'of numpy.ndarray')
-
-        if not (<intptr_t>np.PyArray_DATA(new_input_array) %
-                self.input_alignment == 0):
-            raise ValueError('Invalid input alignment: '
-                    'The original arrays were %d-byte aligned. It is '
-                    'necessary that the update input array is similarly '
-                    'aligned.' % self.input_alignment)
-
-        if not (<intptr_t>np.PyArray_DATA(new_output_array) %
-                self.output_alignment == 0):
-            raise ValueError('Invalid output alignment: '
-                    'The original arrays were %d-byte aligned. It is '
-                    'necessary that the update output array is similarly '
-                    'aligned.' % self.output_alignment)
-
-        if not new_input_array.dtype == self._input_dtype:
-            raise ValueError('Invalid input dtype: '
-                    'The new input array is not of the same '
-                    'dtype as was originally planned for.')
-
-        if not new_output_array.dtype == self._output_dtype:
-            raise ValueError('Invalid output dtype: '
-                    'The new output array is not of the same '
-                    'dtype as was originally planned for.')
-
-        new_input_shape = new_input_array.shape
-        new_output_shape = new_output_array.shape
-
-        new_input_strides = new_input_array.strides
-        new_output_strides = new_output_array.strides
-
-        if not new_input_shape == self._input_shape:
-            raise ValueError('Invalid input shape: '
-                    'The new input array should be the same shape as '
-                    'the input array used to instantiate the object.')
-
-        if not new_output_shape == self._output_shape:
-            raise ValueError('Invalid output shape: '
-                    'The new output array should be the same shape as '
-                    'the output array used to instantiate the object.')
-
-        if not new_input_strides == self._input_strides:
-            raise ValueError('Invalid input striding: '
-                    'The strides should be identical for the new '
-                    'input array as for the old.')
-
-        if not new_output_strides == self._output_strides:
-            raise ValueError('Invalid output striding: '
-                    'The strides should be identical for the new '
-                    'output array as for the old.')
+        self._check_arrays(new_input_array, new_output_array)
 
         self._update_arrays(new_input_array, new_output_array)
 
+    cdef int _check_arrays(self,
+            new_input_array, new_output_array) except -1:
+        '''Check that a pair of arrays matches the planned geometry
+        (dtypes, shapes, strides and alignment), raising a ``ValueError``
+        otherwise. The shapes and strides are compared in C against those
+        of the current internal arrays, which always match the plan. Both
+        parts of a split complex array are checked.
+        '''
+        if self._split_input:
+            if not _is_split_pair(new_input_array):
+                raise ValueError('Invalid input array: '
+                        'The new input array should be a pair of the '
+                        'real and imaginary parts.')
+            input_planes = tuple(new_input_array)
+        else:
+            input_planes = (new_input_array,)
+
+        if self._split_output:
+            if not _is_split_pair(new_output_array):
+                raise ValueError('Invalid output array: '
+                        'The new output array should be a pair of the '
+                        'real and imaginary parts.')
+            output_planes = tuple(new_output_array)
+        else:
+            output_planes = (new_output_array,)
+
+        for new_input_plane in input_planes:
+            if not isinstance(new_input_plane, np.ndarray):
+                raise ValueError('Invalid input array: '
+                        'The new input array needs to be an instance '
+                        'of numpy.ndarray')
+
+        for new_output_plane in output_planes:
+            if not isinstance(new_output_plane, np.ndarray):
+                raise ValueError('Invalid output array '
+                        'The new output array needs to be an instance '
+                        'of numpy.ndarray')
+
+        for new_input_plane in input_planes:
+            if not (<intptr_t>np.PyArray_DATA(new_input_plane) %
+                    self.input_alignment == 0):
+                raise ValueError('Invalid input alignment: '
+                        'The original arrays were %d-byte aligned. It is '
+                        'necessary that the update input array is '
+                        'similarly aligned.' % self.input_alignment)
+
+        for new_output_plane in output_planes:
+            if not (<intptr_t>np.PyArray_DATA(new_output_plane) %
+                    self.output_alignment == 0):
+                raise ValueError('Invalid output alignment: '
+                        'The original arrays were %d-byte aligned. It is '
+                        'necessary that the update output array is '
+                        'similarly aligned.' % self.output_alignment)
+
+        for new_input_plane in input_planes:
+            if not new_input_plane.dtype == self._input_dtype:
+                raise ValueError('Invalid input dtype: '
+                        'The new input array is not of the same '
+                        'dtype as was originally planned for.')
+
+        for new_output_plane in output_planes:
+            if not new_output_plane.dtype == self._output_dtype:
+                raise ValueError('Invalid output dtype: '
+                        'The new output array is not of the same '
+                        'dtype as was originally planned for.')
+
+        cdef np.ndarray planned_input = self._input_array
+        cdef np.ndarray planned_output = self._output_array
+        cdef int input_ndim = np.PyArray_NDIM(planned_input)
+        cdef int output_ndim = np.PyArray_NDIM(planned_output)
+
+        for new_input_plane in input_planes:
+            if not (np.PyArray_NDIM(new_input_plane) == input_ndim and
+                    _equal_intp_arrays(np.PyArray_DIMS(new_input_plane),
+                        np.PyArray_DIMS(planned_input), input_ndim)):
+                raise ValueError('Invalid input shape: '
+                        'The new input array should be the same shape as '
+                        'the input array used to instantiate the object.')
+
+        for new_output_plane in output_planes:
+            if not (np.PyArray_NDIM(new_output_plane) == output_ndim and
+                    _equal_intp_arrays(np.PyArray_DIMS(new_output_plane),
+                        np.PyArray_DIMS(planned_output), output_ndim)):
+                raise ValueError('Invalid output shape: '
+                        'The new output array should be the same shape as '
+                        'the output array used to instantiate the object.')
+
+        for new_input_plane in input_planes:
+            if not _equal_intp_arrays(np.PyArray_STRIDES(new_input_plane),
+                    np.PyArray_STRIDES(planned_input), input_ndim):
+                raise ValueError('Invalid input striding: '
+                        'The strides should be identical for the new '
+                        'input array as for the old.')
+
+        for new_output_plane in output_planes:
+            if not _equal_intp_arrays(np.PyArray_STRIDES(new_output_plane),
+                    np.PyArray_STRIDES(planned_output), output_ndim):
+                raise ValueError('Invalid output striding: '
+                        'The strides should be identical for the new '
+                        'output array as for the old.')
+
+        return 0
+
     cdef _update_arrays(self,
-            np.ndarray new_input_array, np.ndarray new_output_array):
+            new_input_array, new_output_array):
         ''' A C interface to the update_arrays method that does not
         perform any checks on strides being correct and so on.
         '''
-        self._input_array = new_input_array
-        self._output_array = new_output_array
+        if self._split_input:
+            self._input_array, self._input_imag_array = new_input_array
+        else:
+            self._input_array = new_input_array
+
+        if self._split_output:
+            self._output_array, self._output_imag_array = new_output_array
+        else:
+            self._output_array = new_output_array
 
     def get_input_array(self):
         '''get_input_array()
@@ -1746,7 +2888,7 @@ cdef class FFTW:
                 'Consider using the input_array property instead.',
                 DeprecationWarning)
 
-        return self._input_array
+        return self._get_input_array()
 
     def get_output_array(self):
         '''get_output_array()
@@ -1761,7 +2903,7 @@ cdef class FFTW:
                 'Consider using the output_array property instead.',
                 DeprecationWarning)
 
-        return self._output_array
+        return self._get_output_array()
 
     cpdef execute(self):
         '''execute()
@@ -1771,42 +2913,598 @@ cdef class FFTW:
         and putting the result in the output array (i.e.
         :attr:`FFTW.output_array`).
         '''
-        cdef void *input_pointer = (
-                <void *>np.PyArray_DATA(self._input_array))
-        cdef void *output_pointer = (
-                <void *>np.PyArray_DATA(self._output_array))
+        self._execute(self._get_input_array(), self._get_output_array(), 1.0)
+
+    def execute_into(self, input_array, output_array,
+            normalise_idft=None, ortho=None):
+        '''execute_into(input_array, output_array, normalise_idft=None,
+                        ortho=None)
+
+        Execute the planned operation on ``input_array``, putting the
+        result in ``output_array``, and return ``output_array``.
+
+        Unlike :meth:`~pyfftw.FFTW.__call__` and
+        :meth:`~pyfftw.FFTW.update_arrays`, the arrays are not stored on
+        the object, which is left unchanged. Since FFTW plans can be
+        safely executed concurrently on different arrays, a single
+        :class:`FFTW` object can then be shared between many threads,
+        each passing its own arrays.
+
+        The arrays must satisfy the same conditions as for
+        :meth:`~pyfftw.FFTW.update_arrays` (the same dtypes, shapes,
+        strides and alignment as the planned arrays), else a
+        ``ValueError`` is raised. No copy is ever made, so the input
+        array may be destroyed if the plan does so.
+
+        ``normalise_idft`` and ``ortho`` are as for
+        :meth:`~pyfftw.FFTW.__call__`, defaulting to the values the object
+        was created with.
+        '''
+        cdef double scaling = self._get_scaling(normalise_idft, ortho)
+
+        self._check_arrays(input_array, output_array)
+        self._execute(input_array, output_array, scaling)
+
+        return output_array
+
+    def _execute_to_output(self, input_array, output_array=None,
+            normalise_idft=None, ortho=None):
+        '''_execute_to_output(input_array, output_array=None,
+                              normalise_idft=None, ortho=None)
+
+        Execute the planned operation on ``input_array``, putting the
+        result in ``output_array``, or in a newly allocated array if
+        ``output_array`` is ``None``, and return it. This is the call made
+        by :mod:`pyfftw.interfaces` on an object taken from the cache, so
+        the checks are done in C.
+
+        ``input_array`` is used as-is if it matches the plan, otherwise it
+        is coerced by copying it into the internal input array, as for
+        :meth:`~pyfftw.FFTW.__call__`. ``output_array`` is never copied:
+        it must satisfy the same conditions as for
+        :meth:`~pyfftw.FFTW.update_arrays`, else a ``ValueError`` is
+        raised. The internal arrays are not replaced. Split complex
+        objects are not supported.
+        '''
+        cdef double scaling = self._get_scaling(normalise_idft, ortho)
+
+        if self._split_input or self._split_output:
+            raise ValueError('Invalid scheme: '
+                    'The output array of a split complex object cannot be '
+                    'given or allocated this way.')
+
+        cdef np.ndarray planned_input = self._input_array
+        cdef np.ndarray planned_output = self._output_array
+        cdef int input_ndim = np.PyArray_NDIM(planned_input)
+        cdef int output_ndim = np.PyArray_NDIM(planned_output)
+        cdef np.ndarray new_input
+        cdef np.ndarray new_output
+
+        if (isinstance(input_array, np.ndarray) and
+                np.PyArray_NDIM(input_array) == input_ndim and
+                _equal_intp_arrays(np.PyArray_DIMS(input_array),
+                    np.PyArray_DIMS(planned_input), input_ndim) and
+                _equal_intp_arrays(np.PyArray_STRIDES(input_array),
+                    np.PyArray_STRIDES(planned_input), input_ndim) and
+                <intptr_t>np.PyArray_DATA(input_array) %
+                    self._input_array_alignment == 0 and
+                input_array.dtype == self._input_dtype):
+
+            new_input = input_array
+
+        else:
+            if not isinstance(input_array, np.ndarray):
+                input_array = np.asanyarray(input_array)
+
+            if not input_array.shape == self._input_shape:
+                raise ValueError('Invalid input shape: '
+                        'The new input array should be the same '
+                        'shape as the input array used to '
+                        'instantiate the object.')
+
+            planned_input[...] = input_array
+            new_input = planned_input
+
+        if output_array is None:
+            new_output = _empty_aligned_c(self._output_shape,
+                    self._output_dtype, np.PyArray_ITEMSIZE(planned_output),
+                    output_ndim, np.PyArray_DIMS(planned_output),
+                    self._output_array_alignment)
+
+            if not _equal_intp_arrays(np.PyArray_STRIDES(new_output),
+                    np.PyArray_STRIDES(planned_output), output_ndim):
+                # Raises the appropriate error
+                self._check_arrays(new_input, new_output)
+
+        else:
+            self._check_arrays(new_input, output_array)
+            new_output = output_array
+
+        self._execute(new_input, new_output, scaling)
+
+        return new_output
+
+    def execute_batch(self, input_arrays, output_arrays,
+            normalise_idft=None, ortho=None, timings=False):
+        '''execute_batch(input_arrays, output_arrays, normalise_idft=None,
+                         ortho=None, timings=False)
+
+        Execute the planned operation on every pair of arrays in
+        ``input_arrays`` and ``output_arrays``, all under a single release
+        of the GIL, and return ``output_arrays``.
+
+        Each of ``input_arrays`` and ``output_arrays`` is either a
+        sequence of arrays, or a single stacked array whose first axis
+        indexes the batch (so ``input_arrays[n]`` is the ``n``-th input).
+        For a split complex array, the items of a sequence are each a pair
+        of real and imaginary arrays, and a stacked array is a pair of
+        stacked real and imaginary arrays. Every item must satisfy the
+        same conditions as the arrays passed to
+        :meth:`~pyfftw.FFTW.execute_into`, else a ``ValueError`` is
+        raised before anything is executed. A stacked array is only
+        checked once. As with :meth:`~pyfftw.FFTW.execute_into`, the
+        object itself is left unchanged and no copies are made.
+
+        ``normalise_idft`` and ``ortho`` are as for
+        :meth:`~pyfftw.FFTW.__call__`.
+
+        If ``timings`` is ``True``, a tuple of ``output_arrays`` and a
+        double precision array of the wall time in seconds taken by each
+        transform is returned instead.
+        '''
+        cdef double scaling = self._get_scaling(normalise_idft, ortho)
+
+        cdef bint stacked_input = _is_stacked(input_arrays,
+                self._split_input, np.PyArray_NDIM(self._input_array))
+        cdef bint stacked_output = _is_stacked(output_arrays,
+                self._split_output, np.PyArray_NDIM(self._output_array))
+
+        cdef Py_ssize_t n, batch_length
+        if stacked_input and self._split_input:
+            batch_length = len(input_arrays[0])
+        else:
+            batch_length = len(input_arrays)
+
+        if stacked_output and self._split_output:
+            output_length = len(output_arrays[0])
+        else:
+            output_length = len(output_arrays)
+
+        if not output_length == batch_length:
+            raise ValueError('Invalid batch: '
+                    'The input and output batches should be the same '
+                    'length.')
+
+        if stacked_input:
+            for each_array in (input_arrays if self._split_input
+                               else (input_arrays,)):
+                if not (np.PyArray_STRIDES(each_array)[0] %
+                        self.input_alignment == 0):
+                    raise ValueError('Invalid input alignment: '
+                            'The original arrays were %d-byte aligned. It '
+                            'is necessary that every stacked input array '
+                            'is similarly aligned.' % self.input_alignment)
+
+        if stacked_output:
+            for each_array in (output_arrays if self._split_output
+                               else (output_arrays,)):
+                if not (np.PyArray_STRIDES(each_array)[0] %
+                        self.output_alignment == 0):
+                    raise ValueError('Invalid output alignment: '
+                            'The original arrays were %d-byte aligned. It '
+                            'is necessary that every stacked output array '
+                            'is similarly aligned.' % self.output_alignment)
+
+        cdef np.ndarray batch_timings = np.zeros(batch_length, np.float64)
+
+        if batch_length == 0:
+            if timings:
+                return output_arrays, batch_timings
+            return output_arrays
+
+        # The stacked arrays all share the geometry of their first item
+        # so only need checking once.
+        cdef Py_ssize_t n_checks = batch_length
+        if stacked_input and stacked_output:
+            n_checks = 1
+
+        for n in range(n_checks):
+            self._check_arrays(
+                    _batch_item(input_arrays, stacked_input,
+                                self._split_input, n),
+                    _batch_item(output_arrays, stacked_output,
+                                self._split_output, n))
+
+        # Each item has two pointers if split complex, else one
+        cdef void **input_pointers = <void **>malloc(
+                2 * batch_length * sizeof(void *))
+        cdef void **output_pointers = <void **>malloc(
+                2 * batch_length * sizeof(void *))
+
+        try:
+            if input_pointers == NULL or output_pointers == NULL:
+                raise MemoryError
+
+            self._fill_pointers(input_arrays, stacked_input,
+                    self._split_input, batch_length, input_pointers)
+            self._fill_pointers(output_arrays, stacked_output,
+                    self._split_output, batch_length, output_pointers)
+
+            self._execute_pointers(input_pointers, output_pointers,
+                    batch_length, scaling,
+                    <double *>np.PyArray_DATA(batch_timings)
+                    if timings else NULL)
+        finally:
+            free(input_pointers)
+            free(output_pointers)
+
+        if timings:
+            return output_arrays, batch_timings
+
+        return output_arrays
+
+    def sprint_plan(self):
+        '''sprint_plan()
+
+        Return the human readable description of the plan that FFTW
+        chose, as printed by ``fftw_print_plan()``.
+
+        This shows the algorithms and codelets that are used, so a
+        length that is executed with a slow ``dft-generic``, ``rader`` or
+        ``bluestein`` step can be spotted and padded instead.
+        '''
+        cdef FILE *plan_file = tmpfile()
+        cdef long length
+        cdef bytes plan
+
+        if plan_file == NULL:
+            raise OSError('Unable to create a temporary file to print the '
+                          'plan into.')
+
+        try:
+            self._fprint_plan(self._plan, plan_file)
+            fflush(plan_file)
+            length = ftell(plan_file)
+            rewind(plan_file)
+
+            plan = b'\0' * length
+            if fread(<char *>plan, 1, length, plan_file) != <size_t>length:
+                raise OSError('Unable to read back the printed plan.')
+        finally:
+            fclose(plan_file)
+
+        return plan.decode('ascii')
+
+    def enable_stats(self, enabled=True):
+        '''enable_stats(enabled=True)
+
+        Start recording the statistics of the calls to the instance that
+        are returned by :attr:`~pyfftw.FFTW.stats`, clearing any that were
+        recorded before, or stop recording them if ``enabled`` is
+        ``False``.
+
+        This is off by default, as the timing adds a small overhead to
+        every call.
+        '''
+        cdef int n
+
+        self._stats_enabled = enabled
+        self._call_count = 0
+
+        for n in range(CALL_STAGES):
+            self._stage_counts[n] = 0
+            self._stage_total_times[n] = 0
+            self._stage_last_times[n] = 0
+
+        for n in range(COPY_REASONS):
+            self._copy_reason_counts[n] = 0
+
+    def measure_gflops(self, repeats=10):
+        '''measure_gflops(repeats=10)
+
+        Execute the plan ``repeats`` times on random data and return the
+        rate it achieved in GFLOP/s, from the fastest of the execution
+        times (as returned by :meth:`~pyfftw.FFTW.execute_batch`) and the
+        operations that are counted in :attr:`~pyfftw.FFTW.flops` (a
+        fused multiply-add counting as two).
+
+        The plan is executed on new arrays laid out like the internal
+        arrays, which are left unchanged. An in-place plan can only be
+        executed in place though, so for one the internal input array is
+        filled with the random data and the output array is overwritten.
+        '''
+        if repeats < 1:
+            raise ValueError('Invalid repeats: '
+                    'At least one execution is needed.')
+
+        # Imported here as the builders need this module to be loaded
+        from .builders._utils import _empty_like_layout
+
+        add, mul, fma = self._get_flops()
+
+        input_array = self._get_input_array()
+        output_array = self._get_output_array()
+
+        input_parts = input_array if self._split_input else (input_array,)
+        output_parts = (
+                output_array if self._split_output else (output_array,))
+
+        in_place = any(np.may_share_memory(input_part, output_part)
+                       for input_part in input_parts
+                       for output_part in output_parts)
+
+        if not in_place:
+            input_parts = tuple(_empty_like_layout(input_part)
+                                for input_part in input_parts)
+            output_parts = tuple(_empty_like_layout(output_part)
+                                 for output_part in output_parts)
+
+        # Finite data, as uninitialised memory can hold values (such as
+        # denormals or NaNs) that are much slower to transform
+        for input_part in input_parts:
+            input_part[...] = np.random.standard_normal(input_part.shape)
+
+        if self._split_input:
+            input_array = input_parts
+        else:
+            input_array = input_parts[0]
+
+        if self._split_output:
+            output_array = output_parts
+        else:
+            output_array = output_parts[0]
+
+        output_arrays, timings = self.execute_batch(
+                [input_array] * repeats, [output_array] * repeats,
+                normalise_idft=False, ortho=False, timings=True)
+
+        best_time = timings.min()
+        if best_time <= 0:
+            return float('inf')
+
+        return (add + mul + 2 * fma) / best_time / 1e9
+
+    cdef int _fill_pointers(self, arrays, bint stacked, bint split,
+            Py_ssize_t batch_length, void **pointers) except -1:
+        '''Fill ``pointers`` with the data pointers of the
+        ``batch_length`` items of ``arrays``, which is a sequence of
+        arrays or a stacked array as for ``execute_batch``. A split
+        complex item takes two consecutive pointers, ordered as FFTW
+        should be given them.
+        '''
+        cdef Py_ssize_t n, step = 1
+        cdef int plane
+        cdef void *tmp
+
+        if split:
+            step = 2
+
+        for n in range(batch_length):
+            if stacked:
+                planes = arrays if split else (arrays,)
+                for plane in range(step):
+                    pointers[n * step + plane] = (
+                            <char *>np.PyArray_DATA(planes[plane]) +
+                            n * np.PyArray_STRIDES(planes[plane])[0])
+            else:
+                planes = arrays[n] if split else (arrays[n],)
+                for plane in range(step):
+                    pointers[n * step + plane] = (
+                            np.PyArray_DATA(planes[plane]))
+
+            if split and self._split_swap:
+                tmp = pointers[2 * n]
+                pointers[2 * n] = pointers[2 * n + 1]
+                pointers[2 * n + 1] = tmp
+
+        return 0
+
+    cdef int _execute(self, input_array, output_array,
+            double scaling) except -1:
+        '''Execute the planned operation on the given arrays (a pair of
+        arrays for a split complex array) and then scale the output by
+        ``scaling``, all without holding the GIL. A ``scaling`` of ``1.0``
+        leaves the output unscaled. The arrays are assumed to match the
+        plan.
+        '''
+        cdef void *input_pointers[2]
+        cdef void *output_pointers[2]
+
+        self._fill_pointers((input_array,), False, self._split_input, 1,
+                            input_pointers)
+        self._fill_pointers((output_array,), False, self._split_output, 1,
+                            output_pointers)
+
+        self._execute_pointers(input_pointers, output_pointers, 1,
+                               scaling, NULL)
+
+        return 0
+
+    cdef int _copy_output_layout(self, np.npy_intp *shape,
+                                 np.npy_intp *strides):
+        '''Copy the shape and strides of the internal output array into
+        ``shape`` and ``strides`` (each of length ``NPY_MAXDIMS``) and
+        return its number of dimensions.
+
+        The copies are what should be used without the GIL, as the
+        internal array may be replaced (and freed) by ``update_arrays`` in
+        another thread as soon as the GIL is released.
+        '''
+        cdef np.ndarray output_array = self._output_array
+        cdef int ndim = np.PyArray_NDIM(output_array)
+        cdef np.npy_intp *_shape = np.PyArray_DIMS(output_array)
+        cdef np.npy_intp *_strides = np.PyArray_STRIDES(output_array)
+        cdef int n
+
+        for n in range(ndim):
+            shape[n] = _shape[n]
+            strides[n] = _strides[n]
+
+        return ndim
+
+    cdef int _scale_output(self, output_array, double scaling) except -1:
+        '''Scale ``output_array`` (a pair of arrays for a split complex
+        array), which is assumed to match the plan, by ``scaling``
+        without holding the GIL.
+        '''
+        cdef void *output_pointers[2]
+        cdef np.npy_intp shape[np.NPY_MAXDIMS]
+        cdef np.npy_intp strides[np.NPY_MAXDIMS]
+        cdef int ndim = self._copy_output_layout(shape, strides)
+        cdef fftw_generic_scale scale = self._scale
+        cdef int components = self._output_components
+        cdef int n, planes = 1
 
+        if self._split_output:
+            planes = 2
+
+        self._fill_pointers((output_array,), False, self._split_output, 1,
+                            output_pointers)
+
+        with nogil:
+            for n in range(planes):
+                scale(output_pointers[n], ndim, shape, strides, components,
+                      scaling)
+
+        return 0
+
+    cdef void _execute_pointers(self, void **input_pointers,
+            void **output_pointers, Py_ssize_t batch_length,
+            double scaling, double *timings):
+        '''Execute the planned operation on each of the ``batch_length``
+        items given by the data pointers in turn (as filled by
+        ``_fill_pointers``), in a single nogil block, as for ``_execute``.
+        The pointers are assumed to address arrays matching the plan. If
+        ``timings`` is not ``NULL``, the wall time taken by each transform
+        is written to it.
+        '''
         cdef void *plan = self._plan
         cdef fftw_generic_execute fftw_execute = self._fftw_execute
+        cdef fftw_generic_hermitian_fill hermitian_fill = (
+                self._hermitian_fill)
+        cdef np.npy_intp shape[np.NPY_MAXDIMS]
+        cdef np.npy_intp strides[np.NPY_MAXDIMS]
+        cdef int ndim = self._copy_output_layout(shape, strides)
+        cdef int64_t *axes = self._axes
+        cdef int64_t axes_length = self._axes_length
+        cdef fftw_generic_scale scale = self._scale
+        cdef int components = self._output_components
+        cdef bint split_input = self._split_input
+        cdef bint split_output = self._split_output
+        cdef Py_ssize_t n
+        cdef double start_time = 0
+        cdef void *_in
+        cdef void *_out
         with nogil:
-            fftw_execute(plan, input_pointer, output_pointer)
-
-cdef void count_char(char c, void *counter_ptr):
+            for n in range(batch_length):
+                if timings != NULL:
+                    start_time = pyfftw_perf_counter()
+
+                # Split complex arrays are passed as a pointer to the
+                # pointers to their two parts.
+                if split_input:
+                    _in = <void *>(input_pointers + 2 * n)
+                else:
+                    _in = input_pointers[n]
+
+                if split_output:
+                    _out = <void *>(output_pointers + 2 * n)
+                else:
+                    _out = output_pointers[n]
+
+                fftw_execute(plan, _in, _out)
+
+                if hermitian_fill != NULL:
+                    hermitian_fill(_out, ndim, shape, strides,
+                                   axes, axes_length)
+
+                if scaling != 1.0:
+                    if split_output:
+                        scale(output_pointers[2 * n], ndim, shape, strides,
+                              components, scaling)
+                        scale(output_pointers[2 * n + 1], ndim, shape,
+                              strides, components, scaling)
+                    else:
+                        scale(_out, ndim, shape, strides, components,
+                              scaling)
+
+                if timings != NULL:
+                    timings[n] = pyfftw_perf_counter() - start_time
+
+cdef struct _WisdomBuffer:
+    char *data
+    size_t length
+    size_t capacity
+    bint failed
+
+cdef void _append_wisdom_char(char c, void *buffer_ptr):
     '''
-    On every call, increment the derefenced counter_ptr.
+    Append the passed character c to the _WisdomBuffer pointed to by
+    buffer_ptr, doubling the size of its memory when it is full. If the
+    memory cannot be grown, the buffer is marked as failed and the rest
+    of the characters are dropped.
     '''
-    (<int *>counter_ptr)[0] += 1
+    cdef _WisdomBuffer *buffer = <_WisdomBuffer *>buffer_ptr
+    cdef char *new_data
 
+    if buffer.failed:
+        return
 
-cdef void write_char_to_string(char c, void *string_location_ptr):
-    '''
-    Write the passed character c to the memory location
-    pointed to by the contents of string_location_ptr (i.e. a pointer
-    to a pointer), then increment the contents of string_location_ptr
-    (i.e. move to the next byte in memory).
+    if buffer.length == buffer.capacity:
+        new_data = <char *>realloc(buffer.data, 2 * buffer.capacity)
+        if new_data == NULL:
+            buffer.failed = True
+            return
+
+        buffer.data = new_data
+        buffer.capacity *= 2
 
-    In other words, for every character that is passed, we write that
-    to a string that is referenced by the dereferenced value of
-    string_location_ptr.
+    buffer.data[buffer.length] = c
+    buffer.length += 1
 
-    If the derefenced value of string_location points to an
-    unallocated piece of memory, a segfault will likely occur.
+cdef bytes _export_wisdom_string(fftw_generic_export_wisdom export_wisdom):
     '''
-    cdef char *write_location = <char *>((<intptr_t *>string_location_ptr)[0])
-    write_location[0] = c
+    Return the wisdom exported by export_wisdom (one of the
+    fftw*_export_wisdom functions) as a bytes string.
+
+    The string is extracted in a single pass into memory we own rather
+    than using `fftw_export_wisdom_to_string`, to avoid calling `free` on
+    a string potentially allocated by a different C library; see #3
+    '''
+    cdef _WisdomBuffer buffer
+
+    buffer.length = 0
+    buffer.capacity = 4096
+    buffer.failed = False
+    buffer.data = <char *>malloc(buffer.capacity)
 
-    (<intptr_t *>string_location_ptr)[0] += 1
+    if buffer.data == NULL:
+        raise MemoryError
 
+    try:
+        export_wisdom(&_append_wisdom_char, <void *>&buffer)
+
+        if buffer.failed:
+            raise MemoryError
+
+        return buffer.data[:buffer.length]
+    finally:
+        free(buffer.data)
+
+
+def _interfaces_cache_key(a, s, axes, overwrite_input, planner_effort,
+        threads, auto_align_input, auto_contiguous, calling_func, r2r_type):
+    '''Return the key under which :mod:`pyfftw.interfaces` caches the
+    object that transforms the array ``a`` with the given arguments. The
+    alignment of ``a`` is found in C, which is much cheaper than going
+    through ``a.ctypes``.
+    '''
+    cdef intptr_t alignment = (
+            <intptr_t>np.PyArray_DATA(<np.ndarray?>a) % _simd_alignment)
+
+    return (calling_func, a.shape, a.strides, a.dtype, s, axes, alignment,
+            overwrite_input, planner_effort, threads, auto_align_input,
+            auto_contiguous, r2r_type)
 
 def export_wisdom():
     '''export_wisdom()
@@ -1824,62 +3522,18 @@ def export_wisdom():
     '''
 
     cdef:
-        # can't directly initialize `bytes` with ''
-        const char* empty = ''
-        bytes py_wisdom  = empty
-        bytes py_wisdomf = empty
-        bytes py_wisdoml = empty
-
-        # default init to zero
-        cdef int counter  = 0
-        cdef int counterf = 0
-        cdef int counterl = 0
-
-        char* c_wisdom  = NULL
-        char* c_wisdomf = NULL
-        char* c_wisdoml = NULL
-
-    # count the length of the string and extract it manually rather than using
-    # `fftw_export_wisdom_to_string` to avoid calling `free` on the string
-    # potentially allocated by a different C library; see #3
-    IF HAVE_DOUBLE:
-        fftw_export_wisdom(&count_char, <void *>&counter)
-        c_wisdom = <char *>malloc(sizeof(char)*(counter + 1))
-        if c_wisdom == NULL:
-            raise MemoryError
-        # Set the pointers to the string pointers
-        cdef intptr_t c_wisdom_ptr = <intptr_t>c_wisdom
-        fftw_export_wisdom(&write_char_to_string, <void *>&c_wisdom_ptr)
-        # Write the last byte as the null byte
-        c_wisdom[counter] = 0
-        try:
-            py_wisdom = c_wisdom
-        finally:
-            free(c_wisdom)
-    IF HAVE_SINGLE:
-        fftwf_export_wisdom(&count_char, <void *>&counterf)
-        c_wisdomf = <char *>malloc(sizeof(char)*(counterf + 1))
-        if c_wisdomf == NULL:
-            raise MemoryError
-        cdef intptr_t c_wisdomf_ptr = <intptr_t>c_wisdomf
-        fftwf_export_wisdom(&write_char_to_string, <void *>&c_wisdomf_ptr)
-        c_wisdomf[counterf] = 0
-        try:
-            py_wisdomf = c_wisdomf
-        finally:
-            free(c_wisdomf)
-    IF HAVE_LONG:
-        fftwl_export_wisdom(&count_char, <void *>&counterl)
-        c_wisdoml = <char *>malloc(sizeof(char)*(counterl + 1))
-        if c_wisdoml == NULL:
-            raise MemoryError
-        cdef intptr_t c_wisdoml_ptr = <intptr_t>c_wisdoml
-        fftwl_export_wisdom(&write_char_to_string, <void *>&c_wisdoml_ptr)
-        c_wisdoml[counterl] = 0
-        try:
-            py_wisdoml = c_wisdoml
-        finally:
-            free(c_wisdoml)
+        bytes py_wisdom  = b''
+        bytes py_wisdomf = b''
+        bytes py_wisdoml = b''
+
+    # The wisdom is held by the planner, so it is protected by the same lock
+    with plan_lock:
+        IF HAVE_DOUBLE:
+            py_wisdom = _export_wisdom_string(&fftw_export_wisdom)
+        IF HAVE_SINGLE:
+            py_wisdomf = _export_wisdom_string(&fftwf_export_wisdom)
+        IF HAVE_LONG:
+            py_wisdoml = _export_wisdom_string(&fftwl_export_wisdom)
 
     return (py_wisdom, py_wisdomf, py_wisdoml)
 
@@ -1911,109 +3565,181 @@ def import_wisdom(wisdom):
         bint successf = False
         bint successl = False
 
-    IF HAVE_DOUBLE:
-        success = fftw_import_wisdom_from_string(c_wisdom)
-    IF HAVE_SINGLE:
-        successf = fftwf_import_wisdom_from_string(c_wisdomf)
-    IF HAVE_LONG:
-        successl = fftwl_import_wisdom_from_string(c_wisdoml)
+    with plan_lock:
+        IF HAVE_DOUBLE:
+            success = fftw_import_wisdom_from_string(c_wisdom)
+        IF HAVE_SINGLE:
+            successf = fftwf_import_wisdom_from_string(c_wisdomf)
+        IF HAVE_LONG:
+            successl = fftwl_import_wisdom_from_string(c_wisdoml)
+
     return (success, successf, successl)
 
-#def export_wisdom_to_files(
-#        double_wisdom_file=None,
-#        single_wisdom_file=None,
-#        long_double_wisdom_file=None):
-#    '''export_wisdom_to_file(double_wisdom_file=None, single_wisdom_file=None, long_double_wisdom_file=None)
-#
-#    Export the wisdom to the passed files.
-#
-#    The double precision wisdom is written to double_wisdom_file.
-#    The single precision wisdom is written to single_wisdom_file.
-#    The long double precision wisdom is written to
-#    long_double_wisdom_file.
-#
-#    If any of the arguments are None, then nothing is done for that
-#    file.
-#
-#    This function returns a tuple of boolean values indicating
-#    the success of storing each of the wisdom types (double, float
-#    and long double, in that order).
-#    '''
-#    cdef bint success = True
-#    cdef bint successf = True
-#    cdef bint successl = True
-#
-#    cdef char *_double_wisdom_file
-#    cdef char *_single_wisdom_file
-#    cdef char *_long_double_wisdom_file
-#
-#
-#    if double_wisdom_file is not None:
-#        _double_wisdom_file = double_wisdom_file
-#        success = fftw_export_wisdom_to_filename(_double_wisdom_file)
-#
-#    if single_wisdom_file is not None:
-#        _single_wisdom_file = single_wisdom_file
-#        successf = fftwf_export_wisdom_to_filename(_single_wisdom_file)
-#
-#    if long_double_wisdom_file is not None:
-#        _long_double_wisdom_file = long_double_wisdom_file
-#        successl = fftwl_export_wisdom_to_filename(
-#                _long_double_wisdom_file)
-#
-#    return (success, successf, successl)
-#
-#def import_wisdom_to_files(
-#        double_wisdom_file=None,
-#        single_wisdom_file=None,
-#        long_double_wisdom_file=None):
-#    '''import_wisdom_to_file(double_wisdom_file=None, single_wisdom_file=None, long_double_wisdom_file=None)
-#
-#    import the wisdom to the passed files.
-#
-#    The double precision wisdom is imported from double_wisdom_file.
-#    The single precision wisdom is imported from single_wisdom_file.
-#    The long double precision wisdom is imported from
-#    long_double_wisdom_file.
-#
-#    If any of the arguments are None, then nothing is done for that
-#    file.
-#
-#    This function returns a tuple of boolean values indicating
-#    the success of loading each of the wisdom types (double, float
-#    and long double, in that order).
-#    '''
-#    cdef bint success = True
-#    cdef bint successf = True
-#    cdef bint successl = True
-#
-#    cdef char *_double_wisdom_file
-#    cdef char *_single_wisdom_file
-#    cdef char *_long_double_wisdom_file
-#
-#    if double_wisdom_file is not None:
-#        _double_wisdom_file = double_wisdom_file
-#        success = fftw_import_wisdom_from_filename(_double_wisdom_file)
-#
-#    if single_wisdom_file is not None:
-#        _single_wisdom_file = single_wisdom_file
-#        successf = fftwf_import_wisdom_from_filename(_single_wisdom_file)
-#
-#    if long_double_wisdom_file is not None:
-#        _long_double_wisdom_file = long_double_wisdom_file
-#        successl = fftwl_import_wisdom_from_filename(
-#                _long_double_wisdom_file)
-#
-#    return (success, successf, successl)
+def export_wisdom_to_files(
+        double_wisdom_file=None,
+        single_wisdom_file=None,
+        long_double_wisdom_file=None):
+    '''export_wisdom_to_files(double_wisdom_file=None, single_wisdom_file=None, long_double_wisdom_file=None)
+
+    Export the wisdom to the passed files, in the format of FFTW's own
+    wisdom files (as read by :func:`~pyfftw.import_wisdom_from_files`,
+    or by the ``fftw-wisdom`` tool).
+
+    The double precision wisdom is written to double_wisdom_file.
+    The single precision wisdom is written to single_wisdom_file.
+    The long double precision wisdom is written to
+    long_double_wisdom_file.
+
+    If any of the arguments are None, or the precision is not supported
+    in the build, then nothing is done for that file.
+
+    This function returns a tuple of boolean values indicating
+    the success of storing each of the wisdom types (double, float
+    and long double, in that order).
+    '''
+    cdef bint success = False
+    cdef bint successf = False
+    cdef bint successl = False
+
+    with plan_lock:
+        IF HAVE_DOUBLE:
+            if double_wisdom_file is not None:
+                success = fftw_export_wisdom_to_filename(
+                        os.fsencode(double_wisdom_file))
+        IF HAVE_SINGLE:
+            if single_wisdom_file is not None:
+                successf = fftwf_export_wisdom_to_filename(
+                        os.fsencode(single_wisdom_file))
+        IF HAVE_LONG:
+            if long_double_wisdom_file is not None:
+                successl = fftwl_export_wisdom_to_filename(
+                        os.fsencode(long_double_wisdom_file))
+
+    return (success, successf, successl)
+
+def import_wisdom_from_files(
+        double_wisdom_file=None,
+        single_wisdom_file=None,
+        long_double_wisdom_file=None):
+    '''import_wisdom_from_files(double_wisdom_file=None, single_wisdom_file=None, long_double_wisdom_file=None)
+
+    Import the wisdom from the passed files, in the format of FFTW's own
+    wisdom files (as written by :func:`~pyfftw.export_wisdom_to_files`,
+    or by the ``fftw-wisdom`` tool).
+
+    The double precision wisdom is imported from double_wisdom_file.
+    The single precision wisdom is imported from single_wisdom_file.
+    The long double precision wisdom is imported from
+    long_double_wisdom_file.
+
+    If any of the arguments are None, or the precision is not supported
+    in the build, then nothing is done for that file.
+
+    This function returns a tuple of boolean values indicating
+    the success of loading each of the wisdom types (double, float
+    and long double, in that order).
+    '''
+    cdef bint success = False
+    cdef bint successf = False
+    cdef bint successl = False
+
+    with plan_lock:
+        IF HAVE_DOUBLE:
+            if double_wisdom_file is not None:
+                success = fftw_import_wisdom_from_filename(
+                        os.fsencode(double_wisdom_file))
+        IF HAVE_SINGLE:
+            if single_wisdom_file is not None:
+                successf = fftwf_import_wisdom_from_filename(
+                        os.fsencode(single_wisdom_file))
+        IF HAVE_LONG:
+            if long_double_wisdom_file is not None:
+                successl = fftwl_import_wisdom_from_filename(
+                        os.fsencode(long_double_wisdom_file))
+
+    return (success, successf, successl)
+
+def import_system_wisdom():
+    '''import_system_wisdom()
+
+    Import the system wisdom of FFTW, which is read from
+    ``/etc/fftw/wisdom``, ``/etc/fftw/wisdomf`` and ``/etc/fftw/wisdoml``
+    on Unix (FFTW does not support system wisdom on other platforms).
+
+    This function returns a tuple of boolean values indicating
+    the success of loading each of the wisdom types (double, float
+    and long double, in that order).
+    '''
+    cdef bint success = False
+    cdef bint successf = False
+    cdef bint successl = False
+
+    with plan_lock:
+        IF HAVE_DOUBLE:
+            success = fftw_import_system_wisdom()
+        IF HAVE_SINGLE:
+            successf = fftwf_import_system_wisdom()
+        IF HAVE_LONG:
+            successl = fftwl_import_system_wisdom()
+
+    return (success, successf, successl)
 
 def forget_wisdom():
     '''forget_wisdom()
 
     Forget all the accumulated wisdom.
     '''
-    IF HAVE_DOUBLE:
-        fftw_forget_wisdom()
-    IF HAVE_SINGLE:
-        fftwf_forget_wisdom()
-    IF HAVE_LONG:
-        fftwl_forget_wisdom()
+    with plan_lock:
+        IF HAVE_DOUBLE:
+            fftw_forget_wisdom()
+        IF HAVE_SINGLE:
+            fftwf_forget_wisdom()
+        IF HAVE_LONG:
+            fftwl_forget_wisdom()
+
+def add_planner_hook(hook):
+    '''add_planner_hook(hook)
+
+    Add ``hook`` to the hooks that are told about every planning call
+    made when an :class:`FFTW` object is created.
+
+    ``hook.before_plan(event)`` is called before the planner lock is
+    acquired, and ``hook.after_plan(event)`` once the planner returns.
+    ``event`` is a dictionary of the ``'input_shape'``,
+    ``'output_shape'``, ``'input_strides'``, ``'output_strides'``,
+    ``'input_dtype'``, ``'output_dtype'``, ``'axes'``, ``'direction'``,
+    ``'flags'``, ``'threads'`` and ``'planning_timelimit'`` of the plan,
+    the ``'thread_id'`` of the planning thread and the ``'start_time'``
+    (in seconds, on an arbitrary monotonic clock) at which the planner
+    lock is requested. The event passed to ``after_plan`` also has the
+    ``'lock_wait_time'`` spent waiting for the planner lock, the
+    ``'planning_time'`` taken by the planner, both in seconds, and
+    whether the planning ``'succeeded'``.
+
+    The hooks are called in the planning thread, in the order they were
+    added, and any exception they raise is raised from the creation of
+    the :class:`FFTW` object. :class:`~pyfftw.LoggingPlannerHook` and
+    :class:`~pyfftw.ChromeTracePlannerHook` are provided.
+    '''
+    global _planner_hooks
+
+    with plan_lock:
+        _planner_hooks = _planner_hooks + (hook,)
+
+def remove_planner_hook(hook):
+    '''remove_planner_hook(hook)
+
+    Remove ``hook``, which was added with
+    :func:`~pyfftw.add_planner_hook`. If it was not added, a
+    ``ValueError`` is raised.
+    '''
+    global _planner_hooks
+
+    with plan_lock:
+        if hook not in _planner_hooks:
+            raise ValueError('Invalid hook: '
+                    'The hook was not added.')
+
+        hooks = list(_planner_hooks)
+        hooks.remove(hook)
+        _planner_hooks = tuple(hooks)
@@ -57,6 +57,40 @@ elif _simd_alignment == 32:
 else:
     _valid_simd_alignments = ()
 
+# The names of the instruction set extensions in the order of the CPU_*
+# bits set by cpu.cpu_features
+_cpu_feature_names = ('sse', 'sse2', 'sse3', 'ssse3', 'sse4_1', 'sse4_2',
+                      'avx', 'fma', 'avx2', 'avx512f', 'neon')
+
+def _cpu_features():
+    '''Return a tuple of the names of the instruction set extensions that
+    the CPU has.
+    '''
+    cdef int features = cpu.cpu_features()
+
+    return tuple([name for n, name in enumerate(_cpu_feature_names)
+                  if features & (1 << n)])
+
+def _cpu_brand():
+    '''Return the name of the CPU model, or an empty string if it is not
+    known.
+    '''
+    cdef char brand[cpu.CPU_BRAND_LENGTH]
+
+    cpu.cpu_brand(brand)
+
+    return brand.decode('ascii', 'replace').strip()
+
+def _cpu_cache_sizes():
+    '''Return a tuple of the sizes in bytes of the level 1 data cache and
+    the level 2 and 3 caches, each of which is 0 if it is not known.
+    '''
+    cdef int sizes[cpu.CPU_CACHE_LEVELS]
+
+    cpu.cpu_cache_sizes(sizes)
+
+    return tuple([sizes[level] for level in range(cpu.CPU_CACHE_LEVELS)])
+
 cpdef n_byte_align_empty(shape, n, dtype='float64', order='C'):
     '''n_byte_align_empty(shape, n, dtype='float64', order='C')
     **This function is deprecated:** ``empty_aligned`` **should be used
@@ -248,8 +282,9 @@ cpdef ones_aligned(shape, dtype='float64', order='C', n=None):
     return array
 
 
-cpdef next_fast_len(target):
-    '''next_fast_len(target)
+cpdef next_fast_len(target, real=False, tuned=False, dtype=None,
+                    threads=1):
+    '''next_fast_len(target, real=False, tuned=False, dtype=None, threads=1)
 
     Find the next fast transform length for FFTW.
 
@@ -260,11 +295,28 @@ cpdef next_fast_len(target):
     ----------
     target : int
         Length to start searching from.  Must be a positive integer.
+    real : bool, optional
+        If ``True``, the length is for a real-to-complex (or
+        complex-to-real) transform, for which FFTW is fastest with even
+        lengths, so only even lengths are returned (for a ``target``
+        above 1).
+    tuned : bool, optional
+        If ``True``, rather than returning the first fast length, the
+        transforms of the first few fast lengths are timed on the running
+        machine and the length giving the fastest transform is returned.
+        See :func:`pyfftw.next_fast_shape`, which this calls.
+    dtype : dtype, optional
+        The dtype of the transformed array, used for the timings when
+        ``tuned`` is ``True``.
+    threads : int, optional
+        The number of threads used for the timings when ``tuned`` is
+        ``True``.
 
     Returns
     -------
     out : int
-        The first fast length greater than or equal to `target`.
+        The first fast length greater than or equal to `target` (or the
+        fastest of the first few if ``tuned`` is ``True``).
 
     Examples
     --------
@@ -290,6 +342,25 @@ cpdef next_fast_len(target):
     Similar speedups will occur for pre-planned FFTs as generated via
     pyfftw.builders.
 
+    '''
+    if tuned:
+        from ._tuning import next_fast_shape
+
+        return next_fast_shape((target,), real=real, tuned=True,
+                               dtype=dtype, threads=threads)[0]
+
+    length = _next_fast_len(target)
+
+    if real:
+        # The fast lengths are not all even, but the next even one is near
+        while length % 2 and length > 1:
+            length = _next_fast_len(length + 1)
+
+    return length
+
+def _next_fast_len(target):
+    '''Return the first length of the form given in the docstring of
+    :func:`next_fast_len` that is at least ``target``.
     '''
     lpre = (18,    20,    21,    22,    24,    25,    26,    27,    28,    30,
             32,    33,    35,    36,    39,    40,    42,    44,    45,    48,
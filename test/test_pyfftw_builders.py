@@ -32,6 +32,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 #
 
+import pyfftw
 from pyfftw import builders, empty_aligned, byte_align, FFTW
 from pyfftw import _supported_nptypes_complex, _supported_nptypes_real
 from pyfftw.builders import _utils as utils
@@ -523,6 +524,58 @@ class BuildersTestFFT(unittest.TestCase):
 
                 self.assertTrue(type(FFTW_object) == FFTW)
 
+    def test_real_input_hermitian_fill(self):
+        '''With hermitian_fill, a forward complex transform of a real
+        array should keep the input real and still return the full
+        complex output.
+        '''
+        if self.func not in ('fft', 'fft2', 'fftn'):
+            return
+
+        dtype_tuple = input_dtypes['r2c']
+
+        for dtype in dtype_tuple[0]:
+            for test_shape, s, kwargs in self.test_data:
+                s = None
+                kwargs = dict(kwargs, hermitian_fill=True)
+
+                FFTW_object = self.validate_pyfftw_object(dtype_tuple[1],
+                        test_shape, dtype, s, kwargs)
+
+                self.assertEqual(FFTW_object.input_dtype.char,
+                                 np.dtype(dtype).char)
+                self.assertEqual(FFTW_object.output_shape, test_shape)
+                self.assertTrue(
+                    numpy.iscomplexobj(FFTW_object.output_array))
+
+    def test_real_input_complex_call(self):
+        '''By default, an object built from a real array should take a
+        complex input, so it can be called with complex data.
+        '''
+        if self.func not in ('fft', 'fft2', 'fftn'):
+            return
+
+        dtype_tuple = input_dtypes['r2c']
+
+        for dtype in dtype_tuple[0]:
+            for test_shape, s, kwargs in self.test_data:
+                real_array = dtype_tuple[1](test_shape, dtype)
+                complex_array = input_dtypes['complex'][1](
+                        test_shape, np.dtype(dtype).char.upper())
+
+                FFTW_object = getattr(builders, self.func)(
+                        real_array, s, **kwargs)
+
+                self.assertTrue(
+                    numpy.iscomplexobj(FFTW_object.input_array))
+
+                output_array = FFTW_object(complex_array)
+
+                self.assertTrue(numpy.allclose(output_array,
+                    getattr(np_fft, self.func)(
+                        numpy.complex128(complex_array), s, **kwargs),
+                    rtol=1e-4, atol=1e-4))
+
     def test_persistent_padding(self):
         '''Test to confirm the padding it not touched after creation.
         '''
@@ -1088,6 +1141,106 @@ class BuildersTestFFTWWrapper(unittest.TestCase):
             self.input_array[self.input_array_slicer],
             _input_array[self.FFTW_array_slicer]))
 
+    def test_call_stats(self):
+        self.fft.enable_stats()
+
+        self.fft()
+        self.fft(self.input_array)
+
+        stats = self.fft.stats
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['copy']['count'], 1)
+        self.assertEqual(stats['copy_reasons']['slicer'], 1)
+        self.assertEqual(stats['update']['count'], 0)
+        self.assertEqual(stats['execute']['count'], 2)
+
+
+class BuildersTestSplit(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+
+        super(BuildersTestSplit, self).__init__(*args, **kwargs)
+
+        if not hasattr(self, 'assertRaisesRegex'):
+            self.assertRaisesRegex = self.assertRaisesRegexp
+
+    def to_complex(self, pair):
+        return numpy.float64(pair[0]) + 1j*numpy.float64(pair[1])
+
+    def test_complex_input(self):
+        for dtype in real_dtypes:
+            a = make_complex_data((6, 10), np.float64)
+            pair = (a.real.astype(dtype), a.imag.astype(dtype))
+
+            for func, kwargs in (('fft', {}), ('ifft', {'n': 16}),
+                                 ('fftn', {'s': (4, 12)}),
+                                 ('ifftn', {'norm': 'ortho'})):
+                FFTW_object = getattr(builders, func + '_split')(
+                    pair, **kwargs)
+
+                output = FFTW_object()
+                self.assertIsInstance(output, tuple)
+                self.assertEqual(output[0].dtype, np.dtype(dtype))
+
+                ref = getattr(np_fft, func)(a, **kwargs)
+                self.assertTrue(numpy.allclose(
+                    self.to_complex(output), ref, rtol=1e-4, atol=1e-4))
+
+                # A subsequent call takes a new pair
+                b = make_complex_data((6, 10), np.float64)
+                output = FFTW_object((b.real.astype(dtype),
+                                      b.imag.astype(dtype)))
+                ref = getattr(np_fft, func)(b, **kwargs)
+                self.assertTrue(numpy.allclose(
+                    self.to_complex(output), ref, rtol=1e-4, atol=1e-4))
+
+    def test_real_transforms(self):
+        for dtype in real_dtypes:
+            a = make_real_data((6, 10), dtype)
+
+            for func in ('rfft', 'rfftn'):
+                output = getattr(builders, func + '_split')(a)()
+                ref = getattr(np_fft, func)(numpy.float64(a))
+                self.assertTrue(numpy.allclose(
+                    self.to_complex(output), ref, rtol=1e-4, atol=1e-4))
+
+                spectrum = (output[0].copy(), output[1].copy())
+                inverse = getattr(builders, 'i' + func + '_split')(
+                    spectrum, **({'n': 10} if func == 'rfft'
+                                 else {'s': (6, 10)}))
+                self.assertTrue(numpy.allclose(
+                    inverse(), a, rtol=1e-4, atol=1e-4))
+
+    def test_complex_array_input(self):
+        a = make_complex_data((16,), np.complex128)
+        output = builders.fft_split(a)()
+
+        self.assertTrue(numpy.allclose(self.to_complex(output),
+                                       np_fft.fft(a)))
+
+    def test_non_contiguous_input(self):
+        a = make_complex_data((8, 16), np.float64)
+        pair = (a.real[:, ::2], a.imag[:, ::2])
+
+        FFTW_object = builders.fft_split(pair)
+        self.assertTrue(numpy.allclose(self.to_complex(FFTW_object()),
+                                       np_fft.fft(a[:, ::2])))
+
+        with self.assertRaisesRegex(ValueError, 'Cannot avoid copy'):
+            builders.fft_split(pair, avoid_copy=True)
+
+    def test_invalid_pair_fail(self):
+        a = make_real_data((16,), np.float64)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid input array'):
+            builders.fft_split((a, a[:8]))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid input array'):
+            builders.fft_split((a, a + 1j))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid input array'):
+            builders.fft_split((a, a, a))
+
 
 class BuildersTestUtilities(unittest.TestCase):
 
@@ -1118,6 +1271,29 @@ class BuildersTestUtilities(unittest.TestCase):
 
 
 
+    def test_auto_pad(self):
+        a = numpy.random.rand(17, 1021)
+
+        fft_object = builders.fft2(a + 0j, auto_pad=True)
+        self.assertEqual(fft_object.input_shape, (18, 1024))
+        self.assertTrue(numpy.allclose(
+            fft_object(), numpy.fft.fft2(a, s=(18, 1024))))
+
+        fft_object = builders.rfftn(a, s=(17, 15), auto_pad=True)
+        self.assertEqual(fft_object.input_shape, (18, 16))
+
+        fft_object = builders.rfft(a, auto_pad=True)
+        self.assertEqual(fft_object.input_shape, (17, 1024))
+        self.assertTrue(numpy.allclose(
+            fft_object(), numpy.fft.rfft(a, n=1024)))
+
+        # Nothing is padded by default
+        fft_object = builders.fft(a)
+        self.assertEqual(fft_object.input_shape, (17, 1021))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid auto_pad'):
+            builders.fft(a, auto_pad='fast')
+
     def test_compute_array_shapes(self):
         # inputs are:
         # (a.shape, s, axes, inverse, real)
@@ -1247,6 +1423,108 @@ class BuildersTestUtilities(unittest.TestCase):
                     each_output)
 
 
+    def test_irfftn_preserve_input(self):
+        a = np_fft.rfft(numpy.random.randn(8, 16))
+        a_copy = a.copy()
+
+        for func in ('irfft2', 'irfftn'):
+            FFTW_object = getattr(builders, func)(a, axes=(-1,),
+                    overwrite_input=False, planner_effort='FFTW_MEASURE')
+            self.assertTrue('FFTW_PRESERVE_INPUT' in FFTW_object.flags)
+
+            FFTW_object(a)
+            self.assertTrue(numpy.array_equal(a, a_copy))
+
+            with self.assertRaisesRegex(ValueError, 'Invalid flags'):
+                getattr(builders, func)(a, axes=(0, 1),
+                                        overwrite_input=False)
+
+    def test_planning_input_maintained(self):
+        a = empty_aligned((8, 16), dtype='complex128')
+        a[:] = make_complex_data((8, 16), np.complex128)
+        a_copy = a.copy()
+
+        for effort in ('FFTW_ESTIMATE', 'FFTW_MEASURE'):
+            FFTW_object = builders.fft(a, planner_effort=effort)
+            self.assertTrue(FFTW_object.input_array is a)
+            self.assertTrue(numpy.array_equal(a, a_copy))
+
+    def test_planning_makes_no_copies(self):
+
+        class CopyCountingArray(numpy.ndarray):
+            copies = 0
+
+            def copy(self, *args, **kwargs):
+                CopyCountingArray.copies += 1
+                return numpy.ndarray.copy(self, *args, **kwargs)
+
+        planning_arrays = []
+
+        def recording_plan(FFTW_class, input_array, *args, **kwargs):
+            planning_arrays.append(input_array)
+            return plan(FFTW_class, input_array, *args, **kwargs)
+
+        plan = utils._plan
+        utils._plan = recording_plan
+        try:
+            for order in ('C', 'F'):
+                a = empty_aligned((8, 16), dtype='complex128', order=order)
+                a[:] = make_complex_data((8, 16), np.complex128)
+                a_copy = numpy.array(a)
+                a = a.view(CopyCountingArray)
+
+                FFTW_object = builders.fft2(a, planner_effort='FFTW_MEASURE')
+
+                self.assertEqual(CopyCountingArray.copies, 0)
+                self.assertTrue(FFTW_object.input_array is a)
+                self.assertTrue(numpy.array_equal(a, a_copy))
+
+                # The planner was given a scratch array with the same layout
+                self.assertFalse(
+                    numpy.may_share_memory(planning_arrays[-1], a))
+                self.assertEqual(planning_arrays[-1].strides, a.strides)
+
+                self.assertTrue(numpy.allclose(
+                    FFTW_object(), np_fft.fft2(a_copy)))
+        finally:
+            utils._plan = plan
+
+    def test_empty_like_layout(self):
+        a = empty_aligned((12, 10), dtype='float64', n=64)[1::2, ::-3]
+        b = utils._empty_like_layout(a)
+
+        self.assertEqual(b.shape, a.shape)
+        self.assertEqual(b.dtype, a.dtype)
+        self.assertEqual(b.strides, a.strides)
+        self.assertEqual(b.ctypes.data % pyfftw.simd_alignment,
+                         a.ctypes.data % pyfftw.simd_alignment)
+
+    def test_low_memory_retry(self):
+
+        class FailingFFTW(FFTW):
+            def __init__(self, input_array, output_array, axes, direction,
+                         flags, threads):
+                if 'FFTW_CONSERVE_MEMORY' not in flags:
+                    raise MemoryError
+
+                FFTW.__init__(self, input_array, output_array, axes,
+                              direction, flags, threads)
+
+        a = empty_aligned(16, dtype='complex128')
+        b = empty_aligned(16, dtype='complex128')
+        args = (a, b, (-1,), 'FFTW_FORWARD', ['FFTW_ESTIMATE'], 1)
+
+        low_memory = pyfftw.config.LOW_MEMORY
+        try:
+            pyfftw.config.LOW_MEMORY = False
+            self.assertRaises(MemoryError, utils._plan, FailingFFTW, *args)
+
+            pyfftw.config.LOW_MEMORY = True
+            FFTW_object = utils._plan(FailingFFTW, *args)
+            self.assertTrue('FFTW_CONSERVE_MEMORY' in FFTW_object.flags)
+        finally:
+            pyfftw.config.LOW_MEMORY = low_memory
+
     def test_cook_nd_args_invalid_inputs(self):
         # inputs are (a.shape, s, axes, invreal)
         # None corresponds to no argument
@@ -1263,6 +1541,7 @@ class BuildersTestUtilities(unittest.TestCase):
 test_cases = (
         BuildersTestFFTWWrapper,
         BuildersTestUtilities,
+        BuildersTestSplit,
         BuildersTestFFT,
         BuildersTestIFFT,
         BuildersTestRFFT,
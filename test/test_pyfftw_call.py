@@ -461,6 +461,439 @@ class FFTWCallTest(unittest.TestCase):
         # Scaling by normalise_idft is performed by default
         self.assertTrue(numpy.allclose(self.input_array, _input_array))
 
+    def test_call_with_normalisation_non_contiguous_output(self):
+        '''The normalisation should only touch the (strided) output.
+        '''
+        for dtype, real_dtype in (('complex128', 'float64'),
+                                  ('complex64', 'float32')):
+            _output_array = empty_aligned((64, 96), dtype=dtype, n=16)
+            _output_array[:] = 7
+
+            _input_array = numpy.array(self.output_array[:32, :48], dtype)
+
+            ifft = FFTW(_input_array.copy(), _output_array[::2, ::2],
+                        direction='FFTW_BACKWARD', axes=(0, 1),
+                        flags=('FFTW_ESTIMATE', 'FFTW_UNALIGNED'))
+
+            output = ifft(_input_array)
+            self.assertTrue(numpy.allclose(
+                output, numpy.fft.ifft2(_input_array),
+                rtol=1e-4, atol=1e-4))
+            self.assertTrue(numpy.alltrue(_output_array[1::2] == 7))
+            self.assertTrue(numpy.alltrue(_output_array[:, 1::2] == 7))
+
+            output = ifft(_input_array, ortho=True, normalise_idft=False)
+            self.assertTrue(numpy.allclose(
+                output, numpy.fft.ifft2(_input_array, norm='ortho'),
+                rtol=1e-4, atol=1e-4))
+
+            # A real output is scaled too
+            _real_output = empty_aligned((32, 94), dtype=real_dtype, n=16)
+            irfft = FFTW(_input_array.copy(), _real_output, axes=(0, 1),
+                         direction='FFTW_BACKWARD', flags=('FFTW_ESTIMATE',))
+
+            _input_array.imag[:, 0] = 0
+            _input_array.imag[0, -1] = _input_array.imag[16, -1] = 0
+            ref = numpy.fft.irfft2(_input_array, s=(32, 94))
+            self.assertTrue(numpy.allclose(irfft(_input_array), ref,
+                                           rtol=1e-4, atol=1e-4))
+
+    def test_execute_into(self):
+        '''execute_into should transform the passed arrays without
+        changing the arrays held by the object.
+        '''
+        input_array = byte_align(
+                numpy.random.randn(*self.input_array.shape)
+                + 1j*numpy.random.randn(*self.input_array.shape), n=16)
+        output_array = empty_aligned(self.output_array.shape,
+                                     dtype='complex128', n=16)
+
+        internal_input = self.fft.input_array
+        internal_output = self.fft.output_array
+
+        returned = self.fft.execute_into(input_array, output_array)
+
+        self.assertIs(returned, output_array)
+        self.assertIs(self.fft.input_array, internal_input)
+        self.assertIs(self.fft.output_array, internal_output)
+
+        self.assertTrue(numpy.allclose(output_array,
+                                       numpy.fft.fft(input_array)))
+
+    def test_execute_into_normalisation(self):
+        _input_array = empty_aligned((256, 512), dtype='complex128', n=16)
+        ifft = FFTW(self.output_array, _input_array,
+                    direction='FFTW_BACKWARD')
+
+        self.fft()
+        output_array = empty_aligned((256, 512), dtype='complex128', n=16)
+
+        ifft.execute_into(self.output_array, output_array)
+        self.assertTrue(numpy.allclose(self.input_array, output_array))
+
+        ifft.execute_into(self.output_array, output_array,
+                          normalise_idft=False)
+        self.assertTrue(numpy.allclose(self.input_array * ifft.N,
+                                       output_array))
+
+        ifft.execute_into(self.output_array, output_array,
+                          ortho=True, normalise_idft=False)
+        self.assertTrue(numpy.allclose(
+            self.input_array * numpy.sqrt(ifft.N), output_array))
+
+        self.assertRaisesRegex(ValueError, 'Invalid options',
+                               ifft.execute_into, self.output_array,
+                               output_array, ortho=True)
+
+    def test_execute_into_invalid_arrays(self):
+        output_array = empty_aligned(self.output_array.shape,
+                                     dtype='complex128', n=16)
+
+        invalid_cases = (
+            (self.input_array.tolist(), output_array, 'Invalid input array'),
+            (self.input_array, numpy.complex64(output_array),
+             'Invalid output dtype'),
+            (self.input_array[:, :256], output_array,
+             'Invalid input shape'),
+            (empty_aligned(self.input_array.shape, dtype='complex128',
+                           order='F', n=self.fft.input_alignment),
+             output_array, 'Invalid input striding'),
+            (self.input_array, empty_aligned((256, 256), dtype='complex128'),
+             'Invalid output shape'))
+
+        for input_array, _output_array, message in invalid_cases:
+            self.assertRaisesRegex(ValueError, message,
+                                   self.fft.execute_into, input_array,
+                                   _output_array)
+
+    def test_execute_into_shared_between_threads(self):
+        '''A single object should be usable from many threads at once
+        through execute_into.
+        '''
+        import threading
+
+        n_threads = 8
+        inputs = [byte_align(numpy.random.randn(*self.input_array.shape)
+                             + 1j*numpy.random.randn(*self.input_array.shape),
+                             n=16) for n in range(n_threads)]
+        outputs = [empty_aligned(self.output_array.shape,
+                                 dtype='complex128', n=16)
+                   for n in range(n_threads)]
+
+        def worker(n):
+            for repeat in range(5):
+                self.fft.execute_into(inputs[n], outputs[n])
+
+        threads = [threading.Thread(target=worker, args=(n,))
+                   for n in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for input_array, output_array in zip(inputs, outputs):
+            self.assertTrue(numpy.allclose(output_array,
+                                           numpy.fft.fft(input_array)))
+
+    def _run_while_updating_arrays(self, worker, n_threads=3):
+        '''Run ``worker(ifft, n)`` for a normalised backward transform
+        ``ifft`` in ``n_threads`` threads while another thread repeatedly
+        replaces the internal arrays of ``ifft`` with ``update_arrays``.
+        '''
+        import threading
+
+        shape = (64, 4096)
+        ifft = FFTW(empty_aligned(shape, dtype='complex128', n=16),
+                    empty_aligned(shape, dtype='complex128', n=16),
+                    direction='FFTW_BACKWARD')
+        running = [True]
+
+        def updater():
+            while running[0]:
+                ifft.update_arrays(
+                    empty_aligned(shape, dtype='complex128', n=16),
+                    empty_aligned(shape, dtype='complex128', n=16))
+                # Reuse the memory just freed with a different shape
+                [numpy.empty((1, 1)) for n in range(16)]
+
+        threads = [threading.Thread(target=worker, args=(ifft, n))
+                   for n in range(n_threads)]
+        update_thread = threading.Thread(target=updater)
+        update_thread.start()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            running[0] = False
+            update_thread.join()
+
+    def test_execute_into_while_updating_arrays(self):
+        '''execute_into should be safe to call while another thread
+        replaces the internal arrays, including when normalising.
+        '''
+        n_threads = 3
+        shape = (64, 4096)
+        inputs = [byte_align(numpy.random.randn(*shape)
+                             + 1j*numpy.random.randn(*shape), n=16)
+                  for n in range(n_threads)]
+        outputs = [empty_aligned(shape, dtype='complex128', n=16)
+                   for n in range(n_threads)]
+
+        def worker(ifft, n):
+            for repeat in range(20):
+                ifft.execute_into(inputs[n], outputs[n])
+
+        self._run_while_updating_arrays(worker, n_threads)
+
+        for input_array, output_array in zip(inputs, outputs):
+            self.assertTrue(numpy.allclose(output_array,
+                                           numpy.fft.ifft(input_array)))
+
+    def test_execute_batch_while_updating_arrays(self):
+        '''execute_batch should be safe to call while another thread
+        replaces the internal arrays, including when normalising.
+        '''
+        n_threads = 3
+        shape = (4, 64, 4096)
+        inputs = [byte_align(numpy.random.randn(*shape)
+                             + 1j*numpy.random.randn(*shape), n=16)
+                  for n in range(n_threads)]
+        outputs = [empty_aligned(shape, dtype='complex128', n=16)
+                   for n in range(n_threads)]
+
+        def worker(ifft, n):
+            for repeat in range(5):
+                ifft.execute_batch(inputs[n], outputs[n])
+
+        self._run_while_updating_arrays(worker, n_threads)
+
+        for input_array, output_array in zip(inputs, outputs):
+            self.assertTrue(numpy.allclose(output_array,
+                                           numpy.fft.ifft(input_array)))
+
+    def test_execute_batch(self):
+        '''execute_batch should transform every pair of arrays, whether
+        passed as stacked arrays or as sequences of arrays.
+        '''
+        batch_shape = (6,) + self.input_array.shape
+        inputs = empty_aligned(batch_shape, dtype='complex128', n=16)
+        inputs[:] = (numpy.random.randn(*batch_shape)
+                     + 1j*numpy.random.randn(*batch_shape))
+        ref = numpy.fft.fft(inputs)
+
+        internal_input = self.fft.input_array
+
+        for input_arrays, output_arrays in (
+                (inputs, empty_aligned(batch_shape, dtype='complex128', n=16)),
+                (list(inputs), empty_aligned(batch_shape,
+                                             dtype='complex128', n=16)),
+                (inputs, [empty_aligned(self.output_array.shape,
+                                        dtype='complex128', n=16)
+                          for n in range(6)])):
+
+            returned = self.fft.execute_batch(input_arrays, output_arrays)
+
+            self.assertIs(returned, output_arrays)
+            self.assertTrue(numpy.allclose(numpy.array(output_arrays), ref))
+
+        self.assertIs(self.fft.input_array, internal_input)
+
+    def test_execute_batch_normalisation(self):
+        _input_array = empty_aligned((256, 512), dtype='complex128', n=16)
+        ifft = FFTW(self.output_array, _input_array,
+                    direction='FFTW_BACKWARD')
+
+        self.fft()
+        inputs = numpy.array([self.output_array, 2 * self.output_array])
+        outputs = numpy.empty_like(inputs)
+        ifft.execute_batch(list(inputs), list(outputs))
+
+        self.assertTrue(numpy.allclose(outputs[0], self.input_array))
+        self.assertTrue(numpy.allclose(outputs[1], 2 * self.input_array))
+
+        ifft.execute_batch(list(inputs), list(outputs), ortho=True,
+                           normalise_idft=False)
+        self.assertTrue(numpy.allclose(
+            outputs[1], 2 * numpy.sqrt(ifft.N) * self.input_array))
+
+    def test_execute_batch_timings(self):
+        inputs = [self.input_array.copy() for n in range(3)]
+        outputs = [self.output_array.copy() for n in range(3)]
+
+        returned, timings = self.fft.execute_batch(
+            inputs, outputs, timings=True)
+
+        self.assertIs(returned, outputs)
+        self.assertEqual(timings.shape, (3,))
+        self.assertEqual(timings.dtype, numpy.float64)
+        self.assertTrue(numpy.all(timings > 0))
+
+        returned, timings = self.fft.execute_batch([], [], timings=True)
+        self.assertEqual(timings.shape, (0,))
+
+    def test_execute_batch_invalid(self):
+        batch_shape = (4,) + self.input_array.shape
+        inputs = empty_aligned(batch_shape, dtype='complex128', n=16)
+        outputs = empty_aligned(batch_shape, dtype='complex128', n=16)
+        outputs[:] = 0
+
+        self.assertRaisesRegex(ValueError, 'Invalid batch',
+                               self.fft.execute_batch, inputs, outputs[:3])
+        self.assertRaisesRegex(ValueError, 'Invalid input shape',
+                               self.fft.execute_batch, inputs[:, :, :256],
+                               outputs)
+
+        # A bad item anywhere in a sequence is caught before anything runs
+        bad_outputs = list(outputs)
+        bad_outputs[-1] = numpy.complex64(bad_outputs[-1])
+        self.assertRaisesRegex(ValueError, 'Invalid output dtype',
+                               self.fft.execute_batch, inputs, bad_outputs)
+        self.assertTrue(numpy.alltrue(outputs == 0))
+
+    def test_execute_to_output(self):
+        '''_execute_to_output should return the transform in a new
+        aligned array, without changing the arrays held by the object.
+        '''
+        internal_input = self.fft.input_array
+        internal_output = self.fft.output_array
+        internal_output[:] = 0
+
+        input_array = empty_aligned(self.input_array.shape,
+                                    dtype='complex128', n=16)
+        input_array[:] = self.input_array * 2
+
+        output_array = self.fft._execute_to_output(input_array)
+        other_output_array = self.fft._execute_to_output(input_array)
+
+        self.assertIsNot(output_array, other_output_array)
+        self.assertIsNot(output_array, internal_output)
+        self.assertEqual(output_array.ctypes.data %
+                         self.fft.output_alignment, 0)
+        self.assertTrue(numpy.allclose(output_array,
+                                       numpy.fft.fft(input_array)))
+
+        self.assertIs(self.fft.input_array, internal_input)
+        self.assertIs(self.fft.output_array, internal_output)
+        self.assertTrue(numpy.alltrue(internal_output == 0))
+
+        # Normalisation is applied as for __call__
+        ifft = FFTW(self.output_array, empty_aligned(
+            self.input_array.shape, dtype='complex128', n=16),
+            direction='FFTW_BACKWARD')
+
+        self.assertTrue(numpy.allclose(
+            ifft._execute_to_output(output_array), input_array))
+        self.assertTrue(numpy.allclose(
+            ifft._execute_to_output(output_array, ortho=True,
+                                     normalise_idft=False),
+            input_array * numpy.sqrt(ifft.N)))
+
+    def test_execute_to_output_coerces_input(self):
+        '''An input array that does not match the plan should be copied
+        into the internal input array, as for __call__.
+        '''
+        expected = numpy.fft.fft(self.input_array)
+
+        for input_array in (numpy.complex64(self.input_array),
+                            self.input_array.tolist(),
+                            numpy.asfortranarray(self.input_array)):
+
+            self.fft.input_array[:] = 0
+            output_array = self.fft._execute_to_output(input_array)
+
+            self.assertTrue(numpy.allclose(output_array, expected,
+                                           rtol=1e-4, atol=1e-3))
+            self.assertTrue(numpy.allclose(self.fft.input_array,
+                                           self.input_array, rtol=1e-6))
+
+        self.assertRaisesRegex(ValueError, 'Invalid input shape',
+                               self.fft._execute_to_output,
+                               self.input_array[:, :256])
+
+    def test_execute_error_propagates(self):
+        '''An error while getting the arrays ready for FFTW should be
+        raised, rather than FFTW being run on them anyway.
+        '''
+        class BrokenFFTW(FFTW):
+            broken = False
+
+            def _get_output_array(self):
+                if self.broken:
+                    return self.output_array_list
+
+                return super(BrokenFFTW, self)._get_output_array()
+
+        fft = BrokenFFTW(self.input_array, self.output_array)
+        fft.output_array_list = self.output_array.tolist()
+        fft.broken = True
+
+        self.assertRaises(TypeError, fft.execute)
+        self.assertRaises(TypeError, fft)
+
+        fft.enable_stats()
+        self.assertRaises(TypeError, fft)
+
+    def test_call_stats(self):
+        '''Enabled stats should count the calls, time their stages and
+        record why the input array was copied.
+        '''
+        self.assertIs(self.fft.stats, None)
+
+        self.fft.enable_stats()
+        stats = self.fft.stats
+        self.assertEqual(stats['calls'], 0)
+        self.assertEqual(stats['execute'],
+                         {'count': 0, 'total_time': 0, 'last_time': 0})
+
+        self.fft()
+        self.fft(self.input_array)
+        self.fft(numpy.complex64(self.input_array))
+        self.fft(self.input_array.tolist())
+        self.fft(numpy.asfortranarray(self.input_array))
+
+        stats = self.fft.stats
+        self.assertEqual(stats['calls'], 5)
+        self.assertEqual(stats['execute']['count'], 5)
+        self.assertEqual(stats['update']['count'], 4)
+        self.assertEqual(stats['copy']['count'], 3)
+        self.assertEqual(stats['normalise']['count'], 0)
+        self.assertEqual(stats['copy_reasons'],
+                         {'not_ndarray': 1, 'dtype': 1, 'strides': 1,
+                          'alignment': 0, 'slicer': 0})
+
+        for stage in ('copy', 'update', 'execute'):
+            self.assertGreater(stats[stage]['last_time'], 0)
+            self.assertGreaterEqual(stats[stage]['total_time'],
+                                    stats[stage]['last_time'])
+
+        # The input should be realigned
+        input_array = empty_aligned(256 * 512 * 16 + 8, dtype='int8',
+                                    n=16)[8:].view('complex128')
+        input_array = input_array.reshape(256, 512)
+        input_array[:] = self.input_array
+        self.fft(input_array)
+        self.assertEqual(self.fft.stats['copy_reasons']['alignment'], 1)
+
+        # The normalisation is timed separately
+        ifft = FFTW(self.output_array, self.input_array,
+                    direction='FFTW_BACKWARD')
+        ifft.enable_stats()
+        expected = numpy.fft.ifft(self.output_array)
+        self.assertTrue(numpy.allclose(ifft(), expected))
+        self.assertEqual(ifft.stats['normalise']['count'], 1)
+
+        ifft(ortho=False, normalise_idft=False)
+        self.assertEqual(ifft.stats['normalise']['count'], 1)
+
+        self.fft.enable_stats(False)
+        self.fft()
+        self.assertIs(self.fft.stats, None)
+
+        self.fft.enable_stats()
+        self.assertEqual(self.fft.stats['calls'], 0)
+
 test_cases = (
         FFTWCallTest,)
 
@@ -41,6 +41,9 @@ from .test_pyfftw_base import run_test_suites, miss, require
 import unittest
 import numpy
 import warnings
+import os
+import sys
+import tempfile
 
 # FFTW tests that don't seem to fit anywhere else
 
@@ -107,6 +110,41 @@ class FFTWMiscTest(unittest.TestCase):
         fft = FFTW(u_input_array, u_output_array)
         self.assertEqual(fft.flags, ('FFTW_MEASURE', 'FFTW_UNALIGNED'))
 
+    def test_input_preservation_flags(self):
+        fft = FFTW(self.input_array, self.output_array,
+                flags=('FFTW_ESTIMATE', 'FFTW_PRESERVE_INPUT',
+                       'FFTW_CONSERVE_MEMORY'))
+        self.assertEqual(fft.flags, ('FFTW_ESTIMATE', 'FFTW_PRESERVE_INPUT',
+                                     'FFTW_CONSERVE_MEMORY'))
+
+        self.input_array[:] = numpy.random.randn(*self.input_array.shape)
+        input_copy = self.input_array.copy()
+        fft()
+        self.assertTrue(numpy.array_equal(self.input_array, input_copy))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid flags'):
+            FFTW(self.input_array, self.output_array,
+                    flags=('FFTW_DESTROY_INPUT', 'FFTW_PRESERVE_INPUT'))
+
+    def test_preserve_input_c2r(self):
+        input_array = empty_aligned((16, 9), dtype='complex128')
+        output_array = empty_aligned((16, 16), dtype='float64')
+
+        # FFTW can preserve the input over one axis...
+        fft = FFTW(input_array, output_array, direction='FFTW_BACKWARD',
+                flags=('FFTW_ESTIMATE', 'FFTW_PRESERVE_INPUT'))
+
+        input_array[:] = numpy.fft.rfft(numpy.random.randn(16, 16))
+        input_copy = input_array.copy()
+        fft()
+        self.assertTrue(numpy.array_equal(input_array, input_copy))
+
+        # ...but not more
+        with self.assertRaisesRegex(ValueError, 'Invalid flags'):
+            FFTW(input_array, output_array, axes=(0, 1),
+                    direction='FFTW_BACKWARD',
+                    flags=('FFTW_ESTIMATE', 'FFTW_PRESERVE_INPUT'))
+
     @unittest.skipIf(*miss('32'))
     def test_differing_aligned_arrays_update(self):
         '''Test to see if the alignment code is working as expected
@@ -372,6 +410,125 @@ class FFTWMiscTest(unittest.TestCase):
             FFTW, self.input_array, self.output_array,
             direction='FFTW_BACKWARD', ortho=True, normalise_idft=True)
 
+    def test_flops_and_cost(self):
+        add, mul, fma = self.fft.flops
+        self.assertGreater(add + mul + fma, 0)
+
+        self.assertGreater(self.fft.estimated_cost, 0)
+
+        # A plan that is recreated from wisdom has no measured cost
+        self.assertEqual(FFTW(self.input_array, self.output_array).cost, 0)
+
+        pyfftw.forget_wisdom()
+        measured_fft = FFTW(self.input_array, self.output_array)
+        self.assertGreater(measured_fft.cost, 0)
+
+        # A plan that is not measured may have no cost either
+        estimated_fft = FFTW(self.input_array, self.output_array,
+                             flags=('FFTW_ESTIMATE',))
+        self.assertGreaterEqual(estimated_fft.cost, 0)
+        self.assertGreater(estimated_fft.estimated_cost, 0)
+
+    def test_sprint_plan(self):
+        plan = self.fft.sprint_plan()
+        self.assertTrue(plan.startswith('('))
+        self.assertEqual(plan.count('('), plan.count(')'))
+
+        # A prime length cannot be split into smaller transforms
+        input_array = empty_aligned(1009, dtype='complex128')
+        output_array = empty_aligned(1009, dtype='complex128')
+        prime_fft = FFTW(input_array, output_array,
+                         flags=('FFTW_ESTIMATE',))
+
+        plan = prime_fft.sprint_plan()
+        self.assertTrue('rader' in plan or 'bluestein' in plan
+                        or 'generic' in plan)
+
+    def test_measure_gflops(self):
+        self.input_array[:] = 1
+        self.output_array[:] = 0
+        self.assertGreater(self.fft.measure_gflops(repeats=3), 0)
+
+        # The internal arrays are not used
+        self.assertTrue(numpy.all(self.input_array == 1))
+        self.assertTrue(numpy.all(self.output_array == 0))
+
+        # An in-place plan is executed on finite data in place
+        in_place_array = empty_aligned(self.input_array.shape,
+                                       dtype=self.input_array.dtype)
+        in_place_fft = FFTW(in_place_array, in_place_array)
+        in_place_array[:] = numpy.nan
+        self.assertGreater(in_place_fft.measure_gflops(repeats=3), 0)
+        self.assertTrue(numpy.all(numpy.isfinite(in_place_array)))
+
+        self.assertRaisesRegex(ValueError, 'Invalid repeats',
+                               self.fft.measure_gflops, 0)
+
+    def _large_stride_arrays(self, in_dtype, out_dtype, shape, out_shape):
+        '''Create input and output arrays in a sparse memory mapped file,
+        with a stride along the first axis of more than 2^31 items. Only
+        the few pages actually used are ever touched.
+        '''
+        if sys.maxsize < 2**40:
+            self.skipTest('Requires a 64-bit address space.')
+
+        stride_items = 2**31 + 64
+        in_stride = stride_items * numpy.dtype(in_dtype).itemsize
+        out_stride = stride_items * numpy.dtype(out_dtype).itemsize
+        in_bytes = in_stride * shape[0]
+        file_size = in_bytes + out_stride * out_shape[0]
+
+        fd, filename = tempfile.mkstemp()
+        self.addCleanup(os.remove, filename)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.truncate(file_size)
+
+            volume = numpy.memmap(filename, dtype=numpy.uint8, mode='r+',
+                                  shape=(file_size,))
+        except (OSError, ValueError, OverflowError) as e:
+            self.skipTest('Cannot create a large sparse file: %s' % e)
+
+        input_array = numpy.ndarray(
+            shape, dtype=in_dtype, buffer=volume,
+            strides=(in_stride,) + (numpy.dtype(in_dtype).itemsize,))
+        output_array = numpy.ndarray(
+            out_shape, dtype=out_dtype, buffer=volume, offset=in_bytes,
+            strides=(out_stride,) + (numpy.dtype(out_dtype).itemsize,))
+
+        return input_array, output_array
+
+    def test_large_strides_complex(self):
+        '''Strides of more than 2^31 items should be planned for through
+        the 64-bit guru interface.
+        '''
+        input_array, output_array = self._large_stride_arrays(
+            'complex128', 'complex128', (3, 16), (3, 16))
+
+        fft = FFTW(input_array, output_array, axes=(0, 1),
+                   flags=('FFTW_ESTIMATE',))
+
+        self.assertEqual(fft.input_strides[0], input_array.strides[0])
+
+        data = (numpy.random.randn(3, 16) + 1j*numpy.random.randn(3, 16))
+        input_array[:] = data
+        fft()
+
+        self.assertTrue(numpy.allclose(output_array, numpy.fft.fft2(data)))
+
+    def test_large_strides_real(self):
+        input_array, output_array = self._large_stride_arrays(
+            'float64', 'complex128', (4, 16), (4, 9))
+
+        fft = FFTW(input_array, output_array, axes=(0, 1),
+                   flags=('FFTW_ESTIMATE',))
+
+        data = numpy.random.randn(4, 16)
+        input_array[:] = data
+        fft()
+
+        self.assertTrue(numpy.allclose(output_array, numpy.fft.rfft2(data)))
+
 test_cases = (
         FFTWMiscTest,)
 
@@ -12,7 +12,8 @@ from numpy.testing import assert_equal
 class ConfigTest(unittest.TestCase):
 
     env_keys = ['PYFFTW_NUM_THREADS', 'OMP_NUM_THREADS',
-                'PYFFTW_PLANNER_EFFORT']
+                'PYFFTW_PLANNER_EFFORT', 'PYFFTW_LOW_MEMORY',
+                'PYFFTW_WISDOM_FILE', 'PYFFTW_TUNING_FILE']
     orig_env = {}
 
     def setUp(self):
@@ -36,10 +37,28 @@ class ConfigTest(unittest.TestCase):
         os.environ.pop('PYFFTW_NUM_THREADS', None)
         os.environ.pop('OMP_NUM_THREADS', None)
         os.environ.pop('PYFFTW_PLANNER_EFFORT', None)
+        os.environ.pop('PYFFTW_LOW_MEMORY', None)
+        os.environ.pop('PYFFTW_WISDOM_FILE', None)
+        os.environ.pop('PYFFTW_TUNING_FILE', None)
         # defaults to single-threaded and FFTW_ESTIMATE
         config._reload_config()
         assert_equal(config.NUM_THREADS, 1)
         assert_equal(config.PLANNER_EFFORT, 'FFTW_ESTIMATE')
+        assert_equal(config.LOW_MEMORY, False)
+        assert_equal(config.WISDOM_FILE, None)
+        assert_equal(config.TUNING_FILE, None)
+
+    def test_wisdom_file_config(self):
+        os.environ['PYFFTW_WISDOM_FILE'] = 'wisdom.json'
+        try:
+            config._reload_config()
+            assert_equal(config.WISDOM_FILE, 'wisdom.json')
+        finally:
+            # Nothing should be saved to the file by the other tests
+            os.environ.pop('PYFFTW_WISDOM_FILE')
+            config._env_reloader.reset()
+
+        assert_equal(config.WISDOM_FILE, None)
 
     @unittest.skipIf(_threading_type != 'OMP', reason='non-OpenMP build')
     def test_default_threads_OpenMP(self):
@@ -68,10 +87,12 @@ class ConfigTest(unittest.TestCase):
         else:
             os.environ['PYFFTW_NUM_THREADS'] = '4'
         os.environ['PYFFTW_PLANNER_EFFORT'] = 'FFTW_MEASURE'
+        os.environ['PYFFTW_LOW_MEMORY'] = '1'
 
         config._reload_config()
         assert_equal(config.NUM_THREADS, 4)
         assert_equal(config.PLANNER_EFFORT, 'FFTW_MEASURE')
+        assert_equal(config.LOW_MEMORY, True)
 
         # set values to something else
         config.NUM_THREADS = 6
@@ -86,6 +107,7 @@ class ConfigTest(unittest.TestCase):
         config._env_reloader.reset()
         assert_equal(config.NUM_THREADS, 4)
         assert_equal(config.PLANNER_EFFORT, 'FFTW_MEASURE')
+        assert_equal(config.LOW_MEMORY, True)
 
 
 test_cases = (ConfigTest, )
@@ -0,0 +1,201 @@
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+
+from pyfftw import (
+        FFTW, empty_aligned, add_planner_hook, remove_planner_hook,
+        LoggingPlannerHook, ChromeTracePlannerHook)
+
+from .test_pyfftw_base import run_test_suites, miss
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+import unittest
+
+class RecordingHook(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def before_plan(self, event):
+        self.calls.append(('before', event))
+
+    def after_plan(self, event):
+        self.calls.append(('after', event))
+
+@unittest.skipIf(*miss('64'))
+class PlannerHooksTest(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+
+        super(PlannerHooksTest, self).__init__(*args, **kwargs)
+
+        if not hasattr(self, 'assertRaisesRegex'):
+            self.assertRaisesRegex = self.assertRaisesRegexp
+
+    def setUp(self):
+        self.input_array = empty_aligned((16, 24), dtype='complex128')
+        self.output_array = empty_aligned((16, 24), dtype='complex128')
+
+    def add_hook(self, hook):
+        add_planner_hook(hook)
+        self.addCleanup(remove_planner_hook, hook)
+
+    def plan(self, flags=('FFTW_ESTIMATE',)):
+        return FFTW(self.input_array, self.output_array, axes=(1,),
+                    flags=flags, threads=2, planning_timelimit=1.5)
+
+    def test_events(self):
+        hook = RecordingHook()
+        self.add_hook(hook)
+
+        self.plan()
+
+        self.assertEqual([call[0] for call in hook.calls],
+                         ['before', 'after'])
+        before = hook.calls[0][1]
+        after = hook.calls[1][1]
+
+        self.assertEqual(before['input_shape'], (16, 24))
+        self.assertEqual(before['output_strides'], self.output_array.strides)
+        self.assertEqual(before['input_dtype'], 'complex128')
+        self.assertEqual(before['axes'], (1,))
+        self.assertEqual(before['direction'], 'FFTW_FORWARD')
+        self.assertIn('FFTW_ESTIMATE', before['flags'])
+        self.assertEqual(before['threads'], 2)
+        self.assertEqual(before['planning_timelimit'], 1.5)
+        self.assertEqual(before['thread_id'], threading.get_ident())
+
+        for key in before:
+            if key != 'start_time':
+                self.assertEqual(after[key], before[key])
+
+        self.assertGreaterEqual(after['start_time'], before['start_time'])
+        self.assertGreaterEqual(after['lock_wait_time'], 0)
+        self.assertGreater(after['planning_time'], 0)
+        self.assertTrue(after['succeeded'])
+
+    def test_failed_planning(self):
+        hook = RecordingHook()
+        self.add_hook(hook)
+
+        input_array = empty_aligned(97, dtype='complex128')
+        self.assertRaises(RuntimeError, FFTW, input_array,
+                          empty_aligned(97, dtype='complex128'),
+                          flags=('FFTW_EXHAUSTIVE', 'FFTW_WISDOM_ONLY'))
+
+        self.assertFalse(hook.calls[-1][1]['succeeded'])
+
+    def test_remove_hook(self):
+        hook = RecordingHook()
+        add_planner_hook(hook)
+        remove_planner_hook(hook)
+
+        self.plan()
+        self.assertEqual(hook.calls, [])
+
+        self.assertRaisesRegex(ValueError, 'Invalid hook',
+                               remove_planner_hook, hook)
+
+    def test_hook_exception(self):
+        class FailingHook(object):
+            def before_plan(self, event):
+                raise KeyError('failed')
+
+        self.add_hook(FailingHook())
+        self.assertRaises(KeyError, self.plan)
+
+    def test_logging_hook(self):
+        logger = logging.getLogger('pyfftw.test')
+
+        self.add_hook(LoggingPlannerHook(logger, level=logging.INFO))
+        with self.assertLogs(logger, logging.INFO) as logs:
+            self.plan()
+
+        self.assertEqual([record.levelno for record in logs.records],
+                         [logging.INFO, logging.INFO])
+        self.assertIn('Planning FFTW_FORWARD complex128(16, 24)',
+                      logs.output[0])
+        self.assertIn('Planned', logs.output[1])
+
+    def test_logging_hook_slow_plans(self):
+        logger = logging.getLogger('pyfftw.test')
+
+        self.add_hook(LoggingPlannerHook(logger, slow_time=0))
+        with self.assertLogs(logger, logging.DEBUG) as logs:
+            self.plan()
+
+        self.assertEqual([record.levelno for record in logs.records],
+                         [logging.DEBUG, logging.WARNING])
+
+    def test_chrome_trace_hook(self):
+        hook = ChromeTracePlannerHook()
+        self.add_hook(hook)
+
+        threads = [threading.Thread(target=self.plan) for n in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        events = hook.events()
+        self.assertEqual([event['name'] for event in events],
+                         ['planner lock', 'plan'] * 3)
+        self.assertEqual(set(event['tid'] for event in events),
+                         set(thread.ident for thread in threads))
+
+        for lock_event, plan_event in zip(events[::2], events[1::2]):
+            self.assertEqual(plan_event['ts'],
+                             lock_event['ts'] + lock_event['dur'])
+            self.assertEqual(plan_event['args']['input_shape'], [16, 24])
+
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        filename = os.path.join(tempdir, 'trace.json')
+        hook.save(filename)
+
+        with open(filename) as trace_file:
+            self.assertEqual(json.load(trace_file)['traceEvents'], events)
+
+
+test_cases = (
+        PlannerHooksTest,)
+
+test_set = None
+
+if __name__ == '__main__':
+
+    run_test_suites(test_cases, test_set)
@@ -49,6 +49,9 @@ import time
 
 import os
 import hashlib
+import json
+import shutil
+import tempfile
 
 '''Test the caching functionality of the interfaces package.
 '''
@@ -91,6 +94,13 @@ class InterfacesNumpyFFTCacheTestFFT(InterfacesNumpyFFTTestFFT):
         # Turn it off to finish
         interfaces.cache.disable()
 
+    def test_out(self):
+        interfaces.cache.enable()
+        try:
+            super(InterfacesNumpyFFTCacheTestFFT, self).test_out()
+        finally:
+            interfaces.cache.disable()
+
 @unittest.skipIf(*miss('64'))
 class CacheSpecificInterfacesUtils(unittest.TestCase):
 
@@ -133,6 +143,198 @@ class CacheSpecificInterfacesUtils(unittest.TestCase):
             # Revert the monkey patching
             interfaces.cache._Cache = _Cache_class
 
+    def test_miss_makes_no_copies(self):
+        '''Checks that planning on a cache miss neither copies nor
+        touches the input array.
+        '''
+        class CopyCountingArray(numpy.ndarray):
+            copies = 0
+
+            def copy(self, *args, **kwargs):
+                CopyCountingArray.copies += 1
+                return numpy.ndarray.copy(self, *args, **kwargs)
+
+        a = pyfftw.empty_aligned((32, 64), dtype='complex128')
+        a[:] = numpy.random.randn(32, 64) + 1j*numpy.random.randn(32, 64)
+        a_copy = numpy.array(a)
+        a = a.view(CopyCountingArray)
+
+        interfaces.cache.enable()
+        try:
+            output = interfaces.numpy_fft.fftn(
+                a, planner_effort='FFTW_MEASURE')
+        finally:
+            interfaces.cache.disable()
+
+        self.assertEqual(CopyCountingArray.copies, 0)
+        self.assertTrue(numpy.array_equal(a, a_copy))
+        self.assertTrue(numpy.allclose(output, numpy.fft.fftn(a_copy)))
+
+    def test_concurrent_calls(self):
+        '''Checks that threads transforming the same shape at the same time
+        each get their own object from the cache.
+        '''
+        data_shape = (64, 128)
+        n_threads = 4
+        n_calls = 50
+
+        results = []
+        barrier = threading.Barrier(n_threads)
+
+        def worker(seed):
+            rng = numpy.random.RandomState(seed)
+            barrier.wait()
+
+            ok = True
+            for n in range(n_calls):
+                a = rng.randn(*data_shape) + 1j*rng.randn(*data_shape)
+                ok &= numpy.allclose(
+                    interfaces.numpy_fft.fft2(a), numpy.fft.fft2(a))
+
+            results.append(ok)
+
+        interfaces.cache.enable()
+        try:
+            threads = [threading.Thread(target=worker, args=(n,))
+                       for n in range(n_threads)]
+
+            for each_thread in threads:
+                each_thread.start()
+
+            for each_thread in threads:
+                each_thread.join()
+
+            self.assertEqual(results, [True] * n_threads)
+
+            # The idle objects were returned to the cache, up to the cap
+            # for each key (the alignment of the arrays is part of the key)
+            _cache = interfaces.cache._fftw_cache
+            self.assertTrue(len(_cache) > 0)
+            for entry in _cache._cache_dict.values():
+                self.assertTrue(len(entry.objects) <= _cache.max_per_key)
+        finally:
+            interfaces.cache.disable()
+
+
+class CacheManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'manifest.json')
+
+        # An aligned array, a misaligned view and a strided view
+        self.a = pyfftw.empty_aligned((16, 32), dtype='complex128')
+        self.a[:] = numpy.random.randn(16, 32) + 1j*numpy.random.randn(16, 32)
+
+        b_buffer = numpy.random.randn(65).astype('float32')
+        self.b = b_buffer[1:]
+        self.c = numpy.random.randn(32, 10)[:, ::2]
+
+    def tearDown(self):
+        interfaces.cache.disable()
+        shutil.rmtree(self.tempdir)
+
+    def transforms(self):
+        return [
+            (interfaces.numpy_fft.fft2(self.a), numpy.fft.fft2(self.a)),
+            (interfaces.numpy_fft.rfft(self.b, 40), numpy.fft.rfft(self.b, 40)),
+            (interfaces.numpy_fft.irfftn(self.a, axes=(0,)),
+             numpy.fft.irfftn(self.a, axes=(0,))),
+            (interfaces.numpy_fft.fftn(self.c, threads=2),
+             numpy.fft.fftn(self.c))]
+
+    def check_warm(self):
+        keys = set(interfaces.cache._fftw_cache.keys())
+        interfaces.cache.reset_statistics()
+
+        for output, expected in self.transforms():
+            self.assertTrue(numpy.allclose(output, expected))
+
+        statistics = interfaces.cache.get_statistics()
+        self.assertEqual(statistics['hits'], 4)
+        self.assertEqual(statistics['misses'], 0)
+        self.assertEqual(set(interfaces.cache._fftw_cache.keys()), keys)
+
+    def test_cache_not_enabled(self):
+        with self.assertRaises(interfaces.cache.CacheError):
+            interfaces.cache.save_manifest(self.filename)
+
+        with self.assertRaises(interfaces.cache.CacheError):
+            interfaces.cache.warm_start(self.filename)
+
+    def test_save_manifest(self):
+        interfaces.cache.enable()
+        self.transforms()
+        interfaces.cache.save_manifest(self.filename)
+
+        with open(self.filename) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        self.assertEqual(len(manifest['transforms']), 4)
+
+        transform = [each for each in manifest['transforms']
+                     if each['function'] == 'rfft'][0]
+        self.assertEqual(transform['shape'], [64])
+        self.assertEqual(transform['strides'], [4])
+        self.assertEqual(transform['dtype'], self.b.dtype.str)
+        self.assertEqual(transform['s'], 40)
+        self.assertEqual(transform['axes'], -1)
+        self.assertEqual(transform['alignment'],
+                         self.b.ctypes.data % pyfftw.simd_alignment)
+
+        transform = [each for each in manifest['transforms']
+                     if each['function'] == 'fftn'][0]
+        self.assertEqual(transform['threads'], 2)
+        self.assertEqual(transform['strides'], list(self.c.strides))
+
+    def test_warm_start(self):
+        interfaces.cache.enable()
+        self.transforms()
+        interfaces.cache.save_manifest(self.filename)
+        interfaces.cache.disable()
+
+        interfaces.cache.enable()
+        self.assertIs(interfaces.cache.warm_start(self.filename), None)
+
+        statistics = interfaces.cache.get_statistics()
+        self.assertEqual(len(interfaces.cache._fftw_cache), 4)
+        self.assertEqual(statistics['misses'], 0)
+        self.assertTrue(statistics['planning_time'] > 0)
+
+        self.check_warm()
+
+        # Transforms already in the cache are not built again
+        interfaces.cache.warm_start(self.filename)
+        self.assertEqual(len(interfaces.cache._fftw_cache), 4)
+
+    def test_warm_start_background(self):
+        interfaces.cache.enable()
+        self.transforms()
+        interfaces.cache.save_manifest(self.filename)
+        interfaces.cache.disable()
+
+        interfaces.cache.enable()
+        warm_thread = interfaces.cache.warm_start(
+            self.filename, background=True)
+
+        self.assertIsInstance(warm_thread, threading.Thread)
+        self.assertTrue(warm_thread.daemon)
+        warm_thread.join()
+
+        self.assertEqual(len(interfaces.cache._fftw_cache), 4)
+        self.check_warm()
+
+    def test_invalid_manifest(self):
+        interfaces.cache.enable()
+
+        for manifest in ([], {'transforms': []},
+                         {'version': 1, 'transforms': [{'function': 'fft'}]}):
+
+            with open(self.filename, 'w') as manifest_file:
+                json.dump(manifest, manifest_file)
+
+            with self.assertRaisesRegex(ValueError, 'Invalid manifest'):
+                interfaces.cache.warm_start(self.filename)
 
 class InterfacesCacheTest(unittest.TestCase):
 
@@ -182,48 +384,13 @@ class InterfacesCacheTest(unittest.TestCase):
 
 class CacheTest(unittest.TestCase):
 
-    def test_cache_parent_thread_ended(self):
-        '''Test ending cache parent thread ends cache thread.
+    def test_no_cache_thread(self):
+        '''Test the cache does not start a thread.
         '''
-        # Firstly make sure we've exited any lingering threads from other
-        # tests.
-        time.sleep(0.1)
-
-        self.assertTrue(_check_n_cache_threads_running() == 0)
-
-        def cache_parent_thread():
-            cache = interfaces.cache._Cache()
-            time.sleep(0.5)
-
-        # We give the parent thread the same name as a Cache thread so
-        # it is picked up by the cache_threads_running function
-        parent_t = threading.Thread(
-            target=cache_parent_thread, name='PyFFTWCacheThread')
-        parent_t.start()
-
-        time.sleep(0.1)
-        # Check it's running
-        self.assertTrue(_check_n_cache_threads_running() == 2)
-
-        parent_t.join()
-        time.sleep(0.1)
-        # Check both threads have exited properly
-        self.assertTrue(_check_n_cache_threads_running() == 0)
-
-    def test_delete_cache_object(self):
-        '''Test deleting a cache object ends cache thread.
-        '''
-        # Firstly make sure we've exited any lingering threads from other
-        # tests.
-        time.sleep(0.2)
-        self.assertTrue(_check_n_cache_threads_running() == 0)
+        n_threads = threading.active_count()
 
         _cache = interfaces.cache._Cache()
-        time.sleep(0.2)
-        self.assertTrue(_check_n_cache_threads_running() == 1)
-
-        del _cache
-        time.sleep(0.2)
+        self.assertEqual(threading.active_count(), n_threads)
         self.assertTrue(_check_n_cache_threads_running() == 0)
 
     @unittest.skipIf(*miss('64'))
@@ -254,7 +421,7 @@ class CacheTest(unittest.TestCase):
         _cache = interfaces.cache._Cache()
 
         # The default
-        self.assertEqual(_cache.keepalive_time, 0.1)
+        self.assertIs(_cache.keepalive_time, None)
 
         _cache.set_keepalive_time(0.3)
         self.assertEqual(_cache.keepalive_time, 0.3)
@@ -271,6 +438,9 @@ class CacheTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             _cache.set_keepalive_time([])
 
+        _cache.set_keepalive_time(None)
+        self.assertIs(_cache.keepalive_time, None)
+
     @unittest.skipIf(*miss('64'))
     def test_contains(self):
         _cache = interfaces.cache._Cache()
@@ -286,7 +456,7 @@ class CacheTest(unittest.TestCase):
 
     @unittest.skipIf(*miss('64'))
     def test_objects_removed_after_keepalive(self):
-        _cache = interfaces.cache._Cache()
+        _cache = interfaces.cache._Cache(keepalive_time=0.1)
 
         key = 'the key'
 
@@ -327,6 +497,390 @@ class CacheTest(unittest.TestCase):
 
         self.assertRaises(KeyError, _cache.lookup, key)
 
+    @unittest.skipIf(*miss('64'))
+    def test_objects_kept_without_keepalive(self):
+        _cache = interfaces.cache._Cache()
+
+        obj = builders.fft(numpy.random.randn(16))
+        _cache.insert(obj, 'the key')
+
+        time.sleep(0.3)
+        self.assertIs(_cache.lookup('the key'), obj)
+
+    @unittest.skipIf(*miss('64'))
+    def test_least_recently_used_removed(self):
+        _cache = interfaces.cache._Cache(max_entries=3, max_bytes=None)
+
+        objs = [builders.fft(numpy.random.randn(16)) for n in range(4)]
+
+        for n in range(3):
+            _cache.insert(objs[n], n)
+
+        # Using 0 makes 1 the least recently used
+        self.assertIs(_cache.lookup(0), objs[0])
+        _cache.insert(objs[3], 3)
+
+        self.assertEqual(len(_cache), 3)
+        self.assertFalse(1 in _cache)
+        for n in (0, 2, 3):
+            self.assertIs(_cache.lookup(n), objs[n])
+
+        _cache.set_max_entries(1)
+        self.assertEqual(len(_cache), 1)
+        self.assertIs(_cache.lookup(3), objs[3])
+
+    @unittest.skipIf(*miss('64'))
+    def test_bytes_bound(self):
+        # Each object holds 16 complex128 inputs and outputs
+        obj_nbytes = 2 * 16 * 16
+
+        _cache = interfaces.cache._Cache(max_entries=None,
+                                         max_bytes=3 * obj_nbytes)
+
+        objs = [builders.fft(numpy.random.randn(16) + 0j) for n in range(4)]
+
+        for n in range(4):
+            _cache.insert(objs[n], n)
+            self.assertEqual(_cache.nbytes, min(n + 1, 3) * obj_nbytes)
+
+        self.assertFalse(0 in _cache)
+        self.assertEqual(len(_cache), 3)
+
+        _cache.set_max_bytes(obj_nbytes - 1)
+        self.assertEqual(len(_cache), 0)
+        self.assertEqual(_cache.nbytes, 0)
+
+        # An object bigger than the bound is not kept
+        _cache.insert(objs[0], 0)
+        self.assertFalse(0 in _cache)
+
+    @unittest.skipIf(*miss('64'))
+    def test_checkout_and_checkin(self):
+        _cache = interfaces.cache._Cache(max_per_key=2)
+
+        objs = [builders.fft(numpy.random.randn(16)) for n in range(3)]
+
+        for obj in objs:
+            _cache.checkin(obj, 'the key')
+
+        # Only max_per_key objects are kept
+        self.assertEqual(len(_cache), 2)
+
+        # Each checkout hands out a different object, most recent first
+        self.assertIs(_cache.checkout('the key'), objs[1])
+        self.assertIs(_cache.checkout('the key'), objs[0])
+
+        self.assertFalse('the key' in _cache)
+        self.assertEqual(len(_cache), 0)
+        self.assertEqual(_cache.nbytes, 0)
+        self.assertRaises(KeyError, _cache.checkout, 'the key')
+
+        _cache.checkin(objs[0], 'the key')
+        self.assertIs(_cache.checkout('the key'), objs[0])
+
+    @unittest.skipIf(*miss('64'))
+    def test_max_per_key_update(self):
+        _cache = interfaces.cache._Cache(max_per_key=None)
+
+        objs = [builders.fft(numpy.random.randn(16)) for n in range(5)]
+
+        for obj in objs:
+            _cache.checkin(obj, 'the key')
+
+        self.assertEqual(len(_cache), 5)
+
+        _cache.set_max_per_key(2)
+        self.assertEqual(_cache.max_per_key, 2)
+        self.assertEqual(len(_cache), 2)
+        self.assertIs(_cache.checkout('the key'), objs[4])
+        self.assertIs(_cache.checkout('the key'), objs[3])
+
+        _cache.set_max_per_key(0)
+        _cache.checkin(objs[0], 'the key')
+        self.assertEqual(len(_cache), 0)
+        self.assertFalse('the key' in _cache)
+
+    def test_invalid_bounds(self):
+        _cache = interfaces.cache._Cache()
+
+        with self.assertRaisesRegex(ValueError, 'Invalid max_entries'):
+            _cache.set_max_entries(-1)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid max_bytes'):
+            _cache.set_max_bytes(-1)
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Invalid adaptive_threshold'):
+            _cache.set_adaptive_threshold(-1)
+
+    def test_set_bounds(self):
+        with self.assertRaises(interfaces.cache.CacheError):
+            interfaces.cache.set_max_entries(10)
+
+        with self.assertRaises(interfaces.cache.CacheError):
+            interfaces.cache.set_max_bytes(10)
+
+        with self.assertRaises(interfaces.cache.CacheError):
+            interfaces.cache.set_max_per_key(10)
+
+        interfaces.cache.enable()
+        interfaces.cache.set_max_entries(10)
+        interfaces.cache.set_max_bytes(1000)
+        interfaces.cache.set_max_per_key(3)
+
+        self.assertEqual(interfaces.cache._fftw_cache.max_entries, 10)
+        self.assertEqual(interfaces.cache._fftw_cache.max_bytes, 1000)
+        self.assertEqual(interfaces.cache._fftw_cache.max_per_key, 3)
+
+        interfaces.cache.disable()
+
+    @unittest.skipIf(*miss('64'))
+    def test_statistics(self):
+        _cache = interfaces.cache._Cache(max_per_key=1)
+
+        objs = [builders.fft(numpy.random.randn(16)) for n in range(2)]
+        nbytes = interfaces.cache._nbytes(objs[0])
+
+        # A miss, planned in 2 seconds
+        self.assertRaises(KeyError, _cache.checkout, 'a')
+        _cache.checkin(objs[0], 'a', 2.0)
+
+        # Two hits
+        for n in range(2):
+            _cache.checkin(_cache.checkout('a'), 'a')
+
+        # A miss on another key, whose object is evicted by max_per_key
+        self.assertRaises(KeyError, _cache.checkout, 'b')
+        _cache.checkin(objs[1], 'b', 1.0)
+        _cache.checkin(objs[0], 'b')
+
+        statistics = _cache.get_statistics()
+
+        self.assertEqual(statistics['keys']['a'], {
+            'hits': 2, 'misses': 1, 'evictions': 0, 'upgrades': 0,
+            'planning_time': 2.0, 'planning_time_saved': 4.0,
+            'nbytes': nbytes})
+        self.assertEqual(statistics['keys']['b'], {
+            'hits': 0, 'misses': 1, 'evictions': 1, 'upgrades': 0,
+            'planning_time': 1.0, 'planning_time_saved': 0.0,
+            'nbytes': nbytes})
+
+        self.assertEqual(statistics['hits'], 2)
+        self.assertEqual(statistics['misses'], 2)
+        self.assertEqual(statistics['evictions'], 1)
+        self.assertEqual(statistics['planning_time'], 3.0)
+        self.assertEqual(statistics['planning_time_saved'], 4.0)
+        self.assertEqual(statistics['nbytes'], 2 * nbytes)
+
+        # Evictions by the bounds are counted against the key
+        _cache.set_max_entries(0)
+        self.assertEqual(_cache.get_statistics()['keys']['a']['evictions'], 1)
+        self.assertEqual(_cache.get_statistics()['nbytes'], 0)
+
+        _cache.reset_statistics()
+        statistics = _cache.get_statistics()
+
+        self.assertEqual(statistics['keys'], {})
+        for name in ('hits', 'misses', 'evictions', 'planning_time',
+                     'planning_time_saved', 'nbytes'):
+            self.assertEqual(statistics[name], 0)
+
+    def test_statistics_bound(self):
+        _cache = interfaces.cache._Cache(max_entries=4, max_per_key=1,
+                                         max_key_states=8)
+
+        obj = builders.fft(numpy.random.randn(16))
+
+        for n in range(20):
+            self.assertRaises(KeyError, _cache.checkout, n)
+            _cache.checkin(obj, n, 1.0)
+            obj = _cache.checkout(n)
+
+        # Only the most recently used keys are kept
+        statistics = _cache.get_statistics()
+        self.assertEqual(sorted(statistics['keys']), list(range(12, 20)))
+        self.assertEqual(len(_cache._statistics), 8)
+
+        # The rest are still in the totals
+        self.assertEqual(statistics['hits'], 20)
+        self.assertEqual(statistics['misses'], 20)
+        self.assertEqual(statistics['planning_time'], 20.0)
+        self.assertEqual(statistics['planning_time_saved'], 20.0)
+
+        # Using a key keeps its statistics
+        _cache.checkin(obj, 12)
+        _cache.checkout(12)
+        self.assertRaises(KeyError, _cache.checkout, 20)
+        self.assertIn(12, _cache.get_statistics()['keys'])
+        self.assertNotIn(13, _cache.get_statistics()['keys'])
+
+        _cache.reset_statistics()
+        self.assertEqual(_cache.get_statistics()['hits'], 0)
+
+    def test_interfaces_key_states_bound(self):
+        '''Transforms whose shapes keep changing should not grow the
+        statistics or the adaptive planning state without bound.
+        '''
+        interfaces.cache.enable()
+        try:
+            _cache = interfaces.cache._fftw_cache
+            _cache._max_key_states = 16
+            interfaces.cache.set_max_entries(4)
+            interfaces.cache.set_adaptive_threshold(100)
+
+            for n in range(1, 41):
+                interfaces.numpy_fft.fft(numpy.random.randn(n),
+                                         planner_effort='FFTW_MEASURE')
+
+            self.assertEqual(len(_cache._statistics), 16)
+            self.assertEqual(len(_cache._adaptive_state), 16)
+            self.assertEqual(
+                interfaces.cache.get_statistics()['misses'], 40)
+        finally:
+            interfaces.cache.disable()
+
+    def test_interfaces_statistics(self):
+        with self.assertRaises(interfaces.cache.CacheError):
+            interfaces.cache.get_statistics()
+
+        with self.assertRaises(interfaces.cache.CacheError):
+            interfaces.cache.reset_statistics()
+
+        interfaces.cache.enable()
+        try:
+            a = pyfftw.empty_aligned((32, 32), dtype='complex128')
+            a[:] = numpy.random.randn(32, 32)
+
+            for n in range(3):
+                interfaces.numpy_fft.fft2(a)
+
+            statistics = interfaces.cache.get_statistics()
+            self.assertEqual(statistics['hits'], 2)
+            self.assertEqual(statistics['misses'], 1)
+            self.assertTrue(statistics['planning_time'] > 0)
+            self.assertTrue(statistics['planning_time_saved'] > 0)
+            self.assertEqual(
+                statistics['nbytes'], interfaces.cache._fftw_cache.nbytes)
+
+            key, = statistics['keys']
+            self.assertEqual(key[:4], ('fft2', a.shape, a.strides, a.dtype))
+
+            interfaces.cache.reset_statistics()
+            self.assertEqual(interfaces.cache.get_statistics()['hits'], 0)
+            self.assertEqual(len(interfaces.cache._fftw_cache), 1)
+        finally:
+            interfaces.cache.disable()
+
+    def test_adaptive_planning(self):
+        with self.assertRaises(interfaces.cache.CacheError):
+            interfaces.cache.set_adaptive_threshold(3)
+
+        interfaces.cache.enable()
+        try:
+            _cache = interfaces.cache._fftw_cache
+            interfaces.cache.set_adaptive_threshold(3)
+
+            a = pyfftw.empty_aligned((32, 32), dtype='complex128')
+            a[:] = numpy.random.randn(32, 32) + 1j*numpy.random.randn(32, 32)
+            expected = numpy.fft.fft2(a)
+
+            for n in range(2):
+                output = interfaces.numpy_fft.fft2(
+                    a, planner_effort='FFTW_MEASURE')
+                self.assertTrue(numpy.allclose(output, expected))
+
+            # The transform is estimated until it has been used 3 times
+            key, = _cache.keys()
+            self.assertEqual(_cache.planner_effort(key), 'FFTW_ESTIMATE')
+            self.assertTrue('FFTW_ESTIMATE' in _cache.lookup(key).flags)
+
+            output = interfaces.numpy_fft.fft2(
+                a, planner_effort='FFTW_MEASURE')
+            self.assertTrue(numpy.allclose(output, expected))
+
+            _cache.wait_for_upgrades()
+
+            self.assertEqual(_cache.planner_effort(key), 'FFTW_MEASURE')
+            self.assertEqual(len(_cache), 1)
+            self.assertTrue('FFTW_MEASURE' in _cache.lookup(key).flags)
+            self.assertEqual(
+                interfaces.cache.get_statistics()['upgrades'], 1)
+
+            output = interfaces.numpy_fft.fft2(
+                a, planner_effort='FFTW_MEASURE')
+            self.assertTrue(numpy.allclose(output, expected))
+
+            # Transforms that are estimated anyway are left alone
+            for n in range(3):
+                interfaces.numpy_fft.fft(a, planner_effort='FFTW_ESTIMATE')
+
+            _cache.wait_for_upgrades()
+            self.assertEqual(
+                interfaces.cache.get_statistics()['upgrades'], 1)
+        finally:
+            interfaces.cache.disable()
+
+    def test_adaptive_planning_discards_estimated_objects(self):
+        interfaces.cache.enable()
+        try:
+            _cache = interfaces.cache._fftw_cache
+            interfaces.cache.set_adaptive_threshold(1)
+
+            a = pyfftw.empty_aligned(64, dtype='complex128')
+            a[:] = numpy.random.randn(64) + 1j*numpy.random.randn(64)
+
+            # The upgrade starts with the first call, so the estimated
+            # object is checked in either before or after it is done.
+            output = interfaces.numpy_fft.fft(
+                a, planner_effort='FFTW_MEASURE')
+            self.assertTrue(numpy.allclose(output, numpy.fft.fft(a)))
+
+            _cache.wait_for_upgrades()
+
+            key, = _cache.keys()
+            self.assertEqual(len(_cache), 1)
+            self.assertTrue('FFTW_MEASURE' in _cache.lookup(key).flags)
+        finally:
+            interfaces.cache.disable()
+
+    def test_adaptive_state_kept_while_cached(self):
+        '''A key that has been upgraded should stay upgraded while it is
+        in the cache, however many other keys have a state.
+        '''
+        interfaces.cache.enable()
+        try:
+            _cache = interfaces.cache._fftw_cache
+            _cache._max_key_states = 2
+            interfaces.cache.set_adaptive_threshold(1)
+
+            a = pyfftw.empty_aligned(64, dtype='complex128')
+            a[:] = numpy.random.randn(64) + 1j*numpy.random.randn(64)
+
+            interfaces.numpy_fft.fft(a, planner_effort='FFTW_MEASURE')
+            _cache.wait_for_upgrades()
+            key, = _cache.keys()
+
+            for n in range(3, 9):
+                interfaces.numpy_fft.fft(numpy.random.randn(n),
+                                         planner_effort='FFTW_MEASURE')
+                _cache.wait_for_upgrades()
+
+            self.assertEqual(_cache.planner_effort(key), 'FFTW_MEASURE')
+            self.assertEqual(
+                interfaces.cache.get_statistics()['upgrades'], 7)
+
+            # The key is not upgraded again
+            output = interfaces.numpy_fft.fft(
+                a, planner_effort='FFTW_MEASURE')
+            self.assertTrue(numpy.allclose(output, numpy.fft.fft(a)))
+            _cache.wait_for_upgrades()
+
+            self.assertEqual(
+                interfaces.cache.get_statistics()['upgrades'], 7)
+            self.assertTrue('FFTW_MEASURE' in _cache.lookup(key).flags)
+        finally:
+            interfaces.cache.disable()
+
     def test_misaligned_data_doesnt_clobber_cache(self):
         '''A bug was highlighted in #197 in which misaligned data causes
         an overwrite of an FFTW internal array which is also the same as
@@ -360,6 +914,31 @@ class CacheTest(unittest.TestCase):
 
         interfaces.cache.disable()
 
+    def test_invalid_out_returns_object(self):
+        '''An invalid ``out`` should not lose the cached object.
+        '''
+        interfaces.cache.enable()
+        try:
+            a = pyfftw.empty_aligned((32, 32), dtype='complex128')
+            a[:] = np.random.randn(32, 32) + 1j*np.random.randn(32, 32)
+
+            interfaces.numpy_fft.fft2(a)
+            self.assertEqual(len(interfaces.cache._fftw_cache), 1)
+
+            out = pyfftw.empty_aligned(
+                (32, 32), dtype='complex128', order='F')
+            with self.assertRaisesRegex(ValueError, 'Invalid output'):
+                interfaces.numpy_fft.fft2(a, out=out)
+
+            self.assertEqual(len(interfaces.cache._fftw_cache), 1)
+
+            out = pyfftw.empty_aligned((32, 32), dtype='complex128')
+            output = interfaces.numpy_fft.fft2(a, out=out)
+            self.assertIs(output, out)
+            self.assertTrue(np.allclose(out, np.fft.fft2(a)))
+        finally:
+            interfaces.cache.disable()
+
 
 class InterfacesNumpyFFTCacheTestIFFT(InterfacesNumpyFFTCacheTestFFT):
     func = 'ifft'
@@ -422,6 +1001,7 @@ class InterfacesNumpyFFTCacheTestIRFFTN(InterfacesNumpyFFTCacheTestFFTN):
 test_cases = (
         CacheTest,
         InterfacesCacheTest,
+        CacheManifestTest,
         CacheSpecificInterfacesUtils,
         InterfacesNumpyFFTCacheTestFFT,
         InterfacesNumpyFFTCacheTestIFFT,
@@ -0,0 +1,225 @@
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+from pyfftw import (
+        config, export_wisdom, forget_wisdom, load_wisdom, _wisdom)
+from pyfftw.__main__ import main
+
+from .test_pyfftw_base import run_test_suites, miss
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import unittest
+
+@unittest.skipIf(*miss('64'))
+class MainTest(unittest.TestCase):
+    '''Test the ``python -m pyfftw`` command line tool, by calling its
+    main function.
+    '''
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.wisdom_file = config.WISDOM_FILE
+
+        self.manifest = self.write_manifest('manifest.json', [
+            {'shape': [32, 16]},
+            {'function': 'rfft', 'shape': [40], 'dtype': 'float64'}])
+        self.other_manifest = self.write_manifest('other.json', [
+            {'function': 'ifft', 'shape': [24]}])
+
+    def tearDown(self):
+        config.WISDOM_FILE = self.wisdom_file
+        forget_wisdom()
+        shutil.rmtree(self.tempdir)
+
+    def path(self, filename):
+        return os.path.join(self.tempdir, filename)
+
+    def write_manifest(self, filename, transforms):
+        with open(self.path(filename), 'w') as manifest_file:
+            json.dump({'version': 1, 'transforms': transforms},
+                      manifest_file)
+
+        return self.path(filename)
+
+    def run_main(self, *args):
+        '''Return the exit status and the output of the tool.
+        '''
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = main(list(args))
+
+        return status, output.getvalue()
+
+    def wisdom_lines(self, filename):
+        forget_wisdom()
+        load_wisdom(filename)
+
+        return sum(each.count(b'\n') for each in export_wisdom())
+
+    def test_plan_and_validate(self):
+        bundle = self.path('bundle.json')
+
+        status, output = self.run_main(
+            'plan', self.manifest, '-o', bundle, '-e', 'FFTW_ESTIMATE')
+        self.assertEqual(status, 0)
+        self.assertEqual(output.count('planned'), 2)
+        self.assertIs(config.WISDOM_FILE, None)
+
+        status, output = self.run_main('validate', bundle, self.manifest,
+                                       '-e', 'FFTW_ESTIMATE')
+        self.assertEqual(status, 0)
+        self.assertIn('0 of 2 transforms have no wisdom', output)
+
+        # The transforms have no wisdom at a higher effort
+        status, output = self.run_main('validate', bundle, self.manifest)
+        self.assertEqual(status, 1)
+        self.assertIn('2 of 2 transforms have no wisdom', output)
+
+        status, output = self.run_main('validate', bundle,
+                                       self.other_manifest)
+        self.assertEqual(status, 1)
+        self.assertIn('missing ifft (24,)', output)
+
+    def test_plan_with_workers(self):
+        bundle = self.path('bundle.json')
+
+        status, output = self.run_main(
+            'plan', self.manifest, '-o', bundle, '-j', '2')
+        self.assertEqual(status, 0)
+
+        status, output = self.run_main('validate', bundle, self.manifest)
+        self.assertEqual(status, 0)
+
+    def test_merge_and_prune(self):
+        bundle = self.path('bundle.json')
+        other_bundle = self.path('other_bundle.json')
+        merged = self.path('merged.json')
+        pruned = self.path('pruned.json')
+
+        self.run_main('plan', self.manifest, '-o', bundle)
+        self.run_main('plan', self.other_manifest, '-o', other_bundle)
+
+        status, output = self.run_main('merge', merged, bundle, other_bundle)
+        self.assertEqual(status, 0)
+
+        for manifest in (self.manifest, self.other_manifest):
+            status, output = self.run_main('validate', merged, manifest)
+            self.assertEqual(status, 0)
+
+        status, output = self.run_main('prune', merged, self.manifest,
+                                       '-o', pruned)
+        self.assertEqual(status, 0)
+
+        status, output = self.run_main('validate', pruned, self.manifest)
+        self.assertEqual(status, 0)
+        status, output = self.run_main('validate', pruned,
+                                       self.other_manifest)
+        self.assertEqual(status, 1)
+
+        self.assertLess(self.wisdom_lines(pruned),
+                        self.wisdom_lines(merged))
+
+        # By default the bundle is pruned in place
+        status, output = self.run_main('prune', merged, self.other_manifest)
+        self.assertEqual(status, 0)
+        status, output = self.run_main('validate', merged, self.manifest)
+        self.assertEqual(status, 1)
+
+    def test_merge_other_machines(self):
+        bundle = self.path('bundle.json')
+        other_bundle = self.path('other_bundle.json')
+        merged = self.path('merged.json')
+
+        self.run_main('plan', self.manifest, '-o', bundle)
+
+        fingerprint = _wisdom._fingerprint()
+        try:
+            _wisdom._machine_fingerprint = dict(fingerprint, cores=0)
+            self.run_main('plan', self.other_manifest, '-o', other_bundle)
+
+            self.run_main('merge', merged, bundle, other_bundle)
+
+            # Only the wisdom planned on this machine is used
+            status, output = self.run_main('validate', merged,
+                                           self.other_manifest)
+            self.assertEqual(status, 0)
+            status, output = self.run_main('validate', merged,
+                                           self.manifest)
+            self.assertEqual(status, 1)
+
+        finally:
+            _wisdom._machine_fingerprint = fingerprint
+
+        status, output = self.run_main('validate', merged, self.manifest)
+        self.assertEqual(status, 0)
+        status, output = self.run_main('validate', merged,
+                                       self.other_manifest)
+        self.assertEqual(status, 1)
+
+    def test_prune_missing_wisdom_fails(self):
+        bundle = self.path('bundle.json')
+        self.run_main('plan', self.manifest, '-o', bundle)
+
+        status, output = self.run_main('prune', bundle, self.other_manifest)
+        self.assertEqual(status, 2)
+
+    def test_invalid_manifest_fails(self):
+        bundle = self.path('bundle.json')
+
+        for transforms in ([{'function': 'fftn'}],
+                           [{'function': 'not_a_function', 'shape': [8]}]):
+            manifest = self.write_manifest('invalid.json', transforms)
+
+            status, output = self.run_main(
+                'plan', manifest, '-o', bundle)
+            self.assertEqual(status, 2)
+
+        self.assertFalse(os.path.exists(bundle))
+
+        status, output = self.run_main(
+            'validate', self.path('missing.json'), self.manifest)
+        self.assertEqual(status, 2)
+
+
+test_cases = (
+        MainTest,)
+
+test_set = None
+
+if __name__ == '__main__':
+
+    run_test_suites(test_cases, test_set)
@@ -32,7 +32,8 @@
 # POSSIBILITY OF SUCH DAMAGE.
 #
 
-from pyfftw import interfaces, _supported_types, _all_types_np
+from pyfftw import (
+        interfaces, _supported_types, _all_types_np, empty_aligned)
 
 from .test_pyfftw_base import run_test_suites, np_fft
 from ._get_default_args import get_default_args
@@ -185,6 +186,7 @@ class InterfacesNumpyFFTTestFFT(unittest.TestCase):
 
     realinv = False
     has_norm_kwarg = _numpy_fft_has_norm_kwarg()
+    has_out_kwarg = True
 
     @property
     def test_data(self):
@@ -674,6 +676,49 @@ class InterfacesNumpyFFTTestFFT(unittest.TestCase):
             interfaces.numpy_fft.fft,
             a, overwrite_input=True)
 
+    def test_out(self):
+        '''Test the output is written into a suitable out array, and that
+        an unsuitable one raises a ValueError.
+        '''
+        if not self.has_out_kwarg:
+            self.skipTest('out is not supported by this interface')
+
+        dtype_tuple = self.io_dtypes[functions[self.func]]
+        interface_func = getattr(self.test_interface, self.func)
+
+        for dtype in dtype_tuple[0]:
+            for test_shape, s, kwargs in self.test_data:
+                input_array = self.munge_input_array(
+                        dtype_tuple[1](test_shape, dtype), kwargs)
+
+                expected = interface_func(input_array.copy(), s, **kwargs)
+                out = empty_aligned(expected.shape, expected.dtype)
+
+                # Twice, so the second call is from the cache if enabled
+                for n in range(2):
+                    out[:] = 0
+                    output = interface_func(
+                            input_array.copy(), s, out=out, **kwargs)
+
+                    self.assertIs(output, out)
+                    self.assertTrue(numpy.allclose(out, expected,
+                                                   rtol=1e-4, atol=1e-4))
+
+                if expected.dtype == numpy.float64:
+                    invalid_dtype = numpy.float32
+                else:
+                    invalid_dtype = numpy.float64
+
+                invalid_outs = (
+                    empty_aligned(expected.shape, invalid_dtype),
+                    empty_aligned(expected.shape[:-1] +
+                                  (expected.shape[-1] + 1,), expected.dtype))
+
+                for invalid_out in invalid_outs:
+                    self.assertRaisesRegex(
+                        ValueError, 'Invalid output', interface_func,
+                        input_array.copy(), s, out=invalid_out, **kwargs)
+
 
 class InterfacesNumpyFFTTestIFFT(InterfacesNumpyFFTTestFFT):
     func = 'ifft'
@@ -0,0 +1,296 @@
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+from pyfftw import FFTW, empty_aligned
+import numpy
+
+from .test_pyfftw_base import run_test_suites, miss, require, np_fft
+
+import unittest
+
+def _r2r_matrix(kind, n):
+    '''Return the dense matrix of the unnormalised real-to-real transform
+    ``kind`` of length ``n``, as defined in the FFTW documentation.
+    '''
+    j = numpy.arange(n)[None, :]
+    k = numpy.arange(n)[:, None]
+
+    if kind == 'FFTW_REDFT00':
+        m = 2 * numpy.cos(numpy.pi * j * k / (n - 1))
+        m[:, 0] = 1
+        m[:, -1] = (-1.0)**numpy.arange(n)
+    elif kind == 'FFTW_REDFT10':
+        m = 2 * numpy.cos(numpy.pi * (j + 0.5) * k / n)
+    elif kind == 'FFTW_REDFT01':
+        m = 2 * numpy.cos(numpy.pi * j * (k + 0.5) / n)
+        m[:, 0] = 1
+    elif kind == 'FFTW_REDFT11':
+        m = 2 * numpy.cos(numpy.pi * (j + 0.5) * (k + 0.5) / n)
+    elif kind == 'FFTW_RODFT00':
+        m = 2 * numpy.sin(numpy.pi * (j + 1) * (k + 1) / (n + 1))
+    elif kind == 'FFTW_RODFT10':
+        m = 2 * numpy.sin(numpy.pi * (j + 0.5) * (k + 1) / n)
+    elif kind == 'FFTW_RODFT01':
+        m = 2 * numpy.sin(numpy.pi * (j + 1) * (k + 0.5) / n)
+        m[:, -1] = (-1.0)**numpy.arange(n)
+    elif kind == 'FFTW_RODFT11':
+        m = 2 * numpy.sin(numpy.pi * (j + 0.5) * (k + 0.5) / n)
+    elif kind == 'FFTW_DHT':
+        m = (numpy.cos(2 * numpy.pi * j * k / n) +
+             numpy.sin(2 * numpy.pi * j * k / n))
+    else:
+        raise ValueError('No reference for %s' % kind)
+
+    return m
+
+def _reference_r2r(a, kinds, axes):
+    a = numpy.float64(a)
+    for kind, axis in zip(kinds, axes):
+        m = _r2r_matrix(kind, a.shape[axis])
+        a = numpy.moveaxis(numpy.tensordot(m, a, axes=(1, axis)), 0, axis)
+
+    return a
+
+def _halfcomplex_to_complex(hc):
+    '''Unpack a 1D halfcomplex array to the equivalent ``rfft`` output.'''
+    n = len(hc)
+    out = numpy.zeros(n//2 + 1, dtype=numpy.complex128)
+    out.real = hc[:n//2 + 1]
+    out.imag[1:(n + 1)//2] = hc[:n//2:-1]
+    return out
+
+class RealToRealDoubleFFTWTest(unittest.TestCase):
+
+    dtype = numpy.float64
+    rtol = 1e-10
+    atol = 1e-10
+
+    def setUp(self):
+        require(self, '64')
+
+    def __init__(self, *args, **kwargs):
+
+        super(RealToRealDoubleFFTWTest, self).__init__(*args, **kwargs)
+
+        if not hasattr(self, 'assertRaisesRegex'):
+            self.assertRaisesRegex = self.assertRaisesRegexp
+
+    def create_test_arrays(self, shape):
+        a = empty_aligned(shape, dtype=self.dtype)
+        b = empty_aligned(shape, dtype=self.dtype)
+        a[:] = numpy.random.randn(*shape)
+        b[:] = numpy.random.randn(*shape)
+        return a, b
+
+    def run_validate_r2r(self, shape, kinds, axes):
+        a, b = self.create_test_arrays(shape)
+        a_orig = a.copy()
+
+        fft = FFTW(a, b, axes=axes, direction=kinds, flags=('FFTW_ESTIMATE',))
+        fft.execute()
+
+        numpy.testing.assert_allclose(
+            b, _reference_r2r(a_orig, fft.direction, axes),
+            rtol=self.rtol, atol=self.atol)
+
+        return fft
+
+    def test_all_kinds_1d(self):
+        for kind in ('FFTW_REDFT00', 'FFTW_REDFT10', 'FFTW_REDFT01',
+                     'FFTW_REDFT11', 'FFTW_RODFT00', 'FFTW_RODFT10',
+                     'FFTW_RODFT01', 'FFTW_RODFT11', 'FFTW_DHT'):
+            for n in (7, 16):
+                fft = self.run_validate_r2r((n,), kind, (0,))
+                self.assertEqual(fft.direction, [kind])
+
+    def test_kind_per_axis(self):
+        fft = self.run_validate_r2r(
+            (6, 5, 8), ['FFTW_REDFT10', 'FFTW_RODFT11'], (0, 2))
+        self.assertEqual(fft.direction, ['FFTW_REDFT10', 'FFTW_RODFT11'])
+
+    def test_kind_broadcast_to_all_axes(self):
+        fft = self.run_validate_r2r((6, 8), 'FFTW_REDFT01', (-2, -1))
+        self.assertEqual(fft.direction, ['FFTW_REDFT01', 'FFTW_REDFT01'])
+
+    def test_r2hc_matches_rfft(self):
+        for n in (15, 16):
+            a, b = self.create_test_arrays((n,))
+            fft = FFTW(a, b, direction='FFTW_R2HC')
+            a[:] = numpy.random.randn(n)
+            fft()
+            numpy.testing.assert_allclose(
+                _halfcomplex_to_complex(numpy.float64(b)),
+                np_fft.rfft(numpy.float64(a)),
+                rtol=self.rtol, atol=self.atol)
+
+    def test_hc2r_inverts_r2hc(self):
+        a, b = self.create_test_arrays((4, 12))
+        c = empty_aligned(a.shape, dtype=self.dtype)
+
+        fft = FFTW(a, b, direction='FFTW_R2HC')
+        ifft = FFTW(b, c, direction='FFTW_HC2R')
+
+        a[:] = numpy.random.randn(*a.shape)
+        a_orig = a.copy()
+        fft()
+        ifft()
+
+        numpy.testing.assert_allclose(
+            c / 12, a_orig, rtol=self.rtol, atol=self.atol)
+
+    def test_N(self):
+        a, b = self.create_test_arrays((6, 8))
+        expected_N = {
+            'FFTW_REDFT00': 2 * 5 * 2 * 7,
+            'FFTW_RODFT00': 2 * 7 * 2 * 9,
+            'FFTW_REDFT10': 2 * 6 * 2 * 8,
+            'FFTW_RODFT11': 2 * 6 * 2 * 8,
+            'FFTW_DHT': 6 * 8,
+            'FFTW_R2HC': 6 * 8}
+
+        for kind in expected_N:
+            fft = FFTW(a, b, axes=(0, 1), direction=kind)
+            self.assertEqual(fft.N, expected_N[kind])
+
+    def test_inverse_pairs_scale_by_N(self):
+        pairs = (('FFTW_REDFT10', 'FFTW_REDFT01'),
+                 ('FFTW_RODFT10', 'FFTW_RODFT01'),
+                 ('FFTW_REDFT11', 'FFTW_REDFT11'),
+                 ('FFTW_REDFT00', 'FFTW_REDFT00'),
+                 ('FFTW_DHT', 'FFTW_DHT'))
+
+        for forward, backward in pairs:
+            a, b = self.create_test_arrays((5, 9))
+            c = empty_aligned(a.shape, dtype=self.dtype)
+
+            fft = FFTW(a, b, axes=(0, 1), direction=forward)
+            ifft = FFTW(b, c, axes=(0, 1), direction=backward)
+
+            a[:] = numpy.random.randn(*a.shape)
+            a_orig = a.copy()
+            fft()
+            ifft()
+
+            numpy.testing.assert_allclose(
+                c / fft.N, a_orig, rtol=self.rtol, atol=self.atol)
+
+    def test_normalise_idft_ignored(self):
+        a, b = self.create_test_arrays((16,))
+
+        fft = FFTW(a, b, direction='FFTW_REDFT10')
+        a[:] = numpy.random.randn(*a.shape)
+        a_orig = a.copy()
+        fft(normalise_idft=True)
+
+        numpy.testing.assert_allclose(
+            b, _reference_r2r(a_orig, ['FFTW_REDFT10'], (0,)),
+            rtol=self.rtol, atol=self.atol)
+
+    def test_update_arrays(self):
+        a, b = self.create_test_arrays((4, 16))
+        fft = FFTW(a, b, direction='FFTW_RODFT10')
+
+        c, d = self.create_test_arrays((4, 16))
+        fft.update_arrays(c, d)
+        fft.execute()
+
+        numpy.testing.assert_allclose(
+            d, _reference_r2r(c, ['FFTW_RODFT10'], (-1,)),
+            rtol=self.rtol, atol=self.atol)
+
+    def test_invalid_kind_fail(self):
+        a, b = self.create_test_arrays((16,))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid direction'):
+            FFTW(a, b, direction='FFTW_FORWARD')
+
+        with self.assertRaisesRegex(ValueError, 'Invalid direction'):
+            FFTW(a, b, direction=['FFTW_REDFT10', 'FFTW_BACKWARD'],
+                 axes=(0, 0))
+
+    def test_wrong_number_of_kinds_fail(self):
+        a, b = self.create_test_arrays((4, 16))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid direction'):
+            FFTW(a, b, axes=(0, 1), direction=['FFTW_REDFT10'])
+
+    def test_redft00_too_short_fail(self):
+        a, b = self.create_test_arrays((1,))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid shapes'):
+            FFTW(a, b, direction='FFTW_REDFT00')
+
+    def test_ortho_fail(self):
+        a, b = self.create_test_arrays((16,))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid options'):
+            FFTW(a, b, direction='FFTW_REDFT10', ortho=True,
+                 normalise_idft=False)
+
+        fft = FFTW(a, b, direction='FFTW_REDFT10')
+        with self.assertRaisesRegex(ValueError, 'Invalid options'):
+            fft(ortho=True, normalise_idft=False)
+
+    def test_shape_mismatch_fail(self):
+        a = empty_aligned((16,), dtype=self.dtype)
+        b = empty_aligned((9,), dtype=self.dtype)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid shapes'):
+            FFTW(a, b, direction='FFTW_REDFT10')
+
+@unittest.skipIf(*miss('32'))
+class RealToRealSingleFFTWTest(RealToRealDoubleFFTWTest):
+
+    dtype = numpy.float32
+    rtol = 1e-4
+    atol = 1e-3
+
+    def setUp(self):
+        pass
+
+@unittest.skipIf(*miss('ld'))
+class RealToRealLongDoubleFFTWTest(RealToRealDoubleFFTWTest):
+
+    dtype = numpy.longdouble
+
+    def setUp(self):
+        pass
+
+test_cases = (
+        RealToRealDoubleFFTWTest,
+        RealToRealSingleFFTWTest,
+        RealToRealLongDoubleFFTWTest,)
+
+test_set = None
+
+if __name__ == '__main__':
+
+    run_test_suites(test_cases, test_set)
@@ -115,6 +115,45 @@ class RealForwardDoubleFFTWTest(Complex64FFTWTest):
 
         self.run_validate_fft(a_sliced, b_sliced, axes, create_array_copies=False)
 
+    def test_full_output(self):
+        '''An output the same shape as the input should be given the
+        complete complex DFT, with the redundant half filled in from the
+        Hermitian symmetry.
+        '''
+        for in_shape, axes in (((16,), (-1,)), ((15,), (0,)), ((2,), (0,)),
+                               ((6, 7), (0, 1)), ((6, 7), (1, 0)),
+                               ((5, 6, 7), (0, 2)), ((5, 6, 7), (1,))):
+
+            a, b = self.create_test_arrays(in_shape, in_shape)
+
+            fft = FFTW(a, b, axes=axes, flags=('FFTW_ESTIMATE',))
+            a[:] = self.input_dtype(numpy.random.randn(*in_shape))
+            fft.execute()
+
+            ref = np_fft.fftn(numpy.float64(a), axes=axes)
+            self.assertTrue(numpy.allclose(b, ref, rtol=1e-4, atol=1e-4))
+
+    def test_full_output_non_contiguous(self):
+        in_shape = (12, 16)
+        axes = (0, 1)
+        a, b = self.create_test_arrays(in_shape, in_shape)
+
+        b_sliced = b[::2, ::2]
+        a_sliced = a[:6, :8].copy()
+        fft = FFTW(a_sliced, b_sliced, axes=axes,
+                   flags=('FFTW_ESTIMATE', 'FFTW_UNALIGNED'))
+        a_sliced[:] = self.input_dtype(numpy.random.randn(6, 8))
+        fft.execute()
+
+        ref = np_fft.fftn(numpy.float64(a_sliced), axes=axes)
+        self.assertTrue(numpy.allclose(b_sliced, ref, rtol=1e-4, atol=1e-4))
+
+    def test_full_output_wrong_shape_fail(self):
+        a, b = self.create_test_arrays((16,), (15,))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid shapes'):
+            FFTW(a, b)
+
 @unittest.skipIf(*miss('32'))
 class RealForwardSingleFFTWTest(RealForwardDoubleFFTWTest):
 
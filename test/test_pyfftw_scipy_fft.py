@@ -59,8 +59,9 @@ funcs = ('fft', 'ifft', 'fft2', 'ifft2', 'fftn', 'ifftn',
          'rfft', 'irfft', 'rfft2', 'irfft2', 'rfftn', 'irfftn',
          'hfft', 'ihfft')
 
-acquired_names = ('dct', 'idct', 'dst', 'idst', 'dctn', 'idctn', 'dstn', 'idstn',
-                  'hfft2', 'ihfft2', 'hfftn', 'ihfftn',
+r2r_funcs = ('dct', 'idct', 'dst', 'idst', 'dctn', 'idctn', 'dstn', 'idstn')
+
+acquired_names = ('hfft2', 'ihfft2', 'hfftn', 'ihfftn',
                   'fftshift', 'ifftshift', 'fftfreq', 'rfftfreq')
 
 def make_complex_data(shape, dtype):
@@ -114,6 +115,153 @@ class InterfacesScipyFFTTestSimple(unittest.TestCase):
             self.assertIs(fft_attr, acquired_attr)
 
 
+@unittest.skipIf(not has_scipy_fft, 'scipy.fft is unavailable')
+class InterfacesScipyFFTRealToRealTest(unittest.TestCase):
+    ''' Test the DCT and DST functions, which are implemented with the
+    real-to-real FFTW transforms rather than acquired from scipy.fft.
+    '''
+
+    def __init__(self, *args, **kwargs):
+
+        super(InterfacesScipyFFTRealToRealTest, self).__init__(
+            *args, **kwargs)
+
+        if not hasattr(self, 'assertRaisesRegex'):
+            self.assertRaisesRegex = self.assertRaisesRegexp
+
+    def validate(self, func_name, x, *args, **kwargs):
+        x_orig = x.copy()
+
+        output = getattr(scipy_fft, func_name)(x, *args, **kwargs)
+        expected = getattr(scipy.fft, func_name)(x, *args, **kwargs)
+
+        # The unnormalised transforms can be large, so the absolute
+        # tolerance is scaled to the output for the low precision dtypes.
+        atol = 1e-5 * max(1, numpy.abs(expected).max())
+        self.assertTrue(numpy.allclose(output, expected, rtol=1e-4,
+                                       atol=atol))
+        self.assertEqual(output.dtype, expected.dtype)
+        # The input should be untouched
+        self.assertTrue(numpy.array_equal(x, x_orig))
+
+    def test_1d(self):
+        for func_name in ('dct', 'idct', 'dst', 'idst'):
+            for dtype in real_dtypes:
+                for _type in (1, 2, 3, 4):
+                    for norm in (None, 'ortho'):
+                        for n in (None, 7, 20):
+                            x = make_r2c_real_data((6, 16), dtype)
+                            self.validate(func_name, x, type=_type, n=n,
+                                          axis=-1, norm=norm)
+                            self.validate(func_name, x, type=_type, n=n,
+                                          axis=0, norm=norm)
+
+    def test_nd(self):
+        for func_name in ('dctn', 'idctn', 'dstn', 'idstn'):
+            for dtype in real_dtypes:
+                for _type in (1, 2, 3, 4):
+                    for norm in (None, 'ortho'):
+                        x = make_r2c_real_data((6, 5, 8), dtype)
+                        self.validate(func_name, x, type=_type, norm=norm)
+                        self.validate(func_name, x, type=_type, norm=norm,
+                                      s=(7, 4), axes=(0, 2))
+
+    def test_complex_input(self):
+        for func_name in r2r_funcs:
+            x = make_complex_data((8, 12), numpy.complex128)
+            self.validate(func_name, x, type=2, norm='ortho')
+
+    @unittest.skipIf(*miss('64'))
+    def test_integer_input(self):
+        self.validate('dct', numpy.arange(12), type=2)
+
+    @unittest.skipIf(*miss('64'))
+    def test_overwrite_x(self):
+        x = make_r2c_real_data((32,), numpy.float64)
+        expected = scipy.fft.dct(x, type=3, norm='ortho')
+
+        output = scipy_fft.dct(x, type=3, norm='ortho', overwrite_x=True)
+        self.assertTrue(numpy.allclose(output, expected))
+
+    @unittest.skipIf(*miss('64'))
+    def test_workers(self):
+        x = make_r2c_real_data((32, 32), numpy.float64)
+        self.validate('dctn', x, workers=2)
+        self.validate('idstn', x, workers=-1)
+
+    @unittest.skipIf(*miss('64'))
+    def test_invalid_args_fail(self):
+        x = make_r2c_real_data((16,), numpy.float64)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid type'):
+            scipy_fft.dct(x, type=5)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid norm'):
+            scipy_fft.dst(x, norm='unitary')
+
+    @unittest.skipIf(*miss('64'))
+    def test_repeated_axes_fail(self):
+        '''As with scipy.fft, an axis cannot be transformed twice.
+        '''
+        x = make_r2c_real_data((6, 16), numpy.float64)
+
+        for func_name in ('dctn', 'idctn', 'dstn', 'idstn'):
+            for axes in ((1, 1), (0, -2)):
+                with self.assertRaises(ValueError):
+                    getattr(scipy.fft, func_name)(x, axes=axes)
+
+                with self.assertRaisesRegex(ValueError, 'unique'):
+                    getattr(scipy_fft, func_name)(x, axes=axes)
+
+    @unittest.skipIf(*miss('64'))
+    def test_out(self):
+        x = make_r2c_real_data((6, 16), numpy.float64)
+
+        for func_name in ('dct', 'dstn'):
+            expected = getattr(scipy.fft, func_name)(x, type=2)
+
+            out = pyfftw.empty_aligned(x.shape, dtype=numpy.float64)
+            output = getattr(scipy_fft, func_name)(x, type=2, out=out)
+            self.assertIs(output, out)
+            self.assertTrue(numpy.allclose(out, expected))
+
+        z = make_complex_data((8, 12), numpy.complex128)
+        out = pyfftw.empty_aligned(z.shape, dtype=numpy.complex128)
+        with self.assertRaisesRegex(ValueError, 'Invalid output array'):
+            scipy_fft.dct(z, out=out)
+
+    @unittest.skipIf(*miss('64'))
+    def test_uses_cache(self):
+        x = make_r2c_real_data((16, 8), numpy.float64)
+
+        pyfftw.interfaces.cache.enable()
+        try:
+            scipy_fft.dctn(x, type=4)
+            cache_size = len(pyfftw.interfaces.cache._fftw_cache._cache_dict)
+
+            self.validate('dctn', x, type=4)
+            self.assertEqual(
+                len(pyfftw.interfaces.cache._fftw_cache._cache_dict),
+                cache_size)
+
+            # A different type needs a different plan
+            self.validate('dctn', x, type=2)
+            self.assertEqual(
+                len(pyfftw.interfaces.cache._fftw_cache._cache_dict),
+                cache_size + 1)
+        finally:
+            pyfftw.interfaces.cache.disable()
+
+    @unittest.skipIf(*miss('64'))
+    def test_scipy_backend(self):
+        x = make_r2c_real_data((16, 8), numpy.float64)
+        expected = scipy.fft.dctn(x, norm='ortho')
+
+        with scipy.fft.set_backend(scipy_fft, only=True):
+            output = scipy.fft.dctn(x, norm='ortho')
+
+        self.assertTrue(numpy.allclose(output, expected))
+
 # Construct all the test classes automatically.
 test_cases = []
 for each_func in funcs:
@@ -136,6 +284,7 @@ for each_func in funcs:
     test_cases.append(cls)
 
 test_cases.append(InterfacesScipyFFTTestSimple)
+test_cases.append(InterfacesScipyFFTRealToRealTest)
 test_set = None
 
 
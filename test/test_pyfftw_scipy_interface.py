@@ -177,6 +177,45 @@ class InterfacesScipyFFTPackTestSimple(unittest.TestCase):
                 setattr(scipy_fftpack, each_func,
                         func_being_replaced)
 
+    @unittest.skipIf(*miss('64'))
+    def test_rfft_irfft_halfcomplex(self):
+        # Both odd and even lengths, with truncation and zero padding
+        for length, n in ((15, None), (16, None), (16, 11), (15, 24)):
+            x = numpy.random.randn(3, length)
+
+            rfft_output = scipy_fftpack.rfft(x, n)
+            self.assertTrue(numpy.allclose(rfft_output,
+                                           scipy.fftpack.rfft(x, n)))
+
+            irfft_output = scipy_fftpack.irfft(x, n)
+            self.assertTrue(numpy.allclose(irfft_output,
+                                           scipy.fftpack.irfft(x, n)))
+
+            self.assertTrue(numpy.allclose(
+                scipy_fftpack.irfft(rfft_output), scipy.fftpack.irfft(
+                    scipy.fftpack.rfft(x, n))))
+
+    @unittest.skipIf(*miss('64'))
+    def test_rfft_irfft_cache(self):
+        x = numpy.random.randn(4, 32)
+
+        pyfftw.interfaces.cache.enable()
+        try:
+            for func_name in ('rfft', 'irfft'):
+                func = getattr(scipy_fftpack, func_name)
+                func(x)
+                cache_size = len(
+                    pyfftw.interfaces.cache._fftw_cache._cache_dict)
+
+                output = func(x)
+                self.assertEqual(
+                    len(pyfftw.interfaces.cache._fftw_cache._cache_dict),
+                    cache_size)
+                self.assertTrue(numpy.allclose(
+                    output, getattr(scipy.fftpack, func_name)(x)))
+        finally:
+            pyfftw.interfaces.cache.disable()
+
     def test_acquired_names(self):
         for each_name in acquired_names:
 
@@ -206,6 +245,8 @@ for each_func in funcs:
 
     # unlike numpy, none of the scipy functions support the norm kwarg
     globals()[class_name].has_norm_kwarg = False
+    # nor does scipy_fftpack support writing into an out array
+    globals()[class_name].has_out_kwarg = False
 
     built_classes.append(globals()[class_name])
 
@@ -0,0 +1,259 @@
+# Copyright 2019, The pyFFTW developers
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+#
+
+from pyfftw import FFTW, empty_aligned
+import numpy
+
+from .test_pyfftw_base import run_test_suites, miss, require, np_fft
+
+import unittest
+
+class SplitComplexDoubleFFTWTest(unittest.TestCase):
+
+    dtype = numpy.float64
+    rtol = 1e-10
+    atol = 1e-10
+
+    def setUp(self):
+        require(self, '64')
+
+    def __init__(self, *args, **kwargs):
+
+        super(SplitComplexDoubleFFTWTest, self).__init__(*args, **kwargs)
+
+        if not hasattr(self, 'assertRaisesRegex'):
+            self.assertRaisesRegex = self.assertRaisesRegexp
+
+    def create_split_array(self, shape, fill=True):
+        real = empty_aligned(shape, dtype=self.dtype)
+        imag = empty_aligned(shape, dtype=self.dtype)
+        if fill:
+            real[:] = numpy.random.randn(*shape)
+            imag[:] = numpy.random.randn(*shape)
+        return real, imag
+
+    def to_complex(self, pair):
+        return numpy.float64(pair[0]) + 1j*numpy.float64(pair[1])
+
+    def assert_close(self, a, b):
+        numpy.testing.assert_allclose(a, b, rtol=self.rtol, atol=self.atol)
+
+    def test_c2c_forward(self):
+        for shape, axes in (((16,), (-1,)), ((15,), (0,)),
+                            ((6, 8), (0, 1)), ((5, 6, 7), (2, 0))):
+            a = self.create_split_array(shape, fill=False)
+            b = self.create_split_array(shape, fill=False)
+
+            fft = FFTW(a, b, axes=axes, flags=('FFTW_ESTIMATE',))
+            a[0][:] = numpy.random.randn(*shape)
+            a[1][:] = numpy.random.randn(*shape)
+            fft.execute()
+
+            self.assert_close(self.to_complex(b),
+                              np_fft.fftn(self.to_complex(a), axes=axes))
+
+    def test_c2c_backward(self):
+        a = self.create_split_array((6, 8))
+        b = self.create_split_array((6, 8), fill=False)
+        a_orig = self.to_complex(a)
+
+        fft = FFTW(a, b, axes=(0, 1), direction='FFTW_BACKWARD',
+                   flags=('FFTW_ESTIMATE',))
+        output = fft(a)
+
+        self.assertIs(output[0], b[0])
+        self.assertIs(output[1], b[1])
+        self.assert_close(self.to_complex(b), np_fft.ifftn(a_orig))
+
+        fft(ortho=True, normalise_idft=False)
+        self.assert_close(self.to_complex(b),
+                          np_fft.ifftn(a_orig, norm='ortho'))
+
+    def test_r2c(self):
+        a = empty_aligned((6, 16), dtype=self.dtype)
+        b = self.create_split_array((6, 9), fill=False)
+
+        fft = FFTW(a, b, flags=('FFTW_ESTIMATE',))
+        a[:] = numpy.random.randn(*a.shape)
+        fft.execute()
+
+        self.assert_close(self.to_complex(b), np_fft.rfft(numpy.float64(a)))
+
+    def test_c2r(self):
+        for shape, axes in (((6, 16), (-1,)), ((6, 16), (0, 1))):
+            complex_shape = shape[:-1] + (shape[-1]//2 + 1,)
+            a = self.create_split_array(complex_shape, fill=False)
+            b = empty_aligned(shape, dtype=self.dtype)
+
+            fft = FFTW(a, b, axes=axes, direction='FFTW_BACKWARD',
+                       flags=('FFTW_ESTIMATE',))
+
+            ref = numpy.random.randn(*shape)
+            spectrum = np_fft.rfftn(ref, axes=axes)
+            fft((spectrum.real, spectrum.imag))
+
+            self.assert_close(b, ref)
+
+    def test_c2r_preserves_input_1d(self):
+        a = self.create_split_array((4, 9))
+        b = empty_aligned((4, 16), dtype=self.dtype)
+        a_orig = (a[0].copy(), a[1].copy())
+
+        fft = FFTW(a, b, direction='FFTW_BACKWARD')
+        a[0][:] = a_orig[0]
+        a[1][:] = a_orig[1]
+        fft.execute()
+
+        self.assert_close(a[0], a_orig[0])
+        self.assert_close(a[1], a_orig[1])
+
+    def test_array_properties(self):
+        a = self.create_split_array((16,))
+        b = self.create_split_array((16,))
+
+        fft = FFTW(a, b)
+
+        self.assertIsInstance(fft.input_array, tuple)
+        self.assertIs(fft.input_array[0], a[0])
+        self.assertIs(fft.input_array[1], a[1])
+        self.assertIs(fft.output_array[0], b[0])
+        self.assertIs(fft.output_array[1], b[1])
+        self.assertEqual(fft.input_shape, (16,))
+        self.assertEqual(fft.input_dtype, numpy.dtype(self.dtype))
+
+    def test_call_copies_input(self):
+        a = self.create_split_array((4, 16))
+        b = self.create_split_array((4, 16), fill=False)
+
+        fft = FFTW(a, b)
+
+        # A misaligned pair, which is copied into the internal arrays
+        new_a = [numpy.random.randn(4, 17)[:, 1:] for n in range(2)]
+        fft(new_a)
+
+        self.assertIs(fft.input_array[0], a[0])
+        self.assert_close(self.to_complex(b),
+                          np_fft.fft(self.to_complex(new_a)))
+
+    def test_call_with_interleaved_input_fail(self):
+        a = self.create_split_array((16,))
+        b = self.create_split_array((16,))
+
+        fft = FFTW(a, b)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid input array'):
+            fft(numpy.zeros(16, dtype=numpy.complex128))
+
+    def test_update_arrays(self):
+        a = self.create_split_array((4, 16))
+        b = self.create_split_array((4, 16))
+
+        fft = FFTW(a, b)
+
+        c = self.create_split_array((4, 16))
+        d = self.create_split_array((4, 16), fill=False)
+        fft.update_arrays(c, d)
+        fft.execute()
+
+        self.assertIs(fft.output_array[0], d[0])
+        self.assert_close(self.to_complex(d),
+                          np_fft.fft(self.to_complex(c)))
+
+    def test_execute_batch(self):
+        a = self.create_split_array((16,))
+        b = self.create_split_array((16,))
+
+        fft = FFTW(a, b)
+
+        stacked_input = self.create_split_array((3, 16))
+        stacked_output = self.create_split_array((3, 16), fill=False)
+        fft.execute_batch(stacked_input, stacked_output)
+
+        self.assert_close(self.to_complex(stacked_output),
+                          np_fft.fft(self.to_complex(stacked_input)))
+
+        inputs = [self.create_split_array((16,)) for n in range(3)]
+        outputs = [self.create_split_array((16,), fill=False)
+                   for n in range(3)]
+        fft.execute_batch(inputs, outputs)
+
+        for input_array, output_array in zip(inputs, outputs):
+            self.assert_close(self.to_complex(output_array),
+                              np_fft.fft(self.to_complex(input_array)))
+
+    def test_mixed_split_and_interleaved_fail(self):
+        a = self.create_split_array((16,))
+        b = empty_aligned((16,), dtype=numpy.result_type(self.dtype, 1j))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid scheme'):
+            FFTW(a, b)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid scheme'):
+            FFTW(b, a)
+
+    def test_mismatched_parts_fail(self):
+        a = self.create_split_array((16,))
+        b = self.create_split_array((16,))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid input array'):
+            FFTW((a[0], a[1][:8]), b)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid output array'):
+            FFTW(a, (b[0], numpy.zeros(32, dtype=self.dtype)[::2]))
+
+@unittest.skipIf(*miss('32'))
+class SplitComplexSingleFFTWTest(SplitComplexDoubleFFTWTest):
+
+    dtype = numpy.float32
+    rtol = 1e-4
+    atol = 1e-3
+
+    def setUp(self):
+        pass
+
+@unittest.skipIf(*miss('ld'))
+class SplitComplexLongDoubleFFTWTest(SplitComplexDoubleFFTWTest):
+
+    dtype = numpy.longdouble
+
+    def setUp(self):
+        pass
+
+test_cases = (
+        SplitComplexDoubleFFTWTest,
+        SplitComplexSingleFFTWTest,
+        SplitComplexLongDoubleFFTWTest,)
+
+test_set = None
+
+if __name__ == '__main__':
+
+    run_test_suites(test_cases, test_set)
@@ -33,12 +33,16 @@
 #
 
 
-from .test_pyfftw_base import run_test_suites
+from .test_pyfftw_base import run_test_suites, miss
 
 import unittest
 import pyfftw
+from pyfftw import config, _tuning, _wisdom
 import platform
 import os
+import shutil
+import tempfile
+import warnings
 from numpy.testing import assert_, assert_equal
 
 def get_cpus_info():
@@ -164,9 +168,158 @@ class NextFastLenTest(unittest.TestCase):
         for x, y in strict_test_cases.items():
             assert_equal(pyfftw.next_fast_len(x), y)
 
+    def test_next_fast_len_real(self):
+        for n in range(2, 1000):
+            m = pyfftw.next_fast_len(n, real=True)
+
+            self.assertEqual(m % 2, 0)
+            self.assertEqual(pyfftw.next_fast_len(m), m)
+            # No even fast length is skipped
+            self.assertEqual(
+                pyfftw.next_fast_len(pyfftw.next_fast_len(n), real=True), m)
+
+        self.assertEqual(pyfftw.next_fast_len(1, real=True), 1)
+        self.assertEqual(pyfftw.next_fast_len(15, real=True), 16)
+
+    def test_next_fast_shape(self):
+        self.assertEqual(pyfftw.next_fast_shape((17, 1021)), (18, 1024))
+        self.assertEqual(pyfftw.next_fast_shape((17, 1021), axes=(-1,)),
+                         (17, 1024))
+        self.assertEqual(pyfftw.next_fast_shape((17, 15), real=True),
+                         (18, 16))
+        # The last of the axes is the real one
+        self.assertEqual(pyfftw.next_fast_shape((15, 15), axes=(1, 0),
+                                                real=True), (16, 15))
+
+        # Only the axes that fit in the bound are padded, padding as many
+        # as possible
+        self.assertEqual(pyfftw.next_fast_shape((17, 1021), max_extra=0.01),
+                         (17, 1024))
+        self.assertEqual(pyfftw.next_fast_shape((17, 1021), max_extra=0.0),
+                         (17, 1021))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid max_extra'):
+            pyfftw.next_fast_shape((17,), max_extra=-1)
+
+        with self.assertRaisesRegex(ValueError, 'Invalid shape'):
+            pyfftw.next_fast_shape((0, 17))
+
+
+class TunedNextFastLenTest(unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+
+        super(TunedNextFastLenTest, self).__init__(*args, **kwargs)
+
+        if not hasattr(self, 'assertRaisesRegex'):
+            self.assertRaisesRegex = self.assertRaisesRegexp
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'tuning.json')
+
+        self.tuning_file = config.TUNING_FILE
+        self.time_transform = _tuning._time_transform
+        self.timings = dict(_tuning._timings)
+
+        config.TUNING_FILE = self.filename
+        self.reset_timings()
+
+        # Timings that favour lengths ending in 0 over the others
+        self.timed = []
+        def time_transform(length, kind, input_dtype, threads):
+            self.timed.append((length, kind, input_dtype))
+            return length * (1.0 if length % 10 == 0 else 2.0)
+
+        _tuning._time_transform = time_transform
+
+    def tearDown(self):
+        config.TUNING_FILE = self.tuning_file
+        _tuning._time_transform = self.time_transform
+        self.reset_timings()
+        _tuning._timings.update(self.timings)
+
+        shutil.rmtree(self.tempdir)
+
+    def reset_timings(self):
+        _tuning._timings.clear()
+        _tuning._timings_loaded = False
+
+    def test_tuned(self):
+        # The fast lengths above 1021 are 1024, 1029, 1040 and 1050
+        self.assertEqual(pyfftw.next_fast_len(1021), 1024)
+        self.assertEqual(pyfftw.next_fast_len(1021, tuned=True), 1040)
+        self.assertEqual(sorted(self.timed), [
+            (length, 'c2c', 'D') for length in (1021, 1024, 1029, 1040, 1050)])
+
+        self.assertEqual(
+            pyfftw.next_fast_shape((1021, 7), real=True, tuned=True,
+                                   dtype='float32'), (1040, 10))
+        self.assertIn((10, 'r2c', 'f'), self.timed)
+
+        # The bound is kept, and the unpadded length is quicker than those
+        # of the fast lengths that are in the bound
+        self.assertEqual(
+            pyfftw.next_fast_shape((1021,), max_extra=0.02, tuned=True),
+            (1040,))
+        self.assertEqual(
+            pyfftw.next_fast_shape((1021,), max_extra=0.01, tuned=True),
+            (1021,))
+
+    def test_timings_saved(self):
+        pyfftw.next_fast_len(1021, tuned=True)
+        self.assertTrue(os.path.exists(self.filename))
+
+        # Another process loads the timings rather than timing again
+        self.reset_timings()
+        del self.timed[:]
+
+        self.assertEqual(pyfftw.next_fast_len(1021, tuned=True), 1040)
+        self.assertEqual(self.timed, [])
+
+        # The timings of other machines are not used
+        fingerprint = _wisdom._fingerprint()
+        try:
+            _wisdom._machine_fingerprint = dict(fingerprint, cores=0)
+            self.reset_timings()
+
+            pyfftw.next_fast_len(1021, tuned=True)
+            self.assertEqual(len(self.timed), 5)
+
+        finally:
+            _wisdom._machine_fingerprint = fingerprint
+
+    def test_timings_loaded_without_lock_file(self):
+        pyfftw.next_fast_len(1021, tuned=True)
+
+        # The lock file cannot be opened, as in a read-only directory
+        os.remove(self.filename + '.lock')
+        os.mkdir(self.filename + '.lock')
+
+        self.reset_timings()
+        del self.timed[:]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            self.assertEqual(pyfftw.next_fast_len(1021, tuned=True), 1040)
+
+        self.assertEqual(self.timed, [])
+
+    @unittest.skipIf(*miss('64'))
+    def test_measured(self):
+        # The real timings only show that the unpadded prime length is
+        # slower than some fast length
+        _tuning._time_transform = self.time_transform
+        config.TUNING_FILE = None
+
+        self.assertIn(pyfftw.next_fast_len(1021, tuned=True),
+                      (1024, 1029, 1040, 1050))
+
+
 test_cases = (
         UtilsTest,
-        NextFastLenTest)
+        NextFastLenTest,
+        TunedNextFastLenTest)
 
 test_set = None
 
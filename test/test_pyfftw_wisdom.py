@@ -33,19 +33,30 @@
 #
 
 from pyfftw import (
-        FFTW, empty_aligned,
+        FFTW, empty_aligned, builders, config,
         export_wisdom, import_wisdom, forget_wisdom,
+        export_wisdom_to_files, import_wisdom_from_files,
+        import_system_wisdom, save_wisdom, load_wisdom,
         _supported_types, _supported_nptypes_complex)
+from pyfftw import _wisdom
+import pyfftw
 
 from .test_pyfftw_base import run_test_suites
 
 import numpy
+import json
+import os
 import pickle
+import shutil
 import sys
+import tempfile
+import threading
 
 import unittest
 
-class FFTWWisdomTest(unittest.TestCase):
+class WisdomTestMixin(object):
+    '''The helpers shared by the wisdom tests.
+    '''
 
     def generate_wisdom(self):
         for each_dtype in _supported_nptypes_complex:
@@ -74,6 +85,8 @@ class FFTWWisdomTest(unittest.TestCase):
             self.compare_single(prec, before[ind], after[ind])
 
 
+class FFTWWisdomTest(WisdomTestMixin, unittest.TestCase):
+
     def test_export(self):
 
         forget_wisdom()
@@ -103,9 +116,268 @@ class FFTWWisdomTest(unittest.TestCase):
 
         self.assertEqual(success, tuple([x in _supported_types for x in ['64', '32', 'ld']]))
 
+    def test_import_system_wisdom(self):
+        # There is most likely no system wisdom, so just check the call
+        success = import_system_wisdom()
+
+        self.assertEqual(len(success), 3)
+        for each in success:
+            self.assertTrue(isinstance(each, bool))
+
+
+class FFTWWisdomFileTest(WisdomTestMixin, unittest.TestCase):
+
+    def assertSameWisdom(self, wisdom, other_wisdom):
+        # FFTW may export the same wisdom in a different order
+        for each, other in zip(wisdom, other_wisdom):
+            self.assertEqual(sorted(each.splitlines()),
+                             sorted(other.splitlines()))
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempdir, 'wisdom.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_export_import_files(self):
+        filenames = [os.path.join(self.tempdir, 'wisdom' + suffix)
+                     for suffix in ('', 'f', 'l')]
+        supported = tuple([x in _supported_types for x in ['64', '32', 'ld']])
+
+        forget_wisdom()
+        self.generate_wisdom()
+        after_wisdom = export_wisdom()
+
+        self.assertEqual(export_wisdom_to_files(*filenames), supported)
+
+        forget_wisdom()
+        before_wisdom = export_wisdom()
+
+        self.assertEqual(import_wisdom_from_files(*filenames), supported)
+        self.assertSameWisdom(export_wisdom(), after_wisdom)
+        self.compare(before_wisdom, after_wisdom)
+
+        # Nothing is done for a file that is None
+        self.assertEqual(export_wisdom_to_files(), (False, False, False))
+        self.assertEqual(import_wisdom_from_files(), (False, False, False))
+
+        self.assertEqual(
+            import_wisdom_from_files(os.path.join(self.tempdir, 'missing')),
+            (False, False, False))
+
+    def test_save_load(self):
+        forget_wisdom()
+        self.generate_wisdom()
+        after_wisdom = export_wisdom()
+
+        save_wisdom(self.filename)
+
+        forget_wisdom()
+        before_wisdom = export_wisdom()
+
+        success = load_wisdom(self.filename)
+
+        self.assertEqual(success, tuple([x in _supported_types for x in ['64', '32', 'ld']]))
+        self.assertSameWisdom(export_wisdom(), after_wisdom)
+        self.compare(before_wisdom, after_wisdom)
+
+        # Only the wisdom file itself and its lock file are left
+        self.assertEqual(sorted(os.listdir(self.tempdir)),
+                         ['wisdom.json', 'wisdom.json.lock'])
+
+    def test_save_merges(self):
+        forget_wisdom()
+        self.generate_wisdom()
+        saved_wisdom = export_wisdom()
+        save_wisdom(self.filename)
+
+        # Another process saves without the wisdom of the first
+        forget_wisdom()
+        save_wisdom(self.filename)
+
+        forget_wisdom()
+        load_wisdom(self.filename)
+        self.assertSameWisdom(export_wisdom(), saved_wisdom)
+
+        forget_wisdom()
+        save_wisdom(self.filename, merge=False)
+
+        forget_wisdom()
+        load_wisdom(self.filename)
+        self.compare(export_wisdom(), saved_wisdom)
+
+    @unittest.skipIf(not hasattr(os, 'geteuid') or os.geteuid() == 0,
+                     'Permissions are not enforced')
+    def test_load_read_only_directory(self):
+        forget_wisdom()
+        self.generate_wisdom()
+        wisdom = export_wisdom()
+        save_wisdom(self.filename)
+
+        # The lock file cannot be created in the directory
+        os.remove(self.filename + '.lock')
+        os.chmod(self.tempdir, 0o555)
+        try:
+            forget_wisdom()
+            load_wisdom(self.filename)
+            self.assertSameWisdom(export_wisdom(), wisdom)
+        finally:
+            os.chmod(self.tempdir, 0o755)
+
+    def test_load_without_lock_file(self):
+        forget_wisdom()
+        self.generate_wisdom()
+        wisdom = export_wisdom()
+        save_wisdom(self.filename)
+
+        # The lock file cannot be opened
+        os.remove(self.filename + '.lock')
+        os.mkdir(self.filename + '.lock')
+
+        forget_wisdom()
+        load_wisdom(self.filename)
+        self.assertSameWisdom(export_wisdom(), wisdom)
+
+        self.assertRaises(OSError, save_wisdom, self.filename)
+
+    def test_concurrent_saves(self):
+        forget_wisdom()
+        self.generate_wisdom()
+        wisdom = export_wisdom()
+
+        # Each thread takes the lock through its own file, as separate
+        # processes would.
+        threads = [threading.Thread(target=save_wisdom, args=(self.filename,))
+                   for n in range(8)]
+
+        for each_thread in threads:
+            each_thread.start()
+
+        for each_thread in threads:
+            each_thread.join()
+
+        forget_wisdom()
+        load_wisdom(self.filename)
+        self.assertSameWisdom(export_wisdom(), wisdom)
+
+        self.assertEqual(sorted(os.listdir(self.tempdir)),
+                         ['wisdom.json', 'wisdom.json.lock'])
+
+    def test_invalid_file(self):
+        with open(self.filename, 'w') as wisdom_file:
+            wisdom_file.write('(fftw-3.3 fftw_wisdom)')
+
+        with self.assertRaisesRegex(ValueError, 'Invalid wisdom file'):
+            load_wisdom(self.filename)
+
+        with open(self.filename, 'w') as wisdom_file:
+            wisdom_file.write('{"version": 1, "wisdom": {"double": 1}}')
+
+        with self.assertRaisesRegex(ValueError, 'Invalid wisdom file'):
+            load_wisdom(self.filename)
+
+        self.assertRaises(IOError, load_wisdom,
+                          os.path.join(self.tempdir, 'missing.json'))
+
+    def test_other_machine_skipped(self):
+        forget_wisdom()
+        self.generate_wisdom()
+        wisdom = export_wisdom()
+        save_wisdom(self.filename)
+
+        fingerprint = _wisdom._fingerprint()
+        try:
+            # The same file seen from a machine with a different CPU
+            _wisdom._machine_fingerprint = dict(
+                fingerprint, features=fingerprint['features'] + ['new'])
+
+            forget_wisdom()
+            self.assertEqual(load_wisdom(self.filename),
+                             (False, False, False))
+            self.compare(export_wisdom(), wisdom)
+
+            # The other machine's wisdom is kept alongside its own
+            save_wisdom(self.filename)
+
+        finally:
+            _wisdom._machine_fingerprint = fingerprint
+
+        forget_wisdom()
+        load_wisdom(self.filename)
+        self.assertSameWisdom(export_wisdom(), wisdom)
+
+        with open(self.filename) as wisdom_file:
+            self.assertEqual(len(json.load(wisdom_file)['machines']), 2)
+
+    def test_fingerprint(self):
+        fingerprint = _wisdom._fingerprint()
+
+        self.assertEqual(sorted(fingerprint), [
+            'caches', 'cores', 'cpu', 'features', 'fftw', 'machine'])
+        self.assertTrue(fingerprint['fftw'].startswith('fftw-3'))
+        self.assertEqual(len(fingerprint['caches']), 3)
+
+        # The fingerprint is stored as JSON
+        self.assertEqual(json.loads(json.dumps(fingerprint)), fingerprint)
+
+        if pyfftw.simd_alignment == 32:
+            self.assertIn('avx', fingerprint['features'])
+
+    def test_version_1_file_skipped(self):
+        forget_wisdom()
+        self.generate_wisdom()
+        wisdom = export_wisdom()
+
+        # A file saved before the wisdom had a fingerprint
+        with open(self.filename, 'w') as wisdom_file:
+            json.dump({'version': 1, 'wisdom': {
+                'double': wisdom[0].decode(), 'single': wisdom[1].decode(),
+                'long double': wisdom[2].decode()}}, wisdom_file)
+
+        forget_wisdom()
+        self.assertEqual(load_wisdom(self.filename), (False, False, False))
+
+    def test_wisdom_saved_after_planning(self):
+        wisdom_file = config.WISDOM_FILE
+        save_delay = _wisdom._SAVE_DELAY
+        saved = threading.Event()
+        run = _wisdom._saver._run
+
+        def run_and_notify():
+            run()
+            saved.set()
+
+        try:
+            config.WISDOM_FILE = self.filename
+            _wisdom._SAVE_DELAY = 0.0
+            _wisdom._saver._run = run_and_notify
+
+            forget_wisdom()
+            a = empty_aligned(64, dtype='complex128')
+            builders.fft(a, planner_effort='FFTW_MEASURE')
+
+            # The save is done in the background, by the timer
+            self.assertTrue(saved.wait(10))
+
+            with open(self.filename) as wisdom_file:
+                contents = json.load(wisdom_file)
+
+            machine, = contents['machines']
+            self.assertEqual(machine['fingerprint'], _wisdom._fingerprint())
+            self.assertSameWisdom(
+                [machine['wisdom'][precision].encode('ascii')
+                 for precision in _wisdom._PRECISIONS], export_wisdom())
+
+        finally:
+            config.WISDOM_FILE = wisdom_file
+            _wisdom._SAVE_DELAY = save_delay
+            del _wisdom._saver._run
+
 
 test_cases = (
-        FFTWWisdomTest,)
+        FFTWWisdomTest,
+        FFTWWisdomFileTest,)
 
 test_set = None
 